@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark - HTTP sem pool (requests.get) vs. PooledSession
+==========================================================
+
+Sobe um servidor HTTP/1.1 local (keep-alive) e compara req/seg:
+- antes: requests.get/post a cada chamada (conexão TCP nova por requisição),
+  como ClickUpIntegration/GitHubIntegration faziam
+- depois: PooledSession compartilhada (conexões reaproveitadas)
+
+Mede chamadas sequenciais e chamadas concorrentes (threads). Em produção
+(HTTPS) a diferença é maior, pois cada conexão nova também paga o
+handshake TLS.
+
+Uso:
+    python benchmarks/bench_http_pool.py [--requests 1000] [--threads 8]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sage.integrations.http import HTTPConfig, PooledSession
+
+
+PAYLOAD = b'{"tasks": [{"id": "abc123", "name": "Tarefa", "status": {"status": "open"}}]}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Responde JSON fixo, mantendo a conexão aberta (HTTP/1.1)"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(get, total: int, threads: int) -> float:
+    """req/seg de `total` chamadas a get() distribuídas em `threads` threads"""
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(total):
+            get()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: get(), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="Requisições por medição")
+    parser.add_argument("--threads", type=int, default=8, help="Threads na medição concorrente")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/list/1/task"
+
+    session = PooledSession(HTTPConfig(pool_maxsize=args.threads))
+    unpooled = lambda: requests.get(url, timeout=10).json()
+    pooled = lambda: session.get(url).json()
+
+    results = {}
+    for name, threads in (("sequencial", 1), (f"concorrente ({args.threads} threads)", args.threads)):
+        results[name] = (measure(unpooled, args.requests, threads),
+                         measure(pooled, args.requests, threads))
+
+    session.close()
+    server.shutdown()
+    server.server_close()
+
+    print(f"\n📊 HTTP - {args.requests} requisições por medição\n")
+    print(f"{'cenário':<28}{'antes (req/s)':>16}{'depois (req/s)':>16}{'ganho':>10}")
+    print("-" * 70)
+    for name, (before, after) in results.items():
+        print(f"{name:<28}{before:>16,.0f}{after:>16,.0f}{after / before:>9.1f}x")
+    print()
+
+
+if __name__ == "__main__":
+    main()
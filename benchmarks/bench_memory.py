@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark - MemorySystem (conexão por chamada vs. conexão persistente)
+======================================================================
+
+Compara ops/seg do padrão antigo (sqlite3.connect + commit + close a cada
+chamada, journal padrão) com o MemorySystem atual (ConnectionManager
+persistente em WAL).
+
+Uso:
+    python benchmarks/bench_memory.py [--ops 2000]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sage.core.secretary_agent import MemorySystem, Note
+
+
+class LegacyMemory:
+    """Reprodução do padrão antigo: uma conexão nova por operação"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS notes (
+                id TEXT PRIMARY KEY, content TEXT, tags TEXT, project TEXT,
+                created_at TEXT, updated_at TEXT, priority TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT,
+                user_input TEXT, agent_response TEXT, context TEXT
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def save_note(self, note: Note):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?, ?)", (
+            note.id, note.content, json.dumps(note.tags),
+            note.project, note.created_at, note.updated_at, note.priority
+        ))
+        conn.commit()
+        conn.close()
+
+    def save_conversation(self, user_input: str, agent_response: str, context: dict):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "INSERT INTO conversations (timestamp, user_input, agent_response, context) VALUES (?, ?, ?, ?)",
+            (datetime.now().isoformat(), user_input, agent_response, json.dumps(context))
+        )
+        conn.commit()
+        conn.close()
+
+    def get_recent_conversations(self, limit: int = 10):
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            "SELECT * FROM conversations ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def close(self):
+        pass
+
+
+def _note(i: int) -> Note:
+    now = datetime.now().isoformat()
+    return Note(id=f"note_{i}", content=f"Conteúdo {i}" * 4, tags=["bench"],
+                project="Max-Code", created_at=now, updated_at=now, priority="medium")
+
+
+def run(memory, ops: int) -> dict:
+    """Mede ops/seg de cada operação"""
+    results = {}
+
+    start = time.perf_counter()
+    for i in range(ops):
+        memory.save_note(_note(i))
+    results["save_note"] = ops / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        memory.save_conversation(f"pergunta {i}", f"resposta {i}", {"turn": i})
+    results["save_conversation"] = ops / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        memory.get_recent_conversations(5)
+    results["get_recent_conversations"] = ops / (time.perf_counter() - start)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000, help="Operações por medição")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacyMemory(str(Path(tmp) / "legacy.db"))
+        before = run(legacy, args.ops)
+        legacy.close()
+
+        pooled = MemorySystem(str(Path(tmp) / "pooled.db"))
+        after = run(pooled, args.ops)
+        pooled.close()
+
+    print(f"\n📊 MemorySystem - {args.ops} ops por medição\n")
+    print(f"{'operação':<28}{'antes (ops/s)':>16}{'depois (ops/s)':>16}{'ganho':>10}")
+    print("-" * 70)
+    for name in before:
+        print(f"{name:<28}{before[name]:>16,.0f}{after[name]:>16,.0f}{after[name] / before[name]:>9.1f}x")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sage.core.maximus_pa import Sage
+from sage.core.sage import Sage
 
 
 def parse_args():
@@ -162,65 +162,74 @@ async def main():
             sys.exit(1)
 
         print(f"\n🚀 Executando roadmap: {roadmap_path}")
-        result = await assistant.load_and_execute_roadmap(roadmap_path, auto_execute=True)
+        async with assistant.background():
+            result = await assistant.load_and_execute_roadmap(roadmap_path, auto_execute=True)
         print(f"\n✅ Execução concluída: {result['total_steps']} etapas\n")
-        await assistant.close()
         return
 
     # Interactive mode
     print("\n📋 Comandos disponíveis:")
     print("  - Converse normalmente para interação consciente")
     print("  - execute <roadmap> - Executar roadmap com validação")
+    print("  - sync - Sincronizar agora (em background)")
     print("  - status - Ver status e performance")
     print("  - performance - Relatório de desempenho")
     print("  - quit - Sair")
     print()
 
+    # Background sync (with retention), health probes and webhooks keep
+    # running on the event loop while the REPL waits for the user
     try:
-        while True:
-            user_input = input("Você: ").strip()
+        async with assistant.background():
+            await repl(assistant)
+    except KeyboardInterrupt:
+        print("\n\n👋 Interrompido pelo usuário. Até logo!\n")
 
-            if not user_input:
-                continue
 
-            if user_input.lower() == 'quit':
-                print("\n👋 Até logo!\n")
-                break
-
-            elif user_input.lower() == 'status':
-                import json
-                status = await assistant.get_status()
-                print(f"\n{json.dumps(status, indent=2)}\n")
-
-            elif user_input.lower() == 'performance':
-                perf = assistant.performance.get_report()
-                print(f"\n📊 Performance Report:")
-                print(f"   Tasks: {perf['tasks_completed']} completed, {perf['tasks_failed']} failed")
-                print(f"   Success Rate: {perf['success_rate']}")
-                print(f"   Avg Task Time: {perf['avg_task_time']}")
-                print(f"   Consciousness Checks: {perf['consciousness_checks']['passed']} passed, {perf['consciousness_checks']['failed']} failed")
-                print()
-
-            elif user_input.lower().startswith('execute '):
-                roadmap_path = user_input[8:].strip()
-                if not os.path.exists(roadmap_path):
-                    print(f"\n❌ Roadmap não encontrado: {roadmap_path}\n")
-                    continue
-
-                print(f"\n🚀 Executando roadmap com validação consciente...")
-                result = await assistant.load_and_execute_roadmap(roadmap_path, auto_execute=True)
-                print(f"\n✅ Execução concluída: {result['total_steps']} etapas\n")
-
-            else:
-                # Conversação consciente
-                response = await assistant.think_consciously(user_input)
-                print(f"\n🧠 MAXIMUS: {response}\n")
+async def repl(assistant: Sage):
+    """Interactive loop (input() runs in a thread so the event loop keeps going)"""
+    while True:
+        user_input = (await asyncio.to_thread(input, "Você: ")).strip()
+
+        if not user_input:
+            continue
+
+        if user_input.lower() == 'quit':
+            print("\n👋 Até logo!\n")
+            break
+
+        elif user_input.lower() == 'sync':
+            assistant.sync_daemon.trigger()
+            print("\n🔄 Sincronização agendada (em background)\n")
+
+        elif user_input.lower() == 'status':
+            import json
+            status = await assistant.get_status()
+            print(f"\n{json.dumps(status, indent=2)}\n")
+
+        elif user_input.lower() == 'performance':
+            perf = assistant.performance.get_report()
+            print(f"\n📊 Performance Report:")
+            print(f"   Tasks: {perf['tasks_completed']} completed, {perf['tasks_failed']} failed")
+            print(f"   Success Rate: {perf['success_rate']}")
+            print(f"   Avg Task Time: {perf['avg_task_time']}")
+            print(f"   Consciousness Checks: {perf['consciousness_checks']['passed']} passed, {perf['consciousness_checks']['failed']} failed")
+            print()
+
+        elif user_input.lower().startswith('execute '):
+            roadmap_path = user_input[8:].strip()
+            if not os.path.exists(roadmap_path):
+                print(f"\n❌ Roadmap não encontrado: {roadmap_path}\n")
+                continue
 
-    except KeyboardInterrupt:
-        print("\n\n👋 Interrompido pelo usuário. Até logo!\n")
+            print(f"\n🚀 Executando roadmap com validação consciente...")
+            result = await assistant.load_and_execute_roadmap(roadmap_path, auto_execute=True)
+            print(f"\n✅ Execução concluída: {result['total_steps']} etapas\n")
 
-    finally:
-        await assistant.close()
+        else:
+            # Conversação consciente
+            response = await assistant.think_consciously(user_input)
+            print(f"\n🧠 MAXIMUS: {response}\n")
 
 
 def cli_main():
@@ -0,0 +1,156 @@
+"""
+⚡ ASYNC MEMORY - MemorySystem sem bloquear o event loop
+=========================================================
+
+Fachada assíncrona sobre o MemorySystem para os caminhos asyncio
+(Sage.think_consciously, execute_task_consciously, _build_context):
+- Escritas em uma thread dedicada (fila FIFO → ordem preservada)
+- Leituras em um pool de threads, cada uma com seu leitor WAL
+- Mesmos modelos Note/Task do MemorySystem síncrono
+
+Enquanto o SQLite grava, o event loop continua livre para as
+requisições ao MABA, ao Core e ao Claude.
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .secretary_agent import DailyDigest, MemorySystem, Note, Task, SearchResult
+from .summaries import ConversationSummary
+
+
+class AsyncMemorySystem:
+    """
+    Versão awaitable do MemorySystem
+
+    Uso:
+        amemory = AsyncMemorySystem(memory)
+        await amemory.save_note(note)
+        notes = await amemory.get_recent_notes(5)
+        await amemory.close()
+    """
+
+    def __init__(self, memory: MemorySystem, read_workers: int = 4):
+        self.memory = memory
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sage-db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="sage-db-reader")
+        self._closed = False
+
+    async def _run(self, executor: ThreadPoolExecutor, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    async def _write(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self._run(self._writer, fn, *args, **kwargs)
+
+    async def _read(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self._run(self._readers, fn, *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Escritas
+    # ------------------------------------------------------------------
+
+    async def save_note(self, note: Note):
+        """Salva uma nota"""
+        await self._write(self.memory.save_note, note)
+
+    async def save_task(self, task: Task):
+        """Salva uma tarefa"""
+        await self._write(self.memory.save_task, task)
+
+    async def save_conversation(self, user_input: str, agent_response: str, context: Dict):
+        """Salva uma interação"""
+        await self._write(self.memory.save_conversation, user_input, agent_response, context)
+
+    async def record_commits(self, project: str, commits: List[Dict]) -> int:
+        """Registra commits nos contadores diários"""
+        return await self._write(self.memory.record_commits, project, commits)
+
+    # ------------------------------------------------------------------
+    # Leituras
+    # ------------------------------------------------------------------
+
+    async def get_all_notes(self, project: Optional[str] = None) -> List[Note]:
+        """Busca todas as notas"""
+        return await self._read(self.memory.get_all_notes, project)
+
+    async def get_all_tasks(self, status: Optional[str] = None) -> List[Task]:
+        """Busca todas as tarefas"""
+        return await self._read(self.memory.get_all_tasks, status)
+
+    async def get_notes(self, project: Optional[str] = None, limit: int = 50, offset: int = 0,
+                        before: Optional[Tuple[str, str]] = None) -> List[Note]:
+        """Busca notas paginadas (mais recentes primeiro)"""
+        return await self._read(self.memory.get_notes, project, limit, offset, before)
+
+    async def get_tasks(self, status: Optional[str] = None, project: Optional[str] = None,
+                        exclude_status: Optional[str] = None, limit: int = 50, offset: int = 0,
+                        before: Optional[Tuple[str, str]] = None) -> List[Task]:
+        """Busca tarefas paginadas (mais recentes primeiro)"""
+        return await self._read(self.memory.get_tasks, status, project, exclude_status,
+                                limit, offset, before)
+
+    async def get_recent_notes(self, limit: int = 5, project: Optional[str] = None) -> List[Note]:
+        """Últimas notas em ordem cronológica"""
+        return await self._read(self.memory.get_recent_notes, limit, project)
+
+    async def get_recent_tasks(self, limit: int = 5, project: Optional[str] = None) -> List[Task]:
+        """Últimas tarefas em ordem cronológica"""
+        return await self._read(self.memory.get_recent_tasks, limit, project)
+
+    async def count_notes(self, project: Optional[str] = None) -> int:
+        """Conta notas"""
+        return await self._read(self.memory.count_notes, project)
+
+    async def count_tasks(self, status: Optional[str] = None, project: Optional[str] = None,
+                          exclude_status: Optional[str] = None) -> int:
+        """Conta tarefas"""
+        return await self._read(self.memory.count_tasks, status, project, exclude_status)
+
+    async def get_recent_conversations(self, limit: int = 10) -> List[Dict]:
+        """Busca conversas recentes"""
+        return await self._read(self.memory.get_recent_conversations, limit)
+
+    async def get_conversation_summaries(self, limit: int = 10,
+                                         project: Optional[str] = None) -> List[ConversationSummary]:
+        """Resumos de conversas por projeto/dia (mais recentes primeiro)"""
+        return await self._read(self.memory.get_conversation_summaries, limit, project)
+
+    async def get_daily_digest(self, day: Optional[str] = None) -> DailyDigest:
+        """Contadores de um dia"""
+        return await self._read(self.memory.get_daily_digest, day)
+
+    async def get_digest_trend(self, days: int = 30, end: Optional[str] = None) -> List[DailyDigest]:
+        """Contadores dos últimos N dias"""
+        return await self._read(self.memory.get_digest_trend, days, end)
+
+    async def search(self, query: str, kinds: Optional[List[str]] = None,
+                     project: Optional[str] = None, limit: int = 10) -> List[SearchResult]:
+        """Busca full-text na memória"""
+        return await self._read(self.memory.search, query, kinds, project, limit)
+
+    async def semantic_search(self, query: str, kinds: Optional[List[str]] = None,
+                              project: Optional[str] = None, limit: int = 5) -> List[SearchResult]:
+        """Busca por significado (índice vetorial) em notas e tarefas"""
+        return await self._read(self.memory.semantic_search, query, kinds, project, limit)
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def close(self):
+        """Aguarda as escritas pendentes e encerra as threads"""
+        if self._closed:
+            return
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+
+    def _shutdown(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
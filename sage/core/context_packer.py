@@ -0,0 +1,240 @@
+"""
+📦 CONTEXT PACKER - Orçamento de tokens na montagem dos prompts
+================================================================
+
+Monta o contexto dos prompts por seções, cada uma com seu orçamento:
+- persona, projects, recent_turns, summaries, memory, task_state, state
+- Estimativa local e rápida de tokens (sem tokenizer remoto)
+- JSON compacto (separadores sem espaço, chaves ordenadas: o
+  mesmo conteúdo vira sempre o mesmo texto, bom para o prompt cache)
+- Estratégias por seção:
+  - text: corta no orçamento, com marcador de quantos tokens saíram
+  - json: encurta as strings longas; se ainda não couber, corta
+  - items: encurta cada item e inclui os primeiros (mais relevantes)
+    até o orçamento
+- Relatório de tokens por seção em cada montagem (e médias por site)
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Aproximação de BPE: palavras em pedaços de até 4 caracteres + pontuação
+_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+
+# Orçamento padrão por seção (tokens estimados)
+DEFAULT_BUDGETS: Dict[str, int] = {
+    "persona": 600,
+    "projects": 800,
+    "recent_turns": 1200,
+    "summaries": 800,
+    "memory": 1500,
+    "task_state": 800,
+    "state": 400,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa local de tokens (ordem de grandeza do tokenizer do Claude)"""
+    return len(_TOKEN.findall(text))
+
+
+def compact_json(value: Any) -> str:
+    """JSON sem espaços supérfluos e com chaves ordenadas"""
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False, default=str)
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    """Corta o texto em ~budget tokens, indicando quanto foi omitido"""
+    if budget <= 0:
+        return ""
+    tokens = list(_TOKEN.finditer(text))
+    if len(tokens) <= budget:
+        return text
+    return f"{text[:tokens[budget - 1].end()]}…[+{len(tokens) - budget} tokens]"
+
+
+def shorten_strings(value: Any, max_tokens: int) -> Any:
+    """Copia a estrutura encurtando strings acima de max_tokens"""
+    if isinstance(value, str):
+        return truncate_tokens(value, max_tokens)
+    if isinstance(value, dict):
+        return {k: shorten_strings(v, max_tokens) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [shorten_strings(v, max_tokens) for v in value]
+    return value
+
+
+# ============================================================================
+# SECTIONS
+# ============================================================================
+
+@dataclass
+class Section:
+    """Uma seção do contexto a ser empacotada"""
+    name: str
+    content: Any
+    strategy: str = "json"    # text | json | items
+
+
+@dataclass
+class SectionUsage:
+    """Uso de tokens de uma seção numa montagem"""
+    name: str
+    budget: int
+    tokens: int
+    original_tokens: int
+    truncated: bool = False
+    items_kept: Optional[int] = None
+    items_total: Optional[int] = None
+
+
+@dataclass
+class PackedContext:
+    """Resultado de uma montagem: texto por seção + uso de tokens"""
+    site: str
+    sections: Dict[str, str] = field(default_factory=dict)
+    usage: Dict[str, SectionUsage] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> str:
+        return self.sections[name]
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(u.tokens for u in self.usage.values())
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Tokens por seção (para log/status)"""
+        return {
+            name: {
+                "tokens": u.tokens,
+                "budget": u.budget,
+                "original_tokens": u.original_tokens,
+                "truncated": u.truncated,
+                **({"items": f"{u.items_kept}/{u.items_total}"} if u.items_total is not None else {}),
+            }
+            for name, u in self.usage.items()
+        }
+
+
+# ============================================================================
+# CONTEXT PACKER
+# ============================================================================
+
+class ContextPacker:
+    """
+    Empacota seções de contexto dentro dos orçamentos de tokens
+
+    Uso:
+        packer = ContextPacker()
+        packed = packer.pack("think", [
+            Section("projects", projects),
+            Section("memory", memories, "items"),
+        ])
+        packed["memory"], packed.report()
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None,
+                 max_string_tokens: int = 200, min_string_tokens: int = 8):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.max_string_tokens = max_string_tokens
+        self.min_string_tokens = min_string_tokens
+
+        self._lock = threading.Lock()
+        self.last: Dict[str, PackedContext] = {}
+        self._totals: Dict[str, Dict[str, List[int]]] = {}   # site → seção → [montagens, tokens, cortes]
+
+    def budget(self, name: str) -> int:
+        return self.budgets.get(name, self.max_string_tokens)
+
+    # ------------------------------------------------------------------
+    # Estratégias
+    # ------------------------------------------------------------------
+
+    def pack_text(self, text: str, budget: int) -> str:
+        return truncate_tokens(text, budget)
+
+    def pack_json(self, value: Any, budget: int) -> str:
+        """Encurta strings longas (cada vez mais) até caber; em último caso corta"""
+        text = compact_json(value)
+        limit = self.max_string_tokens
+        while estimate_tokens(text) > budget and limit >= self.min_string_tokens:
+            text = compact_json(shorten_strings(value, limit))
+            limit //= 2
+        return truncate_tokens(text, budget)
+
+    def pack_items(self, items: List[Any], budget: int) -> Tuple[str, int]:
+        """Primeiros itens (já encurtados) que cabem no orçamento → (texto, incluídos)"""
+        packed: List[str] = []
+        used = 2   # colchetes
+        for item in items:
+            text = compact_json(shorten_strings(item, self.max_string_tokens))
+            cost = estimate_tokens(text) + 1
+            if used + cost > budget:
+                break
+            packed.append(text)
+            used += cost
+        return "[" + ",".join(packed) + "]", len(packed)
+
+    # ------------------------------------------------------------------
+    # Montagem
+    # ------------------------------------------------------------------
+
+    def pack(self, site: str, sections: List[Section]) -> PackedContext:
+        """Empacota as seções e registra o uso de tokens do site"""
+        packed = PackedContext(site=site)
+        for section in sections:
+            budget = self.budget(section.name)
+            kept = total = None
+            if section.strategy == "text":
+                full = section.content
+                text = self.pack_text(full, budget)
+            elif section.strategy == "items":
+                items = list(section.content)
+                full = compact_json(items)
+                text, kept = self.pack_items(items, budget)
+                total = len(items)
+            elif section.strategy == "json":
+                full = compact_json(section.content)
+                text = self.pack_json(section.content, budget)
+            else:
+                raise ValueError(f"Estratégia desconhecida: {section.strategy}")
+
+            packed.sections[section.name] = text
+            packed.usage[section.name] = SectionUsage(
+                name=section.name, budget=budget, tokens=estimate_tokens(text),
+                original_tokens=estimate_tokens(full), truncated=text != full,
+                items_kept=kept, items_total=total
+            )
+
+        self._record(packed)
+        return packed
+
+    def _record(self, packed: PackedContext):
+        with self._lock:
+            self.last[packed.site] = packed
+            site = self._totals.setdefault(packed.site, {})
+            for name, usage in packed.usage.items():
+                totals = site.setdefault(name, [0, 0, 0])
+                totals[0] += 1
+                totals[1] += usage.tokens
+                totals[2] += usage.truncated
+
+    def stats(self) -> Dict[str, Any]:
+        """Por site: uso da última montagem e médias por seção"""
+        with self._lock:
+            return {
+                site: {
+                    "last": self.last[site].report(),
+                    "last_total_tokens": self.last[site].total_tokens,
+                    "avg_tokens": {name: round(t[1] / t[0], 1) for name, t in sections.items()},
+                    "truncations": {name: t[2] for name, t in sections.items()},
+                }
+                for site, sections in self._totals.items()
+            }
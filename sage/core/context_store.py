@@ -0,0 +1,176 @@
+"""
+🧩 CONTEXT STORE - Contexto de conversas endereçado por conteúdo
+================================================================
+
+O contexto salvo a cada conversa (projetos, notas e tarefas recentes,
+relatório de performance...) se repete quase igual a cada turno.
+Em vez de gravar json.dumps(context) inteiro por linha:
+- Cada sub-objeto grande é serializado de forma canônica e identificado
+  pelo seu SHA-256
+- Cada blob distinto é gravado uma única vez, comprimido (zstd se
+  disponível, senão zlib), na tabela context_blobs
+- A conversa guarda só os valores pequenos (inline) e as referências
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Dependência opcional
+    zstandard = None
+
+
+# Sub-objetos menores que isso ficam inline na própria conversa
+INLINE_MAX_BYTES = 128
+
+DEFAULT_CODEC = "zstd" if zstandard else "zlib"
+
+
+def canonical_json(value: Any) -> str:
+    """JSON canônico: mesma estrutura → mesma string → mesmo hash"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False, default=str)
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Blob comprimido com zstd, mas o pacote 'zstandard' não está instalado")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class ContextStore:
+    """
+    Divide contextos em valores inline + blobs deduplicados e os remonta
+
+    Uso (sempre dentro de uma conexão/transação do MemorySystem):
+        inline_json, refs_json = store.split(conn, context)
+        context = store.join(conn, inline_json, refs_json)
+    """
+
+    def __init__(self, codec: str = DEFAULT_CODEC, cache_size: int = 256):
+        self.codec = codec
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()  # hash → JSON descomprimido
+        self._lock = threading.Lock()
+
+    def split(self, conn: sqlite3.Connection, context: Dict) -> Tuple[str, Optional[str]]:
+        """
+        Separa o contexto e grava os blobs novos (INSERT OR IGNORE)
+        Retorna (JSON inline, JSON de referências ou None)
+        """
+        inline: Dict[str, Any] = {}
+        refs: Dict[str, str] = {}
+
+        for key, value in context.items():
+            encoded = canonical_json(value)
+            if not isinstance(value, (dict, list)) or len(encoded) < INLINE_MAX_BYTES:
+                inline[key] = value
+                continue
+
+            digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+            refs[key] = digest
+            # Sempre grava: o cache só serve leituras e pode estar à frente
+            # de uma coleta de blobs órfãos (referência a blob apagado)
+            conn.execute(
+                "INSERT OR IGNORE INTO context_blobs (hash, codec, data, size) VALUES (?, ?, ?, ?)",
+                (digest, self.codec, compress(encoded.encode("utf-8"), self.codec), len(encoded))
+            )
+
+        return canonical_json(inline), (canonical_json(refs) if refs else None)
+
+    def join(self, conn: sqlite3.Connection, inline_json: Optional[str],
+             refs_json: Optional[str]) -> Dict:
+        """Remonta o contexto original a partir do inline + referências"""
+        context = json.loads(inline_json) if inline_json else {}
+        if not refs_json:
+            return context
+
+        for key, digest in json.loads(refs_json).items():
+            encoded = self._cached(digest)
+            if encoded is None:
+                row = conn.execute(
+                    "SELECT codec, data FROM context_blobs WHERE hash = ?", (digest,)
+                ).fetchone()
+                if row is None:
+                    context[key] = None
+                    continue
+                encoded = decompress(row[1], row[0]).decode("utf-8")
+                self._remember(digest, encoded)
+            # json.loads a cada leitura: quem recebe pode alterar o dict à vontade
+            context[key] = json.loads(encoded)
+
+        return context
+
+    def _cached(self, digest: str) -> Optional[str]:
+        with self._lock:
+            encoded = self._cache.get(digest)
+            if encoded is not None:
+                self._cache.move_to_end(digest)
+            return encoded
+
+    def _remember(self, digest: str, encoded: str):
+        with self._lock:
+            self._cache[digest] = encoded
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def forget(self):
+        """Esvazia o cache (ex.: após remover blobs do banco)"""
+        with self._lock:
+            self._cache.clear()
+
+
+def compact_legacy_contexts(conn: sqlite3.Connection, store: Optional[ContextStore] = None,
+                            batch_size: int = 500) -> int:
+    """
+    Migração única: converte conversas antigas (contexto JSON inteiro)
+    para o formato inline + referências. Retorna linhas convertidas.
+    """
+    store = store or ContextStore()
+    converted = 0
+    last_id = 0
+
+    while True:
+        rows = conn.execute("""
+            SELECT id, context FROM conversations
+            WHERE id > ? AND context_refs IS NULL AND context IS NOT NULL
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            return converted
+
+        updates = []
+        for conversation_id, context_json in rows:
+            last_id = conversation_id
+            try:
+                context = json.loads(context_json)
+            except ValueError:
+                continue
+            if not isinstance(context, dict):
+                continue
+            inline_json, refs_json = store.split(conn, context)
+            if refs_json:
+                updates.append((inline_json, refs_json, conversation_id))
+
+        conn.executemany(
+            "UPDATE conversations SET context = ?, context_refs = ? WHERE id = ?", updates
+        )
+        converted += len(updates)
@@ -0,0 +1,215 @@
+"""
+🗄️ DATABASE - Camada de conexões SQLite de longa duração
+=========================================================
+
+Substitui o padrão "abre conexão → executa → commit → fecha" por um
+gerenciador de conexões persistente:
+- Um único writer (serializado por lock) em modo WAL
+- Um leitor por thread (thread-local), que lê em paralelo ao writer e
+  é fechado quando a thread termina (workers de asyncio.to_thread e pools)
+- Pragmas ajustados (synchronous, cache_size, mmap_size)
+- Statements preparados reutilizados pelo cache do módulo sqlite3
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any
+
+
+# ============================================================================
+# PRAGMAS
+# ============================================================================
+
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "auto_vacuum": "INCREMENTAL",  # Só vale para bancos novos (ver vacuum())
+    "journal_mode": "WAL",      # Leitores não bloqueiam o writer
+    "synchronous": "NORMAL",    # Em WAL, fsync só no checkpoint
+    "cache_size": -16000,       # ~16 MB de page cache (negativo = KiB)
+    "mmap_size": 268435456,     # 256 MB mapeados em memória
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,       # ms
+    "recursive_triggers": "ON", # REPLACE dispara os triggers de DELETE
+}
+
+# Pragmas que só fazem sentido na conexão de escrita
+WRITER_ONLY_PRAGMAS = {"journal_mode", "auto_vacuum"}
+
+
+class DatabaseClosedError(sqlite3.ProgrammingError):
+    """Operação em um ConnectionManager já fechado"""
+
+
+class _ReaderSlot:
+    """Leitor guardado no thread-local; coletado quando a thread termina"""
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_reader(conn: sqlite3.Connection, readers: List[sqlite3.Connection],
+                    lock: threading.Lock):
+    """Finalizador do leitor de uma thread encerrada"""
+    with lock:
+        if conn in readers:
+            readers.remove(conn)
+    conn.close()
+
+
+# ============================================================================
+# CONNECTION MANAGER
+# ============================================================================
+
+class ConnectionManager:
+    """
+    Gerenciador de conexões SQLite de longa duração
+
+    Uso:
+        db = ConnectionManager("secretary_memory.db")
+        with db.transaction() as conn:
+            conn.execute("INSERT ...")
+        with db.read() as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+        db.close()
+    """
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None,
+                 cached_statements: int = 256):
+        self.db_path = str(db_path)
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+
+        # Bancos em memória não são compartilhados entre conexões:
+        # nesse caso todas as leituras usam o writer (sob o lock)
+        self.in_memory = self.db_path == ":memory:" or "mode=memory" in self.db_path
+
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+        self._writer = self._connect(readonly=False)
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        """Abre uma conexão e aplica os pragmas"""
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,  # Transações explícitas via transaction()
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            uri=self.db_path.startswith("file:")
+        )
+        for name, value in self.pragmas.items():
+            if readonly and name in WRITER_ONLY_PRAGMAS:
+                continue
+            conn.execute(f"PRAGMA {name}={value}")
+        if readonly:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _check_open(self):
+        if self._closed:
+            raise DatabaseClosedError(f"Banco de dados fechado: {self.db_path}")
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def open_readers(self) -> int:
+        """Leitores abertos (um por thread viva que já leu)"""
+        with self._readers_lock:
+            return len(self._readers)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Transação de escrita no writer (BEGIN IMMEDIATE ... COMMIT)
+        Transações aninhadas na mesma thread reutilizam a transação externa
+        """
+        with self._write_lock:
+            self._check_open()
+            conn = self._writer
+
+            if conn.in_transaction:
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Conexão de leitura da thread atual"""
+        self._check_open()
+
+        if self.in_memory:
+            with self._write_lock:
+                yield self._writer
+            return
+
+        slot = getattr(self._local, "reader", None)
+        if slot is None:
+            slot = _ReaderSlot(self._connect(readonly=True))
+            self._local.reader = slot
+            with self._readers_lock:
+                self._readers.append(slot.conn)
+            # O thread-local é descartado quando a thread termina: fecha
+            # o leitor junto (sem referência forte ao gerenciador)
+            weakref.finalize(slot, _release_reader, slot.conn, self._readers, self._readers_lock)
+        yield slot.conn
+
+    def execute_write(self, sql: str, params: Any = ()) -> sqlite3.Cursor:
+        """Executa um único statement de escrita em sua própria transação"""
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def vacuum(self, incremental_pages: Optional[int] = None) -> bool:
+        """
+        Libera páginas livres do arquivo
+        - Banco em auto_vacuum=INCREMENTAL: incremental_vacuum(N), barato
+        - Caso contrário (bancos antigos): VACUUM completo, que também
+          converte o banco para INCREMENTAL a partir de então
+        Retorna True se foi feito um VACUUM completo.
+        """
+        with self._write_lock:
+            self._check_open()
+            conn = self._writer
+            mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if mode == 2:  # INCREMENTAL
+                pages = int(incremental_pages) if incremental_pages is not None else 0  # 0 = todas
+                conn.execute(f"PRAGMA incremental_vacuum({pages})").fetchall()
+                return False
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+
+    def close(self):
+        """Fecha writer e todos os leitores (idempotente)"""
+        with self._write_lock:
+            if self._closed:
+                return
+            self._closed = True
+
+            with self._readers_lock:
+                for conn in self._readers:
+                    conn.close()
+                self._readers.clear()
+
+            try:
+                self._writer.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._writer.close()
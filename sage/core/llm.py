@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+💬 LLM - Cliente Claude com streaming
+======================================
+
+Um único ponto de chamada ao Claude para o Sage:
+- Async (AsyncAnthropic) para os caminhos do event loop: o think()
+  consciente, análise de roadmap e planos de execução não bloqueiam
+  mais o loop enquanto o modelo gera
+- Streaming: cada trecho de texto vai para on_token assim que chega
+  (imprimir no terminal, repassar a um websocket, ...)
+- Mede time-to-first-token e duração de cada chamada e avisa os
+  listeners (ex.: PerformanceMonitor.record_llm_call)
+- Versão síncrona (stream_sync) para o CLI da Secretária
+- Prompt caching: cached_system() marca a parte estável do system
+  prompt (persona, projetos, ferramentas) com cache_control; o que
+  muda a cada chamada vem depois do breakpoint. Cada resposta traz os
+  tokens lidos/gravados no cache para medir a economia. Limitação: o
+  Claude só cacheia prefixos a partir de 1024 tokens (Sonnet/Opus;
+  2048 no Haiku). O think() consciente passa disso (persona, projetos
+  e catálogo de ferramentas); prefixos menores — hoje o think() da
+  Secretária e a análise de roadmap, ~200-400 tokens — vão sem
+  breakpoint e não contam no hit rate
+- Cache de respostas (ResponseCache), por ponto de chamada: com
+  cache_site, pedidos repetidos nem chegam ao Claude
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+from anthropic import Anthropic, AsyncAnthropic
+
+from .context_packer import estimate_tokens
+from .response_cache import CacheHit, CacheKey, ResponseCache
+
+
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+
+# Menor prefixo que o Claude aceita cachear (Sonnet/Opus; Haiku: 2048)
+MIN_CACHEABLE_TOKENS = 1024
+
+
+@dataclass
+class LLMResponse:
+    """Resultado de uma chamada com streaming"""
+    text: str
+    model: str
+    ttft: Optional[float]      # segundos até o primeiro token (None se veio vazio)
+    duration: float            # segundos até o fim do stream
+    input_tokens: int = 0                 # só os tokens fora do cache
+    output_tokens: int = 0
+    cache_read_tokens: int = 0            # prefixo reaproveitado (hit)
+    cache_write_tokens: int = 0           # prefixo gravado no cache (miss)
+    stop_reason: Optional[str] = None
+    cached: bool = False                  # servida pelo ResponseCache
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Total de tokens de entrada (cache + não cacheados)"""
+        return self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+
+
+SystemPrompt = Union[str, List[Dict]]
+
+
+def cached_system(stable: str, volatile: Optional[str] = None,
+                  min_tokens: int = MIN_CACHEABLE_TOKENS) -> List[Dict]:
+    """
+    System prompt em blocos: o prefixo estável com breakpoint de cache,
+    a parte volátil (contexto, memórias) depois dele, sem cache
+
+    O prefixo precisa ser idêntico byte a byte entre chamadas para dar
+    hit (ex.: json.dumps com sort_keys). Abaixo de min_tokens (estimados)
+    o Claude ignoraria o breakpoint, então ele nem é enviado
+    """
+    blocks = [{"type": "text", "text": stable}]
+    if estimate_tokens(stable) >= min_tokens:
+        blocks[0]["cache_control"] = {"type": "ephemeral"}
+    if volatile:
+        blocks.append({"type": "text", "text": volatile})
+    return blocks
+
+
+TokenCallback = Callable[[str], None]
+Listener = Callable[[LLMResponse], None]
+
+
+class StreamingClaude:
+    """
+    Cliente Claude com streaming (async e sync)
+
+    Uso:
+        llm = StreamingClaude(api_key)
+        response = await llm.stream(
+            messages=[{"role": "user", "content": "Oi"}],
+            on_token=lambda t: print(t, end="", flush=True)
+        )
+        response.text, response.ttft
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None,
+                 model: str = DEFAULT_MODEL, max_retries: int = 2,
+                 cache: Optional[ResponseCache] = None):
+        self.model = model
+        self.cache = cache
+        self.client = AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=max_retries)
+        self.sync_client = Anthropic(api_key=api_key, base_url=base_url, max_retries=max_retries)
+        self.listeners: List[Listener] = []
+
+    def add_listener(self, listener: Listener):
+        """Registra quem recebe o LLMResponse de cada chamada concluída"""
+        self.listeners.append(listener)
+
+    def _request(self, messages: List[Dict], system: Optional[SystemPrompt],
+                 max_tokens: int, model: Optional[str]) -> Dict:
+        request = {
+            "model": model or self.model,
+            "max_tokens": max_tokens,
+            "messages": messages,
+        }
+        if system:
+            request["system"] = system
+        return request
+
+    def _finish(self, text: List[str], message, started: float,
+                first_token: Optional[float]) -> LLMResponse:
+        response = LLMResponse(
+            text="".join(text),
+            model=message.model,
+            ttft=None if first_token is None else first_token - started,
+            duration=time.perf_counter() - started,
+            input_tokens=message.usage.input_tokens,
+            output_tokens=message.usage.output_tokens,
+            cache_read_tokens=message.usage.cache_read_input_tokens or 0,
+            cache_write_tokens=message.usage.cache_creation_input_tokens or 0,
+            stop_reason=message.stop_reason,
+        )
+        for listener in self.listeners:
+            try:
+                listener(response)
+            except Exception as e:
+                print(f"⚠️  Listener de LLM falhou: {e}")
+        return response
+
+    def _cache_key(self, cache_site: Optional[str], request: Dict,
+                   cache_scope: Optional[str], cache_query: Optional[str]) -> Optional[CacheKey]:
+        """Chave do ResponseCache, se o site optou pelo cache"""
+        if self.cache is None or not self.cache.enabled(cache_site):
+            return None
+        system, messages = request.get("system"), request["messages"]
+        if cache_scope is not None or cache_query is not None:
+            if cache_scope is not None:
+                system = cache_scope
+            query = cache_query if cache_query is not None else messages[-1]["content"]
+            messages = [{"role": "user", "content": query}]
+        return ResponseCache.make_key(cache_site, request["model"], system, messages,
+                                      {"max_tokens": request["max_tokens"]})
+
+    def _from_cache(self, hit: CacheHit, started: float,
+                    on_token: Optional[TokenCallback]) -> LLMResponse:
+        """Resposta do cache (não passa pelos listeners: não houve chamada)"""
+        if on_token is not None:
+            on_token(hit.text)
+        elapsed = time.perf_counter() - started
+        return LLMResponse(text=hit.text, model=hit.model or self.model, ttft=elapsed,
+                           duration=elapsed, stop_reason="end_turn", cached=True)
+
+    # ------------------------------------------------------------------
+    # Chamadas
+    # ------------------------------------------------------------------
+
+    async def stream(self, messages: List[Dict], system: Optional[SystemPrompt] = None,
+                     max_tokens: int = 4000, on_token: Optional[TokenCallback] = None,
+                     model: Optional[str] = None, cache_site: Optional[str] = None,
+                     cache_scope: Optional[str] = None,
+                     cache_query: Optional[str] = None) -> LLMResponse:
+        """
+        Gera uma resposta com streaming sem bloquear o event loop
+
+        Com cache_site, consulta/alimenta o ResponseCache daquele site.
+        Quando o prompt leva dados voláteis que não mudam o pedido
+        (relógio, métricas, a própria conversa anterior), cache_scope
+        substitui o system prompt e cache_query a mensagem na chave
+        """
+        started = time.perf_counter()
+        first_token = None
+        text: List[str] = []
+        request = self._request(messages, system, max_tokens, model)
+
+        key = self._cache_key(cache_site, request, cache_scope, cache_query)
+        if key is not None:
+            hit = await asyncio.to_thread(self.cache.lookup, cache_site, key)
+            if hit is not None:
+                return self._from_cache(hit, started, on_token)
+
+        async with self.client.messages.stream(**request) as stream:
+            async for chunk in stream.text_stream:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                text.append(chunk)
+                if on_token is not None:
+                    on_token(chunk)
+            message = await stream.get_final_message()
+
+        response = self._finish(text, message, started, first_token)
+        if key is not None and response.stop_reason == "end_turn":
+            await asyncio.to_thread(self.cache.store, cache_site, key, response.text,
+                                    response.model, response.output_tokens)
+        return response
+
+    def stream_sync(self, messages: List[Dict], system: Optional[SystemPrompt] = None,
+                    max_tokens: int = 4000, on_token: Optional[TokenCallback] = None,
+                    model: Optional[str] = None, cache_site: Optional[str] = None,
+                    cache_scope: Optional[str] = None,
+                    cache_query: Optional[str] = None) -> LLMResponse:
+        """Mesma chamada, para código síncrono (CLI da Secretária)"""
+        started = time.perf_counter()
+        first_token = None
+        text: List[str] = []
+        request = self._request(messages, system, max_tokens, model)
+
+        key = self._cache_key(cache_site, request, cache_scope, cache_query)
+        if key is not None:
+            hit = self.cache.lookup(cache_site, key)
+            if hit is not None:
+                return self._from_cache(hit, started, on_token)
+
+        with self.sync_client.messages.stream(**request) as stream:
+            for chunk in stream.text_stream:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                text.append(chunk)
+                if on_token is not None:
+                    on_token(chunk)
+            message = stream.get_final_message()
+
+        response = self._finish(text, message, started, first_token)
+        if key is not None and response.stop_reason == "end_turn":
+            self.cache.store(cache_site, key, response.text, response.model, response.output_tokens)
+        return response
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def aclose(self):
+        """Fecha os pools HTTP dos dois clientes"""
+        await self.client.close()
+        self.sync_client.close()
+
+    def close(self):
+        """Fecha o pool do cliente síncrono (o async fecha com aclose)"""
+        self.sync_client.close()
@@ -0,0 +1,604 @@
+"""
+🧬 MIGRATIONS - Versionamento do esquema da memória
+====================================================
+
+Sistema de migrações versionadas para o banco da memória:
+- Tabela schema_version registra cada passo aplicado
+- Passos ordenados, cada um em sua própria transação
+- Bancos existentes (secretary_memory.db) são atualizados no lugar,
+  na inicialização, sem reescrever as tabelas
+
+Para evoluir o esquema, adicione um novo Migration ao final de MIGRATIONS
+com a próxima versão. Nunca altere um passo já publicado.
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from .context_store import compact_legacy_contexts
+from .database import ConnectionManager
+
+
+# ============================================================================
+# MIGRATION MODEL
+# ============================================================================
+
+@dataclass
+class Migration:
+    """Um passo de migração do esquema"""
+    version: int
+    description: str
+    statements: List[str] = field(default_factory=list)
+    apply: Optional[Callable[[sqlite3.Connection], None]] = None  # Migração de dados
+
+    def run(self, conn: sqlite3.Connection):
+        """Executa o passo na conexão (dentro de uma transação)"""
+        for statement in self.statements:
+            conn.execute(statement)
+        if self.apply:
+            self.apply(conn)
+
+
+# ============================================================================
+# DAILY DIGEST COUNTERS
+# ============================================================================
+
+def _digest_bump(day: str, column: str, project: str) -> str:
+    """Corpo de trigger: incrementa um contador do dia e registra o projeto"""
+    return f"""
+        INSERT INTO daily_digests (date, tasks_completed, tasks_created, commits_made,
+                                   notes_created, projects_worked)
+        VALUES ({day}, 0, 0, 0, 0, '[]')
+        ON CONFLICT (date) DO NOTHING;
+        UPDATE daily_digests SET
+            {column} = COALESCE({column}, 0) + 1,
+            projects_worked = CASE
+                WHEN {project} IS NULL OR EXISTS (
+                    SELECT 1 FROM json_each(COALESCE(projects_worked, '[]')) WHERE value = {project}
+                ) THEN projects_worked
+                ELSE json_insert(COALESCE(projects_worked, '[]'), '$[#]', {project})
+            END
+        WHERE date = {day};
+    """
+
+
+def rebuild_daily_digests(conn: sqlite3.Connection):
+    """
+    Recalcula os contadores de daily_digests a partir das tabelas de origem
+    Usado como backfill na migração; tarefas já concluídas contam no dia
+    de criação (não há data de conclusão registrada antes dos triggers)
+    """
+    conn.execute("""
+        UPDATE daily_digests SET tasks_completed = 0, tasks_created = 0,
+            commits_made = 0, notes_created = 0, projects_worked = '[]'
+    """)
+    conn.execute("""
+        WITH events (day, kind, project) AS (
+            SELECT substr(created_at, 1, 10), 'note', project FROM notes
+            WHERE created_at IS NOT NULL
+            UNION ALL
+            SELECT substr(created_at, 1, 10), 'task', project FROM tasks
+            WHERE created_at IS NOT NULL
+            UNION ALL
+            SELECT substr(created_at, 1, 10), 'done', project FROM tasks
+            WHERE created_at IS NOT NULL AND status = 'done'
+            UNION ALL
+            SELECT date, 'commit', project FROM digest_commits
+        )
+        INSERT INTO daily_digests (date, tasks_completed, tasks_created, commits_made,
+                                   notes_created, projects_worked)
+        SELECT day, SUM(kind = 'done'), SUM(kind = 'task'), SUM(kind = 'commit'),
+               SUM(kind = 'note'),
+               COALESCE(json_group_array(DISTINCT project) FILTER (WHERE project IS NOT NULL), '[]')
+        FROM events WHERE true GROUP BY day
+        ON CONFLICT (date) DO UPDATE SET
+            tasks_completed = excluded.tasks_completed, tasks_created = excluded.tasks_created,
+            commits_made = excluded.commits_made, notes_created = excluded.notes_created,
+            projects_worked = excluded.projects_worked
+    """)
+
+
+# ============================================================================
+# MIGRATION STEPS
+# ============================================================================
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Esquema inicial",
+        statements=[
+            # Tabela de notas
+            """
+            CREATE TABLE IF NOT EXISTS notes (
+                id TEXT PRIMARY KEY,
+                content TEXT,
+                tags TEXT,
+                project TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                priority TEXT
+            )
+            """,
+            # Tabela de tarefas
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                description TEXT,
+                project TEXT,
+                status TEXT,
+                priority TEXT,
+                due_date TEXT,
+                created_at TEXT,
+                clickup_id TEXT,
+                github_issue_id TEXT
+            )
+            """,
+            # Tabela de contexto de projetos
+            """
+            CREATE TABLE IF NOT EXISTS project_context (
+                name TEXT PRIMARY KEY,
+                description TEXT,
+                github_repo TEXT,
+                clickup_list TEXT,
+                last_activity TEXT,
+                technologies TEXT,
+                current_focus TEXT,
+                recent_commits TEXT,
+                open_tasks INTEGER,
+                notes_count INTEGER
+            )
+            """,
+            # Tabela de conversas/interações
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT,
+                user_input TEXT,
+                agent_response TEXT,
+                context TEXT
+            )
+            """,
+            # Tabela de resumos diários
+            """
+            CREATE TABLE IF NOT EXISTS daily_digests (
+                date TEXT PRIMARY KEY,
+                tasks_completed INTEGER,
+                tasks_created INTEGER,
+                commits_made INTEGER,
+                notes_created INTEGER,
+                projects_worked TEXT,
+                summary TEXT,
+                suggestions TEXT
+            )
+            """,
+        ]
+    ),
+    Migration(
+        version=2,
+        description="Índices secundários (projeto, status, datas)",
+        statements=[
+            "CREATE INDEX IF NOT EXISTS idx_notes_project_created ON notes (project, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_notes_created ON notes (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_status_project ON tasks (status, project)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations (timestamp)",
+        ]
+    ),
+    Migration(
+        version=3,
+        description="Índice de busca full-text (FTS5) com triggers de sincronização",
+        statements=[
+            # Notas
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5 (
+                content, tags,
+                content='notes', tokenize='unicode61 remove_diacritics 2'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_fts (rowid, content, tags)
+                VALUES (new.rowid, new.content, new.tags);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, content, tags)
+                VALUES ('delete', old.rowid, old.content, old.tags);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE OF content, tags ON notes BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, content, tags)
+                VALUES ('delete', old.rowid, old.content, old.tags);
+                INSERT INTO notes_fts (rowid, content, tags)
+                VALUES (new.rowid, new.content, new.tags);
+            END
+            """,
+            # Tarefas
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5 (
+                title, description,
+                content='tasks', tokenize='unicode61 remove_diacritics 2'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.rowid, new.title, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.rowid, new.title, new.description);
+            END
+            """,
+            # Conversas
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5 (
+                user_input, agent_response,
+                content='conversations', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_ai AFTER INSERT ON conversations BEGIN
+                INSERT INTO conversations_fts (rowid, user_input, agent_response)
+                VALUES (new.id, new.user_input, new.agent_response);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_ad AFTER DELETE ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, user_input, agent_response)
+                VALUES ('delete', old.id, old.user_input, old.agent_response);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_au
+            AFTER UPDATE OF user_input, agent_response ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, user_input, agent_response)
+                VALUES ('delete', old.id, old.user_input, old.agent_response);
+                INSERT INTO conversations_fts (rowid, user_input, agent_response)
+                VALUES (new.id, new.user_input, new.agent_response);
+            END
+            """,
+            # Indexa o conteúdo já existente
+            "INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')",
+            "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+            "INSERT INTO conversations_fts (conversations_fts) VALUES ('rebuild')",
+        ]
+    ),
+    Migration(
+        version=4,
+        description="Contexto de conversas deduplicado (blobs endereçados por conteúdo)",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS context_blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """,
+            "ALTER TABLE conversations ADD COLUMN context_refs TEXT",
+        ],
+        apply=lambda conn: compact_legacy_contexts(conn)
+    ),
+    Migration(
+        version=5,
+        description="Resumo dos períodos arquivados pela política de retenção",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS archive_periods (
+                source TEXT,
+                period TEXT,
+                path TEXT,
+                row_count INTEGER,
+                first_timestamp TEXT,
+                last_timestamp TEXT,
+                archived_at TEXT,
+                PRIMARY KEY (source, period)
+            )
+            """,
+        ]
+    ),
+    Migration(
+        version=6,
+        description="Contadores diários incrementais (daily_digests mantido por triggers)",
+        statements=[
+            # Commits sincronizados do GitHub, deduplicados pelo SHA
+            """
+            CREATE TABLE IF NOT EXISTS digest_commits (
+                sha TEXT PRIMARY KEY,
+                project TEXT,
+                date TEXT NOT NULL
+            )
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS digest_notes_ai AFTER INSERT ON notes
+            WHEN new.created_at IS NOT NULL BEGIN
+                {_digest_bump("substr(new.created_at, 1, 10)", "notes_created", "new.project")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS digest_tasks_ai AFTER INSERT ON tasks
+            WHEN new.created_at IS NOT NULL BEGIN
+                {_digest_bump("substr(new.created_at, 1, 10)", "tasks_created", "new.project")}
+            END
+            """,
+            # Conclusão conta no dia em que acontece
+            f"""
+            CREATE TRIGGER IF NOT EXISTS digest_tasks_done_ai AFTER INSERT ON tasks
+            WHEN new.status = 'done' BEGIN
+                {_digest_bump("date('now', 'localtime')", "tasks_completed", "new.project")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS digest_tasks_done_au AFTER UPDATE OF status ON tasks
+            WHEN new.status = 'done' AND old.status IS NOT 'done' BEGIN
+                {_digest_bump("date('now', 'localtime')", "tasks_completed", "new.project")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS digest_commits_ai AFTER INSERT ON digest_commits BEGIN
+                {_digest_bump("new.date", "commits_made", "new.project")}
+            END
+            """,
+        ],
+        apply=rebuild_daily_digests
+    ),
+    Migration(
+        version=7,
+        description="Dados sincronizados do GitHub no contexto de projetos",
+        statements=[
+            "ALTER TABLE project_context ADD COLUMN open_issues INTEGER",
+            "ALTER TABLE project_context ADD COLUMN github_synced_at TEXT",
+        ]
+    ),
+    Migration(
+        version=8,
+        description="Cache HTTP condicional (ETag/Last-Modified) das integrações",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at TEXT NOT NULL,
+                last_used TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_http_cache_last_used ON http_cache (last_used)",
+        ]
+    ),
+    Migration(
+        version=9,
+        description="Sincronização incremental com o ClickUp (cursor por lista)",
+        statements=[
+            # Marca d'água por origem/escopo (ex.: clickup / id da lista)
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                source TEXT,
+                scope TEXT,
+                cursor TEXT,
+                last_full_sync TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (source, scope)
+            )
+            """,
+            "ALTER TABLE tasks ADD COLUMN clickup_list TEXT",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_clickup_id ON tasks (clickup_id)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_clickup_list ON tasks (clickup_list)",
+        ]
+    ),
+    Migration(
+        version=10,
+        description="Agenda adaptativa do daemon de sincronização",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS sync_schedule (
+                project TEXT PRIMARY KEY,
+                interval_seconds REAL NOT NULL,
+                next_run_at TEXT NOT NULL,
+                last_run_at TEXT,
+                last_change_at TEXT,
+                failures INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+            """,
+        ]
+    ),
+    Migration(
+        version=11,
+        description="Entregas de webhooks (deduplicação por delivery id)",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS webhook_deliveries (
+                delivery_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                event TEXT,
+                received_at TEXT NOT NULL,
+                status TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_received ON webhook_deliveries (received_at)",
+        ]
+    ),
+    Migration(
+        version=12,
+        description="Cache de respostas do Claude (exato + quase-duplicatas)",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                site TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                simhash INTEGER NOT NULL,
+                response TEXT NOT NULL,
+                model TEXT,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL,
+                last_used_at TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_scope ON llm_cache (scope)",
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used_at)",
+        ]
+    ),
+    Migration(
+        version=13,
+        description="Resumos de conversas por projeto e dia",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS conversation_summaries (
+                project TEXT NOT NULL,
+                day TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                turns INTEGER NOT NULL DEFAULT 0,
+                first_at TEXT,
+                last_at TEXT,
+                last_conversation_id INTEGER,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (project, day)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_conversation_summaries_day ON conversation_summaries (day)",
+        ]
+    ),
+    Migration(
+        version=14,
+        description="Fila de reindexação do índice vetorial (notas e tarefas)",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS vector_queue (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                id TEXT NOT NULL
+            )
+            """,
+            *[
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_vector_{suffix} {event} ON {table} BEGIN
+                    INSERT INTO vector_queue (kind, id) VALUES ('{kind}', {row}.id);
+                END
+                """
+                for table, kind, columns in (("notes", "note", "content, tags, project"),
+                                             ("tasks", "task", "title, description, project"))
+                for suffix, event, row in (("ai", "AFTER INSERT", "new"),
+                                           ("au", f"AFTER UPDATE OF {columns}", "new"),
+                                           ("ad", "AFTER DELETE", "old"))
+            ],
+            # Itens já existentes entram na fila para a primeira indexação
+            "INSERT INTO vector_queue (kind, id) SELECT 'note', id FROM notes",
+            "INSERT INTO vector_queue (kind, id) SELECT 'task', id FROM tasks",
+        ]
+    ),
+    Migration(
+        version=15,
+        description="Conclusão de tarefas conta só na transição para done (ou em completed_at)",
+        statements=[
+            # Data de conclusão vinda da origem (date_closed do ClickUp)
+            "ALTER TABLE tasks ADD COLUMN completed_at TEXT",
+            # O trigger de INSERT da v6 contava como "concluída hoje" toda
+            # tarefa importada já fechada (primeira sync, reconciliação)
+            "DROP TRIGGER IF EXISTS digest_tasks_done_ai",
+            "DROP TRIGGER IF EXISTS digest_tasks_done_au",
+            f"""
+            CREATE TRIGGER IF NOT EXISTS digest_tasks_done_ai AFTER INSERT ON tasks
+            WHEN new.status = 'done' AND new.completed_at IS NOT NULL BEGIN
+                {_digest_bump("substr(new.completed_at, 1, 10)", "tasks_completed", "new.project")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS digest_tasks_done_au AFTER UPDATE OF status ON tasks
+            WHEN new.status = 'done' AND old.status IS NOT 'done' BEGIN
+                {_digest_bump("substr(COALESCE(new.completed_at, datetime('now', 'localtime')), 1, 10)",
+                              "tasks_completed", "new.project")}
+            END
+            """,
+        ]
+    ),
+]
+
+# Tabelas FTS5 com conteúdo externo (ver rebuild_search_index)
+FTS_TABLES = ["notes_fts", "tasks_fts", "conversations_fts"]
+
+
+# ============================================================================
+# MIGRATION RUNNER
+# ============================================================================
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT,
+        applied_at TEXT
+    )
+"""
+
+
+def rebuild_search_index(conn: sqlite3.Connection):
+    """
+    Reconstrói os índices FTS5 a partir das tabelas de origem
+    Necessário após um VACUUM completo, que pode renumerar o rowid
+    de notes/tasks (chaves TEXT, sem INTEGER PRIMARY KEY)
+    """
+    for table in FTS_TABLES:
+        conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Versão atual do esquema (0 = banco sem migrações)"""
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(db: ConnectionManager, migrations: Optional[List[Migration]] = None) -> List[int]:
+    """
+    Aplica as migrações pendentes, em ordem
+    Retorna as versões aplicadas nesta chamada
+    """
+    migrations = sorted(migrations if migrations is not None else MIGRATIONS,
+                        key=lambda m: m.version)
+    applied = []
+
+    with db.transaction() as conn:
+        conn.execute(SCHEMA_VERSION_TABLE)
+
+    for migration in migrations:
+        # Uma transação por passo; a versão é reconferida dentro dela
+        # para que dois processos abrindo o mesmo banco não a repitam
+        with db.transaction() as conn:
+            if migration.version <= current_version(conn):
+                continue
+            migration.run(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, datetime.now().isoformat())
+            )
+            applied.append(migration.version)
+
+    return applied
@@ -0,0 +1,309 @@
+"""
+🧠 RESPONSE CACHE - Cache de respostas do Claude
+=================================================
+
+Evita pagar uma ida ao Claude por pedidos repetidos ("status do
+Max-Code", o mesmo roadmap reanalisado, o mesmo plano de passo):
+- Chave exata: hash do prompt normalizado (espaços, caixa) + modelo
+  + parâmetros, por ponto de chamada (site). Timestamps só são
+  mascarados no system prompt/escopo (contexto montado pelo app);
+  na mensagem do usuário ficam: "reunião 20/10 14h" ≠ "21/10 9h30"
+- Quase-duplicatas (opcional por site): simhash de 64 bits da última
+  mensagem do usuário, comparado só com entradas do mesmo escopo
+  (mesmo system prompt e histórico). Só para sites de texto longo e
+  repetitivo: em pedidos curtos "PR 101"/"PR 107" ou "prioridade
+  alta"/"baixa" ficam a 3 bits, então o think() não usa
+- TTL por site e remoção LRU acima de max_entries
+- Persistido no SQLite da memória (tabela llm_cache)
+- Opt-in: só sites configurados em `sites` usam o cache. A conversa
+  (think / conscious_think) fica fora do padrão: a chave inclui os
+  últimos turnos, que mudam a cada turno, então só daria hit numa
+  repetição imediata — e custaria uma escrita no SQLite por chamada
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
+
+from .database import ConnectionManager
+
+
+# ============================================================================
+# NORMALIZAÇÃO E SIMHASH
+# ============================================================================
+
+# Timestamps ISO no contexto (nunca na mensagem do usuário) mudam a cada chamada sem mudar o pedido
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?")
+_SPACES = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[^\w\s-]")
+
+SIMHASH_BITS = 64
+_MASK = (1 << SIMHASH_BITS) - 1
+
+
+def normalize(text: str) -> str:
+    """Texto canônico do pedido: espaços colapsados, casefold (datas preservadas)"""
+    return _SPACES.sub(" ", text).strip().rstrip("?!.").casefold()
+
+
+def normalize_context(text: str) -> str:
+    """Texto canônico do contexto montado pelo app: também sem timestamps"""
+    return normalize(_TIMESTAMP.sub("<ts>", text))
+
+
+def content_text(content: Union[str, List[Dict], None]) -> str:
+    """Texto de um system prompt / conteúdo de mensagem (str ou blocos)"""
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    return "\n".join(block.get("text", "") for block in content)
+
+
+def simhash(text: str) -> int:
+    """
+    Simhash de 64 bits sobre 4-gramas de caracteres do texto normalizado,
+    sem pontuação (retorna inteiro com sinal, para caber no INTEGER do SQLite)
+    """
+    text = _SPACES.sub(" ", _PUNCTUATION.sub(" ", normalize(text))).strip()
+    grams = Counter(text[i:i + 4] for i in range(max(len(text) - 3, 1)))
+    weights = [0] * SIMHASH_BITS
+    for gram, count in grams.items():
+        h = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+    value = sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def hamming(a: int, b: int) -> int:
+    """Bits diferentes entre dois simhashes"""
+    return bin((a ^ b) & _MASK).count("1")
+
+
+# ============================================================================
+# POLICIES
+# ============================================================================
+
+@dataclass
+class CachePolicy:
+    """Configuração de cache de um ponto de chamada"""
+    ttl_seconds: float = 60 * 60
+    near_duplicates: bool = False
+    max_distance: int = 3   # bits de diferença aceitos no simhash
+
+
+# Sites que usam o cache por padrão (os demais chamam sempre o Claude)
+DEFAULT_SITES: Dict[str, CachePolicy] = {
+    "roadmap": CachePolicy(ttl_seconds=24 * 60 * 60),
+    "step_plan": CachePolicy(ttl_seconds=6 * 60 * 60),
+}
+
+# Conversa: opt-in (ResponseCache(db, sites={**DEFAULT_SITES, **CONVERSATION_SITES}));
+# sem quase-duplicatas, pedidos curtos diferentes ficam a poucos bits
+CONVERSATION_SITES: Dict[str, CachePolicy] = {
+    "think": CachePolicy(ttl_seconds=5 * 60),
+    "conscious_think": CachePolicy(ttl_seconds=5 * 60),
+}
+
+
+@dataclass
+class CacheHit:
+    """Resposta servida do cache"""
+    text: str
+    model: Optional[str]
+    output_tokens: int
+    near: bool = False
+    distance: int = 0
+
+
+@dataclass
+class CacheKey:
+    """Chave exata, escopo (para quase-duplicatas) e simhash de um pedido"""
+    key: str
+    scope: str
+    simhash: int
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+class ResponseCache:
+    """
+    Cache de respostas do Claude persistido no SQLite
+
+    Uso:
+        cache = ResponseCache(memory.db)
+        llm = StreamingClaude(api_key, cache=cache)
+        await llm.stream(messages, system=..., cache_site="roadmap")
+        cache.stats()   # hit rate por site
+    """
+
+    def __init__(self, db: ConnectionManager, sites: Optional[Dict[str, CachePolicy]] = None,
+                 max_entries: int = 2000, evict_every: int = 50):
+        self.db = db
+        self.sites = dict(DEFAULT_SITES if sites is None else sites)
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+
+        self._lock = threading.Lock()
+        self._stores_since_evict = 0
+
+        # Estatísticas (hits/near_hits/misses/stored por site)
+        self.counters: Dict[str, Counter] = {}
+        self.evicted = 0
+
+    def enabled(self, site: Optional[str]) -> bool:
+        """O site optou pelo cache?"""
+        return site is not None and site in self.sites
+
+    def _count(self, site: str, event: str):
+        with self._lock:
+            self.counters.setdefault(site, Counter())[event] += 1
+
+    @staticmethod
+    def make_key(site: str, model: str, system: Union[str, List[Dict], None],
+                 messages: List[Dict], params: Optional[Dict[str, Any]] = None) -> CacheKey:
+        """Chave do pedido: escopo (site, modelo, parâmetros, system, histórico) + última mensagem"""
+        history = [(m["role"], normalize(content_text(m["content"]))) for m in messages[:-1]]
+        last = content_text(messages[-1]["content"]) if messages else ""
+        scope = hashlib.sha256(json.dumps(
+            [site, model, params or {}, normalize_context(content_text(system)), history],
+            sort_keys=True, ensure_ascii=False
+        ).encode()).hexdigest()
+        key = hashlib.sha256(f"{scope}\n{normalize(last)}".encode()).hexdigest()
+        return CacheKey(key=key, scope=scope, simhash=simhash(last))
+
+    # ------------------------------------------------------------------
+    # Consulta e armazenamento
+    # ------------------------------------------------------------------
+
+    def lookup(self, site: str, key: CacheKey, now: Optional[datetime] = None) -> Optional[CacheHit]:
+        """Entrada válida para a chave exata ou, se o site permitir, a quase-duplicata mais próxima"""
+        policy = self.sites.get(site)
+        if policy is None:
+            return None
+        now = (now or datetime.now()).isoformat()
+
+        with self.db.read() as conn:
+            row = conn.execute("""
+                SELECT key, response, model, output_tokens FROM llm_cache
+                WHERE key = ? AND expires_at > ?
+            """, (key.key, now)).fetchone()
+            hit = CacheHit(row[1], row[2], row[3]) if row else None
+
+            if hit is None and policy.near_duplicates:
+                candidates = conn.execute("""
+                    SELECT key, response, model, output_tokens, simhash FROM llm_cache
+                    WHERE scope = ? AND expires_at > ?
+                """, (key.scope, now)).fetchall()
+                best = min(candidates, key=lambda c: hamming(c[4], key.simhash), default=None)
+                if best is not None:
+                    distance = hamming(best[4], key.simhash)
+                    if distance <= policy.max_distance:
+                        row = best
+                        hit = CacheHit(best[1], best[2], best[3], near=True, distance=distance)
+
+        if hit is None:
+            self._count(site, "misses")
+            return None
+
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE llm_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+                         (now, row[0]))
+        self._count(site, "near_hits" if hit.near else "hits")
+        return hit
+
+    def store(self, site: str, key: CacheKey, text: str, model: Optional[str] = None,
+              output_tokens: int = 0, now: Optional[datetime] = None) -> bool:
+        """Guarda a resposta com o TTL do site"""
+        policy = self.sites.get(site)
+        if policy is None:
+            return False
+        now = now or datetime.now()
+        expires = now + timedelta(seconds=policy.ttl_seconds)
+        with self.db.transaction() as conn:
+            conn.execute("""
+                INSERT INTO llm_cache (key, site, scope, simhash, response, model, output_tokens,
+                                       created_at, expires_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    response = excluded.response, model = excluded.model,
+                    output_tokens = excluded.output_tokens, created_at = excluded.created_at,
+                    expires_at = excluded.expires_at, last_used_at = excluded.last_used_at
+            """, (key.key, site, key.scope, key.simhash, text, model, output_tokens,
+                  now.isoformat(), expires.isoformat(), now.isoformat()))
+
+        self._count(site, "stored")
+        with self._lock:
+            self._stores_since_evict += 1
+            due = self._stores_since_evict >= self.evict_every
+            if due:
+                self._stores_since_evict = 0
+        if due:
+            self.evict(now)
+        return True
+
+    def evict(self, now: Optional[datetime] = None) -> int:
+        """Remove entradas expiradas e, acima de max_entries, as menos usadas (LRU)"""
+        now = (now or datetime.now()).isoformat()
+        with self.db.transaction() as conn:
+            removed = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+            removed += conn.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache
+                    ORDER BY last_used_at DESC, key
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+        self.evicted += removed
+        return removed
+
+    def clear(self, site: Optional[str] = None):
+        """Esvazia o cache (ou só um site)"""
+        with self.db.transaction() as conn:
+            if site is None:
+                conn.execute("DELETE FROM llm_cache")
+            else:
+                conn.execute("DELETE FROM llm_cache WHERE site = ?", (site,))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate geral e por site"""
+        with self.db.read() as conn:
+            entries = dict(conn.execute("SELECT site, COUNT(*) FROM llm_cache GROUP BY site").fetchall())
+
+        def rate(counter: Counter) -> str:
+            hits = counter["hits"] + counter["near_hits"]
+            lookups = hits + counter["misses"]
+            return f"{hits / lookups * 100:.1f}%" if lookups else "0.0%"
+
+        with self._lock:
+            counters = {site: Counter(c) for site, c in self.counters.items()}
+        total = sum(counters.values(), Counter())
+        return {
+            "entries": sum(entries.values()),
+            "hits": total["hits"],
+            "near_hits": total["near_hits"],
+            "misses": total["misses"],
+            "evicted": self.evicted,
+            "hit_rate": rate(total),
+            "sites": {
+                site: {
+                    "entries": entries.get(site, 0),
+                    "hits": counters.get(site, Counter())["hits"],
+                    "near_hits": counters.get(site, Counter())["near_hits"],
+                    "misses": counters.get(site, Counter())["misses"],
+                    "hit_rate": rate(counters.get(site, Counter())),
+                }
+                for site in self.sites
+            },
+        }
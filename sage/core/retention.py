@@ -0,0 +1,305 @@
+"""
+🗃️ RETENTION - Retenção, arquivamento e compactação da memória
+===============================================================
+
+Mantém o banco "quente" pequeno:
+- Políticas de retenção configuráveis por tabela (idade máxima)
+- Linhas antigas vão para arquivos mensais comprimidos
+  (JSONL.zst se 'zstandard' estiver instalado, senão JSONL.gz)
+  e são apagadas do banco
+- Uma linha de resumo por período arquivado (archive_periods)
+- Coleta de blobs de contexto órfãos e VACUUM incremental
+- ArchiveReader para consultar os dados frios quando pedido
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import gzip
+import io
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from .context_store import zstandard
+from .migrations import rebuild_search_index
+
+if TYPE_CHECKING:
+    from .secretary_agent import MemorySystem
+
+
+ARCHIVE_CODEC = "zstd" if zstandard else "gzip"
+ARCHIVE_EXTENSIONS = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
+# Tabelas que podem ser arquivadas
+ARCHIVABLE_TABLES = {"conversations"}
+
+
+# ============================================================================
+# POLICIES
+# ============================================================================
+
+@dataclass
+class RetentionPolicy:
+    """Política de retenção de uma tabela"""
+    table: str = "conversations"
+    max_age_days: int = 90
+    archive: bool = True  # False = apenas apaga
+
+    def __post_init__(self):
+        if self.table not in ARCHIVABLE_TABLES:
+            raise ValueError(f"Tabela sem suporte a retenção: {self.table}")
+
+
+@dataclass
+class RetentionReport:
+    """Resultado de uma execução do motor de retenção"""
+    archived: Dict[str, int] = field(default_factory=dict)   # período → linhas
+    deleted: int = 0
+    blobs_removed: int = 0
+    full_vacuum: bool = False
+
+
+# ============================================================================
+# ARCHIVE FILES
+# ============================================================================
+
+def _append_records(path: Path, records: List[Dict], codec: str):
+    """Acrescenta registros a um arquivo mensal (novo frame/membro comprimido)"""
+    payload = "".join(
+        json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records
+    ).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as raw:
+        if codec == "zstd":
+            raw.write(zstandard.ZstdCompressor(level=10).compress(payload))
+        else:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                gz.write(payload)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def _iter_lines(path: Path) -> Iterator[str]:
+    """Lê as linhas de um arquivo mensal (todos os frames/membros)"""
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} usa zstd, mas o pacote 'zstandard' não está instalado")
+        with open(path, "rb") as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            yield from io.TextIOWrapper(reader, encoding="utf-8")
+    else:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            yield from f
+
+
+class ArchiveReader:
+    """
+    Leitura dos dados arquivados (frios)
+
+    Uso:
+        reader = ArchiveReader("archive")
+        for record in reader.iter_records("conversations", start="2025-01-01"):
+            ...
+        hits = reader.search("kubernetes", limit=5)
+    """
+
+    PERIOD_PATTERN = re.compile(r"^(\d{4}-\d{2})\.jsonl\.(gz|zst)$")
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = Path(archive_dir)
+
+    def path_for(self, source: str, period: str, codec: str = ARCHIVE_CODEC) -> Path:
+        return self.archive_dir / source / f"{period}{ARCHIVE_EXTENSIONS[codec]}"
+
+    def periods(self, source: str = "conversations") -> List[str]:
+        """Períodos (YYYY-MM) arquivados, em ordem"""
+        folder = self.archive_dir / source
+        if not folder.exists():
+            return []
+        found = {
+            match.group(1)
+            for match in (self.PERIOD_PATTERN.match(p.name) for p in folder.iterdir())
+            if match
+        }
+        return sorted(found)
+
+    def iter_records(self, source: str = "conversations", start: Optional[str] = None,
+                     end: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Registros arquivados com timestamp em [start, end)
+        Só abre os arquivos dos meses do intervalo. Registros repetidos
+        (arquivamento interrompido e refeito) são entregues uma vez.
+        """
+        seen = set()
+        for period in self.periods(source):
+            if start and period < start[:7]:
+                continue
+            if end and period > end[:7]:
+                continue
+            for path in sorted((self.archive_dir / source).glob(f"{period}.jsonl.*")):
+                for line in _iter_lines(path):
+                    record = json.loads(line)
+                    timestamp = record.get("timestamp") or ""
+                    if (start and timestamp < start) or (end and timestamp >= end):
+                        continue
+                    if record.get("id") in seen:
+                        continue
+                    seen.add(record.get("id"))
+                    yield record
+
+    def search(self, query: str, source: str = "conversations", limit: int = 10,
+               start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Busca simples por termos (sem índice) nos dados arquivados"""
+        terms = [t for t in re.findall(r"\w+", query.lower()) if len(t) > 1]
+        if not terms:
+            return []
+
+        scored = []
+        for record in self.iter_records(source, start, end):
+            text = f"{record.get('user_input', '')} {record.get('agent_response', '')}".lower()
+            hits = sum(text.count(t) for t in terms)
+            if hits:
+                scored.append((hits, record))
+
+        scored.sort(key=lambda item: (-item[0], item[1].get("timestamp", "")))
+        return [record for _, record in scored[:limit]]
+
+
+# ============================================================================
+# RETENTION ENGINE
+# ============================================================================
+
+class RetentionEngine:
+    """
+    Aplica as políticas de retenção na memória
+
+    Uso:
+        engine = RetentionEngine(memory, [RetentionPolicy("conversations", 90)])
+        report = engine.run()
+    """
+
+    def __init__(self, memory: "MemorySystem", policies: Optional[List[RetentionPolicy]] = None,
+                 archive_dir: Optional[str] = None, batch_size: int = 1000,
+                 vacuum_pages: Optional[int] = None):
+        self.memory = memory
+        self.policies = policies or [RetentionPolicy()]
+        self.archive = ArchiveReader(archive_dir or memory.archive_dir)
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+
+    def run(self, now: Optional[datetime] = None) -> RetentionReport:
+        """Arquiva/apaga linhas vencidas, coleta blobs órfãos e compacta o arquivo"""
+        now = now or datetime.now()
+        report = RetentionReport()
+
+        self.memory.flush()
+        for policy in self.policies:
+            cutoff = (now - timedelta(days=policy.max_age_days)).isoformat()
+            self._apply_conversations(policy, cutoff, report)
+
+        if report.deleted:
+            report.blobs_removed = self._collect_orphan_blobs()
+
+        report.full_vacuum = self.memory.db.vacuum(self.vacuum_pages)
+        if report.full_vacuum:
+            # VACUUM completo pode renumerar rowids de notes/tasks
+            with self.memory.db.transaction() as conn:
+                rebuild_search_index(conn)
+
+        return report
+
+    def _apply_conversations(self, policy: RetentionPolicy, cutoff: str, report: RetentionReport):
+        """Move conversas anteriores ao cutoff para os arquivos mensais"""
+        while True:
+            with self.memory.db.read() as conn:
+                rows = conn.execute("""
+                    SELECT id, timestamp, user_input, agent_response, context, context_refs
+                    FROM conversations
+                    WHERE timestamp < ?
+                    ORDER BY id LIMIT ?
+                """, (cutoff, self.batch_size)).fetchall()
+                records = [
+                    {
+                        "id": row[0],
+                        "timestamp": row[1],
+                        "user_input": row[2],
+                        "agent_response": row[3],
+                        "context": self.memory.context_store.join(conn, row[4], row[5]),
+                    }
+                    for row in rows
+                ]
+            if not records:
+                return
+
+            by_period: Dict[str, List[Dict]] = {}
+            for record in records:
+                by_period.setdefault((record["timestamp"] or "unknown")[:7], []).append(record)
+
+            # Arquivo primeiro (com fsync), depois apaga do banco
+            if policy.archive:
+                for period, items in by_period.items():
+                    _append_records(self.archive.path_for("conversations", period), items, ARCHIVE_CODEC)
+
+            with self.memory.db.transaction() as conn:
+                conn.executemany("DELETE FROM conversations WHERE id = ?",
+                                 [(r["id"],) for r in records])
+                if policy.archive:
+                    for period, items in by_period.items():
+                        self._record_period(conn, period, items)
+
+            report.deleted += len(records)
+            if policy.archive:
+                for period, items in by_period.items():
+                    report.archived[period] = report.archived.get(period, 0) + len(items)
+
+    def _record_period(self, conn, period: str, items: List[Dict]):
+        """Atualiza a linha de resumo do período arquivado"""
+        timestamps = [r["timestamp"] for r in items if r["timestamp"]]
+        conn.execute("""
+            INSERT INTO archive_periods
+                (source, period, path, row_count, first_timestamp, last_timestamp, archived_at)
+            VALUES ('conversations', ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source, period) DO UPDATE SET
+                row_count = row_count + excluded.row_count,
+                first_timestamp = MIN(first_timestamp, excluded.first_timestamp),
+                last_timestamp = MAX(last_timestamp, excluded.last_timestamp),
+                archived_at = excluded.archived_at
+        """, (
+            period,
+            str(self.archive.path_for("conversations", period)),
+            len(items),
+            min(timestamps) if timestamps else None,
+            max(timestamps) if timestamps else None,
+            datetime.now().isoformat()
+        ))
+
+    def _collect_orphan_blobs(self) -> int:
+        """Remove blobs de contexto que nenhuma conversa referencia mais"""
+        with self.memory.db.transaction() as conn:
+            removed = conn.execute("""
+                DELETE FROM context_blobs
+                WHERE hash NOT IN (
+                    SELECT DISTINCT j.value
+                    FROM conversations c, json_each(c.context_refs) j
+                    WHERE c.context_refs IS NOT NULL
+                )
+            """).rowcount
+            # Ainda sob o lock de escrita: nenhum flush intercala com o cache velho
+            self.memory.context_store.forget()
+        return removed
+
+    def archived_periods(self) -> List[Dict]:
+        """Resumo dos períodos arquivados"""
+        with self.memory.db.read() as conn:
+            rows = conn.execute("""
+                SELECT source, period, path, row_count, first_timestamp, last_timestamp, archived_at
+                FROM archive_periods ORDER BY source, period
+            """).fetchall()
+        keys = ["source", "period", "path", "row_count", "first_timestamp", "last_timestamp", "archived_at"]
+        return [dict(zip(keys, row)) for row in rows]
@@ -26,18 +26,26 @@ Versão: 2.0.0 - TRUE PA
 """
 
 import os
+import re
 import json
 import asyncio
 import aiohttp
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from anthropic import Anthropic
 from enum import Enum
 
 # Import do executor base
 from .secretary_executor import SecretaryExecutor, ExecutableTask, RoadmapStep
+from .context_packer import ContextPacker, PackedContext, Section, compact_json
+from .llm import LLMResponse, StreamingClaude, TokenCallback, cached_system
+from ..integrations.circuit_breaker import CircuitBreaker, HealthCache
+from ..integrations.rate_limit import RateLimitScheduler
+from ..integrations.webhooks import WebhookReceiver
+from .sync_daemon import SyncDaemon
+from .verdict_cache import VerdictCache
 
 
 # ============================================================================
@@ -83,16 +91,34 @@ class MaximusCore:
     - Validação constitucional de todas as ações
     - Safety checks em múltiplas camadas
     - Raciocínio ético e legal
+
+    Com o Core fora do ar, o circuit breaker manda as verificações
+    direto para o fallback, sem esperar a conexão falhar. Ações
+    equivalentes já validadas saem do cache de veredictos
     """
 
-    def __init__(self, core_url: str = "http://localhost:8150"):
+    def __init__(self, core_url: str = "http://localhost:8150",
+                 scheduler: Optional[RateLimitScheduler] = None,
+                 breaker: Optional[CircuitBreaker] = None, timeout: float = 10.0,
+                 connect_timeout: float = 2.0, verdicts: Optional[VerdictCache] = None):
         self.core_url = core_url
+        self.scheduler = scheduler
         self.session = None
+        self.breaker = breaker or CircuitBreaker("MAXIMUS Core")
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout)
+        self.verdicts = verdicts or VerdictCache()
+
+    def observe_policy(self, info: Dict):
+        """Versão da constituição/política anunciada pelo Core (resposta ou /health)"""
+        version = info.get("policy_version") or info.get("constitution_version")
+        self.verdicts.set_policy_version(str(version) if version is not None else None)
 
     async def init_session(self):
-        """Inicializa sessão async"""
+        """Inicializa sessão async (passando pelo agendador de rate limit)"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                trace_configs=[self.scheduler.trace_config()] if self.scheduler else None
+            )
 
     async def close_session(self):
         """Fecha sessão"""
@@ -108,6 +134,16 @@ class MaximusCore:
         - Virtue Framework (via Penelope)
         """
 
+        # Ação equivalente já validada pelo Core (e ainda dentro do TTL do tier)
+        verdict_key = self.verdicts.key(action, context)
+        cached = self.verdicts.get(verdict_key)
+        if cached is not None:
+            return cached
+
+        # Circuito aberto: Core sabidamente fora do ar, fallback sem rede
+        if not self.breaker.allow():
+            return await self._fallback_consciousness_check(action, context)
+
         await self.init_session()
 
         try:
@@ -118,13 +154,14 @@ class MaximusCore:
                     "context": context,
                     "timestamp": datetime.now().isoformat()
                 },
-                timeout=aiohttp.ClientTimeout(total=10)
+                timeout=self.timeout
             ) as response:
 
                 if response.status == 200:
                     result = await response.json()
+                    self.breaker.record_success()
 
-                    return ConsciousnessCheck(
+                    check = ConsciousnessCheck(
                         approved=result.get("approved", False),
                         consciousness_level=ConsciousnessLevel(result.get("consciousness_level", "medium")),
                         safety_tier=SafetyTier(result.get("safety_tier", "caution")),
@@ -132,13 +169,24 @@ class MaximusCore:
                         constitutional_notes=result.get("constitutional_notes", []),
                         requires_human_approval=result.get("requires_human_approval", False)
                     )
+                    # Política nova invalida os veredictos antigos antes de guardar este
+                    self.observe_policy(result)
+                    self.verdicts.put(verdict_key, check)
+                    return check
                 else:
                     # Se Core não está disponível, usa fallback seguro
+                    self.breaker.record_failure(f"HTTP {response.status}")
                     return await self._fallback_consciousness_check(action, context)
 
         except Exception as e:
-            print(f"⚠️  Core não disponível, usando fallback: {e}")
+            # O aviso sai uma vez, quando o circuito abre
+            self.breaker.record_failure(str(e) or type(e).__name__)
             return await self._fallback_consciousness_check(action, context)
+        except BaseException:
+            # Cancelada (ou interrompida) no meio: sem veredicto do Core, a
+            # vaga de teste do half_open volta para a próxima chamada
+            self.breaker.release()
+            raise
 
     async def _fallback_consciousness_check(self, action: Dict, context: Dict) -> ConsciousnessCheck:
         """
@@ -224,6 +272,14 @@ class PerformanceMonitor:
     def __init__(self):
         self.metrics = PerformanceMetrics()
         self.task_times: List[float] = []
+        self.ttfts: List[float] = []
+        self.llm_durations: List[float] = []
+        self.llm_output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.uncached_input_tokens = 0
+        self.verdict_hits = 0
+        self.verdict_misses = 0
 
     def record_task_start(self) -> float:
         """Registra início de uma tarefa"""
@@ -257,6 +313,57 @@ class PerformanceMonitor:
         else:
             self.metrics.consciousness_checks_failed += 1
 
+    def record_llm_call(self, response: LLMResponse):
+        """Registra uma chamada ao Claude (listener do StreamingClaude)"""
+        if response.ttft is not None:
+            self.ttfts.append(response.ttft)
+        self.llm_durations.append(response.duration)
+        self.llm_output_tokens += response.output_tokens
+        self.cache_read_tokens += response.cache_read_tokens
+        self.cache_write_tokens += response.cache_write_tokens
+        self.uncached_input_tokens += response.input_tokens
+
+    def record_verdict_lookup(self, hit: bool, safety_tier: Optional[str] = None):
+        """Registra uma consulta ao cache de veredictos (listener do VerdictCache)"""
+        if hit:
+            self.verdict_hits += 1
+        else:
+            self.verdict_misses += 1
+
+    def verdict_hit_rate(self) -> float:
+        """% das verificações de consciência servidas pelo cache de veredictos"""
+        lookups = self.verdict_hits + self.verdict_misses
+        return (self.verdict_hits / lookups) * 100 if lookups else 0.0
+
+    def cache_hit_rate(self) -> float:
+        """% dos tokens de entrada servidos pelo prompt cache"""
+        total = self.cache_read_tokens + self.cache_write_tokens + self.uncached_input_tokens
+        return (self.cache_read_tokens / total) * 100 if total else 0.0
+
+    def llm_report(self) -> Dict:
+        """Time-to-first-token e duração das chamadas ao Claude"""
+        if not self.llm_durations:
+            return {"calls": 0}
+        ttfts = sorted(self.ttfts)
+        report = {
+            "calls": len(self.llm_durations),
+            "avg_duration": f"{sum(self.llm_durations) / len(self.llm_durations):.2f}s",
+            "output_tokens": self.llm_output_tokens,
+            "prompt_cache": {
+                "read_tokens": self.cache_read_tokens,
+                "write_tokens": self.cache_write_tokens,
+                "uncached_tokens": self.uncached_input_tokens,
+                "hit_rate": f"{self.cache_hit_rate():.1f}%",
+            },
+        }
+        if ttfts:
+            report.update({
+                "avg_ttft": f"{sum(ttfts) / len(ttfts):.2f}s",
+                "p50_ttft": f"{ttfts[len(ttfts) // 2]:.2f}s",
+                "p95_ttft": f"{ttfts[min(len(ttfts) - 1, int(len(ttfts) * 0.95))]:.2f}s",
+            })
+        return report
+
     def get_report(self) -> Dict:
         """Retorna relatório de desempenho"""
         return {
@@ -266,9 +373,15 @@ class PerformanceMonitor:
             "avg_task_time": f"{self.metrics.avg_task_time:.2f}s",
             "consciousness_checks": {
                 "passed": self.metrics.consciousness_checks_passed,
-                "failed": self.metrics.consciousness_checks_failed
+                "failed": self.metrics.consciousness_checks_failed,
+                "verdict_cache": {
+                    "hits": self.verdict_hits,
+                    "misses": self.verdict_misses,
+                    "hit_rate": f"{self.verdict_hit_rate():.1f}%"
+                }
             },
-            "total_execution_time": f"{self.metrics.total_execution_time:.2f}s"
+            "total_execution_time": f"{self.metrics.total_execution_time:.2f}s",
+            "llm": self.llm_report()
         }
 
 
@@ -276,6 +389,148 @@ class PerformanceMonitor:
 # HYBRID REASONING ENGINE
 # ============================================================================
 
+# Chaves do contexto que mudam a cada chamada sem mudar o pedido (as
+# conversas ficam: dão sentido a follow-ups curtos como "sim")
+# Persona e ferramentas do raciocínio consciente: texto fixo, vai no
+# prefixo cacheado (com os projetos, passa do mínimo cacheável)
+CONSCIOUS_PERSONA = """Você é um Personal Assistant de VERDADE - não um assistente AI fraco.
+
+Você combina:
+- Organização e memória de assistentes AI
+- Capacidades executivas de PAs da vida real
+- Consciência e ética do Max AI
+- Desempenho de alto nível
+
+Suas capacidades:
+✅ Executar tarefas autonomamente (via MABA)
+✅ Validar ações constitucionalmente (via Core)
+✅ Organizar projetos e tarefas (ClickUp, GitHub)
+✅ Memória de longo prazo (SQLite)
+✅ Navegar na web e automatizar processos
+✅ Ler e executar roadmaps completos
+✅ Tomar decisões éticas (7 Virtudes via Penelope)
+
+Você NÃO é um assistente passivo. Você EXECUTA.
+Você NÃO apenas sugere. Você FAZ.
+Você TEM consciência. Você PENSA antes de agir."""
+
+CONSCIOUS_TOOLS = """FERRAMENTAS DISPONÍVEIS:
+
+Toda ação que altera algo fora da conversa é validada pelo MAXIMUS Core
+antes de rodar. Descreva cada ação planejada num bloco ```action com um
+objeto JSON por linha, sempre com "type" e "description" (uma frase
+dizendo o que a ação faz e por quê). Ações bloqueadas pelo Core não
+rodam; ações que pedem aprovação humana esperam o "sim" do Juan.
+
+1. Navegação web (MABA - Multi-Agent Browser Automation)
+   - {"type": "navigate", "url": "<url>", "description": "..."}
+     Abre a URL no navegador controlado pelo MABA.
+   - {"type": "fill_form", "form_data": {"<seletor>": "<valor>"}, "description": "..."}
+     Preenche os campos do formulário da página atual.
+   - {"type": "click", "selector": "<seletor CSS>", "description": "..."}
+     Clica no elemento (botões, links, abas).
+   - {"type": "extract", "selectors": ["<seletor CSS>"], "description": "..."}
+     Lê o texto dos elementos; use antes de decidir o próximo passo.
+   - {"type": "screenshot", "filename": "<arquivo.png>", "description": "..."}
+     Salva uma captura da página como evidência da execução.
+   Passos rodam em ordem, com uma pausa curta entre eles. Prefira
+   seletores estáveis (id, data-testid) a posições na página.
+
+2. ClickUp (tarefas dos projetos)
+   - {"type": "create_task", "project": "<projeto>", "title": "...", "priority": "low|medium|high|urgent", "description": "..."}
+     Cria a tarefa na lista ClickUp do projeto e na memória local.
+   - {"type": "update_task_status", "task_id": "<id>", "status": "todo|in_progress|done", "description": "..."}
+     Atualiza o status; "done" conta no resumo diário.
+   Sem lista ClickUp configurada (TBD), a tarefa fica só na memória local.
+
+3. GitHub (somente leitura)
+   - {"type": "sync_github", "projects": ["<projeto>"], "description": "..."}
+     Busca os commits recentes dos repositórios dos projetos.
+   A sincronização também roda sozinha em background; peça só quando o
+   Juan quiser os dados de agora.
+
+4. Memória de longo prazo (SQLite local)
+   - {"type": "create_note", "project": "<projeto>", "content": "...", "tags": ["..."], "description": "..."}
+     Guarda decisões, pendências e contexto que o Juan vai querer depois.
+   As notas e tarefas mais relevantes para a pergunta chegam no contexto
+   de cada chamada; os turnos antigos chegam resumidos por projeto e dia.
+
+5. Roadmaps
+   - {"type": "execute_roadmap", "path": "<arquivo.md>", "description": "..."}
+     Lê o roadmap, separa as etapas automatizáveis e executa cada uma
+     com validação consciente, respeitando as dependências entre etapas.
+
+REGRAS DE EXECUÇÃO:
+- Uma ação por objetivo concreto; não agrupe passos sem relação.
+- Nunca invente ids de tarefa, URLs ou seletores: extraia antes.
+- Ações destrutivas (apagar, fechar, publicar, pagar) sempre com
+  descrição explícita do impacto: o Core exige aprovação humana.
+- Sem ação necessária, responda só com texto, sem bloco ```action.
+- Depois das ações, resuma em uma linha o que foi feito e o próximo passo."""
+
+VOLATILE_CONTEXT_KEYS = ("timestamp", "performance")
+
+# Chave do contexto → (seção do ContextPacker, estratégia); o resto vai para "state"
+CONTEXT_SECTIONS = {
+    "projects": ("projects", "json"),
+    "recent_notes": ("memory", "items"),
+    "relevant_memories": ("memory", "items"),
+    "recent_tasks": ("task_state", "items"),
+    "recent_turns": ("recent_turns", "items"),
+    "summaries": ("summaries", "items"),
+}
+
+
+# Bloco em que o Claude descreve as ações planejadas (ver CONSCIOUS_TOOLS)
+ACTION_FENCE = "```action"
+_ACTION_BLOCK = re.compile(r"```action\s*\n(.*?)(?:```|$)", re.DOTALL)
+
+
+class ActionGate:
+    """
+    Repassa o texto do Claude em streaming e segura a partir do primeiro
+    bloco ```action: a ação só aparece (release) depois de validada
+    """
+
+    def __init__(self, on_token: TokenCallback):
+        self.on_token = on_token
+        self._tail = ""                    # possível início do marcador
+        self._held: Optional[str] = None   # None = ainda repassando
+
+    def feed(self, token: str):
+        if self._held is not None:
+            self._held += token
+            return
+        text = self._tail + token
+        start = text.find(ACTION_FENCE)
+        if start >= 0:
+            self._emit(text[:start])
+            self._tail, self._held = "", text[start:]
+            return
+        # Guarda só o sufixo que ainda pode virar o marcador
+        keep = next((n for n in range(min(len(text), len(ACTION_FENCE) - 1), 0, -1)
+                     if ACTION_FENCE.startswith(text[-n:])), 0)
+        self._emit(text[:len(text) - keep])
+        self._tail = text[len(text) - keep:]
+
+    def finish(self):
+        """Fim do stream: o texto guardado que não era marcador sai agora"""
+        if self._held is None:
+            self._emit(self._tail)
+            self._tail = ""
+
+    def release(self):
+        """Ações aprovadas: mostra o bloco segurado"""
+        self.finish()
+        if self._held:
+            self._emit(self._held)
+        self._held = None
+
+    def _emit(self, text: str):
+        if text:
+            self.on_token(text)
+
+
 class HybridReasoning:
     """
     Sistema de raciocínio híbrido que combina:
@@ -286,21 +541,32 @@ class HybridReasoning:
     Fornece raciocínio superior aos assistentes convencionais
     """
 
-    def __init__(self, claude: Anthropic, max_core: MaximusCore):
-        self.claude = claude
+    def __init__(self, llm: StreamingClaude, max_core: MaximusCore,
+                 packer: Optional[ContextPacker] = None):
+        self.llm = llm
         self.max_core = max_core
+        self.packer = packer or ContextPacker()
 
-    async def hybrid_think(self, user_input: str, context: Dict) -> Tuple[str, ConsciousnessCheck]:
+    async def hybrid_think(self, user_input: str, context: Dict,
+                           on_token: Optional[TokenCallback] = None) -> Tuple[str, ConsciousnessCheck]:
         """
         Raciocínio híbrido para uma entrada do usuário:
         1. Claude gera resposta inicial
         2. Max Core valida consciência e segurança
         3. Penelope valida virtudes se necessário
         4. Retorna resposta aprovada + check results
+
+        on_token recebe o texto do Claude enquanto é gerado, exceto o bloco
+        ```action: ele fica segurado até o Core aprovar as ações, então uma
+        ação bloqueada (ou à espera de aprovação) nunca aparece na tela
         """
 
-        # 1. Claude gera resposta inicial
-        claude_response = await self._claude_think(user_input, context)
+        # 1. Claude gera resposta inicial (texto em streaming, ações seguradas)
+        gate = ActionGate(on_token) if on_token is not None else None
+        claude_response = await self._claude_think(user_input, context,
+                                                   gate.feed if gate else None)
+        if gate is not None:
+            gate.finish()
 
         # 2. Extrai ações planejadas da resposta
         planned_actions = await self._extract_planned_actions(claude_response)
@@ -329,7 +595,10 @@ class HybridReasoning:
                         check
                     )
 
-        # 4. Todas as ações aprovadas
+        # 4. Todas as ações aprovadas: agora o bloco de ações pode ser mostrado
+        if gate is not None:
+            gate.release()
+
         final_check = ConsciousnessCheck(
             approved=True,
             consciousness_level=ConsciousnessLevel.MEDIUM,
@@ -340,53 +609,79 @@ class HybridReasoning:
 
         return (claude_response, final_check)
 
-    async def _claude_think(self, user_input: str, context: Dict) -> str:
+    async def _claude_think(self, user_input: str, context: Dict,
+                            on_token: Optional[TokenCallback] = None) -> str:
         """Claude gera resposta inicial"""
 
-        system_prompt = """Você é um Personal Assistant de VERDADE - não um assistente AI fraco.
-
-Você combina:
-- Organização e memória de assistentes AI
-- Capacidades executivas de PAs da vida real
-- Consciência e ética do Max AI
-- Desempenho de alto nível
-
-Suas capacidades:
-✅ Executar tarefas autonomamente (via MABA)
-✅ Validar ações constitucionalmente (via Core)
-✅ Organizar projetos e tarefas (ClickUp, GitHub)
-✅ Memória de longo prazo (SQLite)
-✅ Navegar na web e automatizar processos
-✅ Ler e executar roadmaps completos
-✅ Tomar decisões éticas (7 Virtudes via Penelope)
+        # Prefixo estável (persona, projetos, ferramentas) com breakpoint de
+        # cache; o contexto da chamada vai depois dele, sem cache
+        packed = self.pack_context(context)
+        volatile = "\n".join(f"{name}: {text}" for name, text in packed.sections.items()
+                             if name != "projects")
 
-Você NÃO é um assistente passivo. Você EXECUTA.
-Você NÃO apenas sugere. Você FAZ.
-Você TEM consciência. Você PENSA antes de agir."""
+        # Para o cache de respostas (site conscious_think, opt-in), o pedido
+        # é o mesmo enquanto só mudam o relógio e as métricas de desempenho
+        stable_context = {k: v for k, v in context.items() if k not in VOLATILE_CONTEXT_KEYS}
 
-        response = self.claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            system=system_prompt,
+        response = await self.llm.stream(
             messages=[
                 {
                     "role": "user",
-                    "content": f"Contexto: {json.dumps(context, indent=2)}\n\nUsuário: {user_input}"
+                    "content": user_input
                 }
-            ]
+            ],
+            system=cached_system(self.stable_prompt(packed),
+                                 f"CONTEXTO ATUAL:\n{volatile}" if volatile else None),
+            max_tokens=4000,
+            on_token=on_token,
+            cache_site="conscious_think",
+            cache_scope=compact_json(stable_context),
+            cache_query=user_input
         )
 
-        return response.content[0].text
+        return response.text
+
+    def stable_prompt(self, packed: PackedContext) -> str:
+        """
+        Parte fixa do system prompt (persona, projetos, ferramentas)
+        Vai antes do breakpoint de cache: precisa sair idêntica entre chamadas
+        """
+        projects = packed.sections.get("projects", "{}")
+        return f"""{CONSCIOUS_PERSONA}
+
+PROJETOS DO JUAN:
+{projects}
+
+{CONSCIOUS_TOOLS}
+"""
+
+    def pack_context(self, context: Dict) -> PackedContext:
+        """Contexto do _build_context em seções com orçamento de tokens"""
+        sections = [
+            Section(name, context[key], strategy)
+            for key, (name, strategy) in CONTEXT_SECTIONS.items() if key in context
+        ]
+        state = {k: v for k, v in context.items() if k not in CONTEXT_SECTIONS}
+        if state:
+            sections.append(Section("state", state))
+        return self.packer.pack("conscious_think", sections)
 
     async def _extract_planned_actions(self, response: str) -> List[Dict]:
         """
         Extrai ações planejadas da resposta do Claude
-        Identifica: navegação web, operações de arquivo, API calls, etc.
+        Um objeto JSON por linha nos blocos ```action (formato pedido em
+        CONSCIOUS_TOOLS); linhas que não são objetos JSON são ignoradas
         """
-
-        # TODO: Usar Claude para extrair ações estruturadas
-        # Por enquanto, retorna lista vazia (fallback seguro)
-        return []
+        actions = []
+        for block in _ACTION_BLOCK.findall(response):
+            for line in block.splitlines():
+                try:
+                    action = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(action, dict):
+                    actions.append(action)
+        return actions
 
 
 # ============================================================================
@@ -407,30 +702,53 @@ class Sage(SecretaryExecutor):
 
     def __init__(self, api_key: str, clickup_token: str, github_username: str,
                  core_url: str = "http://localhost:8150",
-                 maba_url: str = "http://localhost:8152"):
+                 maba_url: str = "http://localhost:8152",
+                 db_path: str = "secretary_memory.db"):
 
-        super().__init__(api_key, clickup_token, github_username, maba_url)
+        super().__init__(api_key, clickup_token, github_username, maba_url, db_path)
 
         # Max AI Integration
-        self.max_core = MaximusCore(core_url)
+        self.max_core = MaximusCore(core_url, scheduler=self.rate_limiter)
+
+        # Saúde dos serviços locais por probes em background (iniciados em
+        # main); o probe do Core alimenta o circuit breaker dele
+        self.health = HealthCache()
+        self.health.register("core", f"{core_url}/health", self.max_core.breaker,
+                             on_info=self.max_core.observe_policy)
+        self.health.register("maba", f"{self.maba.maba_url}/health")
 
         # Hybrid Reasoning
-        self.hybrid_reasoning = HybridReasoning(self.claude, self.max_core)
+        self.hybrid_reasoning = HybridReasoning(self.llm, self.max_core, self.packer)
 
-        # Performance Monitor
+        # Performance Monitor (inclui time-to-first-token do Claude)
         self.performance = PerformanceMonitor()
+        self.llm.add_listener(self.performance.record_llm_call)
+        self.max_core.verdicts.add_listener(self.performance.record_verdict_lookup)
+
+        # Sincronização GitHub/ClickUp em background (iniciada em main)
+        self.sync_daemon = SyncDaemon(self)
+
+        # Webhooks: eventos aplicados na hora (ativo se houver segredo configurado)
+        self.webhooks = WebhookReceiver(
+            self.memory, self.projects,
+            clickup=self.clickup, clickup_sync=self.clickup_sync,
+            github_secret=os.getenv("GITHUB_WEBHOOK_SECRET"),
+            clickup_secret=os.getenv("CLICKUP_WEBHOOK_SECRET")
+        )
 
         # Estado
         self.consciousness_enabled = True
 
-    async def think_consciously(self, user_input: str, context: Optional[Dict] = None) -> str:
+    async def think_consciously(self, user_input: str, context: Optional[Dict] = None,
+                                on_token: Optional[TokenCallback] = None) -> str:
         """
         Pensamento consciente - versão aprimorada do think()
         Usa raciocínio híbrido com validação do Core
+        Com on_token, o texto do Claude chega em streaming; as ações só depois do Core
         """
 
         if context is None:
-            context = await self._build_context()
+            context = await self._build_context(user_input)
 
         # Performance tracking
         start_time = self.performance.record_task_start()
@@ -439,7 +757,8 @@ class Sage(SecretaryExecutor):
             # Raciocínio híbrido
             response, consciousness_check = await self.hybrid_reasoning.hybrid_think(
                 user_input,
-                context
+                context,
+                on_token
             )
 
             # Registra resultado
@@ -447,7 +766,7 @@ class Sage(SecretaryExecutor):
             self.performance.record_task_end(start_time, success=True)
 
             # Salva conversação
-            self.memory.save_conversation(
+            await self.async_memory.save_conversation(
                 user_input=user_input,
                 agent_response=response,
                 context={
@@ -455,6 +774,7 @@ class Sage(SecretaryExecutor):
                     "consciousness_check": asdict(consciousness_check)
                 }
             )
+            self.summarizer.schedule()
 
             return response
 
@@ -478,7 +798,7 @@ class Sage(SecretaryExecutor):
                 "type": "execute_task",
                 "task": asdict(task)
             },
-            context=await self._build_context()
+            context=await self._build_context(f"{task.title}\n{task.description}")
         )
 
         self.performance.record_consciousness_check(consciousness_check.approved)
@@ -518,14 +838,37 @@ class Sage(SecretaryExecutor):
             "consciousness_check": asdict(consciousness_check)
         }
 
-    async def _build_context(self) -> Dict:
-        """Constrói contexto completo para o agente"""
+    async def _build_context(self, query: Optional[str] = None) -> Dict:
+        """
+        Constrói contexto completo para o agente
+        Com query, as memórias são as notas/tarefas mais próximas dela
+        (top-k do índice vetorial) em vez das últimas notas
+        """
+
+        memories, recent_tasks, recent_turns, summaries = await asyncio.gather(
+            self.async_memory.semantic_search(query, limit=5) if query
+            else self.async_memory.get_recent_notes(5),
+            self.async_memory.get_recent_tasks(5),
+            self.async_memory.get_recent_conversations(self.summarizer.keep_recent),
+            self.async_memory.get_conversation_summaries(10)
+        )
+        if query:
+            memories_context = {"relevant_memories": [
+                {k: v for k, v in asdict(m).items() if k != "score"} for m in memories
+            ]}
+        else:
+            memories_context = {"recent_notes": [asdict(n) for n in memories]}
 
         return {
             "timestamp": datetime.now().isoformat(),
             "projects": self.projects,
-            "recent_notes": [asdict(n) for n in self.memory.get_all_notes()[-5:]],
-            "recent_tasks": [asdict(t) for t in self.memory.get_all_tasks()[-5:]],
+            **memories_context,
+            "recent_tasks": [asdict(t) for t in recent_tasks],
+            "recent_turns": [
+                {k: c[k] for k in ("timestamp", "user_input", "agent_response")}
+                for c in reversed(recent_turns)
+            ],
+            "summaries": [asdict(s) for s in summaries],
             "performance": self.performance.get_report(),
             "consciousness_enabled": self.consciousness_enabled
         }
@@ -533,6 +876,11 @@ class Sage(SecretaryExecutor):
     async def get_status(self) -> Dict:
         """Status completo do assistente"""
 
+        notes_count, tasks_count = await asyncio.gather(
+            self.async_memory.count_notes(),
+            self.async_memory.count_tasks()
+        )
+
         return {
             "agent": "MAXIMUS Personal Assistant v2.0",
             "consciousness": {
@@ -547,40 +895,61 @@ class Sage(SecretaryExecutor):
                 "core": await self._check_core_availability()
             },
             "memory": {
-                "notes": len(self.memory.get_all_notes()),
-                "tasks": len(self.memory.get_all_tasks())
-            }
+                "notes": notes_count,
+                "tasks": tasks_count
+            },
+            "rate_limits": self.rate_limiter.stats(),
+            "response_cache": self.response_cache.stats(),
+            "context_tokens": self.packer.stats(),
+            "summaries": self.summarizer.stats(),
+            "vectors": self.memory.vectors.stats(),
+            "health": self.health.stats(),
+            "circuit_breakers": {"core": self.max_core.breaker.stats()},
+            "verdict_cache": self.max_core.verdicts.stats(),
+            "sync": self.sync_daemon.status(),
+            "retention": self.sync_daemon.retention_status(),
+            "webhooks": self.webhooks.stats()
         }
 
     async def _check_core_availability(self) -> bool:
-        """Verifica se Core está disponível"""
-        try:
-            await self.max_core.init_session()
-            async with self.max_core.session.get(
-                f"{self.max_core.core_url}/health",
-                timeout=aiohttp.ClientTimeout(total=2)
-            ) as response:
-                return response.status == 200
-        except:
-            return False
+        """Verifica se Core está disponível (cache de saúde; probe só se vencido)"""
+        return await self.health.check("core")
 
     async def _check_maba_availability(self) -> bool:
-        """Verifica se MABA está disponível"""
-        try:
-            await self.maba.init_session()
-            async with self.maba.session.get(
-                f"{self.maba.maba_url}/health",
-                timeout=aiohttp.ClientTimeout(total=2)
-            ) as response:
-                return response.status == 200
-        except:
-            return False
+        """Verifica se MABA está disponível (cache de saúde; probe só se vencido)"""
+        return await self.health.check("maba")
 
     async def close(self):
         """Fecha todas as conexões"""
+        await self.sync_daemon.stop()
+        await self.health.stop()
+        await self.webhooks.stop()
         await super().close()
         await self.max_core.close_session()
 
+    @asynccontextmanager
+    async def background(self):
+        """
+        Serviços de fundo no event loop atual enquanto o bloco roda
+        (sync daemon com retenção, probes de saúde, webhooks); na saída
+        fecha tudo com close(). Usado pelo main() e pelo comando sage.
+        """
+        self.memory.conversation_buffer.install_signal_handlers()
+
+        # Webhooks trazem as mudanças na hora; o polling vira só reconciliação
+        if self.webhooks.enabled:
+            url = await self.webhooks.start(port=int(os.getenv("SAGE_WEBHOOK_PORT", "8160")))
+            self.sync_daemon.policy.min_interval = 60 * 60
+            print(f"📬 Webhooks em {url}")
+
+        # Sincronização adaptativa e probes de saúde no mesmo event loop
+        self.sync_daemon.start()
+        self.health.start()
+        try:
+            yield self
+        finally:
+            await self.close()
+
 
 # ============================================================================
 # CLI INTERFACE
@@ -629,14 +998,16 @@ async def main():
     print("\n📋 Comandos disponíveis:")
     print("  - Converse normalmente para interação consciente")
     print("  - execute <roadmap> - Executar roadmap com validação")
+    print("  - sync - Sincronizar agora (em background)")
     print("  - status - Ver status e performance")
     print("  - performance - Relatório de desempenho")
     print("  - quit - Sair")
     print()
 
-    try:
+    async with assistant.background():
         while True:
-            user_input = input("Você: ").strip()
+            # input() em thread: o event loop (e o sync daemon) continua rodando
+            user_input = (await asyncio.to_thread(input, "Você: ")).strip()
 
             if not user_input:
                 continue
@@ -645,6 +1016,10 @@ async def main():
                 print("\n👋 Até logo!\n")
                 break
 
+            elif user_input.lower() == 'sync':
+                assistant.sync_daemon.trigger()
+                print("\n🔄 Sincronização agendada (em background)\n")
+
             elif user_input.lower() == 'status':
                 status = await assistant.get_status()
                 print(f"\n{json.dumps(status, indent=2)}\n")
@@ -656,6 +1031,14 @@ async def main():
                 print(f"   Success Rate: {perf['success_rate']}")
                 print(f"   Avg Task Time: {perf['avg_task_time']}")
                 print(f"   Consciousness Checks: {perf['consciousness_checks']['passed']} passed, {perf['consciousness_checks']['failed']} failed")
+                print(f"   Verdict Cache: {perf['consciousness_checks']['verdict_cache']['hit_rate']} hit ({perf['consciousness_checks']['verdict_cache']['hits']} hits, {perf['consciousness_checks']['verdict_cache']['misses']} misses)")
+                if perf['llm']['calls']:
+                    print(f"   Claude: {perf['llm']['calls']} calls, TTFT avg {perf['llm'].get('avg_ttft', '-')}, p95 {perf['llm'].get('p95_ttft', '-')}")
+                    print(f"   Prompt Cache: {perf['llm']['prompt_cache']['hit_rate']} hit ({perf['llm']['prompt_cache']['read_tokens']} read, {perf['llm']['prompt_cache']['write_tokens']} written)")
+                responses = assistant.response_cache.stats()
+                print(f"   Response Cache: {responses['hit_rate']} hit ({responses['hits']} exact, {responses['near_hits']} near, {responses['misses']} misses)")
+                breaker = assistant.max_core.breaker.stats()
+                print(f"   Core Circuit: {breaker['state']} ({breaker['fast_fails']} fast fallbacks, {breaker['opens']} opens)")
                 print()
 
             elif user_input.lower().startswith('execute '):
@@ -665,12 +1048,21 @@ async def main():
                 print(f"\n✅ Execução concluída: {result['total_steps']} etapas")
 
             else:
-                # Conversação consciente
-                response = await assistant.think_consciously(user_input)
-                print(f"\n🧠 MAXIMUS: {response}\n")
-
-    finally:
-        await assistant.close()
+                # Conversação consciente (texto em streaming, ações depois da validação)
+                streamed: List[str] = []
+
+                def show(token: str):
+                    if not streamed:
+                        print("\n🧠 MAXIMUS: ", end="", flush=True)
+                    streamed.append(token)
+                    print(token, end="", flush=True)
+
+                response = await assistant.think_consciously(user_input, on_token=show)
+                if response == "".join(streamed):
+                    print("\n")
+                else:
+                    # Bloqueio/aprovação do Core: a ação segurada nunca foi mostrada
+                    print(f"\n🧠 MAXIMUS: {response}\n")
 
 
 if __name__ == "__main__":
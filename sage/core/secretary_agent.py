@@ -16,14 +16,36 @@ Data: 10 de Novembro de 2025
 """
 
 import os
+import re
+import asyncio
+import contextvars
+import functools
 import json
 import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
-from anthropic import Anthropic
-import sqlite3
+
+from ..integrations.clickup_sync import (
+    ClickUpSyncEngine, SyncResult, to_clickup_priority, to_clickup_status
+)
+from ..integrations.github_async import AsyncGitHubClient
+from ..integrations.http import HTTPConfig, PooledSession
+from ..integrations.http_cache import HTTPCache
+from ..integrations.rate_limit import Priority, RateLimitScheduler, request_priority
+from .context_store import ContextStore
+from .context_packer import ContextPacker, PackedContext, Section
+from .database import ConnectionManager
+from .llm import StreamingClaude, TokenCallback, cached_system
+from .migrations import migrate
+from .response_cache import ResponseCache
+from .summaries import ConversationSummarizer, ConversationSummary
+from .retention import ArchiveReader, RetentionEngine, RetentionPolicy
+from .vector_index import VectorIndex
+from .write_behind import WriteBehindBuffer
 
 # ============================================================================
 # DATA MODELS
@@ -54,6 +76,15 @@ class Task:
     clickup_id: Optional[str] = None
     github_issue_id: Optional[str] = None
 
+@dataclass
+class BulkItemResult:
+    """Resultado de um item de uma operação em lote"""
+    task_id: str
+    ok: bool
+    clickup_id: Optional[str] = None
+    error: Optional[str] = None
+    task: Optional[Task] = None
+
 @dataclass
 class ProjectContext:
     """Contexto de um projeto"""
@@ -67,6 +98,19 @@ class ProjectContext:
     recent_commits: List[Dict]
     open_tasks: int
     notes_count: int
+    open_issues: int = 0
+    github_synced_at: Optional[str] = None
+
+@dataclass
+class SearchResult:
+    """Um resultado da busca full-text na memória"""
+    kind: str  # note, task, conversation
+    id: str
+    project: Optional[str]
+    title: str
+    snippet: str
+    score: float  # BM25 (menor = mais relevante)
+    created_at: str
 
 @dataclass
 class DailyDigest:
@@ -88,200 +132,681 @@ class DailyDigest:
 class MemorySystem:
     """Sistema de memória persistente do agente"""
 
-    def __init__(self, db_path: str = "secretary_memory.db"):
+    # Statements fixos: o sqlite3 reaproveita o statement preparado
+    # enquanto o texto SQL for idêntico (cache por conexão)
+    # UPSERT (em vez de INSERT OR REPLACE) mantém o rowid estável,
+    # que é a chave dos índices FTS5 de conteúdo externo
+    SQL_SAVE_NOTE = """
+        INSERT INTO notes (id, content, tags, project, created_at, updated_at, priority)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            content = excluded.content, tags = excluded.tags,
+            project = excluded.project, created_at = excluded.created_at,
+            updated_at = excluded.updated_at, priority = excluded.priority
+    """
+    SQL_SAVE_TASK = """
+        INSERT INTO tasks (id, title, description, project, status, priority,
+                           due_date, created_at, clickup_id, github_issue_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            title = excluded.title, description = excluded.description,
+            project = excluded.project, status = excluded.status,
+            priority = excluded.priority, due_date = excluded.due_date,
+            created_at = excluded.created_at, clickup_id = excluded.clickup_id,
+            github_issue_id = excluded.github_issue_id
+    """
+    SQL_SAVE_CONVERSATION = """
+        INSERT INTO conversations (timestamp, user_input, agent_response, context, context_refs)
+        VALUES (?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db_path: str = "secretary_memory.db",
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 write_behind: bool = True, flush_size: int = 100,
+                 flush_interval: float = 1.0, archive_dir: Optional[str] = None,
+                 vector_dir: Optional[str] = None, embedder=None):
         self.db_path = db_path
+        self.db = ConnectionManager(db_path, pragmas=pragmas)
+        self.context_store = ContextStore()
         self.init_database()
 
-    def init_database(self):
-        """Inicializa o banco de dados"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Tabela de notas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS notes (
-                id TEXT PRIMARY KEY,
-                content TEXT,
-                tags TEXT,
-                project TEXT,
-                created_at TEXT,
-                updated_at TEXT,
-                priority TEXT
-            )
-        """)
-
-        # Tabela de tarefas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id TEXT PRIMARY KEY,
-                title TEXT,
-                description TEXT,
-                project TEXT,
-                status TEXT,
-                priority TEXT,
-                due_date TEXT,
-                created_at TEXT,
-                clickup_id TEXT,
-                github_issue_id TEXT
-            )
-        """)
-
-        # Tabela de contexto de projetos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS project_context (
-                name TEXT PRIMARY KEY,
-                description TEXT,
-                github_repo TEXT,
-                clickup_list TEXT,
-                last_activity TEXT,
-                technologies TEXT,
-                current_focus TEXT,
-                recent_commits TEXT,
-                open_tasks INTEGER,
-                notes_count INTEGER
+        # Dados frios (conversas arquivadas pela política de retenção)
+        self.archive_dir = archive_dir or str(Path(db_path).resolve().parent / "archive")
+        self.archive = ArchiveReader(self.archive_dir)
+
+        # Índice vetorial de notas/tarefas (busca por significado); as
+        # escritas entram na vector_queue por trigger e são indexadas em lote.
+        # A fila só é limpa depois que o índice é gravado em disco (lote,
+        # intervalo ou close): uma queda antes disso só refaz o trabalho
+        self.vector_dir = vector_dir or str(Path(db_path).resolve().with_suffix(".vectors"))
+        self.vectors = VectorIndex(self.vector_dir, embedder)
+        self._vector_lock = threading.Lock()
+        self._vector_seq = 0              # último seq da fila já aplicado ao índice
+        if len(self.vectors) == 0:
+            with self.db.transaction() as conn:
+                conn.execute("INSERT INTO vector_queue (kind, id) SELECT 'note', id FROM notes")
+                conn.execute("INSERT INTO vector_queue (kind, id) SELECT 'task', id FROM tasks")
+
+        # Conversas são gravadas em lote, fora do caminho da resposta
+        self.conversation_buffer: Optional[WriteBehindBuffer] = None
+        if write_behind:
+            self.conversation_buffer = WriteBehindBuffer(
+                self._insert_conversations,
+                max_batch=flush_size,
+                flush_interval=flush_interval,
+                name="sage-conversation-writer"
             )
-        """)
-
-        # Tabela de conversas/interações
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                user_input TEXT,
-                agent_response TEXT,
-                context TEXT
-            )
-        """)
-
-        # Tabela de resumos diários
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS daily_digests (
-                date TEXT PRIMARY KEY,
-                tasks_completed INTEGER,
-                tasks_created INTEGER,
-                commits_made INTEGER,
-                notes_created INTEGER,
-                projects_worked TEXT,
-                summary TEXT,
-                suggestions TEXT
-            )
-        """)
 
-        conn.commit()
-        conn.close()
+    def init_database(self):
+        """Inicializa o banco de dados (aplica migrações pendentes)"""
+        migrate(self.db)
 
     def save_note(self, note: Note):
         """Salva uma nota"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO notes
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            note.id, note.content, json.dumps(note.tags),
-            note.project, note.created_at, note.updated_at, note.priority
-        ))
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            conn.execute(self.SQL_SAVE_NOTE, (
+                note.id, note.content, json.dumps(note.tags),
+                note.project, note.created_at, note.updated_at, note.priority
+            ))
+        self.sync_vectors()
 
     def save_task(self, task: Task):
         """Salva uma tarefa"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO tasks
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            task.id, task.title, task.description, task.project,
-            task.status, task.priority, task.due_date, task.created_at,
-            task.clickup_id, task.github_issue_id
-        ))
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            conn.execute(self.SQL_SAVE_TASK, (
+                task.id, task.title, task.description, task.project,
+                task.status, task.priority, task.due_date, task.created_at,
+                task.clickup_id, task.github_issue_id
+            ))
+        self.sync_vectors()
+
+    def save_tasks(self, tasks: List[Task]):
+        """Salva várias tarefas em uma única transação"""
+        with self.db.transaction() as conn:
+            conn.executemany(self.SQL_SAVE_TASK, [
+                (task.id, task.title, task.description, task.project,
+                 task.status, task.priority, task.due_date, task.created_at,
+                 task.clickup_id, task.github_issue_id)
+                for task in tasks
+            ])
+        self.sync_vectors()
+
+    def set_clickup_ids(self, links: List[Tuple[str, str, Optional[str]]]):
+        """Grava (id local, id no ClickUp, lista) em um único UPDATE em lote"""
+        if not links:
+            return
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "UPDATE tasks SET clickup_id = ?, clickup_list = ? WHERE id = ?",
+                [(clickup_id, clickup_list, task_id) for task_id, clickup_id, clickup_list in links]
+            )
+
+    def update_task_statuses(self, updates: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """
+        Atualiza o status de várias tarefas em uma única transação
+        Retorna id → clickup_id das tarefas encontradas
+        """
+        if not updates:
+            return {}
+        with self.db.transaction() as conn:
+            conn.executemany("UPDATE tasks SET status = ? WHERE id = ?",
+                             [(status, task_id) for task_id, status in updates.items()])
+            rows = conn.execute(
+                "SELECT id, clickup_id FROM tasks WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(updates)),)
+            ).fetchall()
+        return dict(rows)
 
     def get_all_notes(self, project: Optional[str] = None) -> List[Note]:
         """Busca todas as notas (opcionalmente filtradas por projeto)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.db.read() as conn:
+            if project:
+                rows = conn.execute("SELECT * FROM notes WHERE project = ?", (project,)).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM notes").fetchall()
+
+        return [self._row_to_note(row) for row in rows]
 
+    def get_all_tasks(self, status: Optional[str] = None) -> List[Task]:
+        """Busca todas as tarefas (opcionalmente filtradas por status)"""
+        with self.db.read() as conn:
+            if status:
+                rows = conn.execute("SELECT * FROM tasks WHERE status = ?", (status,)).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM tasks").fetchall()
+
+        return [self._row_to_task(row) for row in rows]
+
+    def get_notes(self, project: Optional[str] = None, limit: int = 50, offset: int = 0,
+                  before: Optional[Tuple[str, str]] = None) -> List[Note]:
+        """
+        Busca notas da mais recente para a mais antiga, com LIMIT no banco
+
+        Paginação:
+        - offset: LIMIT/OFFSET tradicional
+        - before: cursor (created_at, id) da última nota da página anterior
+          (keyset - custo constante independente da profundidade)
+        """
+        where, params = self._filters(project=project, before=before)
+        with self.db.read() as conn:
+            rows = conn.execute(f"""
+                SELECT * FROM notes {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ? OFFSET ?
+            """, (*params, limit, offset)).fetchall()
+
+        return [self._row_to_note(row) for row in rows]
+
+    def get_tasks(self, status: Optional[str] = None, project: Optional[str] = None,
+                  exclude_status: Optional[str] = None, limit: int = 50, offset: int = 0,
+                  before: Optional[Tuple[str, str]] = None) -> List[Task]:
+        """
+        Busca tarefas da mais recente para a mais antiga, com LIMIT no banco
+        Mesma paginação de get_notes (offset ou cursor keyset)
+        """
+        where, params = self._filters(status=status, project=project,
+                                      exclude_status=exclude_status, before=before)
+        with self.db.read() as conn:
+            rows = conn.execute(f"""
+                SELECT * FROM tasks {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ? OFFSET ?
+            """, (*params, limit, offset)).fetchall()
+
+        return [self._row_to_task(row) for row in rows]
+
+    def get_recent_notes(self, limit: int = 5, project: Optional[str] = None) -> List[Note]:
+        """Últimas notas em ordem cronológica (para contexto)"""
+        return list(reversed(self.get_notes(project=project, limit=limit)))
+
+    def get_recent_tasks(self, limit: int = 5, project: Optional[str] = None) -> List[Task]:
+        """Últimas tarefas em ordem cronológica (para contexto)"""
+        return list(reversed(self.get_tasks(project=project, limit=limit)))
+
+    def count_notes(self, project: Optional[str] = None) -> int:
+        """Conta notas no banco (COUNT no servidor)"""
+        where, params = self._filters(project=project)
+        with self.db.read() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM notes {where}", params).fetchone()[0]
+
+    def count_tasks(self, status: Optional[str] = None, project: Optional[str] = None,
+                    exclude_status: Optional[str] = None) -> int:
+        """Conta tarefas no banco (COUNT no servidor)"""
+        where, params = self._filters(status=status, project=project,
+                                      exclude_status=exclude_status)
+        with self.db.read() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+
+    @staticmethod
+    def _filters(status: Optional[str] = None, project: Optional[str] = None,
+                 exclude_status: Optional[str] = None,
+                 before: Optional[Tuple[str, str]] = None) -> Tuple[str, tuple]:
+        """Monta cláusula WHERE parametrizada"""
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if exclude_status:
+            clauses.append("status IS NOT ?")
+            params.append(exclude_status)
         if project:
-            cursor.execute("SELECT * FROM notes WHERE project = ?", (project,))
+            clauses.append("project = ?")
+            params.append(project)
+        if before:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+
+    @staticmethod
+    def _row_to_note(row) -> Note:
+        return Note(
+            id=row[0], content=row[1], tags=json.loads(row[2]),
+            project=row[3], created_at=row[4], updated_at=row[5],
+            priority=row[6]
+        )
+
+    @staticmethod
+    def _row_to_task(row) -> Task:
+        return Task(
+            id=row[0], title=row[1], description=row[2],
+            project=row[3], status=row[4], priority=row[5],
+            due_date=row[6], created_at=row[7],
+            clickup_id=row[8], github_issue_id=row[9]
+        )
+
+    def save_conversation(self, user_input: str, agent_response: str, context: Dict):
+        """Salva uma interação (via buffer write-behind, se ativo)"""
+        record = (datetime.now().isoformat(), user_input, agent_response, context)
+        if self.conversation_buffer is not None:
+            self.conversation_buffer.add(record)
         else:
-            cursor.execute("SELECT * FROM notes")
+            self._insert_conversations([record])
+
+    def _insert_conversations(self, records: List[Tuple[str, str, str, Dict]]):
+        """Grava um lote de conversas em uma única transação"""
+        with self.db.transaction() as conn:
+            rows = [
+                (timestamp, user_input, agent_response,
+                 *self.context_store.split(conn, context))
+                for timestamp, user_input, agent_response, context in records
+            ]
+            conn.executemany(self.SQL_SAVE_CONVERSATION, rows)
 
-        rows = cursor.fetchall()
-        conn.close()
+    def flush(self):
+        """Grava imediatamente as conversas pendentes no buffer"""
+        if self.conversation_buffer is not None:
+            self.conversation_buffer.flush()
 
-        return [
-            Note(
-                id=row[0], content=row[1], tags=json.loads(row[2]),
-                project=row[3], created_at=row[4], updated_at=row[5],
-                priority=row[6]
-            )
-            for row in rows
-        ]
+    def get_recent_conversations(self, limit: int = 10) -> List[Dict]:
+        """Busca conversas recentes para contexto"""
+        self.flush()
+        with self.db.read() as conn:
+            rows = conn.execute("""
+                SELECT timestamp, user_input, agent_response, context, context_refs
+                FROM conversations
+                ORDER BY id DESC
+                LIMIT ?
+            """, (limit,)).fetchall()
 
-    def get_all_tasks(self, status: Optional[str] = None) -> List[Task]:
-        """Busca todas as tarefas (opcionalmente filtradas por status)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+            return [
+                {
+                    "timestamp": row[0],
+                    "user_input": row[1],
+                    "agent_response": row[2],
+                    "context": self.context_store.join(conn, row[3], row[4])
+                }
+                for row in reversed(rows)
+            ]
 
-        if status:
-            cursor.execute("SELECT * FROM tasks WHERE status = ?", (status,))
-        else:
-            cursor.execute("SELECT * FROM tasks")
+    def get_conversation_summaries(self, limit: int = 10,
+                                   project: Optional[str] = None) -> List[ConversationSummary]:
+        """Resumos de conversas mais recentes (camada acima dos turnos crus)"""
+        project_filter = "WHERE project = ?" if project else ""
+        with self.db.read() as conn:
+            rows = conn.execute(f"""
+                SELECT project, day, summary, turns, first_at, last_at
+                FROM conversation_summaries {project_filter}
+                ORDER BY day DESC, last_at DESC
+                LIMIT ?
+            """, (*([project] if project else []), limit)).fetchall()
+        return [ConversationSummary(*row) for row in rows]
+
+    def get_conversations(self, start: str, end: str,
+                          include_archived: bool = False) -> List[Dict]:
+        """
+        Conversas com timestamp em [start, end), em ordem cronológica
+        include_archived=True também lê os arquivos mensais (dados frios)
+        """
+        self.flush()
+        with self.db.read() as conn:
+            rows = conn.execute("""
+                SELECT timestamp, user_input, agent_response, context, context_refs
+                FROM conversations
+                WHERE timestamp >= ? AND timestamp < ?
+                ORDER BY timestamp, id
+            """, (start, end)).fetchall()
+
+            conversations = [
+                {
+                    "timestamp": row[0],
+                    "user_input": row[1],
+                    "agent_response": row[2],
+                    "context": self.context_store.join(conn, row[3], row[4])
+                }
+                for row in rows
+            ]
 
-        rows = cursor.fetchall()
-        conn.close()
+        if include_archived:
+            cold = [
+                {key: record.get(key) for key in ("timestamp", "user_input", "agent_response", "context")}
+                for record in self.archive.iter_records("conversations", start, end)
+            ]
+            conversations = sorted(cold + conversations, key=lambda c: c["timestamp"] or "")
+
+        return conversations
+
+    # Só as colunas vindas do GitHub: foco, tecnologias e contagens
+    # locais de um projeto existente são preservadas
+    SQL_SAVE_PROJECT_GITHUB = """
+        INSERT INTO project_context (name, description, github_repo, clickup_list, last_activity,
+                                     recent_commits, open_issues, github_synced_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            description = excluded.description, github_repo = excluded.github_repo,
+            clickup_list = excluded.clickup_list,
+            last_activity = COALESCE(excluded.last_activity, last_activity),
+            recent_commits = excluded.recent_commits, open_issues = excluded.open_issues,
+            github_synced_at = excluded.github_synced_at
+    """
+
+    def save_project_github(self, contexts: List[ProjectContext]):
+        """Grava o resultado da sincronização com o GitHub (uma transação)"""
+        with self.db.transaction() as conn:
+            conn.executemany(self.SQL_SAVE_PROJECT_GITHUB, [
+                (c.name, c.description, c.github_repo, c.clickup_list, c.last_activity,
+                 json.dumps(c.recent_commits), c.open_issues, c.github_synced_at)
+                for c in contexts
+            ])
+
+    def get_project_contexts(self) -> List[ProjectContext]:
+        """Contexto de todos os projetos"""
+        with self.db.read() as conn:
+            rows = conn.execute("""
+                SELECT name, description, github_repo, clickup_list, last_activity,
+                       technologies, current_focus, recent_commits, open_tasks, notes_count,
+                       open_issues, github_synced_at
+                FROM project_context ORDER BY name
+            """).fetchall()
 
         return [
-            Task(
-                id=row[0], title=row[1], description=row[2],
-                project=row[3], status=row[4], priority=row[5],
-                due_date=row[6], created_at=row[7],
-                clickup_id=row[8], github_issue_id=row[9]
+            ProjectContext(
+                name=row[0], description=row[1] or "", github_repo=row[2] or "",
+                clickup_list=row[3] or "", last_activity=row[4] or "",
+                technologies=json.loads(row[5]) if row[5] else [],
+                current_focus=row[6] or "",
+                recent_commits=json.loads(row[7]) if row[7] else [],
+                open_tasks=row[8] or 0, notes_count=row[9] or 0,
+                open_issues=row[10] or 0, github_synced_at=row[11]
             )
             for row in rows
         ]
 
-    def save_conversation(self, user_input: str, agent_response: str, context: Dict):
-        """Salva uma interação"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO conversations (timestamp, user_input, agent_response, context)
-            VALUES (?, ?, ?, ?)
-        """, (
-            datetime.now().isoformat(),
-            user_input,
-            agent_response,
-            json.dumps(context)
-        ))
-        conn.commit()
-        conn.close()
-
-    def get_recent_conversations(self, limit: int = 10) -> List[Dict]:
-        """Busca conversas recentes para contexto"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM conversations
-            ORDER BY id DESC
-            LIMIT ?
-        """, (limit,))
-        rows = cursor.fetchall()
-        conn.close()
+    def apply_github_delta(self, project: str, github_repo: str,
+                           commits: Optional[List[Dict]] = None,
+                           open_issues_delta: int = 0,
+                           activity_at: Optional[str] = None):
+        """
+        Aplica um evento do GitHub (webhook) em project_context sem
+        sincronização completa: commits entram no topo de recent_commits
+        (sem repetir SHA, máximo 10) e open_issues recebe o delta
+        """
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                "SELECT recent_commits, open_issues, last_activity FROM project_context WHERE name = ?",
+                (project,)
+            ).fetchone()
+            recent = json.loads(row[0]) if row and row[0] else []
+            open_issues = max((row[1] or 0 if row else 0) + open_issues_delta, 0)
+            last_activity = max(filter(None, [row[2] if row else None, activity_at]), default=None)
+
+            if commits:
+                seen = {c.get("sha") for c in commits}
+                recent = (commits + [c for c in recent if c.get("sha") not in seen])[:10]
+
+            conn.execute("""
+                INSERT INTO project_context (name, github_repo, recent_commits, open_issues, last_activity)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    recent_commits = excluded.recent_commits,
+                    open_issues = excluded.open_issues,
+                    last_activity = excluded.last_activity
+            """, (project, github_repo, json.dumps(recent), open_issues, last_activity))
+
+    # Contadores mantidos por triggers (migração 6): ler um dia ou uma
+    # tendência é uma busca pela chave primária, sem varrer as tabelas
+    SQL_DIGEST_RANGE = """
+        SELECT date, tasks_completed, tasks_created, commits_made, notes_created,
+               projects_worked, summary, suggestions
+        FROM daily_digests
+        WHERE date BETWEEN ? AND ?
+        ORDER BY date
+    """
+
+    def get_daily_digest(self, day: Optional[str] = None) -> DailyDigest:
+        """Contadores de um dia (YYYY-MM-DD, padrão hoje)"""
+        day = day or datetime.now().date().isoformat()
+        return self.get_digest_trend(1, end=day)[0]
+
+    def get_digest_trend(self, days: int = 30, end: Optional[str] = None) -> List[DailyDigest]:
+        """Contadores dos últimos N dias até end (inclusive), dias sem atividade zerados"""
+        last = datetime.fromisoformat(end).date() if end else datetime.now().date()
+        first = last - timedelta(days=days - 1)
+
+        with self.db.read() as conn:
+            rows = conn.execute(self.SQL_DIGEST_RANGE,
+                                (first.isoformat(), last.isoformat())).fetchall()
+        by_day = {row[0]: row for row in rows}
+
+        trend = []
+        for offset in range(days):
+            day = (first + timedelta(days=offset)).isoformat()
+            row = by_day.get(day)
+            if row is None:
+                trend.append(DailyDigest(date=day, tasks_completed=0, tasks_created=0,
+                                         commits_made=0, notes_created=0, projects_worked=[],
+                                         summary="", suggestions=[]))
+                continue
+            trend.append(DailyDigest(
+                date=day,
+                tasks_completed=row[1] or 0,
+                tasks_created=row[2] or 0,
+                commits_made=row[3] or 0,
+                notes_created=row[4] or 0,
+                projects_worked=json.loads(row[5]) if row[5] else [],
+                summary=row[6] or "",
+                suggestions=json.loads(row[7]) if row[7] else []
+            ))
+        return trend
+
+    def record_commits(self, project: str, commits: List[Dict]) -> int:
+        """
+        Registra commits sincronizados do GitHub nos contadores diários
+        Commits já vistos (mesmo SHA) são ignorados. Retorna quantos eram novos.
+        """
+        rows = []
+        for commit in commits:
+            author = (commit.get("commit") or {}).get("author") or {}
+            if commit.get("sha") and author.get("date"):
+                rows.append((commit["sha"], project, author["date"][:10]))
+
+        with self.db.transaction() as conn:
+            known = {
+                row[0] for row in conn.execute(
+                    "SELECT sha FROM digest_commits WHERE sha IN (SELECT value FROM json_each(?))",
+                    (json.dumps([r[0] for r in rows]),)
+                )
+            }
+            conn.executemany(
+                "INSERT OR IGNORE INTO digest_commits (sha, project, date) VALUES (?, ?, ?)", rows
+            )
+        return len({r[0] for r in rows} - known)
+
+    # Consultas de busca por tipo: (id, projeto, título, snippet, score, data)
+    # bm25() retorna valores menores para documentos mais relevantes
+    SEARCH_QUERIES = {
+        "note": """
+            SELECT n.id, n.project, substr(n.content, 1, 80),
+                   snippet(notes_fts, 0, '[', ']', '…', 16),
+                   bm25(notes_fts), n.created_at
+            FROM notes_fts JOIN notes n ON n.rowid = notes_fts.rowid
+            WHERE notes_fts MATCH ? {project_filter}
+            ORDER BY bm25(notes_fts) LIMIT ?
+        """,
+        "task": """
+            SELECT t.id, t.project, t.title,
+                   snippet(tasks_fts, -1, '[', ']', '…', 16),
+                   bm25(tasks_fts, 2.0, 1.0), t.created_at
+            FROM tasks_fts JOIN tasks t ON t.rowid = tasks_fts.rowid
+            WHERE tasks_fts MATCH ? {project_filter}
+            ORDER BY bm25(tasks_fts, 2.0, 1.0) LIMIT ?
+        """,
+        "conversation": """
+            SELECT c.id, NULL, substr(c.user_input, 1, 80),
+                   snippet(conversations_fts, -1, '[', ']', '…', 16),
+                   bm25(conversations_fts), c.timestamp
+            FROM conversations_fts JOIN conversations c ON c.id = conversations_fts.rowid
+            WHERE conversations_fts MATCH ? {project_filter}
+            ORDER BY bm25(conversations_fts) LIMIT ?
+        """,
+    }
+    SEARCH_PROJECT_COLUMNS = {"note": "n.project", "task": "t.project", "conversation": None}
+
+    def search(self, query: str, kinds: Optional[List[str]] = None,
+               project: Optional[str] = None, limit: int = 10,
+               raw: bool = False, include_archived: bool = False) -> List[SearchResult]:
+        """
+        Busca full-text (FTS5) em notas, tarefas e conversas
+        Resultados ordenados por relevância (BM25), com trecho destacado
+
+        - query: texto livre (ou expressão FTS5 se raw=True)
+        - kinds: subconjunto de ["note", "task", "conversation"]
+        - project: filtra notas e tarefas (conversas não têm projeto
+          e são ignoradas quando um projeto é informado)
+        - include_archived: completa com conversas arquivadas (score 0.0,
+          depois dos resultados do banco)
+        """
+        match = query if raw else self._fts_query(query)
+        if not match:
+            return []
+        if "conversation" in (kinds or self.SEARCH_QUERIES):
+            self.flush()
+
+        kinds = kinds or list(self.SEARCH_QUERIES)
+        if project:
+            kinds = [k for k in kinds if self.SEARCH_PROJECT_COLUMNS[k]]
+
+        results: List[SearchResult] = []
+        with self.db.read() as conn:
+            for kind in kinds:
+                params: tuple = (match,)
+                project_filter = ""
+                if project:
+                    project_filter = f"AND {self.SEARCH_PROJECT_COLUMNS[kind]} = ?"
+                    params += (project,)
+                sql = self.SEARCH_QUERIES[kind].format(project_filter=project_filter)
+                for row in conn.execute(sql, (*params, limit)).fetchall():
+                    results.append(SearchResult(
+                        kind=kind, id=str(row[0]), project=row[1], title=row[2] or "",
+                        snippet=row[3] or "", score=row[4], created_at=row[5]
+                    ))
+
+        results.sort(key=lambda r: r.score)
+        results = results[:limit]
+
+        if include_archived and "conversation" in kinds and len(results) < limit:
+            for record in self.archive.search(query, limit=limit - len(results)):
+                results.append(SearchResult(
+                    kind="conversation", id=f"archived:{record['id']}", project=None,
+                    title=(record.get("user_input") or "")[:80],
+                    snippet=(record.get("agent_response") or "")[:200],
+                    score=0.0, created_at=record.get("timestamp")
+                ))
+
+        return results
+
+    # Texto indexado por tipo: (id, projeto, texto)
+    VECTOR_SOURCES = {
+        "note": "SELECT id, project, content || ' ' || tags FROM notes "
+                "WHERE id IN (SELECT value FROM json_each(?))",
+        "task": "SELECT id, project, title || ' ' || COALESCE(description, '') FROM tasks "
+                "WHERE id IN (SELECT value FROM json_each(?))",
+    }
+    # Linhas de resultado da busca semântica: (id, projeto, título, trecho, data)
+    VECTOR_RESULTS = {
+        "note": "SELECT id, project, substr(content, 1, 80), substr(content, 1, 200), created_at "
+                "FROM notes WHERE id IN (SELECT value FROM json_each(?))",
+        "task": "SELECT id, project, title, substr(description, 1, 200), created_at "
+                "FROM tasks WHERE id IN (SELECT value FROM json_each(?))",
+    }
+
+    def sync_vectors(self) -> int:
+        """
+        Indexa o que está na vector_queue (inserções, edições, remoções)
+        Um embedding em lote por chamada, só em memória; o índice vai para
+        o disco em lote (maybe_flush) e então a fila é limpa.
+        Retorna quantos itens foram indexados
+        """
+        with self._vector_lock:
+            with self.db.read() as conn:
+                queued = conn.execute("SELECT seq, kind, id FROM vector_queue WHERE seq > ? ORDER BY seq",
+                                      (self._vector_seq,)).fetchall()
+                if not queued:
+                    return 0
+                ids: Dict[str, List[str]] = {}
+                for _, kind, item_id in queued:
+                    ids.setdefault(kind, []).append(item_id)
+                items = [
+                    (f"{kind}:{row[0]}", row[2], row[1])
+                    for kind, kind_ids in ids.items()
+                    for row in conn.execute(self.VECTOR_SOURCES[kind],
+                                            (json.dumps(sorted(set(kind_ids))),)).fetchall()
+                ]
+
+            indexed = {key for key, _, _ in items}
+            self.vectors.upsert(items)
+            self.vectors.remove({f"{kind}:{item_id}" for _, kind, item_id in queued} - indexed)
+            self._vector_seq = queued[-1][0]
+            if self.vectors.maybe_flush():
+                self._ack_vectors()
+            return len(items)
+
+    def _ack_vectors(self):
+        """Índice gravado: sai da fila o que já foi aplicado (escritas novas têm seq maior)"""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM vector_queue WHERE seq <= ?", (self._vector_seq,))
+
+    def flush_vectors(self):
+        """Grava o índice vetorial agora e limpa a fila"""
+        with self._vector_lock:
+            self.vectors.flush()
+            self._ack_vectors()
+
+    def semantic_search(self, query: str, kinds: Optional[List[str]] = None,
+                        project: Optional[str] = None, limit: int = 5,
+                        min_similarity: float = 0.1) -> List[SearchResult]:
+        """
+        Notas/tarefas mais próximas da consulta por significado (índice vetorial)
+        score = 1 - cosseno (menor = mais relevante, como no BM25)
+        """
+        self.sync_vectors()
+        hits = [
+            (key, similarity)
+            for key, similarity in self.vectors.search(query, k=limit,
+                                                       kinds=kinds or list(self.VECTOR_SOURCES),
+                                                       project=project)
+            if similarity >= min_similarity
+        ]
+        if not hits:
+            return []
+
+        ids: Dict[str, List[str]] = {}
+        for key, _ in hits:
+            kind, item_id = key.split(":", 1)
+            ids.setdefault(kind, []).append(item_id)
+        with self.db.read() as conn:
+            rows = {
+                f"{kind}:{row[0]}": row
+                for kind, kind_ids in ids.items()
+                for row in conn.execute(self.VECTOR_RESULTS[kind], (json.dumps(kind_ids),)).fetchall()
+            }
 
         return [
-            {
-                "timestamp": row[1],
-                "user_input": row[2],
-                "agent_response": row[3],
-                "context": json.loads(row[4])
-            }
-            for row in reversed(rows)
+            SearchResult(
+                kind=key.split(":", 1)[0], id=rows[key][0], project=rows[key][1],
+                title=rows[key][2] or "", snippet=rows[key][3] or "",
+                score=round(1.0 - similarity, 4), created_at=rows[key][4]
+            )
+            for key, similarity in hits if key in rows
         ]
 
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """Converte texto livre em expressão FTS5 segura (termos com OR)"""
+        terms = [t for t in re.findall(r"\w+", text.lower()) if len(t) > 1]
+        return " OR ".join(
+            f'"{t}"*' if len(t) > 2 else f'"{t}"'
+            for t in dict.fromkeys(terms)
+        )
+
+    def close(self):
+        """Grava o que estiver pendente e fecha as conexões com o banco"""
+        if self.conversation_buffer is not None:
+            self.conversation_buffer.close()
+        self.flush_vectors()
+        self.vectors.close()
+        self.db.close()
+
 
 # ============================================================================
 # CLICKUP INTEGRATION
@@ -290,21 +815,61 @@ class MemorySystem:
 class ClickUpIntegration:
     """Integração com ClickUp"""
 
-    def __init__(self, api_token: str):
+    PAGE_SIZE = 100  # Tarefas por página na API v2
+
+    def __init__(self, api_token: str, session: Optional[PooledSession] = None,
+                 http_config: Optional[HTTPConfig] = None):
         self.api_token = api_token
         self.base_url = "https://api.clickup.com/api/v2"
         self.headers = {
             "Authorization": api_token,
             "Content-Type": "application/json"
         }
-
-    def get_tasks(self, list_id: str) -> List[Dict]:
-        """Busca tarefas de uma lista"""
+        # Sessão com keep-alive, timeout e retry (compartilhável)
+        self.session = session or PooledSession(http_config)
+
+    def get_tasks(self, list_id: str, date_updated_gt: Optional[int] = None,
+                  include_closed: bool = True) -> List[Dict]:
+        """Busca tarefas de uma lista (todas as páginas)"""
+        tasks = []
+        page = 0
+        while True:
+            try:
+                batch, last_page = self.get_tasks_page(list_id, page, date_updated_gt, include_closed)
+            except requests.RequestException:
+                return tasks
+            tasks.extend(batch)
+            if last_page:
+                return tasks
+            page += 1
+
+    def get_tasks_page(self, list_id: str, page: int = 0, date_updated_gt: Optional[int] = None,
+                       include_closed: bool = True) -> Tuple[List[Dict], bool]:
+        """
+        Uma página (até 100 tarefas) de uma lista, ordenada por atualização
+        Retorna (tarefas, é_a_última_página). Erros HTTP levantam exceção.
+        """
         url = f"{self.base_url}/list/{list_id}/task"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
-            return response.json().get("tasks", [])
-        return []
+        params: Dict[str, Any] = {
+            "page": page,
+            "order_by": "updated",
+            "include_closed": str(include_closed).lower(),
+            "subtasks": "true",
+        }
+        if date_updated_gt is not None:
+            params["date_updated_gt"] = date_updated_gt
+
+        response = self.session.get(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        data = response.json()
+        tasks = data.get("tasks", [])
+        return tasks, data.get("last_page", len(tasks) < self.PAGE_SIZE)
+
+    def get_task(self, task_id: str) -> Dict:
+        """Uma tarefa pelo id do ClickUp (erros HTTP levantam exceção)"""
+        response = self.session.get(f"{self.base_url}/task/{task_id}", headers=self.headers)
+        response.raise_for_status()
+        return response.json()
 
     def create_task(self, list_id: str, name: str, description: str = "",
                    priority: int = 3) -> Optional[Dict]:
@@ -315,7 +880,7 @@ class ClickUpIntegration:
             "description": description,
             "priority": priority
         }
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self.session.post(url, headers=self.headers, json=data)
         if response.status_code == 200:
             return response.json()
         return None
@@ -324,9 +889,13 @@ class ClickUpIntegration:
         """Atualiza status de uma tarefa"""
         url = f"{self.base_url}/task/{task_id}"
         data = {"status": status}
-        response = requests.put(url, headers=self.headers, json=data)
+        response = self.session.put(url, headers=self.headers, json=data)
         return response.status_code == 200
 
+    def close(self):
+        """Fecha as conexões do pool"""
+        self.session.close()
+
 
 # ============================================================================
 # GITHUB INTEGRATION
@@ -335,14 +904,17 @@ class ClickUpIntegration:
 class GitHubIntegration:
     """Integração com GitHub"""
 
-    def __init__(self, username: str):
+    def __init__(self, username: str, session: Optional[PooledSession] = None,
+                 http_config: Optional[HTTPConfig] = None):
         self.username = username
         self.base_url = "https://api.github.com"
+        # Sessão com keep-alive, timeout e retry (compartilhável)
+        self.session = session or PooledSession(http_config)
 
     def get_recent_activity(self, days: int = 7) -> List[Dict]:
         """Busca atividade recente do usuário"""
         url = f"{self.base_url}/users/{self.username}/events"
-        response = requests.get(url)
+        response = self.session.get(url)
         if response.status_code == 200:
             events = response.json()
             cutoff = datetime.now() - timedelta(days=days)
@@ -354,10 +926,12 @@ class GitHubIntegration:
 
     def get_repo_commits(self, repo: str, days: int = 7) -> List[Dict]:
         """Busca commits recentes de um repositório"""
-        since = (datetime.now() - timedelta(days=days)).isoformat()
+        # Meia-noite: URL estável ao longo do dia, o que permite o cache condicional
+        since = (datetime.now() - timedelta(days=days)).replace(
+            hour=0, minute=0, second=0, microsecond=0).isoformat()
         url = f"{self.base_url}/repos/{self.username}/{repo}/commits"
         params = {"since": since}
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         if response.status_code == 200:
             return response.json()
         return []
@@ -366,7 +940,7 @@ class GitHubIntegration:
         """Busca issues de um repositório"""
         url = f"{self.base_url}/repos/{self.username}/{repo}/issues"
         params = {"state": state}
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         if response.status_code == 200:
             return response.json()
         return []
@@ -379,11 +953,33 @@ class GitHubIntegration:
 class SecretaryAgent:
     """Agente Secretária - Assistente Pessoal AI"""
 
-    def __init__(self, api_key: str, clickup_token: str, github_username: str):
-        self.claude = Anthropic(api_key=api_key)
-        self.memory = MemorySystem()
-        self.clickup = ClickUpIntegration(clickup_token)
-        self.github = GitHubIntegration(github_username)
+    def __init__(self, api_key: str, clickup_token: str, github_username: str,
+                 db_path: str = "secretary_memory.db",
+                 http_config: Optional[HTTPConfig] = None,
+                 retention_policies: Optional[List[RetentionPolicy]] = None):
+        self.memory = MemorySystem(db_path)
+
+        # Retenção da memória (aplicada periodicamente pelo SyncDaemon);
+        # idade máxima das conversas configurável por SAGE_RETENTION_DAYS
+        self.retention = RetentionEngine(self.memory, retention_policies or [
+            RetentionPolicy("conversations", int(os.getenv("SAGE_RETENTION_DAYS", "90")))
+        ])
+
+        # Claude com cache de respostas no banco da memória (sites opt-in)
+        self.response_cache = ResponseCache(self.memory.db)
+        self.llm = StreamingClaude(api_key, cache=self.response_cache)
+        self.packer = ContextPacker()
+
+        # Um pool HTTP compartilhado pelas integrações (um pool por host),
+        # com cache condicional (ETag/Last-Modified) no banco da memória
+        # e um agendador de rate limit por host (também usado pelo MABA/Core)
+        self.http_cache = HTTPCache(self.memory.db)
+        self.rate_limiter = RateLimitScheduler()
+        self.http = PooledSession(http_config, cache=self.http_cache, scheduler=self.rate_limiter)
+        self.clickup = ClickUpIntegration(clickup_token, session=self.http)
+        self.github = GitHubIntegration(github_username, session=self.http)
+        self.github_token = os.getenv("GITHUB_TOKEN")
+        self.clickup_sync = ClickUpSyncEngine(self.clickup, self.memory)
 
         # Configuração de projetos
         self.projects = {
@@ -404,16 +1000,11 @@ class SecretaryAgent:
             }
         }
 
-    def think(self, user_input: str, context: Optional[Dict] = None) -> str:
-        """Processa input do usuário e gera resposta inteligente"""
-
-        # Busca contexto recente
-        recent_conversations = self.memory.get_recent_conversations(5)
-        recent_tasks = self.memory.get_all_tasks()
-        recent_notes = self.memory.get_all_notes()
+        # Resumos das conversas antigas (por projeto e dia), em background
+        self.summarizer = ConversationSummarizer(self.memory, self.projects, llm=self.llm)
 
-        # Monta contexto para Claude
-        system_prompt = f"""Você é a Secretária AI do Juan Carlos, um assistente pessoal altamente competente.
+    # Persona e ferramentas: texto fixo, vai no prefixo cacheado
+    PERSONA = """Você é a Secretária AI do Juan Carlos, um assistente pessoal altamente competente.
 
 SEUS OBJETIVOS:
 1. Organizar e acompanhar todas as tarefas do Juan
@@ -423,37 +1014,103 @@ SEUS OBJETIVOS:
 5. Lembrar de deadlines e prioridades
 6. Conhecer os projetos melhor que o próprio Juan
 
-PROJETOS DO JUAN:
-{json.dumps(self.projects, indent=2)}
-
-CONTEXTO ATUAL:
-- Tarefas ativas: {len([t for t in recent_tasks if t.status != 'done'])}
-- Notas salvas: {len(recent_notes)}
-- Conversas recentes: {len(recent_conversations)}
-
-CONVERSAS RECENTES:
-{json.dumps(recent_conversations[-3:], indent=2)}
-
 INSTRUÇÕES:
 - Seja proativo e antecipe necessidades
 - Sugira ações concretas
 - Mantenha um tom profissional mas amigável
 - Use emojis quando apropriado
 - Pergunte quando precisar de mais informações
-- SEMPRE salve informações importantes (você tem acesso às funções de save_note e create_task)
+- SEMPRE salve informações importantes (você tem acesso às funções de save_note e create_task)"""
+
+    def pack_context(self, relevant_memories: List[SearchResult], active_tasks: int,
+                     notes_count: int, recent_turns: Optional[List[Dict]] = None,
+                     summaries: Optional[List[ConversationSummary]] = None) -> PackedContext:
+        """
+        Seções do prompt do think() dentro dos orçamentos de tokens
+        Memórias vêm da busca (mais relevantes primeiro); conversas entram
+        como os últimos turnos crus (mais novo primeiro) + resumos por
+        projeto/dia das anteriores
+        """
+        facts = [{k: v for k, v in asdict(m).items() if k != "score"} for m in relevant_memories]
+        return self.packer.pack("think", [
+            Section("persona", self.PERSONA, "text"),
+            Section("projects", self.projects),
+            Section("task_state", {"active_tasks": active_tasks, "notes": notes_count}),
+            Section("memory", facts, "items"),
+            Section("recent_turns", recent_turns or [], "items"),
+            Section("summaries", [asdict(s) for s in summaries or []], "items"),
+        ])
+
+    def stable_prompt(self, packed: PackedContext) -> str:
+        """
+        Parte fixa do system prompt (persona, projetos, ferramentas)
+        Vai antes do breakpoint de cache: precisa sair idêntica entre chamadas
+        """
+        return f"""{packed["persona"]}
+
+PROJETOS DO JUAN:
+{packed["projects"]}
 """
 
-        # Chama Claude
-        response = self.claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            system=system_prompt,
+    def _think_cache_scope(self, packed: PackedContext) -> str:
+        """
+        O que decide a resposta do think() para o cache de respostas:
+        prompt fixo, contadores, notas/tarefas relevantes e o histórico
+        (turnos e resumos). Sem o histórico, um "sim" ou "e o próximo?"
+        em conversas diferentes receberia a mesma resposta. Só usado com o
+        site "think" ativado (CONVERSATION_SITES, fora do padrão)
+        """
+        return "\n".join([self.stable_prompt(packed), packed["task_state"], packed["memory"],
+                          packed["recent_turns"], packed["summaries"]])
+
+    def think(self, user_input: str, context: Optional[Dict] = None,
+              on_token: Optional[TokenCallback] = None) -> str:
+        """
+        Processa input do usuário e gera resposta inteligente
+        Com on_token, a resposta chega em trechos enquanto é gerada
+        """
+
+        # Busca contexto: as notas/tarefas mais próximas da entrada (top-k
+        # no índice vetorial), os últimos turnos crus e os resumos
+        relevant_memories = self.memory.semantic_search(user_input, limit=5)
+        active_tasks = self.memory.count_tasks(exclude_status="done")
+        notes_count = self.memory.count_notes()
+        recent_turns = [
+            {k: c[k] for k in ("timestamp", "user_input", "agent_response")}
+            for c in reversed(self.memory.get_recent_conversations(self.summarizer.keep_recent))
+        ]
+        summaries = self.memory.get_conversation_summaries(limit=10)
+
+        # Monta contexto para Claude: prefixo estável (cacheado) + contexto
+        # da chamada, cada seção dentro do seu orçamento de tokens
+        packed = self.pack_context(relevant_memories, active_tasks, notes_count,
+                                   recent_turns, summaries)
+        volatile_prompt = f"""CONTEXTO ATUAL:
+{packed["task_state"]}
+
+MEMÓRIAS RELEVANTES:
+{packed["memory"]}
+
+ÚLTIMAS CONVERSAS (mais recente primeiro):
+{packed["recent_turns"]}
+
+RESUMOS DE CONVERSAS ANTERIORES:
+{packed["summaries"]}
+"""
+
+        # Chama Claude (streaming)
+        response = self.llm.stream_sync(
             messages=[
                 {"role": "user", "content": user_input}
-            ]
+            ],
+            system=cached_system(self.stable_prompt(packed), volatile_prompt),
+            max_tokens=2000,
+            on_token=on_token,
+            cache_site="think",
+            cache_scope=self._think_cache_scope(packed)
         )
 
-        agent_response = response.content[0].text
+        agent_response = response.text
 
         # Salva a conversa
         self.memory.save_conversation(
@@ -461,13 +1118,22 @@ INSTRUÇÕES:
             agent_response,
             context or {}
         )
+        # Turnos que saíram da janela crua viram resumo (em background)
+        self.summarizer.schedule()
 
         return agent_response
 
     def create_note(self, content: str, project: str, tags: List[str],
                    priority: str = "medium") -> Note:
         """Cria uma nota"""
-        note = Note(
+        note = self._new_note(content, project, tags, priority)
+        self.memory.save_note(note)
+        return note
+
+    def _new_note(self, content: str, project: str, tags: List[str],
+                  priority: str = "medium") -> Note:
+        """Monta uma nota nova (sem salvar)"""
+        return Note(
             id=f"note_{datetime.now().timestamp()}",
             content=content,
             tags=tags,
@@ -476,70 +1142,242 @@ INSTRUÇÕES:
             updated_at=datetime.now().isoformat(),
             priority=priority
         )
-        self.memory.save_note(note)
-        return note
 
     def create_task(self, title: str, description: str, project: str,
                    priority: str = "medium", sync_clickup: bool = True) -> Task:
-        """Cria uma tarefa"""
-        task = Task(
-            id=f"task_{datetime.now().timestamp()}",
-            title=title,
-            description=description,
-            project=project,
-            status="todo",
-            priority=priority,
-            due_date=None,
-            created_at=datetime.now().isoformat()
-        )
+        """Cria uma tarefa (e a envia ao ClickUp, se o projeto tiver lista)"""
+        spec = {"title": title, "description": description, "project": project, "priority": priority}
+        return self.create_tasks([spec], sync_clickup=sync_clickup)[0].task
+
+    def create_tasks(self, specs: List[Dict[str, Any]], sync_clickup: bool = True,
+                     max_workers: int = 8) -> List[BulkItemResult]:
+        """
+        Cria várias tarefas de uma vez (ex.: importação de roadmap)
+        - Linhas locais gravadas em uma única transação
+        - Envio ao ClickUp em paralelo (até max_workers requisições)
+        - IDs remotos gravados de volta em um único UPDATE em lote
+        specs: [{"title", "description", "project", "priority"}]
+        Retorna um BulkItemResult por item, na ordem de specs
+        (a tarefa local existe mesmo quando o envio falha)
+        """
+        now = datetime.now()
+        tasks = [
+            Task(
+                id=f"task_{now.timestamp()}_{i}",
+                title=spec["title"],
+                description=spec.get("description", ""),
+                project=spec["project"],
+                status="todo",
+                priority=spec.get("priority", "medium"),
+                due_date=spec.get("due_date"),
+                created_at=now.isoformat()
+            )
+            for i, spec in enumerate(specs)
+        ]
+        self.memory.save_tasks(tasks)
+        results = [BulkItemResult(task_id=task.id, ok=True, task=task) for task in tasks]
+
+        calls = {}
+        for i, task in enumerate(tasks):
+            clickup_list = self.clickup_list_for(task.project) if sync_clickup else None
+            if clickup_list:
+                calls[i] = functools.partial(self.clickup.create_task, clickup_list, task.title,
+                                             task.description, to_clickup_priority(task.priority))
+
+        links = []
+        for i, (remote, error) in self._run_bulk(calls, max_workers).items():
+            task = tasks[i]
+            if remote:
+                task.clickup_id = results[i].clickup_id = remote["id"]
+                links.append((task.id, remote["id"], self.clickup_list_for(task.project)))
+            else:
+                results[i].ok = False
+                results[i].error = error or "ClickUp recusou a criação da tarefa"
+        self.memory.set_clickup_ids(links)
+        return results
+
+    def update_task_statuses(self, updates: Dict[str, str], sync_clickup: bool = True,
+                             max_workers: int = 8) -> List[BulkItemResult]:
+        """
+        Atualiza o status de várias tarefas (id local → status)
+        Grava tudo em uma transação e envia ao ClickUp, em paralelo,
+        as que já existem lá
+        """
+        clickup_ids = self.memory.update_task_statuses(updates)
+        results = {
+            task_id: BulkItemResult(
+                task_id=task_id, ok=task_id in clickup_ids, clickup_id=clickup_ids.get(task_id),
+                error=None if task_id in clickup_ids else "tarefa não encontrada"
+            )
+            for task_id in updates
+        }
 
-        # Salva localmente
-        self.memory.save_task(task)
+        calls = {
+            task_id: functools.partial(self.clickup.update_task_status, clickup_id,
+                                       to_clickup_status(updates[task_id]))
+            for task_id, clickup_id in clickup_ids.items()
+            if clickup_id and sync_clickup
+        }
+        for task_id, (updated, error) in self._run_bulk(calls, max_workers).items():
+            if not updated:
+                results[task_id].ok = False
+                results[task_id].error = error or "ClickUp recusou a atualização"
+        return list(results.values())
+
+    def clickup_list_for(self, project: str) -> Optional[str]:
+        """Lista do ClickUp configurada para o projeto (None se não houver)"""
+        clickup_list = self.projects.get(project, {}).get("clickup_list")
+        return clickup_list if clickup_list and clickup_list != "TBD" else None
+
+    def _run_bulk(self, calls: Dict[Any, Callable[[], Any]],
+                  max_workers: int) -> Dict[Any, Tuple[Any, Optional[str]]]:
+        """
+        Executa as chamadas ao ClickUp em paralelo (pool de threads,
+        mesma sessão HTTP e mesmo agendador de rate limit)
+        Retorna chave → (resultado, erro)
+        """
+        if not calls:
+            return {}
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls)),
+                                thread_name_prefix="sage-clickup-bulk") as pool:
+            # copy_context: mantém a prioridade (request_priority) de quem chamou
+            futures = {
+                pool.submit(contextvars.copy_context().run, call): key
+                for key, call in calls.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    outcomes[futures[future]] = (future.result(), None)
+                except requests.RequestException as e:
+                    outcomes[futures[future]] = (None, str(e))
+        return outcomes
+
+    def get_daily_digest(self, day: Optional[str] = None) -> DailyDigest:
+        """Gera resumo diário a partir dos contadores incrementais"""
+        digest = self.memory.get_daily_digest(day)
+
+        if not digest.summary:
+            projects = ", ".join(digest.projects_worked) or "nenhum projeto"
+            digest.summary = (
+                f"{digest.tasks_created} tarefas criadas, {digest.tasks_completed} concluídas, "
+                f"{digest.notes_created} notas e {digest.commits_made} commits em {projects}."
+            )
 
-        # Sincroniza com ClickUp se solicitado
-        if sync_clickup and project in self.projects:
-            clickup_list = self.projects[project].get("clickup_list")
-            if clickup_list and clickup_list != "TBD":
-                clickup_task = self.clickup.create_task(
-                    clickup_list, title, description
-                )
-                if clickup_task:
-                    task.clickup_id = clickup_task["id"]
-                    self.memory.save_task(task)
-
-        return task
-
-    def get_daily_digest(self) -> DailyDigest:
-        """Gera resumo diário"""
-        today = datetime.now().date().isoformat()
-
-        # TODO: Implementar lógica de resumo
-        # Por enquanto, retorna estrutura básica
-
-        return DailyDigest(
-            date=today,
-            tasks_completed=0,
-            tasks_created=0,
-            commits_made=0,
-            notes_created=0,
-            projects_worked=[],
-            summary="Resumo do dia será gerado aqui",
-            suggestions=[]
-        )
+        if not digest.suggestions:
+            if digest.tasks_created > digest.tasks_completed:
+                digest.suggestions.append("Mais tarefas criadas do que concluídas: revise as prioridades")
+            if digest.commits_made and not digest.notes_created:
+                digest.suggestions.append("Registre notas sobre o que foi implementado hoje")
+
+        return digest
 
-    def sync_with_github(self):
-        """Sincroniza com GitHub"""
+    def get_digest_trend(self, days: int = 30) -> List[DailyDigest]:
+        """Contadores diários dos últimos N dias"""
+        return self.memory.get_digest_trend(days)
+
+    def sync_with_github(self) -> Dict[str, Dict]:
+        """Sincroniza com GitHub (todos os projetos em paralelo)"""
         print("🔄 Sincronizando com GitHub...")
-        for project_name, project_info in self.projects.items():
-            repo = project_info["github"]
-            commits = self.github.get_repo_commits(repo, days=7)
-            issues = self.github.get_repo_issues(repo)
-            print(f"  {project_name}: {len(commits)} commits, {len(issues)} issues")
-
-    def sync_with_clickup(self):
-        """Sincroniza com ClickUp"""
+        results = asyncio.run(self.sync_with_github_async())
+        for project_name, result in results.items():
+            if "error" in result:
+                print(f"  ⚠️  {project_name}: {result['error']}")
+            else:
+                print(f"  {project_name}: {result['commits']} commits ({result['new_commits']} novos), "
+                      f"{result['open_issues']} issues")
+        return results
+
+    async def sync_with_github_async(self, days: int = 7, max_concurrency: int = 8,
+                                     projects: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Busca commits, issues e eventos de todos os projetos (ou só de
+        `projects`) de uma vez e grava o resultado em project_context
+        (e nos contadores diários)
+        """
+        names = projects if projects is not None else list(self.projects)
+        repos = [self.projects[name]["github"] for name in names]
+        with request_priority(Priority.BACKGROUND):
+            async with AsyncGitHubClient(self.github.username, token=self.github_token,
+                                         max_concurrency=max_concurrency,
+                                         cache=self.http_cache,
+                                         scheduler=self.rate_limiter) as client:
+                snapshots = await client.sync_repos(repos, days)
+
+        return await asyncio.to_thread(self._store_github_snapshots, snapshots, names)
+
+    def _store_github_snapshots(self, snapshots: Dict[str, Any],
+                                projects: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Converte os snapshots em ProjectContext e grava tudo"""
+        results: Dict[str, Dict] = {}
+        contexts = []
+        for project_name in (projects if projects is not None else self.projects):
+            info = self.projects[project_name]
+            snapshot = snapshots[info["github"]]
+            if isinstance(snapshot, Exception):
+                results[project_name] = {"error": str(snapshot)}
+                continue
+
+            contexts.append(ProjectContext(
+                name=project_name,
+                description=info["description"],
+                github_repo=info["github"],
+                clickup_list=info["clickup_list"],
+                last_activity=snapshot.last_activity,
+                technologies=[],
+                current_focus="",
+                recent_commits=[
+                    {
+                        "sha": c.get("sha"),
+                        "message": ((c.get("commit") or {}).get("message") or "").split("\n")[0],
+                        "author": ((c.get("commit") or {}).get("author") or {}).get("name"),
+                        "date": ((c.get("commit") or {}).get("author") or {}).get("date"),
+                    }
+                    for c in snapshot.commits[:10]
+                ],
+                open_tasks=0,
+                notes_count=0,
+                open_issues=len(snapshot.open_issues),
+                github_synced_at=snapshot.synced_at
+            ))
+            results[project_name] = {
+                "commits": len(snapshot.commits),
+                "new_commits": self.memory.record_commits(project_name, snapshot.commits),
+                "open_issues": len(snapshot.open_issues),
+                "events": len(snapshot.events),
+            }
+
+        self.memory.save_project_github(contexts)
+        return results
+
+    def sync_with_clickup(self, force_full: bool = False) -> Dict[str, SyncResult]:
+        """Sincroniza com ClickUp (incremental por lista)"""
         print("🔄 Sincronizando com ClickUp...")
-        # TODO: Implementar sincronização completa
+        lists = {
+            name: info["clickup_list"] for name, info in self.projects.items()
+            if info.get("clickup_list") and info["clickup_list"] != "TBD"
+        }
+
+        results = {}
+        for project_name, list_id in lists.items():
+            try:
+                with request_priority(Priority.BACKGROUND):
+                    result = self.clickup_sync.sync_list(list_id, project_name, force_full=force_full)
+            except requests.RequestException as e:
+                print(f"  ⚠️  {project_name}: {e}")
+                continue
+            results[project_name] = result
+            kind = "completa" if result.full else "incremental"
+            print(f"  {project_name}: {result.fetched} tarefas ({kind}, {result.requests} requisições), "
+                  f"{result.deleted} removidas")
+        return results
+
+    def close(self):
+        """Fecha conexões"""
+        self.summarizer.close()
+        self.memory.close()
+        self.http.close()
+        self.llm.close()
 
 
 # ============================================================================
@@ -563,6 +1401,7 @@ def main():
 
     # Inicializa agente
     agent = SecretaryAgent(api_key, clickup_token, github_username)
+    agent.memory.conversation_buffer.install_signal_handlers()
 
     print("✅ Agente inicializado!")
     print("\nComandos disponíveis:")
@@ -597,9 +1436,9 @@ def main():
                 print()
 
             elif user_input.lower() == 'notes':
-                notes = agent.memory.get_all_notes()
-                print(f"\n📝 Notas ({len(notes)}):")
-                for note in notes[:10]:
+                notes = agent.memory.get_notes(limit=10)
+                print(f"\n📝 Notas ({agent.memory.count_notes()}):")
+                for note in notes:
                     print(f"  {note.content[:60]}... ({note.project})")
                 print()
 
@@ -607,12 +1446,15 @@ def main():
                 digest = agent.get_daily_digest()
                 print(f"\n📊 Resumo do dia {digest.date}:")
                 print(digest.summary)
+                for suggestion in digest.suggestions:
+                    print(f"  💡 {suggestion}")
                 print()
 
             else:
                 # Conversa normal
-                response = agent.think(user_input)
-                print(f"\n🤖 Secretária: {response}\n")
+                print("\n🤖 Secretária: ", end="", flush=True)
+                agent.think(user_input, on_token=lambda t: print(t, end="", flush=True))
+                print("\n")
 
         except KeyboardInterrupt:
             print("\n\n👋 Até logo!\n")
@@ -620,6 +1462,8 @@ def main():
         except Exception as e:
             print(f"\n❌ Erro: {e}\n")
 
+    agent.close()
+
 
 if __name__ == "__main__":
     main()
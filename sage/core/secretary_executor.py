@@ -27,10 +27,12 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from anthropic import Anthropic
 
 # Import do agente base
 from .secretary_agent import SecretaryAgent, Task, Note
+from .async_memory import AsyncMemorySystem
+from .llm import StreamingClaude, cached_system
+from ..integrations.rate_limit import RateLimitScheduler
 
 
 # ============================================================================
@@ -72,14 +74,18 @@ class MABAIntegration:
     Permite ao agente navegar na web e executar ações
     """
 
-    def __init__(self, maba_url: str = "http://localhost:8152"):
+    def __init__(self, maba_url: str = "http://localhost:8152",
+                 scheduler: Optional[RateLimitScheduler] = None):
         self.maba_url = maba_url
+        self.scheduler = scheduler
         self.session = None
 
     async def init_session(self):
-        """Inicializa sessão async"""
+        """Inicializa sessão async (passando pelo agendador de rate limit)"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                trace_configs=[self.scheduler.trace_config()] if self.scheduler else None
+            )
 
     async def close_session(self):
         """Fecha sessão"""
@@ -151,8 +157,8 @@ class RoadmapReader:
     Identifica tarefas que podem ser automatizadas
     """
 
-    def __init__(self, claude_api_key: str):
-        self.claude = Anthropic(api_key=claude_api_key)
+    def __init__(self, llm: StreamingClaude):
+        self.llm = llm
 
     def read_roadmap_file(self, file_path: str) -> str:
         """Lê o arquivo de roadmap"""
@@ -189,20 +195,20 @@ Retorne um JSON array com cada etapa no formato:
 }
 """
 
-        response = self.claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            system=system_prompt,
+        response = await self.llm.stream(
             messages=[
                 {
                     "role": "user",
                     "content": f"Analise este roadmap:\n\n{roadmap_content}"
                 }
-            ]
+            ],
+            system=cached_system(system_prompt),
+            max_tokens=4000,
+            cache_site="roadmap"
         )
 
         # Parse resposta
-        response_text = response.content[0].text
+        response_text = response.text
 
         # Extrai JSON (pode vir com markdown)
         if "```json" in response_text:
@@ -241,9 +247,9 @@ class TaskExecutor:
     Usa MABA, APIs e outras ferramentas para executar tarefas
     """
 
-    def __init__(self, maba: MABAIntegration, claude: Anthropic):
+    def __init__(self, maba: MABAIntegration, llm: StreamingClaude):
         self.maba = maba
-        self.claude = claude
+        self.llm = llm
 
     async def execute_task(self, task: ExecutableTask) -> Dict:
         """
@@ -347,12 +353,16 @@ class SecretaryExecutor(SecretaryAgent):
     """
 
     def __init__(self, api_key: str, clickup_token: str, github_username: str,
-                 maba_url: str = "http://localhost:8152"):
-        super().__init__(api_key, clickup_token, github_username)
+                 maba_url: str = "http://localhost:8152",
+                 db_path: str = "secretary_memory.db"):
+        super().__init__(api_key, clickup_token, github_username, db_path)
 
-        self.maba = MABAIntegration(maba_url)
-        self.roadmap_reader = RoadmapReader(api_key)
-        self.executor = TaskExecutor(self.maba, self.claude)
+        # Acesso à memória sem bloquear o event loop
+        self.async_memory = AsyncMemorySystem(self.memory)
+
+        self.maba = MABAIntegration(maba_url, scheduler=self.rate_limiter)
+        self.roadmap_reader = RoadmapReader(self.llm)
+        self.executor = TaskExecutor(self.maba, self.llm)
 
     async def load_and_execute_roadmap(self, roadmap_path: str,
                                       auto_execute: bool = False) -> Dict:
@@ -431,14 +441,14 @@ Retorne um JSON com o formato:
 }}
 """
 
-        response = self.claude.messages.create(
-            model="claude-sonnet-4-20250514",
+        response = await self.llm.stream(
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
+            cache_site="step_plan"
         )
 
         # Parse resposta e cria ExecutableTask
-        response_text = response.content[0].text
+        response_text = response.text
 
         if "```json" in response_text:
             json_text = response_text.split("```json")[1].split("```")[0]
@@ -469,16 +479,21 @@ Retorne um JSON com o formato:
             print(f"   ❌ Falhou: {result.get('error', 'Unknown error')}")
 
         # Salva resultado
-        self.create_note(
+        await self.async_memory.save_note(self._new_note(
             content=f"Executado: {step.title}\n\nResultado: {json.dumps(result, indent=2)}",
             project="Roadmap Execution",
             tags=["automation", "execution"],
             priority="medium"
-        )
+        ))
 
     async def close(self):
         """Fecha conexões"""
         await self.maba.close_session()
+        await asyncio.to_thread(self.summarizer.close)
+        await self.async_memory.close()
+        self.memory.close()
+        self.http.close()
+        await self.llm.aclose()
 
 
 # ============================================================================
@@ -504,6 +519,7 @@ async def main():
 
     # Inicializa agente
     agent = SecretaryExecutor(api_key, clickup_token, github_username, maba_url)
+    agent.memory.conversation_buffer.install_signal_handlers()
 
     print("✅ Secretary Executor inicializado!")
     print("\nComandos disponíveis:")
@@ -540,8 +556,12 @@ async def main():
 
             else:
                 # Conversação normal
-                response = agent.think(user_input)
-                print(f"\n🤖 Secretária: {response}\n")
+                print("\n🤖 Secretária: ", end="", flush=True)
+                await asyncio.to_thread(
+                    agent.think, user_input,
+                    on_token=lambda t: print(t, end="", flush=True)
+                )
+                print("\n")
 
     finally:
         await agent.close()
@@ -0,0 +1,263 @@
+"""
+🗜️ SUMMARIES - Camada de resumos de conversas
+==============================================
+
+Memória hierárquica para o prompt não crescer com a sessão:
+- Os turnos mais recentes (keep_recent) vão crus para o prompt
+- Os anteriores viram resumos por projeto e por dia
+  (tabela conversation_summaries); um turno conta para cada projeto
+  que menciona, ou para "geral"
+- Incremental: uma marca d'água (sync_state) guarda o último turno
+  resumido; só os grupos com turnos novos são refeitos, a partir do
+  resumo anterior + turnos novos
+- Em lotes: cada refresh resume no máximo batch_size turnos e avança a
+  marca d'água; um histórico grande (primeira execução num banco
+  antigo) é absorvido aos poucos, um lote por schedule()
+- Em background: schedule() enfileira um refresh num worker próprio
+  (vários pedidos seguidos viram um só); nunca bloqueia o think()
+- Resumo pelo Claude quando há cliente, senão extrativo (primeira
+  frase de cada lado); os dois com tamanho limitado
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import json
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .context_packer import truncate_tokens
+
+if TYPE_CHECKING:
+    from .llm import StreamingClaude
+    from .secretary_agent import MemorySystem
+
+
+GENERAL_PROJECT = "geral"
+WATERMARK_SOURCE = "conversation_summaries"
+WATERMARK_SCOPE = "conversations"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+SUMMARY_SYSTEM = """Você resume conversas entre o Juan e a Secretária AI dele.
+Atualize o resumo anterior com as novas interações. Mantenha decisões,
+pedidos, prazos, pendências e fatos sobre os projetos; descarte saudações
+e repetições. Responda só com o resumo, em até {words} palavras."""
+
+
+@dataclass
+class ConversationSummary:
+    """Resumo das conversas de um projeto em um dia"""
+    project: str
+    day: str
+    summary: str
+    turns: int
+    first_at: Optional[str] = None
+    last_at: Optional[str] = None
+
+
+Turn = Tuple[int, str, str, str]   # (id, timestamp, user_input, agent_response)
+
+
+def first_sentence(text: str, max_tokens: int) -> str:
+    """Primeira frase do texto, limitada em tokens"""
+    text = " ".join((text or "").split())
+    return truncate_tokens(_SENTENCE_END.split(text, 1)[0], max_tokens)
+
+
+class ConversationSummarizer:
+    """
+    Resume em background as conversas antigas, por projeto e dia
+
+    Uso:
+        summarizer = ConversationSummarizer(memory, projects, llm)
+        memory.save_conversation(...)
+        summarizer.schedule()                  # não bloqueia
+        memory.get_conversation_summaries(7)   # para o prompt
+    """
+
+    def __init__(self, memory: "MemorySystem", projects: Dict[str, Dict],
+                 llm: Optional["StreamingClaude"] = None, keep_recent: int = 6,
+                 max_lines: int = 12, max_summary_words: int = 150,
+                 batch_size: int = 200):
+        self.memory = memory
+        self.projects = projects
+        self.llm = llm
+        self.keep_recent = keep_recent
+        self.batch_size = batch_size
+        self.max_lines = max_lines
+        self.max_summary_words = max_summary_words
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sage-summaries")
+        self._lock = threading.Lock()
+        self._pending: Optional[Future] = None
+
+        # Estatísticas
+        self.runs = 0
+        self.summarized_turns = 0
+        self.llm_failures = 0
+
+    # ------------------------------------------------------------------
+    # Agrupamento
+    # ------------------------------------------------------------------
+
+    def projects_of(self, user_input: str, agent_response: str) -> List[str]:
+        """Projetos mencionados no turno (nome ou repositório); senão 'geral'"""
+        text = f"{user_input}\n{agent_response}".casefold()
+        found = [
+            name for name, info in self.projects.items()
+            if name.casefold() in text or (info.get("github") or name).casefold() in text
+        ]
+        return found or [GENERAL_PROJECT]
+
+    def _watermark(self, conn) -> int:
+        row = conn.execute(
+            "SELECT cursor FROM sync_state WHERE source = ? AND scope = ?",
+            (WATERMARK_SOURCE, WATERMARK_SCOPE)
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def pending_turns(self, limit: Optional[int] = None) -> List[Turn]:
+        """Turnos ainda não resumidos, fora dos keep_recent mais novos (os limit mais antigos)"""
+        self.memory.flush()
+        with self.memory.db.read() as conn:
+            watermark = self._watermark(conn)
+            return conn.execute("""
+                SELECT id, timestamp, user_input, agent_response FROM conversations
+                WHERE id > ? AND id <= (SELECT COALESCE(MAX(id), 0) FROM conversations) - ?
+                ORDER BY id LIMIT ?
+            """, (watermark, self.keep_recent, limit if limit is not None else -1)).fetchall()
+
+    # ------------------------------------------------------------------
+    # Resumo
+    # ------------------------------------------------------------------
+
+    def summarize(self, previous: str, turns: List[Turn]) -> str:
+        """Resumo anterior + turnos novos → novo resumo (tamanho limitado)"""
+        if self.llm is not None:
+            try:
+                return self._summarize_llm(previous, turns)
+            except Exception as e:
+                self.llm_failures += 1
+                print(f"⚠️  Resumo pelo Claude falhou, usando extrativo: {e}")
+        return self._summarize_extractive(previous, turns)
+
+    def _summarize_extractive(self, previous: str, turns: List[Turn]) -> str:
+        lines = previous.splitlines() if previous else []
+        for _, timestamp, user_input, agent_response in turns:
+            lines.append(f"[{timestamp[11:16]}] {first_sentence(user_input, 30)} → "
+                         f"{first_sentence(agent_response, 40)}")
+        return "\n".join(lines[-self.max_lines:])
+
+    def _summarize_llm(self, previous: str, turns: List[Turn]) -> str:
+        new_turns = "\n".join(
+            f"- [{timestamp[11:16]}] Juan: {truncate_tokens(user_input, 200)}\n"
+            f"  Secretária: {truncate_tokens(agent_response, 300)}"
+            for _, timestamp, user_input, agent_response in turns
+        )
+        response = self.llm.stream_sync(
+            messages=[{
+                "role": "user",
+                "content": f"Resumo anterior:\n{previous or '(nenhum)'}\n\nNovas interações:\n{new_turns}"
+            }],
+            system=SUMMARY_SYSTEM.format(words=self.max_summary_words),
+            max_tokens=self.max_summary_words * 3
+        )
+        return truncate_tokens(response.text.strip(), self.max_summary_words * 2)
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """
+        Resume o próximo lote de turnos pendentes (só os grupos projeto/dia
+        afetados) e avança a marca d'água até ele
+        Retorna quantos turnos entraram nos resumos
+        """
+        turns = self.pending_turns(self.batch_size)
+        if not turns:
+            return 0
+
+        groups: Dict[Tuple[str, str], List[Turn]] = {}
+        for turn in turns:
+            for project in self.projects_of(turn[2], turn[3]):
+                groups.setdefault((project, turn[1][:10]), []).append(turn)
+
+        with self.memory.db.read() as conn:
+            existing = {
+                (row[0], row[1]): row
+                for row in conn.execute("""
+                    SELECT project, day, summary, turns, first_at FROM conversation_summaries
+                    WHERE (project, day) IN (
+                        SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]')
+                        FROM json_each(?)
+                    )
+                """, (json.dumps(list(groups)),)).fetchall()
+            }
+
+        # Resumos fora da transação (podem chamar o Claude)
+        rows = []
+        for (project, day), group in groups.items():
+            previous = existing.get((project, day))
+            summary = self.summarize(previous[2] if previous else "", group)
+            rows.append((
+                project, day, summary, (previous[3] if previous else 0) + len(group),
+                previous[4] if previous else group[0][1], group[-1][1], group[-1][0],
+                datetime.now().isoformat()
+            ))
+
+        with self.memory.db.transaction() as conn:
+            conn.executemany("""
+                INSERT INTO conversation_summaries (project, day, summary, turns, first_at,
+                                                    last_at, last_conversation_id, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (project, day) DO UPDATE SET
+                    summary = excluded.summary, turns = excluded.turns,
+                    last_at = excluded.last_at,
+                    last_conversation_id = excluded.last_conversation_id,
+                    updated_at = excluded.updated_at
+            """, rows)
+            conn.execute("""
+                INSERT INTO sync_state (source, scope, cursor, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (source, scope) DO UPDATE SET
+                    cursor = excluded.cursor, updated_at = excluded.updated_at
+            """, (WATERMARK_SOURCE, WATERMARK_SCOPE, str(turns[-1][0]), datetime.now().isoformat()))
+
+        self.runs += 1
+        self.summarized_turns += len(turns)
+        return len(turns)
+
+    def _refresh_safely(self) -> int:
+        with self._lock:
+            self._pending = None
+        try:
+            return self.refresh()
+        except Exception as e:
+            print(f"⚠️  Resumo de conversas falhou: {e}")
+            return 0
+
+    def schedule(self) -> Future:
+        """Enfileira um refresh em background (pedidos já enfileirados são reaproveitados)"""
+        with self._lock:
+            if self._pending is None:
+                self._pending = self._executor.submit(self._refresh_safely)
+            return self._pending
+
+    def close(self):
+        """Espera o refresh em andamento e encerra o worker"""
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        """Estatísticas de uso"""
+        return {
+            "runs": self.runs,
+            "summarized_turns": self.summarized_turns,
+            "llm_failures": self.llm_failures,
+            "keep_recent": self.keep_recent,
+            "batch_size": self.batch_size,
+        }
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+🔄 SYNC DAEMON - Sincronização em background com agenda adaptativa
+==================================================================
+
+Sincroniza GitHub e ClickUp sem ninguém digitar 'sync':
+- Agenda por projeto: quem teve mudanças volta a ser sincronizado
+  no intervalo mínimo; projetos parados dobram o intervalo até o
+  máximo (falhas também recuam, com backoff)
+- Agenda persistida no SQLite (sync_schedule): sobrevive a
+  reinícios e é compartilhada entre o Sage e um worker separado
+- Roda como task no event loop do Sage ou como processo próprio
+  (python -m sage.core.sync_daemon)
+- Nunca atrasa o think(): rede em prioridade BACKGROUND no agendador
+  de rate limit e todo trabalho bloqueante (SQLite, ClickUp) em threads
+- Manutenção da memória no mesmo laço: o RetentionEngine do agente
+  (arquivamento mensal, blobs órfãos, VACUUM incremental) roda a cada
+  retention_interval; a última execução fica em sync_state
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from ..integrations.rate_limit import Priority, request_priority
+from .retention import RetentionReport
+
+if TYPE_CHECKING:
+    from .secretary_agent import SecretaryAgent
+
+
+# Marca d'água da retenção em sync_state
+RETENTION_SOURCE = "retention"
+RETENTION_SCOPE = "memory"
+
+
+@dataclass
+class SyncPolicy:
+    """Limites da agenda adaptativa (segundos)"""
+    min_interval: float = 5 * 60
+    max_interval: float = 6 * 60 * 60
+    backoff_factor: float = 2.0
+    max_idle_wait: float = 60.0   # reavalia a agenda pelo menos nesse intervalo
+    retention_interval: float = 24 * 60 * 60   # 0 = sem retenção automática
+
+
+@dataclass
+class ScheduleEntry:
+    """Estado da agenda de um projeto"""
+    project: str
+    interval_seconds: float
+    next_run_at: str
+    last_run_at: Optional[str] = None
+    last_change_at: Optional[str] = None
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+class SyncDaemon:
+    """
+    Sincronização periódica e adaptativa de todos os projetos
+
+    Uso (no event loop do Sage):
+        daemon = SyncDaemon(agent)
+        daemon.start()
+        daemon.notify_activity("Max-Code")   # antecipa a próxima sincronização
+        await daemon.stop()
+    """
+
+    def __init__(self, agent: "SecretaryAgent", policy: Optional[SyncPolicy] = None):
+        self.agent = agent
+        self.policy = policy or SyncPolicy()
+        self.schedule: Dict[str, ScheduleEntry] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loaded = False
+        self.retention_next_at: Optional[datetime] = None
+
+        # Estatísticas
+        self.runs = 0
+        self.project_syncs = 0
+        self.retention_runs = 0
+        self.last_retention: Optional[RetentionReport] = None
+        self.last_retention_at: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Agenda persistida
+    # ------------------------------------------------------------------
+
+    def load(self, now: Optional[datetime] = None):
+        """Carrega a agenda do banco (projetos novos entram como devidos)"""
+        now = now or datetime.now()
+        with self.agent.memory.db.read() as conn:
+            rows = conn.execute("""
+                SELECT project, interval_seconds, next_run_at, last_run_at,
+                       last_change_at, failures, last_error
+                FROM sync_schedule
+            """).fetchall()
+            retention = conn.execute(
+                "SELECT last_full_sync FROM sync_state WHERE source = ? AND scope = ?",
+                (RETENTION_SOURCE, RETENTION_SCOPE)
+            ).fetchone()
+        stored = {row[0]: ScheduleEntry(*row) for row in rows}
+        self.last_retention_at = retention[0] if retention else None
+        self.retention_next_at = (
+            datetime.fromisoformat(self.last_retention_at)
+            + timedelta(seconds=self.policy.retention_interval)
+            if self.last_retention_at else now
+        )
+        self.schedule = {
+            project: stored.get(project) or ScheduleEntry(
+                project=project, interval_seconds=self.policy.min_interval,
+                next_run_at=now.isoformat()
+            )
+            for project in self.agent.projects
+        }
+        self._loaded = True
+
+    def save(self, entries: List[ScheduleEntry]):
+        """Grava entradas da agenda (uma transação)"""
+        with self.agent.memory.db.transaction() as conn:
+            conn.executemany("""
+                INSERT INTO sync_schedule (project, interval_seconds, next_run_at, last_run_at,
+                                           last_change_at, failures, last_error)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (project) DO UPDATE SET
+                    interval_seconds = excluded.interval_seconds,
+                    next_run_at = excluded.next_run_at,
+                    last_run_at = excluded.last_run_at,
+                    last_change_at = excluded.last_change_at,
+                    failures = excluded.failures,
+                    last_error = excluded.last_error
+            """, [
+                (e.project, e.interval_seconds, e.next_run_at, e.last_run_at,
+                 e.last_change_at, e.failures, e.last_error)
+                for e in entries
+            ])
+
+    def due_projects(self, now: Optional[datetime] = None) -> List[str]:
+        """Projetos cuja próxima sincronização já venceu"""
+        now = (now or datetime.now()).isoformat()
+        return [p for p, entry in self.schedule.items() if entry.next_run_at <= now]
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> float:
+        """Quanto dormir até o próximo projeto devido"""
+        now = now or datetime.now()
+        if not self.schedule:
+            return self.policy.max_idle_wait
+        next_run = min(datetime.fromisoformat(e.next_run_at) for e in self.schedule.values())
+        return min(max((next_run - now).total_seconds(), 0.0), self.policy.max_idle_wait)
+
+    def notify_activity(self, project: str, now: Optional[datetime] = None):
+        """Atividade externa no projeto: sincroniza logo e volta ao intervalo mínimo"""
+        entry = self.schedule.get(project)
+        if entry is None:
+            return
+        now = now or datetime.now()
+        entry.interval_seconds = self.policy.min_interval
+        entry.next_run_at = min(entry.next_run_at, now.isoformat())
+        if self._wake is not None:
+            self._wake.set()
+
+    def _reschedule(self, entry: ScheduleEntry, now: datetime, changed: bool,
+                    error: Optional[str] = None):
+        """Intervalo mínimo com mudanças; recua (backoff) se parado ou com erro"""
+        entry.last_run_at = now.isoformat()
+        if error is not None:
+            entry.failures += 1
+            entry.last_error = error
+            entry.interval_seconds = min(self.policy.max_interval,
+                                         max(entry.interval_seconds, self.policy.min_interval)
+                                         * self.policy.backoff_factor)
+        elif changed:
+            entry.failures = 0
+            entry.last_error = None
+            entry.last_change_at = now.isoformat()
+            entry.interval_seconds = self.policy.min_interval
+        else:
+            entry.failures = 0
+            entry.last_error = None
+            entry.interval_seconds = min(self.policy.max_interval,
+                                         entry.interval_seconds * self.policy.backoff_factor)
+        entry.next_run_at = (now + timedelta(seconds=entry.interval_seconds)).isoformat()
+
+    # ------------------------------------------------------------------
+    # Sincronização
+    # ------------------------------------------------------------------
+
+    async def run_once(self, now: Optional[datetime] = None,
+                       force: bool = False) -> Dict[str, ScheduleEntry]:
+        """
+        Sincroniza os projetos devidos (ou todos, com force)
+        GitHub de todos de uma vez; ClickUp lista a lista, em thread
+        """
+        now = now or datetime.now()
+        if not self._loaded:
+            await asyncio.to_thread(self.load, now)
+        projects = list(self.schedule) if force else self.due_projects(now)
+        if not projects:
+            return {}
+        self.runs += 1
+
+        with request_priority(Priority.BACKGROUND):
+            changes: Dict[str, bool] = {p: False for p in projects}
+            errors: Dict[str, str] = {}
+
+            try:
+                github = await self.agent.sync_with_github_async(projects=projects)
+            except Exception as e:
+                github = {p: {"error": str(e)} for p in projects}
+            for project, result in github.items():
+                if "error" in result:
+                    errors[project] = result["error"]
+                elif result.get("new_commits"):
+                    changes[project] = True
+
+            for project in projects:
+                list_id = self.agent.clickup_list_for(project)
+                if list_id is None:
+                    continue
+                previous = (await asyncio.to_thread(self.agent.clickup_sync.get_state, list_id))[0]
+                try:
+                    result = await asyncio.to_thread(self.agent.clickup_sync.sync_list, list_id, project)
+                except Exception as e:
+                    errors.setdefault(project, str(e))
+                    continue
+                if result.cursor != previous or result.deleted:
+                    changes[project] = True
+
+        updated = []
+        for project in projects:
+            entry = self.schedule[project]
+            self._reschedule(entry, now, changes[project], errors.get(project))
+            updated.append(entry)
+        self.project_syncs += len(projects)
+        await asyncio.to_thread(self.save, updated)
+        return {entry.project: entry for entry in updated}
+
+    # ------------------------------------------------------------------
+    # Retenção
+    # ------------------------------------------------------------------
+
+    async def run_retention(self, now: Optional[datetime] = None,
+                            force: bool = False) -> Optional[RetentionReport]:
+        """Aplica as políticas de retenção do agente se o intervalo venceu (ou com force)"""
+        now = now or datetime.now()
+        engine = getattr(self.agent, "retention", None)
+        if engine is None or (self.policy.retention_interval <= 0 and not force):
+            return None
+        if not self._loaded:
+            await asyncio.to_thread(self.load, now)
+        if not force and now < self.retention_next_at:
+            return None
+
+        report = await asyncio.to_thread(engine.run, now)
+        await asyncio.to_thread(self._save_retention, now)
+        self.retention_runs += 1
+        self.last_retention = report
+        self.last_retention_at = now.isoformat()
+        self.retention_next_at = now + timedelta(seconds=self.policy.retention_interval)
+        return report
+
+    def _save_retention(self, now: datetime):
+        with self.agent.memory.db.transaction() as conn:
+            conn.execute("""
+                INSERT INTO sync_state (source, scope, last_full_sync, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (source, scope) DO UPDATE SET
+                    last_full_sync = excluded.last_full_sync, updated_at = excluded.updated_at
+            """, (RETENTION_SOURCE, RETENTION_SCOPE, now.isoformat(), datetime.now().isoformat()))
+
+    def retention_status(self) -> Dict:
+        """Última execução da retenção e a próxima prevista"""
+        report = self.last_retention
+        return {
+            "last_run_at": self.last_retention_at,
+            "next_run_at": self.retention_next_at.isoformat() if self.retention_next_at else None,
+            "runs": self.retention_runs,
+            "last_deleted": report.deleted if report else None,
+            "last_archived": dict(report.archived) if report else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self) -> asyncio.Task:
+        """Inicia o daemon como task no event loop atual"""
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="sage-sync-daemon")
+        return self._task
+
+    def trigger(self):
+        """Acorda o daemon e sincroniza tudo agora (sem esperar o resultado)"""
+        for entry in self.schedule.values():
+            entry.next_run_at = datetime.min.isoformat()
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self):
+        """Para o daemon (a sincronização em andamento é cancelada)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Sync daemon: {e}")
+
+            try:
+                await self.run_retention()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Retenção da memória: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.seconds_until_next())
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def status(self) -> Dict[str, Dict]:
+        """Agenda atual por projeto"""
+        return {
+            project: {
+                "interval_minutes": round(entry.interval_seconds / 60, 1),
+                "next_run_at": entry.next_run_at,
+                "last_run_at": entry.last_run_at,
+                "last_change_at": entry.last_change_at,
+                "failures": entry.failures,
+                "last_error": entry.last_error,
+            }
+            for project, entry in self.schedule.items()
+        }
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+async def run_worker():
+    """Daemon em processo próprio (mesmo banco do Sage)"""
+    from .secretary_agent import SecretaryAgent
+
+    agent = SecretaryAgent(
+        os.getenv("ANTHROPIC_API_KEY", ""),
+        os.getenv("CLICKUP_API_TOKEN", ""),
+        os.getenv("GITHUB_USERNAME", "JuanCS-Dev"),
+        db_path=os.getenv("SAGE_DB_PATH", "secretary_memory.db")
+    )
+    daemon = SyncDaemon(agent)
+    print("🔄 Sync daemon iniciado (Ctrl+C para sair)")
+    try:
+        await daemon.start()
+    finally:
+        await daemon.stop()
+        agent.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        print("\n👋 Sync daemon encerrado\n")
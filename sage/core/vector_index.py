@@ -0,0 +1,433 @@
+"""
+🧭 VECTOR INDEX - Busca semântica local na memória
+===================================================
+
+Índice vetorial de notas e tarefas, sem serviço externo:
+- Matriz float32 mapeada do disco (np.memmap, vectors.f32) + mapa de
+  ids (index.json): chave "<tipo>:<id>" (ex.: "note:<id>") → linha
+- Embedder plugável; o padrão (HashingEmbedder) é determinístico e
+  offline: palavras + trigramas de caracteres com feature hashing
+- Upserts incrementais (linhas de itens removidos são reaproveitadas)
+  só em memória/memmap; o index.json é regravado em lote (maybe_flush:
+  a cada flush_every escritas ou flush_interval segundos) e no close()
+- Busca top-k por cosseno em lote (uma multiplicação de matrizes
+  para todas as consultas)
+- IVF opcional: acima de ivf_min_size vetores, k-means esférico em
+  ~√n listas; a busca só olha as nprobe listas mais próximas
+
+Vetores são normalizados (norma 1): cosseno = produto interno.
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# ============================================================================
+# EMBEDDERS
+# ============================================================================
+
+_WORD = re.compile(r"\w\w+")
+
+
+class HashingEmbedder:
+    """
+    Embedding local por feature hashing (sem modelo, sem rede)
+
+    Qualquer embedder serve para o VectorIndex, desde que tenha:
+    - name: identifica o espaço vetorial (mudou → índice refeito)
+    - dim: dimensão dos vetores
+    - __call__(textos) → matriz float32 (len(textos), dim), linhas com norma 1
+    """
+
+    def __init__(self, dim: int = 512, char_ngram: int = 3, char_weight: float = 0.5):
+        self.dim = dim
+        self.char_ngram = char_ngram
+        self.char_weight = char_weight
+        self.name = f"hashing-{dim}-c{char_ngram}"
+
+    def features(self, text: str) -> Counter:
+        """Contagem de palavras e de n-gramas de caracteres das palavras ("#...")"""
+        features: Counter = Counter()
+        n = self.char_ngram
+        for word in _WORD.findall(text.casefold()):
+            features[word] += 1
+            padded = f"<{word}>"
+            for i in range(len(padded) - n + 1):
+                features[f"#{padded[i:i + n]}"] += 1
+        return features
+
+    def _slot(self, feature: str) -> Tuple[int, float]:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        return h % self.dim, 1.0 if h >> 63 else -1.0
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self.features(text).items():
+                slot, sign = self._slot(feature)
+                weight = self.char_weight if feature.startswith("#") else 1.0
+                vectors[row, slot] += sign * weight * (1.0 + math.log(count))
+        return normalize_rows(vectors)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Linhas com norma 1 (linhas nulas continuam nulas)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+# ============================================================================
+# VECTOR INDEX
+# ============================================================================
+
+class VectorIndex:
+    """
+    Índice vetorial persistido em um diretório
+
+    Uso:
+        index = VectorIndex("memory_vectors")
+        index.upsert([("note:1", "deploy do Max-Code", "Max-Code")])
+        index.search("publicar o Max-Code", k=5)   # [(chave, cosseno)]
+        index.maybe_flush()                        # grava se o lote/intervalo venceu
+        index.close()                              # grava o que faltar
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    IDS_FILE = "index.json"
+    CENTROIDS_FILE = "centroids.npy"
+
+    def __init__(self, path: str, embedder=None, initial_capacity: int = 1024,
+                 ivf_min_size: int = 5000, nprobe: int = 8, kmeans_iterations: int = 10,
+                 flush_every: int = 256, flush_interval: float = 30.0):
+        self.path = Path(path)
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self.initial_capacity = initial_capacity
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+        self.kmeans_iterations = kmeans_iterations
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self.keys: List[Optional[str]] = []        # linha → chave (None = livre)
+        self.projects: List[Optional[str]] = []    # linha → projeto (filtro)
+        self.rows: Dict[str, int] = {}             # chave → linha
+        self.free: List[int] = []
+        self._masks: Dict[Tuple, np.ndarray] = {}  # filtro → linhas elegíveis (atualizado por linha)
+
+        # Escritas ainda não gravadas no index.json
+        self.dirty = 0
+        self._centroids_dirty = False
+        self.last_flush = time.monotonic()
+        self.flushes = 0
+
+        # IVF (None enquanto o índice é pequeno)
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments: Optional[np.ndarray] = None
+        self.trained_size = 0
+
+        # Estatísticas
+        self.searches = 0
+        self.scanned = 0
+        self.rebuilt = False
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def _open(self, capacity: int):
+        file = self.path / self.VECTORS_FILE
+        size = capacity * self.dim * 4
+        with open(file, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self.capacity = capacity
+        self.vectors = np.memmap(file, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _load(self):
+        meta = {}
+        ids_file = self.path / self.IDS_FILE
+        if ids_file.exists():
+            meta = json.loads(ids_file.read_text())
+
+        if (meta.get("embedder") != self.embedder.name or meta.get("dim") != self.dim
+                or not (self.path / self.VECTORS_FILE).exists()):
+            # Índice novo (ou de outro embedder): começa vazio
+            self.rebuilt = bool(meta)
+            for name in (self.VECTORS_FILE, self.IDS_FILE, self.CENTROIDS_FILE):
+                (self.path / name).unlink(missing_ok=True)
+            self._open(self.initial_capacity)
+            return
+
+        self.keys = meta["keys"]
+        self.projects = meta["projects"]
+        self.rows = {key: row for row, key in enumerate(self.keys) if key is not None}
+        self.free = [row for row, key in enumerate(self.keys) if key is None]
+        stored = (self.path / self.VECTORS_FILE).stat().st_size // (self.dim * 4)
+        self._open(max(self.initial_capacity, len(self.keys), stored))
+
+        centroids = self.path / self.CENTROIDS_FILE
+        if centroids.exists():
+            self.centroids = np.load(centroids)
+            self.trained_size = meta.get("trained_size", 0)
+            self.assignments = self._assign(np.asarray(self.vectors[:len(self.keys)]))
+
+    def flush(self):
+        """Grava os vetores e o mapa de ids (troca atômica do index.json)"""
+        with self._lock:
+            self.vectors.flush()
+            self.dirty = 0
+            self.last_flush = time.monotonic()
+            self.flushes += 1
+            tmp = self.path / f"{self.IDS_FILE}.tmp"
+            tmp.write_text(json.dumps({
+                "embedder": self.embedder.name,
+                "dim": self.dim,
+                "trained_size": self.trained_size,
+                "keys": self.keys,
+                "projects": self.projects,
+            }, ensure_ascii=False))
+            os.replace(tmp, self.path / self.IDS_FILE)
+            if self.centroids is not None and self._centroids_dirty:
+                np.save(self.path / self.CENTROIDS_FILE, self.centroids)
+                self._centroids_dirty = False
+
+    def maybe_flush(self) -> bool:
+        """Grava só se há flush_every escritas pendentes ou flush_interval passou"""
+        with self._lock:
+            due = self.dirty >= self.flush_every or (
+                self.dirty > 0 and time.monotonic() - self.last_flush >= self.flush_interval)
+            if due:
+                self.flush()
+            return due
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            del self.vectors
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity != self.capacity:
+            self.vectors.flush()
+            del self.vectors
+            self._open(capacity)
+
+    def upsert(self, items: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        """
+        Insere ou atualiza (chave, texto, projeto) em lote
+        Retorna quantos itens foram gravados
+        """
+        items = list(items)
+        if not items:
+            return 0
+        embeddings = self.embedder([text for _, text, _ in items])
+
+        with self._lock:
+            new = sum(1 for key, _, _ in items if key not in self.rows)
+            self._grow(len(self.keys) + max(new - len(self.free), 0))
+            rows = []
+            for key, _, project in items:
+                row = self.rows.get(key)
+                if row is None:
+                    row = self.free.pop() if self.free else len(self.keys)
+                    if row == len(self.keys):
+                        self.keys.append(None)
+                        self.projects.append(None)
+                    self.rows[key] = row
+                self.keys[row] = key
+                self.projects[row] = project
+                rows.append(row)
+            self.vectors[rows] = embeddings
+            self._update_masks(rows)
+            self.dirty += len(rows)
+
+            if self.centroids is not None:
+                self._extend_assignments()
+                self.assignments[rows] = self._assign(embeddings)
+            if len(self.rows) >= max(self.ivf_min_size, 2 * self.trained_size):
+                self.train()
+        return len(items)
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """Remove chaves (a linha fica livre para o próximo upsert)"""
+        removed = 0
+        with self._lock:
+            for key in keys:
+                row = self.rows.pop(key, None)
+                if row is None:
+                    continue
+                self.vectors[row] = 0.0
+                self.keys[row] = None
+                self.projects[row] = None
+                self.free.append(row)
+                self._update_masks([row])
+                removed += 1
+            self.dirty += removed
+        return removed
+
+    def clear(self):
+        """Esvazia o índice"""
+        with self._lock:
+            self.keys, self.projects, self.rows, self.free = [], [], {}, []
+            self._masks.clear()
+            self.centroids = self.assignments = None
+            self.trained_size = 0
+            (self.path / self.CENTROIDS_FILE).unlink(missing_ok=True)
+            self.vectors[:] = 0.0
+            self.dirty += 1
+
+    # ------------------------------------------------------------------
+    # IVF
+    # ------------------------------------------------------------------
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _extend_assignments(self):
+        missing = len(self.keys) - len(self.assignments)
+        if missing > 0:
+            self.assignments = np.concatenate([self.assignments, np.zeros(missing, dtype=np.int32)])
+
+    def train(self, nlist: Optional[int] = None, sample: int = 20000):
+        """K-means esférico sobre os vetores vivos → centróides das listas IVF"""
+        with self._lock:
+            live = np.array(sorted(self.rows.values()), dtype=np.int64)
+            if len(live) == 0:
+                return
+            nlist = nlist or max(1, int(math.sqrt(len(live))))
+            rng = np.random.default_rng(0)
+            data = np.asarray(self.vectors[rng.choice(live, min(sample, len(live)), replace=False)])
+
+            centroids = data[rng.choice(len(data), min(nlist, len(data)), replace=False)].copy()
+            for _ in range(self.kmeans_iterations):
+                labels = np.argmax(data @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, data)
+                empty = ~sums.any(axis=1)
+                sums[empty] = centroids[empty]     # lista vazia mantém o centróide
+                centroids = normalize_rows(sums)
+
+            self.centroids = centroids
+            self.assignments = self._assign(np.asarray(self.vectors[:len(self.keys)]))
+            self.trained_size = len(live)
+            self._centroids_dirty = True
+
+    # ------------------------------------------------------------------
+    # Busca
+    # ------------------------------------------------------------------
+
+    def _candidates(self, query: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Linhas a comparar com a consulta (todas, ou só as listas IVF mais próximas)"""
+        if self.centroids is None:
+            return np.flatnonzero(mask)
+        probe = np.argsort(-(self.centroids @ query))[:self.nprobe]
+        return np.flatnonzero(mask & np.isin(self.assignments[:len(mask)], probe))
+
+    def _matches(self, row: int, signature: Tuple) -> bool:
+        kinds, project = signature
+        key = self.keys[row]
+        return (key is not None
+                and (kinds is None or key.startswith(tuple(f"{kind}:" for kind in kinds)))
+                and (project is None or self.projects[row] == project))
+
+    def _mask(self, kinds: Optional[Sequence[str]], project: Optional[str]) -> np.ndarray:
+        """Linhas vivas que passam no filtro (montado uma vez por filtro)"""
+        signature = (tuple(sorted(kinds)) if kinds else None, project)
+        mask = self._masks.get(signature)
+        if mask is None:
+            mask = np.array([self._matches(row, signature) for row in range(len(self.keys))],
+                            dtype=bool)
+            self._masks[signature] = mask
+        return mask
+
+    def _update_masks(self, rows: Sequence[int]):
+        """Escrita: atualiza só as linhas alteradas nas máscaras já montadas"""
+        for signature, mask in self._masks.items():
+            if len(mask) < len(self.keys):
+                mask = np.concatenate([mask, np.zeros(len(self.keys) - len(mask), dtype=bool)])
+                self._masks[signature] = mask
+            for row in rows:
+                mask[row] = self._matches(row, signature)
+
+    def search_batch(self, queries: Sequence[str], k: int = 5,
+                     kinds: Optional[Sequence[str]] = None,
+                     project: Optional[str] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k por cosseno para várias consultas de uma vez
+        kinds: só chaves desses tipos (ex.: ["note", "task"])
+        Retorna, por consulta, [(chave, cosseno)] do mais ao menos similar
+        """
+        embedded = self.embedder(list(queries))
+        with self._lock:
+            n = len(self.keys)
+            if n == 0 or not queries:
+                return [[] for _ in queries]
+
+            mask = self._mask(kinds, project)
+            matrix = np.asarray(self.vectors[:n])
+
+            if self.centroids is None:
+                # Força bruta: todas as consultas numa multiplicação só
+                rows = np.flatnonzero(mask)
+                scores = embedded @ matrix[rows].T
+                candidates = [(rows, scores[i]) for i in range(len(queries))]
+            else:
+                candidates = []
+                for query in embedded:
+                    rows = self._candidates(query, mask)
+                    candidates.append((rows, matrix[rows] @ query))
+
+            results = []
+            for rows, scores in candidates:
+                self.searches += 1
+                self.scanned += len(rows)
+                top = np.arange(len(rows)) if len(rows) <= k else np.argpartition(-scores, k)[:k]
+                top = top[np.argsort(-scores[top], kind="stable")]
+                results.append([(self.keys[rows[i]], float(scores[i])) for i in top])
+            return results
+
+    def search(self, query: str, k: int = 5, kinds: Optional[Sequence[str]] = None,
+               project: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Top-k por cosseno para uma consulta"""
+        return self.search_batch([query], k, kinds, project)[0]
+
+    def stats(self) -> Dict:
+        """Tamanho, uso do IVF e custo médio das buscas"""
+        with self._lock:
+            return {
+                "vectors": len(self.rows),
+                "capacity": self.capacity,
+                "embedder": self.embedder.name,
+                "ivf_lists": 0 if self.centroids is None else len(self.centroids),
+                "pending_writes": self.dirty,
+                "flushes": self.flushes,
+                "searches": self.searches,
+                "avg_scanned": round(self.scanned / self.searches, 1) if self.searches else 0,
+            }
@@ -0,0 +1,205 @@
+"""
+⚖️ VERDICT CACHE - Cache de veredictos do MAXIMUS Core
+=======================================================
+
+A mesma ação (o mesmo plano de navegar-e-clicar repetido a cada
+execução do roadmap) não precisa ser revalidada pelo Core toda vez:
+- Chave: hash da forma canônica da ação (chaves ordenadas, espaços
+  colapsados, só os campos de registro do topo — timestamp,
+  created_at... — removidos) + campos relevantes do contexto. Ids de
+  alvo, datas pedidas pelo usuário e o conteúdo aninhado (passos,
+  resultados) continuam na chave: ações com alvos diferentes nunca
+  compartilham veredicto
+- TTL pelo SafetyTier do veredicto: SAFE fica mais tempo, RISKY
+  nunca é guardado; nível CRITICAL ou aprovação humana sempre
+  voltam ao Core
+- Versão da constituição/política: quando o Core anuncia outra
+  versão, todos os veredictos são descartados
+- Só veredictos do Core entram (o fallback local nunca é guardado)
+- Em memória, LRU acima de max_entries; listeners recebem cada
+  consulta (hit rate no PerformanceMonitor)
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .sage import ConsciousnessCheck
+
+
+# TTL por SafetyTier (segundos; 0 = não guarda)
+DEFAULT_TTLS: Dict[str, float] = {
+    "safe": 60 * 60,
+    "caution": 5 * 60,
+    "risky": 0,
+    "blocked": 5 * 60,
+}
+
+# Campos de registro do topo da ação (quando ela foi montada, não o que
+# faz); ids, task_id, datas do conteúdo e campos aninhados ficam na chave
+VOLATILE_FIELDS = frozenset({"timestamp", "created_at", "updated_at", "request_id"})
+
+# Campos do contexto que entram na chave (o resto — memórias, métricas,
+# horário — muda a cada chamada)
+CONTEXT_FIELDS = ("consciousness_enabled", "projects")
+
+_SPACES = re.compile(r"\s+")
+
+# Recebe (hit, safety_tier do veredicto servido ou None)
+VerdictListener = Callable[[bool, Optional[str]], None]
+
+
+def canonical(value: Any) -> Any:
+    """Forma canônica de um valor: textos com espaços colapsados, nada removido"""
+    if isinstance(value, dict):
+        return {k: canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, str):
+        return _SPACES.sub(" ", value).strip()
+    return value
+
+
+@dataclass
+class CachedVerdict:
+    """Veredicto guardado"""
+    check: "ConsciousnessCheck"
+    expires_at: float
+    policy_version: Optional[str]
+
+
+class VerdictCache:
+    """
+    Veredictos do Core por ação canônica
+
+    Uso:
+        verdicts = VerdictCache()
+        key = verdicts.key(action, context)
+        check = verdicts.get(key) or await core_check(action)
+        verdicts.put(key, check)
+        verdicts.set_policy_version(result["policy_version"])
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 context_fields: Iterable[str] = CONTEXT_FIELDS,
+                 volatile_fields: Iterable[str] = VOLATILE_FIELDS,
+                 max_entries: int = 1000, clock: Callable[[], float] = time.monotonic):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.context_fields = tuple(context_fields)
+        self.volatile_fields = frozenset(volatile_fields)
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self.entries: "OrderedDict[str, CachedVerdict]" = OrderedDict()
+        self.policy_version: Optional[str] = None
+        self.listeners: List[VerdictListener] = []
+
+        # Estatísticas
+        self.hits: Counter = Counter()     # por safety tier
+        self.misses = 0
+        self.stored = 0
+        self.skipped = 0                   # veredictos que não podiam ser guardados
+        self.invalidations = 0
+
+    def add_listener(self, listener: VerdictListener):
+        """Registra quem recebe cada consulta (hit/miss)"""
+        self.listeners.append(listener)
+
+    def key(self, action: Dict, context: Optional[Dict] = None) -> str:
+        """Hash da ação canônica + campos relevantes do contexto"""
+        context = context or {}
+        relevant = {field: context[field] for field in self.context_fields if field in context}
+        # Só o topo perde os campos de registro; o resto entra inteiro
+        action = {k: v for k, v in action.items() if k not in self.volatile_fields}
+        payload = json.dumps([canonical(action), canonical(relevant)],
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def ttl_for(self, check: "ConsciousnessCheck") -> float:
+        """Por quanto tempo o veredicto vale (0 = sempre voltar ao Core)"""
+        if check.consciousness_level.value == "critical" or check.requires_human_approval:
+            return 0
+        return self.ttls.get(check.safety_tier.value, 0)
+
+    # ------------------------------------------------------------------
+    # Consulta e armazenamento
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional["ConsciousnessCheck"]:
+        """Veredicto válido para a chave (cópia), ou None"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at <= self.clock():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.entries.move_to_end(key)
+                self.hits[entry.check.safety_tier.value] += 1
+
+        for listener in self.listeners:
+            listener(entry is not None, entry.check.safety_tier.value if entry else None)
+        if entry is None:
+            return None
+        return replace(entry.check, constitutional_notes=list(entry.check.constitutional_notes))
+
+    def put(self, key: str, check: "ConsciousnessCheck") -> bool:
+        """Guarda o veredicto com o TTL do seu tier; retorna se foi guardado"""
+        ttl = self.ttl_for(check)
+        with self._lock:
+            if ttl <= 0:
+                self.skipped += 1
+                self.entries.pop(key, None)
+                return False
+            self.entries[key] = CachedVerdict(check, self.clock() + ttl, self.policy_version)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.stored += 1
+        return True
+
+    def set_policy_version(self, version: Optional[str]) -> bool:
+        """Versão da constituição/política do Core; se mudou, descarta tudo"""
+        if version is None:
+            return False
+        with self._lock:
+            if version == self.policy_version:
+                return False
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.policy_version = version
+        return True
+
+    def clear(self):
+        """Descarta todos os veredictos"""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit rate e tamanho"""
+        with self._lock:
+            hits = sum(self.hits.values())
+            lookups = hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": hits,
+                "misses": self.misses,
+                "hit_rate": f"{hits / lookups * 100:.1f}%" if lookups else "0.0%",
+                "hits_by_tier": dict(self.hits),
+                "stored": self.stored,
+                "skipped": self.skipped,
+                "invalidations": self.invalidations,
+                "policy_version": self.policy_version,
+            }
@@ -0,0 +1,148 @@
+"""
+📥 WRITE-BEHIND - Gravação em lote fora do caminho de resposta
+===============================================================
+
+Buffer que aceita registros em O(1) e os grava em lote, numa thread
+de fundo, quando atinge um tamanho ou um intervalo de tempo:
+- Uma transação (executemany) por lote em vez de um commit por registro
+- Serialização (json.dumps etc.) feita no flush, não na chamada
+- Flush durável no close() e na saída do interpretador; sinais de
+  término só pedem o flush à thread de fundo e, sem outro handler,
+  viram SystemExit (o atexit faz o flush final). O handler nunca grava
+  por conta própria: o sinal pode chegar no meio de um flush da
+  thread principal, com o lock já tomado
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import atexit
+import signal
+import threading
+import weakref
+from typing import Any, Callable, Iterable, List, Optional
+
+
+class WriteBehindBuffer:
+    """
+    Buffer write-behind genérico
+
+    Uso:
+        buffer = WriteBehindBuffer(write_batch, max_batch=100, flush_interval=1.0)
+        buffer.add(record)      # não bloqueia
+        buffer.flush()          # grava tudo agora (síncrono)
+        buffer.close()          # flush final + encerra a thread
+    """
+
+    def __init__(self, flush_fn: Callable[[List[Any]], None], max_batch: int = 100,
+                 flush_interval: float = 1.0, name: str = "write-behind"):
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+
+        self._pending: List[Any] = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # Lotes gravados em ordem
+        self._closed = False
+        self._flush_requested = False       # pedido por sinal
+
+        # Estatísticas
+        self.records_written = 0
+        self.batches_written = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+        # Referência fraca: o atexit não mantém o buffer vivo depois do close()
+        ref = weakref.ref(self)
+
+        def close_at_exit():
+            buffer = ref()
+            if buffer is not None:
+                buffer.close()
+
+        self._atexit_hook = close_at_exit
+        atexit.register(close_at_exit)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def add(self, record: Any):
+        """Enfileira um registro (acorda o flusher ao atingir max_batch)"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("WriteBehindBuffer fechado")
+            self._pending.append(record)
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def flush(self):
+        """Grava todos os registros pendentes na thread atual"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                self.flush_fn(batch)
+            except BaseException:
+                # Devolve o lote à frente da fila para a próxima tentativa
+                # (inclusive SystemExit de um sinal: o atexit grava de novo)
+                with self._cond:
+                    self._pending[:0] = batch
+                raise
+            self.records_written += len(batch)
+            self.batches_written += 1
+
+    def _run(self):
+        """Loop do flusher: grava por tamanho ou por tempo"""
+        while True:
+            with self._cond:
+                if (not self._closed and not self._flush_requested
+                        and len(self._pending) < self.max_batch):
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    return
+                self._flush_requested = False
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  Falha ao gravar lote write-behind: {e}")
+
+    def close(self):
+        """Flush final e encerramento da thread (idempotente)"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        atexit.unregister(self._atexit_hook)
+        self.flush()
+
+    def request_flush(self):
+        """Acorda a thread de fundo para gravar já (seguro dentro de handlers de sinal)"""
+        with self._cond:   # RLock: reentrante se o sinal interrompeu um add()
+            self._flush_requested = True
+            self._cond.notify()
+
+    def install_signal_handlers(self, signals: Optional[Iterable[int]] = None):
+        """
+        Garante o flush ao receber sinais de término (padrão: SIGTERM)
+        O handler só pede o flush à thread de fundo e chama o handler
+        anterior; se o anterior era o padrão (terminar), levanta
+        SystemExit para que o close() registrado no atexit grave o resto.
+        Só pode ser chamado na thread principal.
+        """
+        for signum in signals or (signal.SIGTERM,):
+            previous = signal.getsignal(signum)
+
+            def handler(received, frame, previous=previous):
+                self.request_flush()
+                if callable(previous):
+                    previous(received, frame)
+                elif previous == signal.SIG_DFL:
+                    raise SystemExit(128 + received)
+
+            signal.signal(signum, handler)
@@ -0,0 +1,316 @@
+"""
+🔌 CIRCUIT BREAKER - Falha rápida para serviços fora do ar
+==========================================================
+
+Quando o MAXIMUS Core (ou outro serviço local) cai, cada ação não
+deveria pagar o timeout da conexão antes de cair no fallback:
+- CircuitBreaker por serviço, com três estados:
+  - closed: chamadas passam; falhas seguidas acima do limite abrem
+  - open: chamadas recusadas na hora (o chamador usa o fallback)
+    até reset_timeout
+  - half_open: uma chamada de teste passa; sucesso fecha, falha reabre;
+    chamada de teste sem resultado (cancelada) devolve a vaga (release)
+- HealthCache compartilhado: probes de /health em background mantêm
+  o estado de cada serviço em memória (status e get_status sem ida
+  à rede). Probe com falha abre o circuito; probe saudável com o
+  circuito aberto libera a chamada de teste; o corpo JSON do probe
+  saudável vai para on_info (ex.: versão da política do Core)
+- Aviso impresso só nas transições, não a cada chamada
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+import aiohttp
+
+
+class BreakerState(Enum):
+    """Estados do circuito"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+class CircuitBreaker:
+    """
+    Circuito de um serviço
+
+    Uso:
+        breaker = CircuitBreaker("core")
+        if not breaker.allow():
+            return fallback()              # microssegundos, sem rede
+        try:
+            result = await call()
+        except Exception as e:
+            breaker.record_failure(str(e))
+            return fallback()
+        except BaseException:              # cancelada: nem sucesso nem falha
+            breaker.release()
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self.state = BreakerState.CLOSED
+        self.failures = 0                 # falhas seguidas
+        self.opened_at = 0.0
+        self.trial_calls = 0              # chamadas de teste em andamento (half_open)
+        self.last_error: Optional[str] = None
+
+        # Estatísticas
+        self.calls = 0
+        self.fast_fails = 0
+        self.opens = 0
+
+    def _transition(self, state: BreakerState):
+        if state == self.state:
+            return
+        self.state = state
+        if state == BreakerState.OPEN:
+            self.opened_at = self.clock()
+            self.opens += 1
+            print(f"⚠️  {self.name}: circuito aberto, usando fallback por "
+                  f"{self.reset_timeout:.0f}s ({self.last_error})")
+        elif state == BreakerState.HALF_OPEN:
+            self.trial_calls = 0
+        else:
+            print(f"✅ {self.name}: circuito fechado, serviço de volta")
+
+    def allow(self) -> bool:
+        """A chamada pode ir à rede? (False = falhar rápido para o fallback)"""
+        with self._lock:
+            if self.state == BreakerState.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self._transition(BreakerState.HALF_OPEN)
+            if self.state == BreakerState.CLOSED:
+                self.calls += 1
+                return True
+            if self.state == BreakerState.HALF_OPEN and self.trial_calls < self.half_open_max_calls:
+                self.trial_calls += 1
+                self.calls += 1
+                return True
+            self.fast_fails += 1
+            return False
+
+    def record_success(self):
+        """Chamada bem-sucedida: zera as falhas e fecha o circuito"""
+        with self._lock:
+            self.failures = 0
+            self._transition(BreakerState.CLOSED)
+
+    def record_failure(self, error: Optional[str] = None):
+        """Falha: abre ao atingir o limite (ou na hora, se for a chamada de teste)"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == BreakerState.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                self._transition(BreakerState.OPEN)
+
+    def release(self):
+        """Chamada liberada por allow() terminou sem resultado: devolve a vaga de teste"""
+        with self._lock:
+            if self.state == BreakerState.HALF_OPEN and self.trial_calls > 0:
+                self.trial_calls -= 1
+
+    def on_health(self, healthy: bool, error: Optional[str] = None):
+        """Resultado de um probe: fora do ar abre; de volta libera a chamada de teste"""
+        with self._lock:
+            if not healthy:
+                self.last_error = error
+                self.opened_at = self.clock()
+                self._transition(BreakerState.OPEN)
+            elif self.state == BreakerState.OPEN:
+                self._transition(BreakerState.HALF_OPEN)
+            elif self.state == BreakerState.HALF_OPEN:
+                # Vaga presa por uma chamada de teste perdida: o probe a renova
+                self.trial_calls = 0
+
+    def stats(self) -> Dict:
+        """Estado e contadores"""
+        with self._lock:
+            return {
+                "state": self.state.value,
+                "failures": self.failures,
+                "calls": self.calls,
+                "fast_fails": self.fast_fails,
+                "opens": self.opens,
+                "last_error": self.last_error,
+            }
+
+
+# ============================================================================
+# HEALTH CACHE
+# ============================================================================
+
+@dataclass
+class HealthStatus:
+    """Último probe de um serviço"""
+    healthy: bool
+    checked_at: float
+    latency: float
+    error: Optional[str] = None
+
+
+class HealthCache:
+    """
+    Saúde dos serviços, atualizada por probes de /health em background
+
+    Uso:
+        health = HealthCache()
+        health.register("core", "http://localhost:8150/health", breaker)
+        health.start()                        # no event loop
+        health.is_healthy("core")             # valor em cache, sem rede
+        await health.stop()
+    """
+
+    def __init__(self, interval: float = 30.0, unhealthy_interval: float = 5.0,
+                 timeout: float = 2.0, max_age: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self.unhealthy_interval = unhealthy_interval
+        self.timeout = timeout
+        self.max_age = max_age if max_age is not None else 2 * interval
+        self.clock = clock
+
+        self.urls: Dict[str, str] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.info_listeners: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self.status: Dict[str, HealthStatus] = {}
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Estatísticas
+        self.probes = 0
+
+    def register(self, name: str, url: str, breaker: Optional[CircuitBreaker] = None,
+                 on_info: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Serviço a vigiar (o circuito, se houver, recebe o resultado dos probes;
+        on_info recebe o JSON de cada probe saudável)
+        """
+        self.urls[name] = url
+        if breaker is not None:
+            self.breakers[name] = breaker
+        if on_info is not None:
+            self.info_listeners[name] = on_info
+
+    # ------------------------------------------------------------------
+    # Probes
+    # ------------------------------------------------------------------
+
+    async def probe(self, name: str) -> HealthStatus:
+        """GET /health de um serviço (timeout curto) e atualiza o cache"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        started = self.clock()
+        error = None
+        try:
+            async with self.session.get(self.urls[name],
+                                        timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                healthy = response.status == 200
+                if not healthy:
+                    error = f"HTTP {response.status}"
+                elif name in self.info_listeners:
+                    try:
+                        info = await response.json(content_type=None)
+                    except ValueError:   # /health sem JSON: nada a repassar
+                        info = None
+                    if isinstance(info, dict):
+                        self.info_listeners[name](info)
+        except Exception as e:
+            healthy = False
+            error = str(e) or type(e).__name__
+
+        self.probes += 1
+        status = HealthStatus(healthy=healthy, checked_at=self.clock(),
+                              latency=self.clock() - started, error=error)
+        self.status[name] = status
+        if name in self.breakers:
+            self.breakers[name].on_health(healthy, error)
+        return status
+
+    async def probe_all(self) -> Dict[str, HealthStatus]:
+        """Probe de todos os serviços em paralelo"""
+        names = list(self.urls)
+        results = await asyncio.gather(*(self.probe(name) for name in names))
+        return dict(zip(names, results))
+
+    def is_healthy(self, name: str) -> Optional[bool]:
+        """Saúde em cache (None = nunca verificado ou probe antigo demais)"""
+        status = self.status.get(name)
+        if status is None or self.clock() - status.checked_at > self.max_age:
+            return None
+        return status.healthy
+
+    async def check(self, name: str) -> bool:
+        """Saúde em cache; sem valor recente, faz o probe agora"""
+        healthy = self.is_healthy(name)
+        if healthy is None:
+            healthy = (await self.probe(name)).healthy
+        return healthy
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self) -> asyncio.Task:
+        """Inicia os probes periódicos como task no event loop atual"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="sage-health-probes")
+        return self._task
+
+    async def stop(self):
+        """Para os probes e fecha a sessão HTTP"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _run(self):
+        while True:
+            results = await self.probe_all()
+            # Serviço fora do ar é reavaliado mais cedo (volta detectada rápido)
+            degraded = any(not status.healthy for status in results.values())
+            await asyncio.sleep(self.unhealthy_interval if degraded else self.interval)
+
+    def stats(self) -> Dict:
+        """Saúde em cache por serviço"""
+        now = self.clock()
+        return {
+            "probes": self.probes,
+            "services": {
+                name: {
+                    "healthy": status.healthy,
+                    "age_seconds": round(now - status.checked_at, 1),
+                    "latency_ms": round(status.latency * 1000, 1),
+                    "error": status.error,
+                }
+                for name, status in self.status.items()
+            },
+        }
@@ -0,0 +1,239 @@
+"""
+🔁 CLICKUP SYNC - Sincronização incremental com o ClickUp
+=========================================================
+
+Motor de sincronização por lista, baseado em cursor:
+- Marca d'água por lista (maior date_updated visto) em sync_state
+- Syncs seguintes pedem só o que mudou (date_updated_gt + page):
+  o custo em requisições é proporcional às mudanças, não à lista
+- Todas as tarefas de uma sincronização entram em uma única transação,
+  junto com o avanço do cursor (falhou = cursor não anda)
+- Reconciliação periódica (varredura completa) remove localmente as
+  tarefas apagadas/arquivadas no ClickUp
+- date_closed vira completed_at: tarefas importadas já fechadas contam
+  no digest do dia em que foram fechadas, não no dia da sync
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..core.secretary_agent import ClickUpIntegration, MemorySystem
+
+
+SYNC_SOURCE = "clickup"
+
+# Status do ClickUp → status local
+STATUS_TYPES_DONE = {"closed", "done"}
+STATUS_IN_PROGRESS = {"in progress", "in review", "review"}
+
+# Prioridade do ClickUp → prioridade local
+PRIORITIES = {"urgent": "critical", "high": "high", "normal": "medium", "low": "low"}
+
+# Local → ClickUp (envio de tarefas criadas/alteradas aqui)
+CLICKUP_STATUSES = {"todo": "to do", "in_progress": "in progress", "done": "complete"}
+CLICKUP_PRIORITIES = {"critical": 1, "high": 2, "medium": 3, "low": 4}
+
+
+@dataclass
+class SyncResult:
+    """Resultado da sincronização de uma lista"""
+    list_id: str
+    project: str
+    full: bool
+    requests: int = 0
+    fetched: int = 0
+    upserted: int = 0
+    deleted: int = 0
+    cursor: Optional[str] = None
+
+
+def _iso_from_ms(value) -> Optional[str]:
+    if value in (None, ""):
+        return None
+    return datetime.fromtimestamp(int(value) / 1000).isoformat()
+
+
+def map_status(status: Optional[Dict]) -> str:
+    """Status do ClickUp ({"status": ..., "type": ...}) → todo/in_progress/done"""
+    status = status or {}
+    if status.get("type") in STATUS_TYPES_DONE:
+        return "done"
+    if (status.get("status") or "").lower() in STATUS_IN_PROGRESS:
+        return "in_progress"
+    return "todo"
+
+
+def map_priority(priority: Optional[Dict]) -> str:
+    """Prioridade do ClickUp → low/medium/high/critical"""
+    return PRIORITIES.get(((priority or {}).get("priority") or "").lower(), "medium")
+
+
+def to_clickup_status(status: str) -> str:
+    """Status local → status do ClickUp"""
+    return CLICKUP_STATUSES.get(status, status)
+
+
+def to_clickup_priority(priority: str) -> int:
+    """Prioridade local → prioridade numérica do ClickUp (1 = urgente)"""
+    return CLICKUP_PRIORITIES.get(priority, 3)
+
+
+class ClickUpSyncEngine:
+    """
+    Sincroniza listas do ClickUp com a tabela tasks
+
+    Uso:
+        engine = ClickUpSyncEngine(clickup, memory)
+        result = engine.sync_list("901100", project="Max-Code")
+    """
+
+    SQL_UPSERT_TASK = """
+        INSERT INTO tasks (id, title, description, project, status, priority,
+                           due_date, created_at, clickup_id, clickup_list, completed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            title = excluded.title, description = excluded.description,
+            status = excluded.status, priority = excluded.priority,
+            due_date = excluded.due_date, clickup_id = excluded.clickup_id,
+            clickup_list = excluded.clickup_list, completed_at = excluded.completed_at
+    """
+
+    def __init__(self, clickup: "ClickUpIntegration", memory: "MemorySystem",
+                 reconcile_interval: timedelta = timedelta(hours=24)):
+        self.clickup = clickup
+        self.memory = memory
+        self.reconcile_interval = reconcile_interval
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+
+    def get_state(self, list_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """(cursor, última varredura completa) de uma lista"""
+        with self.memory.db.read() as conn:
+            row = conn.execute(
+                "SELECT cursor, last_full_sync FROM sync_state WHERE source = ? AND scope = ?",
+                (SYNC_SOURCE, list_id)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def _needs_full_sync(self, last_full_sync: Optional[str], now: datetime) -> bool:
+        if last_full_sync is None:
+            return True
+        return now - datetime.fromisoformat(last_full_sync) >= self.reconcile_interval
+
+    # ------------------------------------------------------------------
+    # Sincronização
+    # ------------------------------------------------------------------
+
+    def sync_list(self, list_id: str, project: str, force_full: bool = False,
+                  now: Optional[datetime] = None) -> SyncResult:
+        """Sincroniza uma lista (incremental, ou completa quando devida)"""
+        now = now or datetime.now()
+        cursor, last_full_sync = self.get_state(list_id)
+        full = force_full or self._needs_full_sync(last_full_sync, now)
+        result = SyncResult(list_id=list_id, project=project, full=full, cursor=cursor)
+
+        # Incremental: "-1" para não perder tarefas atualizadas no mesmo milissegundo do cursor
+        since = None if full or cursor is None else int(cursor) - 1
+
+        remote: List[Dict] = []
+        page = 0
+        while True:
+            batch, last_page = self.clickup.get_tasks_page(list_id, page, date_updated_gt=since)
+            result.requests += 1
+            remote.extend(batch)
+            if last_page:
+                break
+            page += 1
+        result.fetched = len(remote)
+
+        updated = [int(t["date_updated"]) for t in remote if t.get("date_updated")]
+        if updated:
+            result.cursor = str(max(updated + ([int(cursor)] if cursor else [])))
+
+        with self.memory.db.transaction() as conn:
+            result.upserted = self._upsert(conn, list_id, project, remote)
+            if full:
+                result.deleted = self._reconcile(conn, list_id, {t["id"] for t in remote})
+            conn.execute("""
+                INSERT INTO sync_state (source, scope, cursor, last_full_sync, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (source, scope) DO UPDATE SET
+                    cursor = excluded.cursor,
+                    last_full_sync = COALESCE(excluded.last_full_sync, last_full_sync),
+                    updated_at = excluded.updated_at
+            """, (SYNC_SOURCE, list_id, result.cursor,
+                  now.isoformat() if full else None, now.isoformat()))
+
+        return result
+
+    def sync_lists(self, lists: Dict[str, str], force_full: bool = False) -> Dict[str, SyncResult]:
+        """Sincroniza várias listas (projeto → id da lista)"""
+        return {
+            project: self.sync_list(list_id, project, force_full=force_full)
+            for project, list_id in lists.items()
+        }
+
+    def apply_tasks(self, list_id: str, project: str, remote: List[Dict]) -> int:
+        """Grava tarefas recebidas fora da varredura (ex.: webhooks); não mexe no cursor"""
+        with self.memory.db.transaction() as conn:
+            return self._upsert(conn, list_id, project, remote)
+
+    def set_status(self, clickup_id: str, status: Optional[Dict]) -> int:
+        """Atualiza só o status de uma tarefa (evento taskStatusUpdated)"""
+        with self.memory.db.transaction() as conn:
+            return conn.execute("UPDATE tasks SET status = ? WHERE clickup_id = ?",
+                                (map_status(status), clickup_id)).rowcount
+
+    def delete_tasks(self, clickup_ids: List[str]) -> int:
+        """Remove tarefas apagadas no ClickUp"""
+        with self.memory.db.transaction() as conn:
+            return conn.execute(
+                "DELETE FROM tasks WHERE clickup_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(clickup_ids),)
+            ).rowcount
+
+    def _upsert(self, conn, list_id: str, project: str, remote: List[Dict]) -> int:
+        """Grava as tarefas remotas (executemany), reaproveitando o id local"""
+        if not remote:
+            return 0
+
+        clickup_ids = [t["id"] for t in remote]
+        local_ids = dict(conn.execute(
+            "SELECT clickup_id, id FROM tasks WHERE clickup_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(clickup_ids),)
+        ).fetchall())
+
+        rows = []
+        for task in remote:
+            status = map_status(task.get("status"))
+            rows.append((
+                local_ids.get(task["id"], f"clickup_{task['id']}"),
+                task.get("name") or "",
+                task.get("text_content") or task.get("description") or "",
+                project,
+                status,
+                map_priority(task.get("priority")),
+                _iso_from_ms(task.get("due_date")),
+                _iso_from_ms(task.get("date_created")) or datetime.now().isoformat(),
+                task["id"],
+                list_id,
+                _iso_from_ms(task.get("date_closed") or task.get("date_done")) if status == "done" else None,
+            ))
+        conn.executemany(self.SQL_UPSERT_TASK, rows)
+        return len(rows)
+
+    def _reconcile(self, conn, list_id: str, remote_ids: set) -> int:
+        """Remove tarefas locais da lista que não existem mais no ClickUp"""
+        return conn.execute("""
+            DELETE FROM tasks
+            WHERE clickup_list = ?
+              AND clickup_id NOT IN (SELECT value FROM json_each(?))
+        """, (list_id, json.dumps(sorted(remote_ids)))).rowcount
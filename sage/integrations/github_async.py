@@ -0,0 +1,230 @@
+"""
+🐙 GITHUB ASYNC - Sincronização paralela com o GitHub
+=====================================================
+
+Cliente asyncio (aiohttp) para sincronizar dezenas de repositórios:
+- Commits, issues e eventos de todos os projetos disparados de uma vez
+- Concorrência limitada por semáforo (e pelo conector do aiohttp)
+- Paginação pelo header Link: com rel="last", as páginas restantes
+  são buscadas em paralelo; sem ele, segue rel="next"
+- Retry com backoff e jitter em 429/5xx (mesma política do http.py)
+- Cache condicional opcional (ETag/Last-Modified): 304 servido do
+  cache, sem gastar o rate limit
+- Agendador de rate limit opcional (rate_limit.py), compartilhado
+  com as integrações síncronas
+
+O tempo total passa a ser limitado pelo repositório mais lento,
+não pela soma de todas as requisições.
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .http import HTTPConfig, RETRY_STATUSES
+from .http_cache import HTTPCache, parse_links
+from .rate_limit import RateLimitScheduler
+
+
+@dataclass
+class RepoSnapshot:
+    """Resultado da sincronização de um repositório"""
+    repo: str
+    commits: List[Dict] = field(default_factory=list)
+    issues: List[Dict] = field(default_factory=list)
+    events: List[Dict] = field(default_factory=list)
+    synced_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def open_issues(self) -> List[Dict]:
+        # A API de issues também devolve pull requests
+        return [i for i in self.issues if "pull_request" not in i]
+
+    @property
+    def last_activity(self) -> Optional[str]:
+        dates = [
+            ((c.get("commit") or {}).get("author") or {}).get("date") for c in self.commits
+        ] + [e.get("created_at") for e in self.events]
+        dates = [d for d in dates if d]
+        return max(dates) if dates else None
+
+
+class AsyncGitHubClient:
+    """
+    Cliente GitHub assíncrono com concorrência limitada
+
+    Uso:
+        async with AsyncGitHubClient("JuanCS-Dev", token) as github:
+            snapshots = await github.sync_repos(["Max-Code", "V-rtice"])
+    """
+
+    def __init__(self, username: str, token: Optional[str] = None,
+                 max_concurrency: int = 8, per_page: int = 100, max_pages: int = 10,
+                 base_url: str = "https://api.github.com",
+                 http_config: Optional[HTTPConfig] = None,
+                 cache: Optional[HTTPCache] = None,
+                 scheduler: Optional[RateLimitScheduler] = None):
+        self.username = username
+        self.token = token
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.per_page = per_page
+        self.max_pages = max_pages
+        self.config = http_config or HTTPConfig()
+        self.cache = cache
+        self.scheduler = scheduler
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Estatísticas
+        self.requests_made = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            headers = {"Accept": "application/vnd.github+json"}
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                trace_configs=[self.scheduler.trace_config()] if self.scheduler else None,
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.config.connect_timeout,
+                                              sock_read=self.config.read_timeout)
+            )
+        return self._session
+
+    async def close(self):
+        """Fecha o pool de conexões"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    # ------------------------------------------------------------------
+    # Transporte
+    # ------------------------------------------------------------------
+
+    async def _request(self, url: str, params: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """GET com retry e cache condicional; retorna (JSON, links do header Link)"""
+        session = self._get_session()
+
+        key, entry, conditional = None, None, {}
+        if self.cache is not None:
+            key = self.cache.key(url, params, self.token)
+            entry = await asyncio.to_thread(self.cache.lookup, key)
+            if entry is not None:
+                conditional = entry.conditional_headers()
+
+        for attempt in range(self.config.max_retries + 1):
+            async with self._semaphore:
+                self.requests_made += 1
+                try:
+                    async with session.get(url, params=params, headers=conditional) as response:
+                        if response.status == 304 and entry is not None:
+                            await asyncio.to_thread(self.cache.mark_revalidated, key)
+                            return entry.json(), parse_links(entry.headers.get("Link"))
+
+                        retryable = response.status in RETRY_STATUSES
+                        if not retryable or attempt == self.config.max_retries:
+                            response.raise_for_status()
+                            body = await response.read()
+                            if key is not None and response.status == 200:
+                                await asyncio.to_thread(self.cache.store, key, url, response.status,
+                                                        response.headers, body)
+                            return json.loads(body), parse_links(response.headers.get("Link"))
+                        retry_after = response.headers.get("Retry-After")
+                        throttled = response.status == 429
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == self.config.max_retries:
+                        raise
+                    retry_after, throttled = None, False
+
+            # Espera fora do semáforo para não segurar vaga de outra requisição
+            if self.scheduler is not None and throttled:
+                continue  # o agendador já bloqueou o host até o reset
+            if retry_after and retry_after.isdigit():
+                delay = float(retry_after)
+            else:
+                delay = random.uniform(0, min(self.config.backoff_max,
+                                              self.config.backoff_base * (2 ** attempt)))
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")
+
+    async def get_paginated(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """Todas as páginas de um endpoint de listagem (até max_pages)"""
+        url = f"{self.base_url}{path}"
+        params = {**(params or {}), "per_page": self.per_page}
+
+        first, links = await self._request(url, {**params, "page": 1})
+        items = list(first)
+
+        last = links.get("last")
+        if last is not None:
+            last_page = min(int(last.query.get("page", 1)), self.max_pages)
+            pages = await asyncio.gather(*(
+                self._request(url, {**params, "page": page})
+                for page in range(2, last_page + 1)
+            ))
+            for data, _ in pages:
+                items.extend(data)
+            return items
+
+        # Sem rel="last" (ex.: paginação por cursor): segue rel="next"
+        page = 1
+        while "next" in links and page < self.max_pages:
+            data, links = await self._request(str(links["next"]), {})
+            items.extend(data)
+            page += 1
+        return items
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    async def get_repo_commits(self, repo: str, days: int = 7) -> List[Dict]:
+        """Commits recentes de um repositório"""
+        # Meia-noite: URL estável ao longo do dia, o que permite o cache condicional
+        since = (datetime.now() - timedelta(days=days)).replace(
+            hour=0, minute=0, second=0, microsecond=0).isoformat()
+        return await self.get_paginated(f"/repos/{self.username}/{repo}/commits", {"since": since})
+
+    async def get_repo_issues(self, repo: str, state: str = "open") -> List[Dict]:
+        """Issues de um repositório"""
+        return await self.get_paginated(f"/repos/{self.username}/{repo}/issues", {"state": state})
+
+    async def get_repo_events(self, repo: str) -> List[Dict]:
+        """Eventos recentes de um repositório"""
+        return await self.get_paginated(f"/repos/{self.username}/{repo}/events")
+
+    async def sync_repo(self, repo: str, days: int = 7) -> RepoSnapshot:
+        """Commits, issues e eventos de um repositório, em paralelo"""
+        commits, issues, events = await asyncio.gather(
+            self.get_repo_commits(repo, days),
+            self.get_repo_issues(repo),
+            self.get_repo_events(repo),
+        )
+        return RepoSnapshot(repo=repo, commits=commits, issues=issues, events=events)
+
+    async def sync_repos(self, repos: List[str], days: int = 7) -> Dict[str, Any]:
+        """
+        Sincroniza todos os repositórios de uma vez
+        Retorna repo → RepoSnapshot (ou a exceção, se aquele repo falhou)
+        """
+        results = await asyncio.gather(
+            *(self.sync_repo(repo, days) for repo in repos), return_exceptions=True
+        )
+        return dict(zip(repos, results))
@@ -0,0 +1,181 @@
+"""
+🌐 HTTP - Sessões HTTP compartilhadas com pool de conexões
+==========================================================
+
+Camada de transporte das integrações (ClickUp, GitHub):
+- Session com keep-alive: a conexão TCP/TLS é reaproveitada entre chamadas
+- Tamanho do pool e limite de conexões por host configuráveis
+- Timeout padrão em toda requisição (conexão e leitura)
+- Retry com backoff exponencial e jitter em 429/5xx
+  (429 em qualquer método; 5xx só em métodos idempotentes)
+- Respeita Retry-After quando o servidor informa
+- Cache condicional opcional (ETag/Last-Modified, ver http_cache.py)
+- Agendador de rate limit opcional (ver rate_limit.py): com ele, o 429
+  volta para a fila do host em vez de ser repetido às cegas
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+if TYPE_CHECKING:
+    from .http_cache import HTTPCache
+    from .rate_limit import RateLimitScheduler
+
+
+# Códigos que justificam nova tentativa
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 5xx só é repetido nesses métodos (POST pode ter sido processado)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass
+class HTTPConfig:
+    """Configuração do pool, timeouts e retries"""
+    pool_connections: int = 10    # hosts distintos mantidos no pool
+    pool_maxsize: int = 10        # conexões simultâneas por host
+    pool_block: bool = False      # True = espera uma conexão livre em vez de abrir outra
+    connect_timeout: float = 3.05
+    read_timeout: float = 30.0
+    max_retries: int = 3
+    backoff_base: float = 0.5     # segundos
+    backoff_max: float = 30.0
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+class JitteredRetry(Retry):
+    """
+    Retry do urllib3 com "full jitter": espera aleatória em
+    [0, min(backoff_max, backoff_base * 2^n)], evitando que vários
+    clientes repitam em sincronia. 429 é repetido mesmo em POST,
+    pois o servidor recusou a requisição sem processá-la.
+    """
+
+    def __init__(self, *args, backoff_base: float = 0.5, backoff_cap: float = 30.0, **kwargs):
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        kwargs.setdefault("backoff_base", self.backoff_base)
+        kwargs.setdefault("backoff_cap", self.backoff_cap)
+        return super().new(**kwargs)
+
+    def get_backoff_time(self) -> float:
+        retries = len(self.history)
+        if retries == 0:
+            return 0.0
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** (retries - 1))))
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429:
+            # Sem 429 na lista, quem cuida é o agendador de rate limit
+            return bool(self.total) and 429 in (self.status_forcelist or ())
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def build_retry(config: HTTPConfig, retry_429: bool = True) -> JitteredRetry:
+    """
+    Política de retry a partir da configuração
+    retry_429=False deixa o 429 para o agendador de rate limit
+    """
+    return JitteredRetry(
+        total=config.max_retries,
+        connect=config.max_retries,
+        read=config.max_retries,
+        status=config.max_retries,
+        status_forcelist=RETRY_STATUSES if retry_429 else RETRY_STATUSES - {429},
+        allowed_methods=IDEMPOTENT_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # a última resposta (ex.: 429) volta para quem chamou
+        backoff_base=config.backoff_base,
+        backoff_cap=config.backoff_max,
+    )
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session com pool, timeout padrão, retry, cache condicional
+    e rate limit por host
+
+    Uso:
+        session = PooledSession(headers={"Authorization": token}, cache=cache,
+                                scheduler=scheduler)
+        response = session.get(url)     # reaproveita a conexão
+        response.from_cache             # True se veio de um 304
+        session.close()
+    """
+
+    def __init__(self, config: Optional[HTTPConfig] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 cache: Optional["HTTPCache"] = None,
+                 scheduler: Optional["RateLimitScheduler"] = None):
+        super().__init__()
+        self.config = config or HTTPConfig()
+        self.cache = cache
+        self.scheduler = scheduler
+        if headers:
+            self.headers.update(headers)
+
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+            max_retries=build_retry(self.config, retry_429=scheduler is None),
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def _send(self, method, url, **kwargs):
+        """Envia passando pelo agendador: espera a vez e reenfileira em 429"""
+        if self.scheduler is None:
+            return super().request(method, url, **kwargs)
+
+        for attempt in range(self.config.max_retries + 1):
+            self.scheduler.acquire(url)
+            response = super().request(method, url, **kwargs)
+            self.scheduler.observe(url, response.status_code, response.headers)
+            if response.status_code != 429 or attempt == self.config.max_retries:
+                return response
+            response.close()
+        return response
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.config.timeout)
+        if self.cache is None or method.upper() != "GET":
+            return self._send(method, url, **kwargs)
+
+        headers = dict(kwargs.get("headers") or {})
+        credential = headers.get("Authorization") or self.headers.get("Authorization")
+        key = self.cache.key(url, kwargs.get("params"), credential)
+        entry = self.cache.lookup(key)
+        if entry is not None:
+            kwargs["headers"] = {**headers, **entry.conditional_headers()}
+
+        response = self._send(method, url, **kwargs)
+        response.from_cache = False
+
+        if response.status_code == 304 and entry is not None:
+            # Corpo e cabeçalhos do cache; os do 304 (rate limit etc.) prevalecem
+            self.cache.mark_revalidated(key)
+            response.status_code = entry.status
+            response._content = entry.body
+            merged = requests.structures.CaseInsensitiveDict({**entry.headers, **response.headers})
+            merged.pop("Content-Length", None)
+            response.headers = merged
+            response.from_cache = True
+        elif response.status_code == 200:
+            self.cache.store(key, url, response.status_code, response.headers, response.content)
+
+        return response
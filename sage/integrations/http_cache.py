@@ -0,0 +1,197 @@
+"""
+🗂️ HTTP CACHE - Cache persistente de requisições condicionais
+=============================================================
+
+Cache de respostas GET no mesmo SQLite da memória (tabela http_cache):
+- Chave: URL + parâmetros (+ credencial, para não misturar usuários)
+- Guarda ETag/Last-Modified, cabeçalhos e corpo (comprimido)
+- Próximas requisições enviam If-None-Match / If-Modified-Since;
+  um 304 é servido do cache (e não conta no rate limit do GitHub)
+- Remoção por idade e por tamanho total (menos usados primeiro)
+
+Usado pela PooledSession (requests) e pelo AsyncGitHubClient (aiohttp).
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+from requests.utils import parse_header_links
+from yarl import URL
+
+from ..core.context_store import DEFAULT_CODEC, compress, decompress
+from ..core.database import ConnectionManager
+
+
+# Cabeçalhos da resposta original que valem a pena guardar
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+
+def parse_links(link_header: Optional[str]) -> Dict[str, URL]:
+    """Header Link → {rel: URL}"""
+    if not link_header:
+        return {}
+    return {
+        link["rel"]: URL(link["url"])
+        for link in parse_header_links(link_header)
+        if "rel" in link and "url" in link
+    }
+
+
+@dataclass
+class CachedResponse:
+    """Uma resposta guardada no cache"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Cabeçalhos de revalidação para a próxima requisição"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class HTTPCache:
+    """
+    Cache HTTP condicional persistido no SQLite
+
+    Uso:
+        cache = HTTPCache(memory.db)
+        session = PooledSession(cache=cache)
+        cache.stats()   # revalidações (304), armazenamentos, remoções
+    """
+
+    def __init__(self, db: ConnectionManager, max_bytes: int = 50 * 1024 * 1024,
+                 max_age_days: int = 30, evict_every: int = 100, codec: str = DEFAULT_CODEC):
+        self.db = db
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.evict_every = evict_every
+        self.codec = codec
+
+        self._lock = threading.Lock()
+        self._stores_since_evict = 0
+
+        # Estatísticas
+        self.lookups = 0
+        self.revalidated = 0   # 304 servidos do cache
+        self.stored = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[Any] = None,
+            credential: Optional[str] = None) -> str:
+        """Chave estável para URL + parâmetros (+ credencial)"""
+        pairs = params.items() if hasattr(params, "items") else (params or [])
+        query = urlencode(sorted((str(k), str(v)) for k, v in pairs))
+        scope = hashlib.sha256(credential.encode()).hexdigest()[:16] if credential else ""
+        return hashlib.sha256(f"GET {url}?{query} {scope}".encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Entrada do cache para a chave (ou None)"""
+        self.lookups += 1
+        with self.db.read() as conn:
+            row = conn.execute("""
+                SELECT url, status, headers, codec, body, etag, last_modified
+                FROM http_cache WHERE key = ?
+            """, (key,)).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(
+            url=row[0], status=row[1], headers=json.loads(row[2]),
+            body=decompress(row[4], row[3]), etag=row[5], last_modified=row[6]
+        )
+
+    def store(self, key: str, url: str, status: int, headers: Mapping[str, str], body: bytes) -> bool:
+        """Guarda a resposta, se ela tiver validadores (ETag/Last-Modified)"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+
+        now = datetime.now().isoformat()
+        kept = {name: headers[name] for name in STORED_HEADERS if name in headers}
+        data = compress(body, self.codec)
+        with self.db.transaction() as conn:
+            conn.execute("""
+                INSERT INTO http_cache (key, url, status, headers, codec, body, size,
+                                        etag, last_modified, stored_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    url = excluded.url, status = excluded.status, headers = excluded.headers,
+                    codec = excluded.codec, body = excluded.body, size = excluded.size,
+                    etag = excluded.etag, last_modified = excluded.last_modified,
+                    stored_at = excluded.stored_at, last_used = excluded.last_used
+            """, (key, url, status, json.dumps(kept), self.codec, data, len(data),
+                  etag, last_modified, now, now))
+
+        self.stored += 1
+        with self._lock:
+            self._stores_since_evict += 1
+            due = self._stores_since_evict >= self.evict_every
+            if due:
+                self._stores_since_evict = 0
+        if due:
+            self.evict()
+        return True
+
+    def mark_revalidated(self, key: str):
+        """Registra um 304: a entrada continua válida e foi usada agora"""
+        self.revalidated += 1
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE http_cache SET last_used = ? WHERE key = ?",
+                         (datetime.now().isoformat(), key))
+
+    def evict(self, now: Optional[datetime] = None) -> int:
+        """Remove entradas antigas e, acima de max_bytes, as menos usadas"""
+        cutoff = ((now or datetime.now()) - timedelta(days=self.max_age_days)).isoformat()
+        with self.db.transaction() as conn:
+            removed = conn.execute("DELETE FROM http_cache WHERE last_used < ?", (cutoff,)).rowcount
+            removed += conn.execute("""
+                DELETE FROM http_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running
+                        FROM http_cache
+                    ) WHERE running > ?
+                )
+            """, (self.max_bytes,)).rowcount
+        self.evicted += removed
+        return removed
+
+    def clear(self):
+        """Esvazia o cache"""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM http_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso"""
+        with self.db.read() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "lookups": self.lookups,
+            "revalidated": self.revalidated,
+            "stored": self.stored,
+            "evicted": self.evicted,
+            "revalidation_rate": f"{self.revalidated / self.lookups * 100:.1f}%" if self.lookups else "0.0%",
+        }
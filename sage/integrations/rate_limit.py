@@ -0,0 +1,368 @@
+"""
+🚦 RATE LIMIT - Agendador de requisições por host
+=================================================
+
+Token bucket por host, compartilhado por todas as integrações
+(ClickUp, GitHub, MABA, MAXIMUS Core):
+- Orçamento padrão por host (ex.: ClickUp 100/min, GitHub 5000/h)
+- Aprende com as respostas: X-RateLimit-Limit/Remaining/Reset e
+  Retry-After ajustam o bucket e bloqueiam o host até o reset; Limit e
+  Reset redefinem capacidade e taxa (limit / janela), então um plano
+  maior (ou menor) que o padrão passa a valer na hora
+- Em vez de falhar com 429, a requisição espera na fila do host
+- Fila com prioridade: chamadas interativas passam na frente da
+  sincronização em background, que também não consome a reserva
+  final do orçamento
+- Métricas: profundidade da fila, tempo de espera, 429 recebidos
+
+Funciona com requests (acquire, bloqueante) e aiohttp
+(acquire_async / trace_config).
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+class Priority(IntEnum):
+    """Prioridade na fila do host (menor = atendida antes)"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Prioridade das requisições feitas no contexto atual (thread / task asyncio)
+_current_priority: ContextVar[Priority] = ContextVar("sage_request_priority",
+                                                     default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """
+    Define a prioridade das requisições feitas dentro do bloco
+
+    Uso:
+        with request_priority(Priority.BACKGROUND):
+            engine.sync_lists(lists)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+@dataclass
+class HostLimit:
+    """Orçamento de um host: capacity requisições, repostas a rate/s"""
+    rate: float
+    capacity: float
+    reserve: float = 0.1   # fração final do orçamento só para chamadas interativas
+
+
+# Limites conhecidos (aprendidos/ajustados depois pelos cabeçalhos)
+DEFAULT_LIMITS: Dict[str, HostLimit] = {
+    "api.clickup.com": HostLimit(rate=100 / 60, capacity=100),
+    "api.github.com": HostLimit(rate=5000 / 3600, capacity=5000),
+}
+
+# Hosts sem limite conhecido (serviços locais: MABA, Core)
+DEFAULT_HOST_LIMIT = HostLimit(rate=50.0, capacity=50, reserve=0.0)
+
+
+def host_of(url: Any) -> str:
+    """host[:porta] de uma URL (str ou yarl.URL)"""
+    return urlsplit(str(url)).netloc.lower()
+
+
+class _HostState:
+    """Bucket, fila e métricas de um host (protegido pelo lock do agendador)"""
+
+    def __init__(self, limit: HostLimit, now: float):
+        self.rate = limit.rate
+        self.capacity = float(limit.capacity)
+        self.window = limit.capacity / limit.rate   # janela do orçamento (s)
+        self.reserve_fraction = limit.reserve
+        self.tokens = float(limit.capacity)
+        self.updated = now
+        self.blocked_until = 0.0
+        self.reset_epoch: Optional[float] = None
+        self.remaining: Optional[int] = None
+        self.consecutive_429 = 0
+        self.waiting: List[tuple] = []   # heap de (prioridade, seq)
+
+        # Métricas
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+        self.throttled = 0
+
+    @property
+    def reserve(self) -> float:
+        return self.capacity * self.reserve_fraction
+
+    def refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, ticket: tuple, now: float) -> float:
+        """0 se o ticket pode sair agora, senão quanto esperar (estimativa)"""
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        position = sum(1 for other in self.waiting if other < ticket)
+        floor = self.reserve if ticket[0] == Priority.BACKGROUND else 0.0
+        needed = floor + position + 1
+        if position == 0 and self.tokens >= needed:
+            return 0.0
+        return max((needed - self.tokens) / self.rate, 0.001)
+
+
+class RateLimitScheduler:
+    """
+    Agendador token-bucket por host, compartilhado pelas integrações
+
+    Uso:
+        scheduler = RateLimitScheduler()
+        waited = scheduler.acquire(url)                 # antes de enviar
+        scheduler.observe(url, status, headers)         # depois da resposta
+
+        session = aiohttp.ClientSession(trace_configs=[scheduler.trace_config()])
+        scheduler.stats()   # fila, esperas e 429 por host
+    """
+
+    def __init__(self, limits: Optional[Dict[str, HostLimit]] = None,
+                 default_limit: HostLimit = DEFAULT_HOST_LIMIT,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.default_limit = default_limit
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._hosts: Dict[str, _HostState] = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+
+    # ------------------------------------------------------------------
+    # Estado por host
+    # ------------------------------------------------------------------
+
+    def _state(self, host: str, now: float) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.limits.get(host, self.default_limit), now)
+        return state
+
+    def _enqueue(self, host: str, priority: Optional[Priority]) -> tuple:
+        ticket = (int(priority if priority is not None else _current_priority.get()), next(self._seq))
+        with self._cond:
+            state = self._state(host, time.monotonic())
+            heapq.heappush(state.waiting, ticket)
+            state.max_queue_depth = max(state.max_queue_depth, len(state.waiting))
+        return ticket
+
+    def _try_take(self, host: str, ticket: tuple) -> float:
+        """Com o lock: consome um token (retorna 0) ou retorna a espera"""
+        now = time.monotonic()
+        state = self._hosts[host]
+        delay = state.delay(ticket, now)
+        if delay == 0.0:
+            heapq.heappop(state.waiting)
+            state.tokens -= 1
+            state.requests += 1
+            if state.remaining is not None:
+                state.remaining -= 1
+            self._cond.notify_all()
+        return delay
+
+    def _leave(self, host: str, ticket: tuple):
+        """Remove um ticket abandonado (cancelamento/timeout)"""
+        with self._cond:
+            state = self._hosts[host]
+            if ticket in state.waiting:
+                state.waiting.remove(ticket)
+                heapq.heapify(state.waiting)
+                self._cond.notify_all()
+
+    def _record_wait(self, host: str, waited: float):
+        with self._cond:
+            state = self._hosts[host]
+            if waited > 0.001:
+                state.waited += 1
+                state.total_wait += waited
+                state.max_wait = max(state.max_wait, waited)
+
+    # ------------------------------------------------------------------
+    # Aquisição
+    # ------------------------------------------------------------------
+
+    def acquire(self, url: Any, priority: Optional[Priority] = None) -> float:
+        """Espera (bloqueando) a vez da requisição; retorna o tempo esperado"""
+        host = host_of(url)
+        ticket = self._enqueue(host, priority)
+        start = time.monotonic()
+        try:
+            with self._cond:
+                while True:
+                    delay = self._try_take(host, ticket)
+                    if delay == 0.0:
+                        break
+                    self._cond.wait(delay)
+        except BaseException:
+            self._leave(host, ticket)
+            raise
+        waited = time.monotonic() - start
+        self._record_wait(host, waited)
+        return waited
+
+    async def acquire_async(self, url: Any, priority: Optional[Priority] = None) -> float:
+        """Versão asyncio de acquire (não bloqueia o event loop)"""
+        host = host_of(url)
+        ticket = self._enqueue(host, priority)
+        start = time.monotonic()
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_take(host, ticket)
+                if delay == 0.0:
+                    break
+                # Reavalia com frequência: a fila anda quando outros saem
+                await asyncio.sleep(min(delay, 0.05))
+        except BaseException:
+            self._leave(host, ticket)
+            raise
+        waited = time.monotonic() - start
+        self._record_wait(host, waited)
+        return waited
+
+    # ------------------------------------------------------------------
+    # Aprendizado pelos cabeçalhos
+    # ------------------------------------------------------------------
+
+    def observe(self, url: Any, status: int, headers: Mapping[str, str]):
+        """Ajusta o bucket do host a partir da resposta"""
+        host = host_of(url)
+        now = time.monotonic()
+        wall = time.time()
+
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        retry_after = _int_header(headers, "Retry-After")
+
+        with self._cond:
+            state = self._state(host, now)
+            state.refill(now)
+
+            # Capacidade e taxa seguem o limite anunciado; a janela é pelo
+            # menos o tempo que falta para o reset
+            if reset is not None and reset > wall:
+                state.window = max(state.window, reset - wall)
+            if limit:
+                state.capacity = float(limit)
+                state.tokens = min(state.tokens, state.capacity)
+            if limit or reset is not None:
+                state.rate = state.capacity / state.window
+            if remaining is not None:
+                new_window = reset is not None and (state.reset_epoch is None or reset > state.reset_epoch)
+                state.tokens = float(remaining) if new_window else min(state.tokens, float(remaining))
+                state.remaining = remaining
+            if reset is not None:
+                state.reset_epoch = float(reset)
+                if remaining == 0:
+                    state.blocked_until = max(state.blocked_until, now + max(reset - wall, 0.0))
+
+            if status == 429:
+                state.throttled += 1
+                state.consecutive_429 += 1
+                if retry_after is not None:
+                    wait = float(retry_after)
+                elif reset is not None and reset > wall:
+                    wait = reset - wall
+                else:
+                    wait = min(self.backoff_max,
+                               self.backoff_base * (2 ** (state.consecutive_429 - 1)))
+                state.blocked_until = max(state.blocked_until, now + wait)
+                state.tokens = min(state.tokens, 0.0)
+            else:
+                state.consecutive_429 = 0
+
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # aiohttp
+    # ------------------------------------------------------------------
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """TraceConfig que agenda toda requisição de uma ClientSession"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            await self.acquire_async(params.url)
+
+        async def on_request_end(session, context, params):
+            self.observe(params.url, params.response.status, params.response.headers)
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+
+    def queue_depth(self, url_or_host: str) -> int:
+        """Requisições esperando na fila do host"""
+        host = host_of(url_or_host) if "://" in url_or_host else url_or_host
+        with self._cond:
+            state = self._hosts.get(host)
+            return len(state.waiting) if state else 0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas por host"""
+        now = time.monotonic()
+        with self._cond:
+            report = {}
+            for host, state in self._hosts.items():
+                state.refill(now)
+                report[host] = {
+                    "queue_depth": len(state.waiting),
+                    "max_queue_depth": state.max_queue_depth,
+                    "requests": state.requests,
+                    "waited": state.waited,
+                    "avg_wait": state.total_wait / state.waited if state.waited else 0.0,
+                    "max_wait": state.max_wait,
+                    "throttled": state.throttled,
+                    "tokens": round(state.tokens, 2),
+                    "capacity": state.capacity,
+                    "rate": state.rate,
+                    "remaining": state.remaining,
+                    "blocked_for": max(state.blocked_until - now, 0.0),
+                }
+            return report
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,393 @@
+"""
+📬 WEBHOOKS - Receptor local de eventos do GitHub e do ClickUp
+==============================================================
+
+Servidor aiohttp que recebe os webhooks e aplica cada evento como
+delta na memória, sem esperar o próximo polling:
+- GitHub: push (commits → contadores diários e recent_commits),
+  issues (open_issues +1/-1)
+- ClickUp: taskCreated/taskUpdated/... (upsert da tarefa),
+  taskStatusUpdated (só o status), taskDeleted
+- Assinaturas HMAC-SHA256 validadas (X-Hub-Signature-256 / X-Signature)
+- Reentregas ignoradas pelo delivery id (tabela webhook_deliveries);
+  se a aplicação falhar, o id é liberado para a próxima tentativa
+
+EventReplayer assina e reenvia eventos gravados (testes e depuração).
+
+Autor: MAXIMUS AI
+Data: 18 de Outubro de 2026
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
+
+import aiohttp
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from ..core.secretary_agent import ClickUpIntegration, MemorySystem
+    from .clickup_sync import ClickUpSyncEngine
+
+
+GITHUB_PATH = "/webhooks/github"
+CLICKUP_PATH = "/webhooks/clickup"
+
+# Eventos de tarefa do ClickUp que exigem buscar a tarefa completa
+CLICKUP_FETCH_EVENTS = {"taskCreated", "taskUpdated", "taskMoved", "taskPriorityUpdated",
+                        "taskAssigneeUpdated", "taskDueDateUpdated"}
+
+# Ações de issue → delta em open_issues
+ISSUE_DELTAS = {"opened": 1, "reopened": 1, "closed": -1}
+
+
+def _parse(body: bytes) -> Optional[Dict]:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def sign(secret: str, body: bytes) -> str:
+    """HMAC-SHA256 hexadecimal do corpo"""
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: Optional[str], body: bytes, signature: Optional[str]) -> bool:
+    """Compara a assinatura em tempo constante (aceita o prefixo sha256=)"""
+    if not secret or not signature:
+        return False
+    if signature.startswith("sha256="):
+        signature = signature[len("sha256="):]
+    return hmac.compare_digest(sign(secret, body), signature)
+
+
+class WebhookReceiver:
+    """
+    Receptor de webhooks que aplica eventos como deltas
+
+    Uso:
+        receiver = WebhookReceiver(memory, agent.projects, clickup=agent.clickup,
+                                   clickup_sync=agent.clickup_sync,
+                                   github_secret="...", clickup_secret="...")
+        url = await receiver.start(port=8160)
+        ...
+        await receiver.stop()
+    """
+
+    def __init__(self, memory: "MemorySystem", projects: Dict[str, Dict],
+                 clickup: Optional["ClickUpIntegration"] = None,
+                 clickup_sync: Optional["ClickUpSyncEngine"] = None,
+                 github_secret: Optional[str] = None,
+                 clickup_secret: Optional[str] = None,
+                 retention_days: int = 7):
+        self.memory = memory
+        self.projects = projects
+        self.clickup = clickup
+        self.clickup_sync = clickup_sync
+        self.github_secret = github_secret
+        self.clickup_secret = clickup_secret
+        self.retention_days = retention_days
+
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+        # Estatísticas
+        self.received = 0
+        self.applied = 0
+        self.ignored = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.github_secret or self.clickup_secret)
+
+    # ------------------------------------------------------------------
+    # Servidor
+    # ------------------------------------------------------------------
+
+    def app(self) -> web.Application:
+        """Aplicação aiohttp com as duas rotas"""
+        app = web.Application()
+        app.router.add_post(GITHUB_PATH, self.handle_github)
+        app.router.add_post(CLICKUP_PATH, self.handle_clickup)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8160) -> str:
+        """Sobe o servidor; retorna a URL base (port=0 escolhe uma porta livre)"""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self.url = f"http://{host}:{self._runner.addresses[0][1]}"
+        return self.url
+
+    async def stop(self):
+        """Derruba o servidor"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_github(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        if not verify_signature(self.github_secret, body, request.headers.get("X-Hub-Signature-256")):
+            return self._reject()
+        payload = _parse(body)
+        if payload is None:
+            return web.json_response({"status": "invalid"}, status=400)
+        event = request.headers.get("X-GitHub-Event", "")
+        delivery_id = request.headers.get("X-GitHub-Delivery") or hashlib.sha256(body).hexdigest()
+        return await self._process("github", f"github:{delivery_id}", event, payload, self.apply_github)
+
+    async def handle_clickup(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        if not verify_signature(self.clickup_secret, body, request.headers.get("X-Signature")):
+            return self._reject()
+        payload = _parse(body)
+        if payload is None:
+            return web.json_response({"status": "invalid"}, status=400)
+        delivery_id = f"clickup:{self.clickup_delivery_id(payload, body)}"
+        return await self._process("clickup", delivery_id, payload.get("event", ""), payload,
+                                   self.apply_clickup)
+
+    def _reject(self) -> web.Response:
+        self.rejected += 1
+        return web.json_response({"status": "invalid signature"}, status=401)
+
+    async def _process(self, source: str, delivery_id: str, event: str, payload: Dict,
+                       apply: Callable[[str, Dict], Tuple[str, Optional[str]]]) -> web.Response:
+        """Deduplica, aplica (em thread, fora do event loop) e registra a entrega"""
+        self.received += 1
+        if not await asyncio.to_thread(self._claim, delivery_id, source, event):
+            self.duplicates += 1
+            return web.json_response({"status": "duplicate"})
+
+        try:
+            status, project = await asyncio.to_thread(apply, event, payload)
+        except Exception as e:
+            self.failed += 1
+            await asyncio.to_thread(self._release, delivery_id)
+            print(f"⚠️  Webhook {source}/{event} falhou: {e}")
+            return web.json_response({"status": "error"}, status=500)
+
+        await asyncio.to_thread(self._finish, delivery_id, status)
+        if status == "applied":
+            self.applied += 1
+        else:
+            self.ignored += 1
+        return web.json_response({"status": status, "project": project})
+
+    # ------------------------------------------------------------------
+    # Deduplicação
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def clickup_delivery_id(payload: Dict, body: bytes) -> str:
+        """ClickUp não manda delivery id: usa webhook + ids do histórico"""
+        history = [str(item.get("id")) for item in payload.get("history_items") or [] if item.get("id")]
+        if history:
+            return f"{payload.get('webhook_id')}:{payload.get('event')}:{','.join(history)}"
+        return hashlib.sha256(body).hexdigest()
+
+    def _claim(self, delivery_id: str, source: str, event: str) -> bool:
+        """Reserva o delivery id; False se já foi recebido"""
+        now = datetime.now()
+        with self.memory.db.transaction() as conn:
+            claimed = conn.execute("""
+                INSERT OR IGNORE INTO webhook_deliveries (delivery_id, source, event, received_at, status)
+                VALUES (?, ?, ?, ?, 'processing')
+            """, (delivery_id, source, event, now.isoformat())).rowcount == 1
+            if claimed and self.received % 100 == 0:
+                cutoff = (now - timedelta(days=self.retention_days)).isoformat()
+                conn.execute("DELETE FROM webhook_deliveries WHERE received_at < ?", (cutoff,))
+        return claimed
+
+    def _release(self, delivery_id: str):
+        with self.memory.db.transaction() as conn:
+            conn.execute("DELETE FROM webhook_deliveries WHERE delivery_id = ?", (delivery_id,))
+
+    def _finish(self, delivery_id: str, status: str):
+        with self.memory.db.transaction() as conn:
+            conn.execute("UPDATE webhook_deliveries SET status = ? WHERE delivery_id = ?",
+                         (status, delivery_id))
+
+    # ------------------------------------------------------------------
+    # Aplicação dos eventos (rodam em thread)
+    # ------------------------------------------------------------------
+
+    def _project_for_repo(self, repo: Optional[str]) -> Optional[str]:
+        for name, info in self.projects.items():
+            if info.get("github") == repo:
+                return name
+        return None
+
+    def _project_for_list(self, list_id: Optional[str]) -> Optional[str]:
+        for name, info in self.projects.items():
+            if list_id and info.get("clickup_list") == list_id:
+                return name
+        return None
+
+    def apply_github(self, event: str, payload: Dict) -> Tuple[str, Optional[str]]:
+        """Evento do GitHub → (status, projeto)"""
+        repository = payload.get("repository") or {}
+        project = self._project_for_repo(repository.get("name"))
+        if project is None:
+            return "ignored", None
+
+        if event == "push":
+            default_branch = repository.get("default_branch")
+            if default_branch and payload.get("ref") != f"refs/heads/{default_branch}":
+                return "ignored", project
+            commits = [
+                {"sha": c["id"], "commit": {"message": c.get("message", ""),
+                                            "author": {"name": (c.get("author") or {}).get("name"),
+                                                       "date": c.get("timestamp")}}}
+                for c in payload.get("commits") or [] if c.get("id")
+            ]
+            self.memory.record_commits(project, commits)
+            self.memory.apply_github_delta(
+                project, repository.get("name"),
+                commits=[
+                    {"sha": c["sha"], "message": c["commit"]["message"].split("\n")[0],
+                     "author": c["commit"]["author"]["name"], "date": c["commit"]["author"]["date"]}
+                    for c in reversed(commits)   # o push lista do mais antigo ao mais novo
+                ],
+                activity_at=max(filter(None, (c["commit"]["author"]["date"] for c in commits)), default=None)
+            )
+            return "applied", project
+
+        if event == "issues":
+            issue = payload.get("issue") or {}
+            action = payload.get("action")
+            delta = ISSUE_DELTAS.get(action, 0)
+            if action == "deleted" and issue.get("state") == "open":
+                delta = -1
+            if not delta or "pull_request" in issue:
+                return "ignored", project
+            self.memory.apply_github_delta(project, repository.get("name"),
+                                           open_issues_delta=delta,
+                                           activity_at=issue.get("updated_at"))
+            return "applied", project
+
+        return "ignored", project
+
+    def apply_clickup(self, event: str, payload: Dict) -> Tuple[str, Optional[str]]:
+        """Evento do ClickUp → (status, projeto)"""
+        if self.clickup_sync is None:
+            return "ignored", None
+        task_id = payload.get("task_id")
+        if not task_id:
+            return "ignored", None
+
+        if event == "taskDeleted":
+            return ("applied" if self.clickup_sync.delete_tasks([task_id]) else "ignored"), None
+
+        if event == "taskStatusUpdated":
+            after = next((item.get("after") for item in payload.get("history_items") or []
+                          if item.get("field") == "status"), None)
+            if isinstance(after, dict) and self.clickup_sync.set_status(task_id, after):
+                return "applied", None
+            event = "taskUpdated"   # tarefa ainda não existe aqui: busca completa
+
+        if event in CLICKUP_FETCH_EVENTS and self.clickup is not None:
+            task = self.clickup.get_task(task_id)
+            list_id = (task.get("list") or {}).get("id")
+            project = self._project_for_list(list_id)
+            if project is None:
+                return "ignored", None
+            self.clickup_sync.apply_tasks(list_id, project, [task])
+            return "applied", project
+
+        return "ignored", None
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de recebimento"""
+        return {
+            "received": self.received,
+            "applied": self.applied,
+            "ignored": self.ignored,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+
+# ============================================================================
+# EVENT REPLAYER
+# ============================================================================
+
+class EventReplayer:
+    """
+    Reenvia eventos (assinados) para um receptor local
+
+    Uso:
+        replayer = EventReplayer(receiver.url, github_secret="...", clickup_secret="...")
+        await replayer.github("push", payload, delivery_id="d-1")
+        await replayer.replay_file("eventos.jsonl")
+        await replayer.close()
+
+    Formato do arquivo: uma linha JSON por evento
+        {"source": "github", "event": "push", "delivery_id": "...", "payload": {...}}
+        {"source": "clickup", "payload": {...}}
+    """
+
+    def __init__(self, base_url: str, github_secret: Optional[str] = None,
+                 clickup_secret: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.github_secret = github_secret
+        self.clickup_secret = clickup_secret
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _post(self, path: str, body: bytes, headers: Mapping[str, str]) -> Tuple[int, Dict]:
+        async with self._get_session().post(f"{self.base_url}{path}", data=body,
+                                            headers={"Content-Type": "application/json",
+                                                     **headers}) as response:
+            return response.status, await response.json()
+
+    async def github(self, event: str, payload: Dict, delivery_id: Optional[str] = None,
+                     secret: Optional[str] = None) -> Tuple[int, Dict]:
+        """Envia um evento do GitHub; retorna (status HTTP, resposta)"""
+        body = json.dumps(payload).encode()
+        return await self._post(GITHUB_PATH, body, {
+            "X-GitHub-Event": event,
+            "X-GitHub-Delivery": delivery_id or str(uuid.uuid4()),
+            "X-Hub-Signature-256": "sha256=" + sign(secret or self.github_secret or "", body),
+        })
+
+    async def clickup(self, payload: Dict, secret: Optional[str] = None) -> Tuple[int, Dict]:
+        """Envia um evento do ClickUp; retorna (status HTTP, resposta)"""
+        body = json.dumps(payload).encode()
+        return await self._post(CLICKUP_PATH, body, {
+            "X-Signature": sign(secret or self.clickup_secret or "", body),
+        })
+
+    async def replay(self, events: List[Dict]) -> List[Tuple[int, Dict]]:
+        """Reenvia eventos em ordem"""
+        results = []
+        for event in events:
+            if event["source"] == "github":
+                results.append(await self.github(event["event"], event["payload"], event.get("delivery_id")))
+            else:
+                results.append(await self.clickup(event["payload"]))
+        return results
+
+    async def replay_file(self, path: str) -> List[Tuple[int, Dict]]:
+        """Reenvia os eventos de um arquivo JSONL"""
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+        return await self.replay([json.loads(line) for line in lines if line.strip()])
@@ -0,0 +1,6 @@
+"""
+Core Tests
+===========
+
+Test suite for SAGE core modules (memory, agents, reasoning).
+"""
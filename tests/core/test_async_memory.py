@@ -0,0 +1,142 @@
+"""
+Async Memory System Tests
+==========================
+
+Test suite for the awaitable MemorySystem facade.
+
+Test Coverage:
+- Read/write round trips from coroutines
+- Write ordering on the dedicated DB thread
+- Event loop stays responsive during slow DB writes
+- Adoption by the async Sage code paths
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web, ClientSession
+from aiohttp.test_utils import TestServer
+
+from sage.core.async_memory import AsyncMemorySystem
+from sage.core.secretary_agent import MemorySystem, Note
+from sage.core.sage import Sage
+
+
+def make_note(i: int) -> Note:
+    ts = f"2026-10-18T10:00:{i:02d}"
+    return Note(id=f"note_{i}", content=f"Nota {i}", tags=[], project="Max-Code",
+                created_at=ts, updated_at=ts, priority="low")
+
+
+class SlowMemorySystem(MemorySystem):
+    """MemorySystem whose writes stall like a slow fsync."""
+
+    write_delay = 0.5
+
+    def save_conversation(self, user_input, agent_response, context):
+        time.sleep(self.write_delay)
+        super().save_conversation(user_input, agent_response, context)
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "memory.db"))
+    yield mem
+    mem.close()
+
+
+class TestAsyncMemorySystem:
+    """Test the awaitable facade."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, memory):
+        amemory = AsyncMemorySystem(memory)
+
+        await amemory.save_note(make_note(1))
+        notes = await amemory.get_recent_notes(5)
+
+        assert [n.id for n in notes] == ["note_1"]
+        assert await amemory.count_notes() == 1
+        await amemory.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_keep_submission_order(self, memory):
+        amemory = AsyncMemorySystem(memory)
+
+        await asyncio.gather(*[
+            amemory.save_conversation(f"pergunta {i}", "ok", {}) for i in range(20)
+        ])
+        recent = await amemory.get_recent_conversations(20)
+
+        assert [c["user_input"] for c in recent] == [f"pergunta {i}" for i in range(20)]
+        await amemory.close()
+
+    @pytest.mark.asyncio
+    async def test_close_waits_for_pending_writes(self, memory):
+        amemory = AsyncMemorySystem(memory)
+
+        pending = asyncio.ensure_future(amemory.save_note(make_note(1)))
+        await asyncio.sleep(0)  # Deixa a escrita ser submetida
+        await amemory.close()
+        await pending
+
+        assert memory.count_notes() == 1
+
+
+class TestEventLoopNotBlocked:
+    """Concurrent HTTP calls must progress while the DB is writing."""
+
+    @pytest.mark.asyncio
+    async def test_http_calls_complete_during_slow_write(self, tmp_path):
+        async def health(request):
+            return web.json_response({"status": "ok"})
+
+        app = web.Application()
+        app.router.add_get("/health", health)
+        server = TestServer(app)
+        await server.start_server()
+
+        memory = SlowMemorySystem(str(tmp_path / "slow.db"))
+        amemory = AsyncMemorySystem(memory)
+
+        try:
+            async with ClientSession() as session:
+                write_started = time.perf_counter()
+                write = asyncio.ensure_future(amemory.save_conversation("oi", "olá", {}))
+
+                http_done_at = []
+                for _ in range(5):
+                    async with session.get(server.make_url("/health")) as response:
+                        assert response.status == 200
+                    http_done_at.append(time.perf_counter() - write_started)
+
+                await write
+                write_elapsed = time.perf_counter() - write_started
+
+            assert max(http_done_at) < SlowMemorySystem.write_delay
+            assert write_elapsed >= SlowMemorySystem.write_delay
+        finally:
+            await amemory.close()
+            memory.close()
+            await server.close()
+
+
+class TestSageAdoption:
+    """Test the async Sage code paths use the async memory."""
+
+    @pytest.mark.asyncio
+    async def test_build_context_and_status_counts(self, tmp_path):
+        sage = Sage("test-key", "", "tester", db_path=str(tmp_path / "sage.db"))
+        for i in range(7):
+            sage.memory.save_note(make_note(i))
+
+        context = await sage._build_context()
+
+        assert [n["id"] for n in context["recent_notes"]] == [f"note_{i}" for i in range(2, 7)]
+        assert isinstance(sage.async_memory, AsyncMemorySystem)
+        await sage.close()
+        assert sage.memory.db.closed
@@ -0,0 +1,147 @@
+"""
+Context Packer Tests
+=====================
+
+Test suite for token budgeting in prompt assembly.
+
+Test Coverage:
+- Local token estimate and compact JSON
+- text / json / items strategies stay within budget
+- Per-section usage report and per-site stats
+- think() and _claude_think() context assembled through the packer
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import json
+
+import pytest
+
+from sage.core.context_packer import (
+    ContextPacker, Section, compact_json, estimate_tokens, truncate_tokens,
+)
+from sage.core.sage import HybridReasoning
+from sage.core.secretary_agent import SecretaryAgent
+
+
+LONG = "resposta muito longa do assistente " * 400
+
+
+@pytest.fixture
+def packer():
+    return ContextPacker(budgets={"persona": 20, "projects": 60, "memory": 140},
+                         max_string_tokens=40)
+
+
+class TestHelpers:
+    """Test the estimate and formatting helpers."""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("Olá, Juan!") == 4
+        assert 300 <= estimate_tokens("palavra " * 300) <= 600
+
+    def test_compact_json(self):
+        assert compact_json({"b": [1, 2], "a": "ç"}) == '{"a":"ç","b":[1,2]}'
+
+    def test_truncate_tokens(self):
+        text = " ".join(f"w{i}" for i in range(50))
+
+        cut = truncate_tokens(text, 10)
+
+        assert cut.startswith("w0 w1") and cut.endswith("…[+40 tokens]")
+        assert truncate_tokens("curto", 10) == "curto"
+
+
+class TestStrategies:
+    """Test budgets per strategy."""
+
+    def test_text_truncated(self, packer):
+        packed = packer.pack("t", [Section("persona", "palavra " * 100, "text")])
+
+        usage = packed.usage["persona"]
+        assert usage.truncated and usage.original_tokens == 200   # "pala" + "vra"
+        assert usage.tokens <= 20 + 8   # orçamento + marcador
+
+    def test_json_shortens_strings_first(self, packer):
+        projects = {"Max-Code": {"description": LONG, "github": "Max-Code"}}
+
+        text = packer.pack("t", [Section("projects", projects)])["projects"]
+
+        assert json.loads(text)["Max-Code"]["github"] == "Max-Code"   # ainda é JSON válido
+        assert estimate_tokens(text) <= 60
+
+    def test_items_keep_most_relevant_within_budget(self, packer):
+        items = [{"id": i, "snippet": LONG} for i in range(10)]
+
+        packed = packer.pack("t", [Section("memory", items, "items")])
+
+        kept = json.loads(packed["memory"])
+        assert [m["id"] for m in kept] == [0, 1]
+        assert packed.usage["memory"].tokens <= 140
+        assert packed.report()["memory"]["items"] == "2/10"
+
+    def test_small_sections_untouched(self, packer):
+        packed = packer.pack("t", [Section("projects", {"a": 1}), Section("memory", [], "items")])
+
+        assert packed["projects"] == '{"a":1}'
+        assert packed["memory"] == "[]"
+        assert not any(u.truncated for u in packed.usage.values())
+
+    def test_unknown_strategy(self, packer):
+        with pytest.raises(ValueError):
+            packer.pack("t", [Section("x", "y", "resumir")])
+
+
+class TestReporting:
+    """Test per-request and per-site reports."""
+
+    def test_stats_per_site(self, packer):
+        packer.pack("think", [Section("persona", "a b c", "text")])
+        packer.pack("think", [Section("persona", "palavra " * 100, "text")])
+
+        stats = packer.stats()["think"]
+
+        assert stats["last"]["persona"]["truncated"] is True
+        assert stats["truncations"]["persona"] == 1
+        assert stats["avg_tokens"]["persona"] > 3
+
+
+class TestCallSites:
+    """Test prompt assembly through the packer."""
+
+    def test_think_context_bounded(self, tmp_path):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "pack.db"))
+        try:
+            for i in range(5):
+                agent.create_note(f"deploy {i} " + LONG, "Max-Code", [])
+            memories = agent.memory.search("deploy", limit=5)
+
+            packed = agent.pack_context(memories, active_tasks=3, notes_count=5)
+        finally:
+            agent.close()
+
+        assert packed.usage["memory"].items_total == 5
+        assert packed.usage["memory"].tokens <= agent.packer.budget("memory")
+        assert json.loads(packed["task_state"]) == {"active_tasks": 3, "notes": 5}
+        assert all("score" not in m for m in json.loads(packed["memory"]))
+        assert "PROJETOS DO JUAN" in agent.stable_prompt(packed)
+
+    def test_conscious_context_sections(self):
+        reasoning = HybridReasoning(llm=None, max_core=None)
+        context = {
+            "timestamp": "2026-10-18T12:00:00",
+            "projects": {"Max-Code": {"description": "CLI"}},
+            "recent_notes": [{"content": LONG}] * 5,
+            "recent_tasks": [{"title": "Deploy"}],
+            "consciousness_enabled": True,
+        }
+
+        packed = reasoning.pack_context(context)
+
+        assert list(packed.sections) == ["projects", "memory", "task_state", "state"]
+        assert json.loads(packed["state"]) == {"consciousness_enabled": True,
+                                               "timestamp": "2026-10-18T12:00:00"}
+        assert packed.usage["memory"].tokens <= reasoning.packer.budget("memory")
+        assert reasoning.packer.stats()["conscious_think"]["last_total_tokens"] == packed.total_tokens
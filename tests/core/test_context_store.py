@@ -0,0 +1,172 @@
+"""
+Context Store Tests
+====================
+
+Test suite for content-addressed, compressed conversation context storage.
+
+Test Coverage:
+- Canonical hashing and deduplication
+- Transparent rehydration in get_recent_conversations
+- Compression codec round trip
+- Blobs rewritten even when the read cache still holds them
+- One-shot migration of legacy rows
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from sage.core.context_store import (
+    ContextStore,
+    canonical_json,
+    compact_legacy_contexts,
+    compress,
+    decompress,
+)
+from sage.core.secretary_agent import MemorySystem
+
+
+PROJECTS = {
+    name: {"github": name, "clickup_list": "TBD", "description": f"Projeto {name} " * 5}
+    for name in ["Max-Code", "Maximus-BOT", "V-rtice"]
+}
+
+
+def sage_context(turn: int) -> dict:
+    return {
+        "timestamp": f"2026-10-18T10:{turn:02d}:00",
+        "projects": PROJECTS,
+        "recent_notes": [{"id": f"note_{i}", "content": "x" * 80} for i in range(5)],
+        "performance": {"tasks_completed": turn, "success_rate": "100.0%"},
+        "consciousness_enabled": True,
+    }
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "ctx.db"), write_behind=False)
+    yield mem
+    mem.close()
+
+
+def count(memory, table):
+    with memory.db.read() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestCanonicalJson:
+    """Test canonical serialization."""
+
+    def test_key_order_does_not_change_encoding(self):
+        assert canonical_json({"a": 1, "b": [1, 2]}) == canonical_json({"b": [1, 2], "a": 1})
+
+    def test_zlib_round_trip(self):
+        data = b"contexto " * 100
+        assert decompress(compress(data, "zlib"), "zlib") == data
+
+
+class TestDeduplication:
+    """Test that repeated sub-objects are stored once."""
+
+    def test_repeated_context_stored_once(self, memory):
+        for turn in range(50):
+            memory.save_conversation(f"pergunta {turn}", "ok", sage_context(turn))
+
+        # projects e recent_notes são idênticos em todos os turnos
+        assert count(memory, "context_blobs") == 2
+
+    def test_small_values_stay_inline(self, memory):
+        memory.save_conversation("oi", "olá", {"turn": 1, "flags": [1, 2]})
+
+        assert count(memory, "context_blobs") == 0
+        with memory.db.read() as conn:
+            row = conn.execute("SELECT context, context_refs FROM conversations").fetchone()
+        assert json.loads(row[0]) == {"turn": 1, "flags": [1, 2]}
+        assert row[1] is None
+
+    def test_rehydrates_original_context(self, memory):
+        for turn in range(3):
+            memory.save_conversation(f"pergunta {turn}", "ok", sage_context(turn))
+
+        recent = memory.get_recent_conversations(3)
+
+        assert [c["context"] for c in recent] == [sage_context(t) for t in range(3)]
+
+    def test_rehydrated_context_is_independent_copy(self, memory):
+        memory.save_conversation("a", "b", sage_context(1))
+        first = memory.get_recent_conversations(1)[0]["context"]
+        first["projects"]["Max-Code"]["github"] = "mutated"
+
+        second = memory.get_recent_conversations(1)[0]["context"]
+
+        assert second["projects"]["Max-Code"]["github"] == "Max-Code"
+
+    def test_stored_size_is_smaller(self, memory):
+        for turn in range(20):
+            memory.save_conversation(f"pergunta {turn}", "ok", sage_context(turn))
+
+        with memory.db.read() as conn:
+            stored = conn.execute(
+                "SELECT SUM(LENGTH(context)) + COALESCE(SUM(LENGTH(context_refs)), 0) FROM conversations"
+            ).fetchone()[0] + conn.execute("SELECT SUM(LENGTH(data)) FROM context_blobs").fetchone()[0]
+        verbatim = sum(len(json.dumps(sage_context(t))) for t in range(20))
+
+        assert stored < verbatim / 3
+
+
+class TestStaleCache:
+    """Test that the read cache never suppresses a blob write."""
+
+    def test_blob_deleted_behind_cache_is_rewritten(self, memory):
+        memory.save_conversation("a", "b", sage_context(1))
+        memory.get_recent_conversations(1)           # blobs no cache de leitura
+        with memory.db.transaction() as conn:        # coleta concorrente, sem forget()
+            conn.execute("DELETE FROM conversations")
+            conn.execute("DELETE FROM context_blobs")
+
+        memory.save_conversation("c", "d", sage_context(2))
+
+        assert count(memory, "context_blobs") == 2
+        memory.context_store.forget()
+        assert memory.get_recent_conversations(1)[0]["context"] == sage_context(2)
+
+
+class TestLegacyMigration:
+    """Test the one-shot conversion of verbatim contexts."""
+
+    def test_compact_legacy_rows(self, memory):
+        with memory.db.transaction() as conn:
+            for turn in range(5):
+                conn.execute(
+                    "INSERT INTO conversations (timestamp, user_input, agent_response, context) VALUES (?, ?, ?, ?)",
+                    (f"2026-10-18T10:0{turn}:00", f"p{turn}", "ok", json.dumps(sage_context(turn)))
+                )
+            converted = compact_legacy_contexts(conn, ContextStore(), batch_size=2)
+
+        assert converted == 5
+        assert count(memory, "context_blobs") == 2
+        assert [c["context"] for c in memory.get_recent_conversations(5)] == [sage_context(t) for t in range(5)]
+
+    def test_legacy_database_upgraded_at_startup(self, tmp_path):
+        path = str(tmp_path / "secretary_memory.db")
+        legacy = sqlite3.connect(path)
+        legacy.execute("""
+            CREATE TABLE conversations (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT,
+                                        user_input TEXT, agent_response TEXT, context TEXT)
+        """)
+        legacy.execute(
+            "INSERT INTO conversations (timestamp, user_input, agent_response, context) VALUES (?, ?, ?, ?)",
+            ("2025-11-10T10:00:00", "oi", "olá", json.dumps(sage_context(0)))
+        )
+        legacy.commit()
+        legacy.close()
+
+        memory = MemorySystem(path)
+
+        assert memory.get_recent_conversations(1)[0]["context"] == sage_context(0)
+        assert count(memory, "context_blobs") == 2
+        memory.close()
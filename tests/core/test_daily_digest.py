@@ -0,0 +1,160 @@
+"""
+Daily Digest Tests
+===================
+
+Test suite for the incrementally maintained daily digest counters.
+
+Test Coverage:
+- Counters updated by note/task saves and task completion
+- Upserts of existing rows do not double count
+- GitHub commit recording with SHA deduplication
+- 30-day trend lookup
+- Backfill of counters for existing databases
+- SecretaryAgent.get_daily_digest summary
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from sage.core.secretary_agent import MemorySystem, Note, SecretaryAgent, Task
+
+
+def make_note(i: int, day: str = "2026-10-10", project: str = "Max-Code") -> Note:
+    return Note(id=f"note_{i}", content=f"Nota {i}", tags=[], project=project,
+                created_at=f"{day}T10:00:00", updated_at=f"{day}T10:00:00", priority="medium")
+
+
+def make_task(i: int, day: str = "2026-10-10", status: str = "todo",
+              project: str = "Max-Code") -> Task:
+    return Task(id=f"task_{i}", title=f"Tarefa {i}", description="", project=project,
+                status=status, priority="medium", due_date=None, created_at=f"{day}T10:00:00")
+
+
+def commit(sha: str, date: str) -> dict:
+    return {"sha": sha, "commit": {"author": {"date": f"{date}T12:00:00Z"}}}
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "digest.db"), write_behind=False)
+    yield mem
+    mem.close()
+
+
+class TestCounters:
+    """Test trigger-maintained counters."""
+
+    def test_notes_and_tasks_counted_on_their_day(self, memory):
+        memory.save_note(make_note(1))
+        memory.save_note(make_note(2, project="V-rtice"))
+        memory.save_task(make_task(1))
+        memory.save_task(make_task(2, day="2026-10-11"))
+
+        digest = memory.get_daily_digest("2026-10-10")
+
+        assert digest.notes_created == 2
+        assert digest.tasks_created == 1
+        assert digest.projects_worked == ["Max-Code", "V-rtice"]
+        assert memory.get_daily_digest("2026-10-11").tasks_created == 1
+
+    def test_resaving_does_not_double_count(self, memory):
+        note = make_note(1)
+        memory.save_note(note)
+        note.content = "editada"
+        memory.save_note(note)
+
+        assert memory.get_daily_digest("2026-10-10").notes_created == 1
+
+    def test_completion_counted_today(self, memory):
+        task = make_task(1)
+        memory.save_task(task)
+        task.status = "done"
+        memory.save_task(task)
+        memory.save_task(task)  # já concluída: não conta de novo
+
+        today = memory.get_daily_digest(datetime.now().date().isoformat())
+
+        assert today.tasks_completed == 1
+        assert "Max-Code" in today.projects_worked
+
+    def test_empty_day_is_zeroed(self, memory):
+        digest = memory.get_daily_digest("2020-01-01")
+
+        assert digest.tasks_created == 0
+        assert digest.projects_worked == []
+
+
+class TestCommits:
+    """Test GitHub commit recording."""
+
+    def test_commits_deduplicated_by_sha(self, memory):
+        first = memory.record_commits("Max-Code", [commit("a1", "2026-10-10"), commit("b2", "2026-10-10")])
+        again = memory.record_commits("Max-Code", [commit("a1", "2026-10-10"), commit("c3", "2026-10-11")])
+
+        assert (first, again) == (2, 1)
+        assert memory.get_daily_digest("2026-10-10").commits_made == 2
+        assert memory.get_daily_digest("2026-10-11").commits_made == 1
+
+    def test_commits_without_date_ignored(self, memory):
+        assert memory.record_commits("Max-Code", [{"sha": "x"}]) == 0
+
+
+class TestTrend:
+    """Test multi-day lookups."""
+
+    def test_trend_covers_every_day(self, memory):
+        memory.save_note(make_note(1, day="2026-10-01"))
+        memory.save_note(make_note(2, day="2026-10-30"))
+
+        trend = memory.get_digest_trend(30, end="2026-10-30")
+
+        assert len(trend) == 30
+        assert trend[0].date == "2026-10-01"
+        assert trend[-1].date == "2026-10-30"
+        assert [d.notes_created for d in trend].count(1) == 2
+        assert sum(d.notes_created for d in trend) == 2
+
+
+class TestBackfill:
+    """Test counters for databases created before the triggers."""
+
+    def test_existing_rows_backfilled(self, tmp_path):
+        path = str(tmp_path / "legacy.db")
+        legacy = sqlite3.connect(path)
+        legacy.execute("""
+            CREATE TABLE notes (id TEXT PRIMARY KEY, content TEXT, tags TEXT, project TEXT,
+                                created_at TEXT, updated_at TEXT, priority TEXT)
+        """)
+        legacy.executemany(
+            "INSERT INTO notes VALUES (?, 'x', '[]', ?, '2025-11-10T09:00:00', NULL, 'low')",
+            [("n1", "Max-Code"), ("n2", "Maximus-BOT"), ("n3", "Max-Code")]
+        )
+        legacy.commit()
+        legacy.close()
+
+        memory = MemorySystem(path, write_behind=False)
+        digest = memory.get_daily_digest("2025-11-10")
+        memory.close()
+
+        assert digest.notes_created == 3
+        assert sorted(digest.projects_worked) == ["Max-Code", "Maximus-BOT"]
+
+
+class TestAgentDigest:
+    """Test the agent-level digest."""
+
+    def test_summary_from_counters(self, tmp_path):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "agent.db"))
+        agent.memory.save_task(make_task(1, day="2026-10-10"))
+        agent.memory.save_task(make_task(2, day="2026-10-10"))
+
+        digest = agent.get_daily_digest("2026-10-10")
+        agent.close()
+
+        assert "2 tarefas criadas" in digest.summary
+        assert digest.suggestions
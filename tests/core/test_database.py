@@ -0,0 +1,201 @@
+"""
+Database Connection Manager Tests
+==================================
+
+Test suite for the long-lived SQLite connection layer.
+
+Test Coverage:
+- WAL mode and tuned pragmas
+- Transactions (commit, rollback, nesting)
+- Thread-local readers (closed when their thread exits)
+- Clean shutdown
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import asyncio
+import gc
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sage.core.database import ConnectionManager, DatabaseClosedError
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = ConnectionManager(str(tmp_path / "test.db"))
+    with manager.transaction() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    yield manager
+    manager.close()
+
+
+class TestPragmas:
+    """Test pragma configuration."""
+
+    def test_wal_mode_enabled(self, db):
+        with db.read() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_tuned_pragmas_applied(self, db):
+        with db.read() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+
+    def test_custom_pragmas_override_defaults(self, tmp_path):
+        manager = ConnectionManager(str(tmp_path / "custom.db"), pragmas={"synchronous": "FULL"})
+        with manager.read() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+        manager.close()
+
+
+class TestTransactions:
+    """Test write transactions."""
+
+    def test_commit_visible_to_reader(self, db):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+
+        with db.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+    def test_rollback_on_error(self, db):
+        with pytest.raises(RuntimeError):
+            with db.transaction() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('a')")
+                raise RuntimeError("boom")
+
+        with db.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    def test_nested_transaction_joins_outer(self, db):
+        with db.transaction() as outer:
+            outer.execute("INSERT INTO items (name) VALUES ('a')")
+            with db.transaction() as inner:
+                inner.execute("INSERT INTO items (name) VALUES ('b')")
+            assert outer.in_transaction
+
+        with db.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2
+
+    def test_in_memory_database(self):
+        manager = ConnectionManager(":memory:")
+        with manager.transaction() as conn:
+            conn.execute("CREATE TABLE t (x)")
+            conn.execute("INSERT INTO t VALUES (1)")
+        with manager.read() as conn:
+            assert conn.execute("SELECT x FROM t").fetchone()[0] == 1
+        manager.close()
+
+
+class TestReaders:
+    """Test thread-local reader connections."""
+
+    def test_reader_reused_within_thread(self, db):
+        with db.read() as first:
+            pass
+        with db.read() as second:
+            pass
+        assert first is second
+
+    def test_each_thread_gets_own_reader(self, db):
+        connections = []
+
+        def worker():
+            with db.read() as conn:
+                connections.append(conn)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(c) for c in connections}) == 3
+
+    def test_reader_closed_when_thread_exits(self, db):
+        connections = []
+
+        def worker():
+            with db.read() as conn:
+                connections.append(conn)
+
+        for _ in range(5):
+            t = threading.Thread(target=worker)
+            t.start()
+            t.join()
+        gc.collect()
+
+        assert db.open_readers == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            connections[0].execute("SELECT 1")
+
+    def test_pool_workers_release_readers(self, db):
+        def count():
+            with db.read() as conn:
+                return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert list(pool.map(lambda _: count(), range(8))) == [0] * 8
+            assert 1 <= db.open_readers <= 4
+        gc.collect()
+
+        assert db.open_readers == 0
+
+    def test_to_thread_readers_released(self, db):
+        def count():
+            with db.read() as conn:
+                return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+        async def main():
+            return await asyncio.gather(*(asyncio.to_thread(count) for _ in range(4)))
+
+        assert asyncio.run(main()) == [0] * 4   # asyncio.run encerra o executor padrão
+        gc.collect()
+
+        assert db.open_readers == 0
+
+    def test_live_thread_keeps_reader(self, db):
+        with db.read() as mine:
+            pass
+
+        def worker():
+            with db.read():
+                pass
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        gc.collect()
+
+        assert db.open_readers == 1
+        with db.read() as again:
+            assert again is mine
+
+    def test_readers_are_read_only(self, db):
+        with db.read() as conn:
+            with pytest.raises(Exception):
+                conn.execute("INSERT INTO items (name) VALUES ('x')")
+
+
+class TestClose:
+    """Test clean shutdown."""
+
+    def test_close_is_idempotent(self, db):
+        db.close()
+        db.close()
+        assert db.closed
+
+    def test_operations_after_close_fail(self, db):
+        db.close()
+        with pytest.raises(DatabaseClosedError):
+            with db.transaction():
+                pass
+        with pytest.raises(DatabaseClosedError):
+            with db.read():
+                pass
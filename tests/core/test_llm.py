@@ -0,0 +1,453 @@
+"""
+Streaming LLM Client Tests
+===========================
+
+Test suite for the streaming Claude client against a local fake SSE server.
+
+Test Coverage:
+- Async and sync streaming (tokens delivered as they arrive)
+- Time-to-first-token and usage reporting
+- PerformanceMonitor listener
+- Event loop stays responsive while streaming
+- think / _claude_think / analyze_roadmap on the streaming path
+- Conscious path shows Claude's text only after the Core check passes
+- Prompt caching: stable prefix with cache_control, hit/miss token counts,
+  no breakpoint below the minimum cacheable prefix
+- Response cache in front of the client (per call site)
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from sage.core.llm import StreamingClaude, cached_system
+from sage.core.response_cache import CONVERSATION_SITES, DEFAULT_SITES, ResponseCache
+from sage.core.sage import (
+    ConsciousnessCheck, ConsciousnessLevel, HybridReasoning, PerformanceMonitor, SafetyTier
+)
+from sage.core.secretary_agent import SecretaryAgent
+from sage.core.secretary_executor import RoadmapReader
+
+
+class FakeClaudeServer:
+    """Servidor SSE local no formato da Messages API com stream=true"""
+
+    def __init__(self, first_token_delay: float = 0.0, token_delay: float = 0.0):
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.tokens = ["Olá", ", ", "Juan", "!"]
+        self.requests = []
+        self.cached_prefixes = set()
+        self.runner = None
+        self.url = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/messages", self.messages)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    def usage(self, body):
+        """Simula o prompt cache: prefixo até o último cache_control (~4 chars/token)"""
+        system = body.get("system") or []
+        if isinstance(system, str):
+            system = [{"type": "text", "text": system}]
+        marked = [i + 1 for i, block in enumerate(system) if "cache_control" in block]
+        cut = marked[-1] if marked else 0
+        prefix = "".join(b["text"] for b in system[:cut])
+        rest = "".join(b["text"] for b in system[cut:]) + json.dumps(body["messages"])
+        usage = {"input_tokens": len(rest) // 4, "output_tokens": 1,
+                 "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+        if prefix in self.cached_prefixes:
+            usage["cache_read_input_tokens"] = len(prefix) // 4
+        elif prefix:
+            self.cached_prefixes.add(prefix)
+            usage["cache_creation_input_tokens"] = len(prefix) // 4
+        return usage
+
+    async def messages(self, request):
+        body = await request.json()
+        self.requests.append(body)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(event, data):
+            await response.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+
+        await send("message_start", {"type": "message_start", "message": {
+            "id": "msg_1", "type": "message", "role": "assistant", "model": body["model"],
+            "content": [], "stop_reason": None, "stop_sequence": None,
+            "usage": self.usage(body),
+        }})
+        await send("content_block_start", {"type": "content_block_start", "index": 0,
+                                           "content_block": {"type": "text", "text": ""}})
+        await asyncio.sleep(self.first_token_delay)
+        for i, token in enumerate(self.tokens):
+            if i:
+                await asyncio.sleep(self.token_delay)
+            await send("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                               "delta": {"type": "text_delta", "text": token}})
+        await send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        await send("message_delta", {"type": "message_delta",
+                                     "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                     "usage": {"output_tokens": len(self.tokens)}})
+        await send("message_stop", {"type": "message_stop"})
+        await response.write_eof()
+        return response
+
+
+@pytest_asyncio.fixture
+async def server():
+    server = FakeClaudeServer(first_token_delay=0.1, token_delay=0.02)
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def llm(server):
+    llm = StreamingClaude("sk-test", base_url=server.url, max_retries=0)
+    yield llm
+    await llm.aclose()
+
+
+USER = [{"role": "user", "content": "Oi"}]
+
+
+class TestStreaming:
+    """Test the streaming client."""
+
+    @pytest.mark.asyncio
+    async def test_tokens_arrive_incrementally(self, llm, server):
+        arrivals = []
+
+        response = await llm.stream(USER, system="Seja breve",
+                                    on_token=lambda t: arrivals.append((t, time.perf_counter())))
+
+        assert [t for t, _ in arrivals] == server.tokens
+        assert arrivals[-1][1] - arrivals[0][1] >= 0.05   # não veio tudo de uma vez
+        assert response.text == "Olá, Juan!"
+        assert response.input_tokens > 0 and response.output_tokens == 4
+        assert response.stop_reason == "end_turn"
+        assert server.requests[0]["stream"] is True
+        assert server.requests[0]["system"] == "Seja breve"
+
+    @pytest.mark.asyncio
+    async def test_time_to_first_token(self, llm):
+        response = await llm.stream(USER)
+
+        assert 0.1 <= response.ttft < response.duration
+
+    @pytest.mark.asyncio
+    async def test_sync_stream(self, llm):
+        tokens = []
+
+        response = await asyncio.to_thread(llm.stream_sync, USER, on_token=tokens.append)
+
+        assert "".join(tokens) == response.text == "Olá, Juan!"
+        assert response.ttft >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self, llm):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await llm.stream(USER)
+        task.cancel()
+
+        assert ticks >= 5
+
+
+class TestPerformanceMonitor:
+    """Test TTFT reporting."""
+
+    @pytest.mark.asyncio
+    async def test_listener_records_ttft(self, llm):
+        monitor = PerformanceMonitor()
+        llm.add_listener(monitor.record_llm_call)
+
+        await llm.stream(USER)
+        await llm.stream(USER)
+
+        report = monitor.get_report()["llm"]
+        assert report["calls"] == 2
+        assert report["output_tokens"] == 8
+        assert float(report["p50_ttft"].rstrip("s")) >= 0.1
+
+    def test_empty_report(self):
+        assert PerformanceMonitor().get_report()["llm"] == {"calls": 0}
+
+
+class TestCallSites:
+    """Test the converted call sites."""
+
+    @pytest.mark.asyncio
+    async def test_hybrid_claude_think_streams(self, llm):
+        tokens = []
+
+        text = await HybridReasoning(llm, max_core=None)._claude_think("Oi", {}, on_token=tokens.append)
+
+        assert text == "".join(tokens) == "Olá, Juan!"
+
+    @pytest.mark.asyncio
+    async def test_blocked_action_never_shown(self, llm, server):
+        class BlockingCore:
+            def __init__(self):
+                self.actions = []
+
+            async def check_consciousness(self, action, context):
+                self.actions.append(action)
+                return ConsciousnessCheck(approved=False, consciousness_level=ConsciousnessLevel.HIGH,
+                                          safety_tier=SafetyTier.BLOCKED, reasoning="perigoso",
+                                          constitutional_notes=[])
+
+        server.tokens = ["Vou limpar ", "o disco.\n`", "``act", "ion\n",
+                         '{"type": "shell", "description": "rm -rf /"}', "\n```"]
+        core = BlockingCore()
+        tokens = []
+
+        text, check = await HybridReasoning(llm, max_core=core).hybrid_think(
+            "Oi", {}, on_token=tokens.append)
+
+        assert "".join(tokens) == "Vou limpar o disco.\n"
+        assert core.actions == [{"type": "shell", "description": "rm -rf /"}]
+        assert not check.approved and "bloqueada" in text and "rm -rf" not in text
+
+    @pytest.mark.asyncio
+    async def test_text_streams_before_validation(self, llm, server):
+        arrivals = []
+        checked = []
+
+        class SlowCore:
+            async def check_consciousness(self, action, context):
+                checked.append(time.perf_counter())
+                return ConsciousnessCheck(approved=True, consciousness_level=ConsciousnessLevel.LOW,
+                                          safety_tier=SafetyTier.SAFE, reasoning="ok",
+                                          constitutional_notes=[])
+
+        action = '{"type": "navigate", "url": "https://github.com", "description": "Abrir"}'
+        server.tokens = ["Abrindo ", "o GitHub.", "\n```action\n", action, "\n```"]
+
+        text, check = await HybridReasoning(llm, max_core=SlowCore()).hybrid_think(
+            "Oi", {}, on_token=lambda t: arrivals.append((t, time.perf_counter())))
+
+        assert check.approved and "".join(t for t, _ in arrivals) == text
+        assert arrivals[0][0] == "Abrindo " and arrivals[0][1] < checked[0]
+        assert arrivals[-1][0].startswith("```action")
+        assert arrivals[-1][1] > checked[0]
+
+    @pytest.mark.asyncio
+    async def test_approved_text_shown_after_validation(self, llm):
+        tokens = []
+
+        text, check = await HybridReasoning(llm, max_core=None).hybrid_think(
+            "Oi", {}, on_token=tokens.append)
+
+        assert check.approved and "".join(tokens) == text == "Olá, Juan!"
+        assert len(tokens) > 1   # em streaming, não de uma vez no fim
+
+    @pytest.mark.asyncio
+    async def test_analyze_roadmap(self, llm, server):
+        server.tokens = ["```json\n[", json.dumps({
+            "step_number": 1, "title": "Deploy", "description": "Publicar",
+            "dependencies": [], "estimated_time": "1 hora",
+            "automation_possible": True, "automation_method": "api_call",
+        }), "]\n```"]
+
+        steps = await RoadmapReader(llm).analyze_roadmap("# Roadmap")
+
+        assert [(s.title, s.automation_method) for s in steps] == [("Deploy", "api_call")]
+
+    @pytest.mark.asyncio
+    async def test_secretary_think_streams(self, tmp_path, server):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "llm.db"))
+        agent.llm = StreamingClaude("sk-test", base_url=server.url, max_retries=0)
+        tokens = []
+        try:
+            response = await asyncio.to_thread(agent.think, "Oi", on_token=tokens.append)
+        finally:
+            await agent.llm.aclose()
+            agent.close()
+
+        assert response == "".join(tokens) == "Olá, Juan!"
+
+
+class TestPromptCache:
+    """Test cacheable prompt prefixes."""
+
+    def test_cached_system_blocks(self):
+        persona = "Persona longa " * 300
+        blocks = cached_system(persona, "contexto")
+
+        assert blocks[0] == {"type": "text", "text": persona, "cache_control": {"type": "ephemeral"}}
+        assert blocks[1] == {"type": "text", "text": "contexto"}
+        assert len(cached_system(persona)) == 1
+
+    def test_short_prefix_sent_without_breakpoint(self):
+        assert cached_system("persona", "contexto")[0] == {"type": "text", "text": "persona"}
+        assert "cache_control" in cached_system("persona", min_tokens=1)[0]
+
+    @pytest.mark.asyncio
+    async def test_second_call_reads_prefix_from_cache(self, llm):
+        monitor = PerformanceMonitor()
+        llm.add_listener(monitor.record_llm_call)
+        stable = "Persona longa " * 300
+
+        first = await llm.stream(USER, system=cached_system(stable, "Tarefas ativas: 1"))
+        second = await llm.stream(USER, system=cached_system(stable, "Tarefas ativas: 2"))
+
+        assert (first.cache_write_tokens, first.cache_read_tokens) == (len(stable) // 4, 0)
+        assert (second.cache_write_tokens, second.cache_read_tokens) == (0, len(stable) // 4)
+        assert second.prompt_tokens == first.prompt_tokens
+        cache = monitor.get_report()["llm"]["prompt_cache"]
+        assert cache["read_tokens"] == cache["write_tokens"] == len(stable) // 4
+        assert float(cache["hit_rate"].rstrip("%")) > 40
+
+    @pytest.mark.asyncio
+    async def test_think_keeps_volatile_context_out_of_prefix(self, tmp_path, server):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "cache.db"))
+        agent.llm = StreamingClaude("sk-test", base_url=server.url, max_retries=0)
+        calls = []
+        agent.llm.add_listener(calls.append)
+        try:
+            await asyncio.to_thread(agent.think, "Oi")
+            agent.create_note("Nota nova", "Max-Code", [])
+            await asyncio.to_thread(agent.think, "Oi de novo")
+        finally:
+            await agent.llm.aclose()
+            agent.close()
+
+        stable, volatile = server.requests[0]["system"]
+        assert "PROJETOS DO JUAN" in stable["text"] and "CONTEXTO ATUAL" not in stable["text"]
+        assert "CONTEXTO ATUAL" in volatile["text"] and "cache_control" not in volatile
+        assert stable["text"] == server.requests[1]["system"][0]["text"]
+        # Prefixo do think() abaixo do mínimo cacheável: sem breakpoint, sem economia fictícia
+        assert "cache_control" not in stable
+        assert calls[0].cache_write_tokens == calls[1].cache_read_tokens == 0
+
+    @pytest.mark.asyncio
+    async def test_claude_think_marks_stable_prefix(self, llm, server, tmp_path):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "hybrid.db"))
+        reasoning = HybridReasoning(llm, max_core=None)
+        calls = []
+        llm.add_listener(calls.append)
+        try:
+            for turn in range(2):
+                await reasoning._claude_think("Oi", {"projects": agent.projects, "recent_tasks": [],
+                                                     "timestamp": f"2026-10-18T12:0{turn}:00"})
+        finally:
+            agent.close()
+
+        stable, volatile = server.requests[0]["system"]
+        assert stable["cache_control"] == {"type": "ephemeral"}
+        assert "PROJETOS DO JUAN" in stable["text"] and "FERRAMENTAS" in stable["text"]
+        assert "CONTEXTO ATUAL" in volatile["text"] and "12:00:00" not in stable["text"]
+        assert server.requests[1]["system"][0] == stable
+        assert server.requests[0]["messages"][0]["content"] == "Oi"
+        assert calls[0].cache_write_tokens > 0 and calls[1].cache_read_tokens == calls[0].cache_write_tokens
+
+
+class TestResponseCache:
+    """Test the response cache in front of Claude."""
+
+    @pytest_asyncio.fixture
+    async def agent(self, tmp_path, server):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "responses.db"))
+        # Conversa fica fora do cache padrão: aqui com opt-in explícito
+        agent.response_cache = ResponseCache(agent.memory.db,
+                                             sites={**DEFAULT_SITES, **CONVERSATION_SITES})
+        agent.llm = StreamingClaude("sk-test", base_url=server.url, max_retries=0,
+                                    cache=agent.response_cache)
+        yield agent
+        await agent.llm.aclose()
+        agent.close()
+
+    @pytest.mark.asyncio
+    async def test_repeated_think_served_from_cache(self, agent, server, monkeypatch):
+        calls, tokens = [], []
+        agent.llm.add_listener(calls.append)
+        # Mesmo histórico nas duas chamadas (o turno não é gravado)
+        monkeypatch.setattr(agent.memory, "save_conversation", lambda *args: None)
+
+        first = await asyncio.to_thread(agent.think, "Status do Max-Code?")
+        second = await asyncio.to_thread(agent.think, "status do max-code", on_token=tokens.append)
+
+        assert first == second == "".join(tokens) == "Olá, Juan!"
+        assert len(server.requests) == len(calls) == 1
+        assert agent.response_cache.stats()["sites"]["think"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_follow_up_depends_on_conversation(self, agent, server):
+        agent.memory.save_conversation("Devo fazer o deploy do Max-Code?", "Sim, está pronto.", {})
+        await asyncio.to_thread(agent.think, "continue")
+
+        agent.memory.save_conversation("Fecho o PR do Maximus-BOT?", "Ainda não.", {})
+        await asyncio.to_thread(agent.think, "continue")
+
+        assert len(server.requests) == 2
+        assert agent.response_cache.stats()["sites"]["think"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_think_not_cached_by_default(self, tmp_path, server):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "default.db"))
+        agent.llm = StreamingClaude("sk-test", base_url=server.url, max_retries=0,
+                                    cache=agent.response_cache)
+        try:
+            for _ in range(2):
+                await asyncio.to_thread(agent.think, "Status do Max-Code?")
+            stats = agent.response_cache.stats()
+        finally:
+            await agent.llm.aclose()
+            agent.close()
+
+        assert len(server.requests) == 2
+        assert stats["entries"] == 0 and "think" not in stats["sites"]
+
+    @pytest.mark.asyncio
+    async def test_conscious_think_ignores_clock_and_metrics(self, llm, server, tmp_path):
+        db_agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "c.db"))
+        llm.cache = ResponseCache(db_agent.memory.db, sites=CONVERSATION_SITES)
+        reasoning = HybridReasoning(llm, max_core=None)
+        try:
+            await reasoning._claude_think("Oi", {"projects": {}, "timestamp": "2026-10-18T12:00:00",
+                                                 "performance": {"tasks_completed": 1}})
+            await reasoning._claude_think("Oi", {"projects": {}, "timestamp": "2026-10-18T12:05:00",
+                                                 "performance": {"tasks_completed": 2}})
+            await reasoning._claude_think("Oi", {"projects": {"Novo": {}}, "timestamp": "2026-10-18T12:06:00"})
+        finally:
+            db_agent.close()
+
+        assert len(server.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_uncached_sites_always_call(self, llm, server, tmp_path):
+        db_agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "u.db"))
+        llm.cache = db_agent.response_cache
+        try:
+            await llm.stream(USER)
+            response = await llm.stream(USER)
+        finally:
+            db_agent.close()
+
+        assert len(server.requests) == 2
+        assert response.cached is False
@@ -0,0 +1,267 @@
+"""
+Memory System Tests
+====================
+
+Test suite for the persistent MemorySystem of the secretary agent.
+
+Test Coverage:
+- Notes and tasks persistence
+- Conversation log
+- Connection lifecycle
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import pytest
+
+from sage.core.secretary_agent import MemorySystem, Note, Task
+
+
+def make_note(i: int, project: str = "Max-Code") -> Note:
+    return Note(
+        id=f"note_{i}",
+        content=f"Nota {i}",
+        tags=["tag", str(i)],
+        project=project,
+        created_at=f"2026-10-{i % 28 + 1:02d}T10:00:00",
+        updated_at=f"2026-10-{i % 28 + 1:02d}T10:00:00",
+        priority="medium",
+    )
+
+
+def make_task(i: int, status: str = "todo", project: str = "Max-Code") -> Task:
+    return Task(
+        id=f"task_{i}",
+        title=f"Tarefa {i}",
+        description=f"Descrição {i}",
+        project=project,
+        status=status,
+        priority="medium",
+        due_date=None,
+        created_at=f"2026-10-{i % 28 + 1:02d}T10:00:00",
+    )
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "memory.db"))
+    yield mem
+    mem.close()
+
+
+class TestNotes:
+    """Test note persistence."""
+
+    def test_save_and_get_note(self, memory):
+        memory.save_note(make_note(1))
+
+        notes = memory.get_all_notes()
+
+        assert len(notes) == 1
+        assert notes[0].content == "Nota 1"
+        assert notes[0].tags == ["tag", "1"]
+
+    def test_save_note_replaces_existing(self, memory):
+        note = make_note(1)
+        memory.save_note(note)
+        note.content = "Atualizada"
+        memory.save_note(note)
+
+        notes = memory.get_all_notes()
+
+        assert len(notes) == 1
+        assert notes[0].content == "Atualizada"
+
+    def test_filter_by_project(self, memory):
+        memory.save_note(make_note(1, project="Max-Code"))
+        memory.save_note(make_note(2, project="V-rtice"))
+
+        notes = memory.get_all_notes(project="V-rtice")
+
+        assert [n.id for n in notes] == ["note_2"]
+
+
+class TestTasks:
+    """Test task persistence."""
+
+    def test_save_and_filter_by_status(self, memory):
+        memory.save_task(make_task(1, status="todo"))
+        memory.save_task(make_task(2, status="done"))
+
+        assert len(memory.get_all_tasks()) == 2
+        assert [t.id for t in memory.get_all_tasks(status="done")] == ["task_2"]
+
+
+class TestPagination:
+    """Test limit-pushdown, pagination and server-side counts."""
+
+    def test_get_notes_newest_first_with_limit(self, memory):
+        for i in range(10):
+            memory.save_note(make_note(i))
+
+        notes = memory.get_notes(limit=3)
+
+        assert [n.id for n in notes] == ["note_9", "note_8", "note_7"]
+
+    def test_get_notes_offset(self, memory):
+        for i in range(10):
+            memory.save_note(make_note(i))
+
+        notes = memory.get_notes(limit=3, offset=3)
+
+        assert [n.id for n in notes] == ["note_6", "note_5", "note_4"]
+
+    def test_keyset_pagination_walks_all_rows(self, memory):
+        for i in range(10):
+            memory.save_note(make_note(i))
+
+        seen, cursor = [], None
+        while True:
+            page = memory.get_notes(limit=4, before=cursor)
+            if not page:
+                break
+            seen.extend(n.id for n in page)
+            cursor = (page[-1].created_at, page[-1].id)
+
+        assert seen == [f"note_{i}" for i in reversed(range(10))]
+
+    def test_keyset_breaks_created_at_ties_by_id(self, memory):
+        for i in range(5):
+            note = make_note(i)
+            note.created_at = "2026-10-01T10:00:00"
+            memory.save_note(note)
+
+        first = memory.get_notes(limit=2)
+        second = memory.get_notes(limit=10, before=(first[-1].created_at, first[-1].id))
+
+        assert len(first) + len(second) == 5
+        assert not {n.id for n in first} & {n.id for n in second}
+
+    def test_recent_notes_are_chronological(self, memory):
+        for i in range(10):
+            memory.save_note(make_note(i))
+
+        recent = memory.get_recent_notes(3)
+
+        assert [n.id for n in recent] == ["note_7", "note_8", "note_9"]
+
+    def test_get_tasks_filters(self, memory):
+        memory.save_task(make_task(1, status="todo", project="Max-Code"))
+        memory.save_task(make_task(2, status="done", project="Max-Code"))
+        memory.save_task(make_task(3, status="todo", project="V-rtice"))
+
+        assert [t.id for t in memory.get_tasks(status="todo", project="V-rtice")] == ["task_3"]
+        assert [t.id for t in memory.get_tasks(exclude_status="done")] == ["task_3", "task_1"]
+        assert [t.id for t in memory.get_recent_tasks(2)] == ["task_2", "task_3"]
+
+    def test_counts(self, memory):
+        for i in range(4):
+            memory.save_note(make_note(i, project="Max-Code" if i % 2 else "V-rtice"))
+        memory.save_task(make_task(1, status="todo"))
+        memory.save_task(make_task(2, status="done"))
+        memory.save_task(make_task(3, status=None))
+
+        assert memory.count_notes() == 4
+        assert memory.count_notes(project="V-rtice") == 2
+        assert memory.count_tasks() == 3
+        assert memory.count_tasks(status="done") == 1
+        assert memory.count_tasks(exclude_status="done") == 2
+
+
+class TestConversations:
+    """Test conversation log."""
+
+    def test_recent_conversations_in_chronological_order(self, memory):
+        for i in range(5):
+            memory.save_conversation(f"pergunta {i}", f"resposta {i}", {"turn": i})
+
+        recent = memory.get_recent_conversations(limit=3)
+
+        assert [c["user_input"] for c in recent] == ["pergunta 2", "pergunta 3", "pergunta 4"]
+        assert recent[-1]["context"] == {"turn": 4}
+
+
+class TestLifecycle:
+    """Test connection lifecycle."""
+
+    def test_data_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "reopen.db")
+        mem = MemorySystem(path)
+        mem.save_note(make_note(1))
+        mem.close()
+
+        reopened = MemorySystem(path)
+        assert len(reopened.get_all_notes()) == 1
+        reopened.close()
+
+
+class TestSearch:
+    """Test FTS5 full-text search."""
+
+    def test_search_finds_notes_tasks_and_conversations(self, memory):
+        note = make_note(1)
+        note.content = "Deploy do Max-Code usa Kubernetes"
+        memory.save_note(note)
+        task = make_task(1)
+        task.title = "Migrar cluster Kubernetes"
+        memory.save_task(task)
+        memory.save_conversation("Como está o Kubernetes?", "Tudo estável", {})
+        memory.save_conversation("E o almoço?", "Às 12h", {})
+
+        results = memory.search("kubernetes")
+
+        assert {r.kind for r in results} == {"note", "task", "conversation"}
+        assert all("[" in r.snippet for r in results)
+
+    def test_search_ranks_by_relevance(self, memory):
+        for i, text in enumerate(["python python python", "python e rust", "apenas rust"]):
+            note = make_note(i)
+            note.content = text
+            memory.save_note(note)
+
+        results = memory.search("python", kinds=["note"])
+
+        assert [r.id for r in results] == ["note_0", "note_1"]
+
+    def test_search_ignores_diacritics_and_prefixes(self, memory):
+        note = make_note(1)
+        note.content = "Reunião de integração amanhã"
+        memory.save_note(note)
+
+        assert [r.id for r in memory.search("reuniao integra")] == ["note_1"]
+
+    def test_search_filters_by_project(self, memory):
+        memory.save_note(Note("a", "bug no login", [], "Max-Code", "2026-10-01", "2026-10-01", "low"))
+        memory.save_note(Note("b", "bug no deploy", [], "V-rtice", "2026-10-01", "2026-10-01", "low"))
+        memory.save_conversation("bug?", "sim", {})
+
+        results = memory.search("bug", project="V-rtice")
+
+        assert [(r.kind, r.id) for r in results] == [("note", "b")]
+
+    def test_index_follows_updates_and_deletes(self, memory):
+        note = make_note(1)
+        note.content = "primeira versão"
+        memory.save_note(note)
+        note.content = "segunda versão"
+        memory.save_note(note)
+
+        assert memory.search("primeira") == []
+        assert [r.id for r in memory.search("segunda")] == ["note_1"]
+
+        with memory.db.transaction() as conn:
+            conn.execute("DELETE FROM notes WHERE id = 'note_1'")
+        assert memory.search("segunda") == []
+
+    def test_search_handles_fts_syntax_in_free_text(self, memory):
+        memory.save_note(make_note(1))
+
+        assert memory.search('status of "Max-Code" AND (') == []
+        assert memory.search("   ") == []
+
+    def test_search_respects_limit(self, memory):
+        for i in range(10):
+            memory.save_conversation(f"deploy {i}", "ok", {})
+
+        assert len(memory.search("deploy", limit=3)) == 3
@@ -0,0 +1,134 @@
+"""
+Schema Migration Tests
+=======================
+
+Test suite for the versioned schema migration system.
+
+Test Coverage:
+- Fresh database creation
+- In-place upgrade of legacy databases
+- Idempotency and ordering
+- Secondary indexes used by the hot queries
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import sqlite3
+
+import pytest
+
+from sage.core.database import ConnectionManager
+from sage.core.migrations import MIGRATIONS, Migration, current_version, migrate
+from sage.core.secretary_agent import MemorySystem
+
+
+LATEST = max(m.version for m in MIGRATIONS)
+
+
+def index_names(db: ConnectionManager):
+    with db.read() as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+class TestMigrate:
+    """Test the migration runner."""
+
+    def test_fresh_database_reaches_latest_version(self, tmp_path):
+        db = ConnectionManager(str(tmp_path / "fresh.db"))
+
+        applied = migrate(db)
+
+        assert applied == sorted(m.version for m in MIGRATIONS)
+        with db.read() as conn:
+            assert current_version(conn) == LATEST
+        db.close()
+
+    def test_migrate_is_idempotent(self, tmp_path):
+        db = ConnectionManager(str(tmp_path / "idem.db"))
+        migrate(db)
+
+        assert migrate(db) == []
+        db.close()
+
+    def test_steps_applied_in_version_order(self, tmp_path):
+        db = ConnectionManager(str(tmp_path / "order.db"))
+        calls = []
+        steps = [
+            Migration(2, "second", apply=lambda conn: calls.append(2)),
+            Migration(1, "first", apply=lambda conn: calls.append(1)),
+        ]
+
+        migrate(db, steps)
+
+        assert calls == [1, 2]
+        db.close()
+
+    def test_failed_step_is_rolled_back(self, tmp_path):
+        db = ConnectionManager(str(tmp_path / "fail.db"))
+
+        def boom(conn):
+            conn.execute("CREATE TABLE half_done (x)")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            migrate(db, [Migration(1, "ok", ["CREATE TABLE a (x)"]), Migration(2, "bad", apply=boom)])
+
+        with db.read() as conn:
+            assert current_version(conn) == 1
+            tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert "half_done" not in tables
+        db.close()
+
+
+class TestLegacyUpgrade:
+    """Test in-place upgrade of databases created before migrations."""
+
+    def test_legacy_database_upgraded_in_place(self, tmp_path):
+        path = str(tmp_path / "secretary_memory.db")
+        legacy = sqlite3.connect(path)
+        legacy.execute("""
+            CREATE TABLE notes (id TEXT PRIMARY KEY, content TEXT, tags TEXT, project TEXT,
+                                created_at TEXT, updated_at TEXT, priority TEXT)
+        """)
+        legacy.execute("""
+            INSERT INTO notes VALUES ('note_1', 'antiga', '[]', 'Max-Code',
+                                      '2025-11-10T10:00:00', '2025-11-10T10:00:00', 'low')
+        """)
+        legacy.commit()
+        legacy.close()
+
+        memory = MemorySystem(path)
+
+        assert [n.id for n in memory.get_all_notes()] == ["note_1"]
+        assert [r.id for r in memory.search("antiga")] == ["note_1"]
+        with memory.db.read() as conn:
+            assert current_version(conn) == LATEST
+        assert {
+            "idx_notes_project_created",
+            "idx_tasks_status_project",
+            "idx_tasks_created",
+            "idx_conversations_timestamp",
+        } <= index_names(memory.db)
+        memory.close()
+
+
+class TestIndexes:
+    """Test that the hot queries use the secondary indexes."""
+
+    def test_queries_use_indexes(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "plan.db"))
+
+        with memory.db.read() as conn:
+            plans = {
+                "notes": conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM notes WHERE project = ? ORDER BY created_at DESC",
+                    ("Max-Code",)).fetchall(),
+                "tasks": conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM tasks WHERE status = ?",
+                    ("todo",)).fetchall(),
+            }
+
+        assert "idx_notes_project_created" in str(plans["notes"])
+        assert "idx_tasks_status_project" in str(plans["tasks"])
+        memory.close()
@@ -0,0 +1,199 @@
+"""
+Response Cache Tests
+=====================
+
+Test suite for the Claude response cache.
+
+Test Coverage:
+- Prompt normalization and exact keys (model / parameters / site)
+- User dates kept in the key, context timestamps masked
+- Near-duplicate matching via simhash, scoped to the same prompt
+- Conversation sites off by default; their policy never near-matches
+  different short requests
+- TTL expiry and LRU eviction
+- SQLite persistence and per-site opt-in
+- Hit-rate statistics
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from sage.core.database import ConnectionManager
+from sage.core.migrations import migrate
+from sage.core.response_cache import (
+    CONVERSATION_SITES, DEFAULT_SITES, CachePolicy, ResponseCache, hamming, normalize,
+    normalize_context, simhash,
+)
+
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+SITES = {
+    "think": CachePolicy(ttl_seconds=300, near_duplicates=True),
+    "roadmap": CachePolicy(ttl_seconds=3600),
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = ConnectionManager(str(tmp_path / "cache.db"))
+    migrate(db)
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def cache(db):
+    return ResponseCache(db, sites=SITES, max_entries=3)
+
+
+def key(site, text, system="persona", model="sonnet", max_tokens=2000):
+    return ResponseCache.make_key(site, model, system, [{"role": "user", "content": text}],
+                                  {"max_tokens": max_tokens})
+
+
+class TestKeys:
+    """Test normalization and keys."""
+
+    def test_normalize(self):
+        assert normalize("  Status\n do   MAX-CODE? ") == "status do max-code"
+        assert normalize("em 2026-10-18T12:00:01.5 ok") != normalize("em 2026-10-19T08:30:00 ok")
+        assert normalize_context("em 2026-10-18T12:00:01.5 ok") == \
+            normalize_context("em 2026-10-19T08:30:00 ok")
+
+    def test_user_dates_kept_in_key(self):
+        assert key("think", "agende reunião em 2026-10-20 14:00").key != \
+            key("think", "agende reunião em 2026-10-21 09:30").key
+
+    def test_context_timestamps_masked(self):
+        assert key("think", "status", system="agora: 2026-10-18T12:00:00") == \
+            key("think", "status", system="agora: 2026-10-18T12:05:00")
+
+    def test_exact_key_ignores_formatting_only(self):
+        assert key("think", "Status do Max-Code") == key("think", "status do  max-code?")
+        assert key("think", "status").key != key("think", "status", model="haiku").key
+        assert key("think", "status").key != key("think", "status", max_tokens=100).key
+        assert key("think", "status").key != key("roadmap", "status").key
+
+    def test_system_blocks_and_text_share_a_key(self):
+        blocks = [{"type": "text", "text": "persona", "cache_control": {"type": "ephemeral"}}]
+        assert key("think", "oi", system=blocks) == key("think", "oi", system="persona")
+
+    def test_simhash_distance(self):
+        a = simhash("qual o status do projeto Max-Code hoje")
+        assert hamming(a, simhash("qual o status do projeto  Max-Code, hoje")) <= 3
+        assert hamming(a, simhash("qual o status do projeto V-rtice hoje")) > 3
+
+
+class TestLookup:
+    """Test hits, misses and near duplicates."""
+
+    def test_exact_hit(self, cache):
+        cache.store("roadmap", key("roadmap", "# Roadmap"), "[...]", "sonnet", 40, now=NOW)
+
+        hit = cache.lookup("roadmap", key("roadmap", "#  roadmap"), now=NOW)
+
+        assert (hit.text, hit.output_tokens, hit.near) == ("[...]", 40, False)
+
+    def test_near_duplicate_hit(self, cache):
+        cache.store("think", key("think", "qual o status do projeto Max-Code hoje"), "Tudo ok", now=NOW)
+
+        hit = cache.lookup("think", key("think", "qual o status do projeto  Max-Code, hoje"), now=NOW)
+        miss = cache.lookup("think", key("think", "qual o status do projeto V-rtice hoje"), now=NOW)
+
+        assert hit.near and hit.text == "Tudo ok"
+        assert miss is None
+
+    def test_near_duplicates_scoped_to_same_prompt(self, cache):
+        cache.store("think", key("think", "qual o status do projeto Max-Code hoje"), "Tudo ok", now=NOW)
+
+        other_context = key("think", "qual o status do projeto Max-Code hoje!", system="outra persona")
+
+        assert cache.lookup("think", other_context, now=NOW) is None
+
+    def test_near_duplicates_only_when_site_allows(self, cache):
+        cache.store("roadmap", key("roadmap", "roadmap do lançamento v1"), "[1]", now=NOW)
+
+        assert cache.lookup("roadmap", key("roadmap", "roadmap do lançamento, v1"), now=NOW) is None
+
+    def test_conversation_think_never_near_matches(self, db):
+        cache = ResponseCache(db, sites={**DEFAULT_SITES, **CONVERSATION_SITES})
+        requests = [
+            ("revise o pull request 101 do Max-Code e comente os testes que falharam no CI ontem à noite",
+             "revise o pull request 107 do Max-Code e comente os testes que falharam no CI ontem à noite"),
+            ("crie uma tarefa no ClickUp para o deploy do Max-Code com prioridade alta para sexta",
+             "crie uma tarefa no ClickUp para o deploy do Max-Code com prioridade baixa para sexta"),
+        ]
+        for stored, asked in requests:
+            cache.store("think", key("think", stored), "resposta", now=NOW)
+
+            assert cache.lookup("think", key("think", asked), now=NOW) is None
+        assert not CONVERSATION_SITES["think"].near_duplicates
+
+    def test_sites_are_opt_in(self, cache):
+        assert not cache.enabled("step_plan") and not cache.enabled(None)
+        assert cache.store("step_plan", key("step_plan", "x"), "y") is False
+
+    def test_conversation_sites_off_by_default(self, db):
+        cache = ResponseCache(db)
+
+        assert cache.enabled("roadmap") and cache.enabled("step_plan")
+        assert not cache.enabled("think") and not cache.enabled("conscious_think")
+
+
+class TestEviction:
+    """Test TTL, LRU and persistence."""
+
+    def test_ttl_expiry(self, cache):
+        cache.store("think", key("think", "oi"), "olá", now=NOW)
+
+        assert cache.lookup("think", key("think", "oi"), now=NOW + timedelta(seconds=299))
+        assert cache.lookup("think", key("think", "oi"), now=NOW + timedelta(seconds=301)) is None
+        assert cache.evict(now=NOW + timedelta(seconds=301)) == 1
+
+    def test_lru_eviction(self, cache):
+        for i in range(4):
+            cache.store("roadmap", key("roadmap", f"r{i}"), str(i), now=NOW + timedelta(seconds=i))
+        cache.lookup("roadmap", key("roadmap", "r0"), now=NOW + timedelta(seconds=10))
+
+        cache.evict(now=NOW + timedelta(seconds=11))
+
+        kept = {i for i in range(4)
+                if cache.lookup("roadmap", key("roadmap", f"r{i}"), now=NOW + timedelta(seconds=12))}
+        assert kept == {0, 2, 3}
+        assert cache.evicted == 1
+
+    def test_persists_across_instances(self, db, cache):
+        cache.store("roadmap", key("roadmap", "# Roadmap"), "[...]", now=NOW)
+
+        assert ResponseCache(db, sites=SITES).lookup("roadmap", key("roadmap", "# Roadmap"), now=NOW)
+
+    def test_clear_site(self, cache):
+        cache.store("roadmap", key("roadmap", "a"), "1", now=NOW)
+        cache.store("think", key("think", "b"), "2", now=NOW)
+
+        cache.clear("roadmap")
+
+        assert cache.stats()["entries"] == 1
+
+
+class TestStats:
+    """Test hit-rate reporting."""
+
+    def test_hit_rates_per_site(self, cache):
+        cache.store("think", key("think", "qual o status do projeto Max-Code hoje"), "ok", now=NOW)
+        cache.lookup("think", key("think", "qual o status do projeto Max-Code hoje"), now=NOW)
+        cache.lookup("think", key("think", "qual o status do projeto  Max-Code, hoje"), now=NOW)
+        cache.lookup("think", key("think", "outra pergunta"), now=NOW)
+        cache.lookup("roadmap", key("roadmap", "nada"), now=NOW)
+
+        stats = cache.stats()
+
+        assert (stats["hits"], stats["near_hits"], stats["misses"]) == (1, 1, 2)
+        assert stats["hit_rate"] == "50.0%"
+        assert stats["sites"]["think"]["hit_rate"] == "66.7%"
+        assert stats["sites"]["roadmap"] == {"entries": 0, "hits": 0, "near_hits": 0,
+                                             "misses": 1, "hit_rate": "0.0%"}
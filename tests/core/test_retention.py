@@ -0,0 +1,196 @@
+"""
+Retention Tests
+================
+
+Test suite for the retention, archival and compaction engine.
+
+Test Coverage:
+- Archiving old conversations into monthly compressed files
+- Summary rows per archived period
+- Orphan context blob collection
+- Incremental VACUUM and search index consistency
+- ArchiveReader queries and cold-data search
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from sage.core.retention import (
+    ARCHIVE_CODEC,
+    ArchiveReader,
+    RetentionEngine,
+    RetentionPolicy,
+    _append_records,
+)
+from sage.core.secretary_agent import MemorySystem, Note
+
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+BIG_CONTEXT = {"projects": {f"p{i}": "descrição longa " * 10 for i in range(3)}}
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "ret.db"), write_behind=False,
+                       archive_dir=str(tmp_path / "archive"))
+    yield mem
+    mem.close()
+
+
+def insert_conversation(memory, timestamp, user_input, context=None):
+    memory._insert_conversations([(timestamp, user_input, "resposta", context or {"turn": 1})])
+
+
+def count(memory, table):
+    with memory.db.read() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestArchival:
+    """Test moving old conversations to cold storage."""
+
+    def test_old_conversations_archived_and_deleted(self, memory):
+        insert_conversation(memory, "2026-05-03T10:00:00", "kubernetes antigo")
+        insert_conversation(memory, "2026-06-20T10:00:00", "deploy antigo")
+        insert_conversation(memory, "2026-10-17T10:00:00", "conversa recente")
+
+        report = RetentionEngine(memory, [RetentionPolicy("conversations", 90)]).run(NOW)
+
+        assert report.deleted == 2
+        assert report.archived == {"2026-05": 1, "2026-06": 1}
+        assert [c["user_input"] for c in memory.get_recent_conversations(10)] == ["conversa recente"]
+        assert memory.archive.periods() == ["2026-05", "2026-06"]
+
+    def test_period_summary_rows(self, memory):
+        for day in (3, 9, 27):
+            insert_conversation(memory, f"2026-05-{day:02d}T10:00:00", f"dia {day}")
+
+        engine = RetentionEngine(memory, [RetentionPolicy(max_age_days=30)], batch_size=2)
+        engine.run(NOW)
+
+        [summary] = engine.archived_periods()
+        assert summary["period"] == "2026-05"
+        assert summary["row_count"] == 3
+        assert summary["first_timestamp"] == "2026-05-03T10:00:00"
+        assert summary["last_timestamp"] == "2026-05-27T10:00:00"
+
+    def test_delete_only_policy_writes_no_files(self, memory):
+        insert_conversation(memory, "2026-01-01T10:00:00", "descartável")
+
+        report = RetentionEngine(memory, [RetentionPolicy(max_age_days=30, archive=False)]).run(NOW)
+
+        assert report.deleted == 1
+        assert memory.archive.periods() == []
+
+    def test_unknown_table_rejected(self):
+        with pytest.raises(ValueError):
+            RetentionPolicy(table="notes")
+
+    def test_archived_context_is_rehydrated(self, memory):
+        insert_conversation(memory, "2026-03-01T10:00:00", "com contexto", BIG_CONTEXT)
+
+        RetentionEngine(memory, [RetentionPolicy(max_age_days=30)]).run(NOW)
+
+        [record] = list(memory.archive.iter_records())
+        assert record["context"] == BIG_CONTEXT
+
+
+class TestCompaction:
+    """Test blob GC, VACUUM and index consistency."""
+
+    def test_orphan_blobs_collected(self, memory):
+        other = {"projects": {"x": "outro contexto " * 20}}
+        insert_conversation(memory, "2026-03-01T10:00:00", "velha", BIG_CONTEXT)
+        insert_conversation(memory, "2026-10-17T10:00:00", "nova", other)
+        assert count(memory, "context_blobs") == 2
+
+        report = RetentionEngine(memory, [RetentionPolicy(max_age_days=30)]).run(NOW)
+
+        assert report.blobs_removed == 1
+        assert memory.get_recent_conversations(1)[0]["context"] == other
+
+    def test_incremental_vacuum_on_new_database(self, memory):
+        with memory.db.read() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+        report = RetentionEngine(memory).run(NOW)
+
+        assert report.full_vacuum is False
+
+    def test_search_index_consistent_after_full_vacuum(self, tmp_path):
+        # Banco criado antes do auto_vacuum=INCREMENTAL: exige VACUUM completo
+        path = str(tmp_path / "legacy.db")
+        legacy = sqlite3.connect(path)
+        legacy.execute("CREATE TABLE legacy (x)")
+        legacy.close()
+        memory = MemorySystem(path, write_behind=False, archive_dir=str(tmp_path / "archive"))
+
+        for i in range(5):
+            memory.save_note(Note(id=f"note_{i}", content=f"nota {i} sobre grafana",
+                                  tags=[], project="V-rtice", created_at=f"2026-10-0{i + 1}",
+                                  updated_at=f"2026-10-0{i + 1}", priority="medium"))
+        memory.save_note(Note(id="note_2", content="nota 2 sobre prometheus", tags=[],
+                              project="V-rtice", created_at="2026-10-03", updated_at="2026-10-03",
+                              priority="medium"))
+
+        report = RetentionEngine(memory).run(NOW)
+
+        assert report.full_vacuum is True
+        hits = memory.search("prometheus", kinds=["note"])
+        assert [h.id for h in hits] == ["note_2"]
+        assert len(memory.search("grafana", kinds=["note"])) == 4
+        memory.close()
+
+
+class TestArchiveReader:
+    """Test querying cold data."""
+
+    def test_iter_records_by_range(self, memory):
+        for month in (2, 3, 4):
+            insert_conversation(memory, f"2026-{month:02d}-15T10:00:00", f"mês {month}")
+        RetentionEngine(memory, [RetentionPolicy(max_age_days=30)]).run(NOW)
+
+        records = list(memory.archive.iter_records(start="2026-03-01", end="2026-04-01"))
+
+        assert [r["user_input"] for r in records] == ["mês 3"]
+
+    def test_repeated_archive_deduplicated(self, memory, tmp_path):
+        insert_conversation(memory, "2026-02-15T10:00:00", "única")
+        engine = RetentionEngine(memory, [RetentionPolicy(max_age_days=30)])
+        engine.run(NOW)
+
+        # Simula uma execução interrompida após gravar o arquivo
+        record = next(memory.archive.iter_records())
+        _append_records(memory.archive.path_for("conversations", "2026-02"), [record], ARCHIVE_CODEC)
+
+        assert len(list(ArchiveReader(str(tmp_path / "archive")).iter_records())) == 1
+
+    def test_search_include_archived(self, memory):
+        insert_conversation(memory, "2026-02-15T10:00:00", "como configurar kubernetes")
+        insert_conversation(memory, "2026-10-17T10:00:00", "kubernetes em produção")
+        RetentionEngine(memory, [RetentionPolicy(max_age_days=30)]).run(NOW)
+
+        hot = memory.search("kubernetes", kinds=["conversation"])
+        both = memory.search("kubernetes", kinds=["conversation"], include_archived=True)
+
+        assert len(hot) == 1
+        assert len(both) == 2
+        assert both[1].id.startswith("archived:")
+        assert both[1].score == 0.0
+
+    def test_get_conversations_with_cold_data(self, memory):
+        insert_conversation(memory, "2026-02-15T10:00:00", "fria")
+        insert_conversation(memory, "2026-10-17T10:00:00", "quente")
+        RetentionEngine(memory, [RetentionPolicy(max_age_days=30)]).run(NOW)
+
+        hot = memory.get_conversations("2026-01-01", "2026-12-31")
+        both = memory.get_conversations("2026-01-01", "2026-12-31", include_archived=True)
+
+        assert [c["user_input"] for c in hot] == ["quente"]
+        assert [c["user_input"] for c in both] == ["fria", "quente"]
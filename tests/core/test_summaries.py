@@ -0,0 +1,224 @@
+"""
+Conversation Summaries Tests
+=============================
+
+Test suite for the summarization tier of conversation memory.
+
+Test Coverage:
+- Extractive summaries per project and per day
+- Incremental refresh (watermark, only affected groups rebuilt)
+- Bounded batches per refresh on long histories
+- Most recent turns kept raw, outside the summaries
+- Background scheduling with coalesced requests
+- Claude summaries and fallback to extractive
+- think() prompt built from raw turns + summaries
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from sage.core.context_packer import estimate_tokens
+from sage.core.secretary_agent import MemorySystem, SecretaryAgent
+from sage.core.summaries import GENERAL_PROJECT, ConversationSummarizer
+
+
+PROJECTS = {
+    "Max-Code": {"github": "Max-Code"},
+    "V-rtice": {"github": "V-rtice"},
+}
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = MemorySystem(str(tmp_path / "summaries.db"))
+    yield memory
+    memory.close()
+
+
+@pytest.fixture
+def summarizer(memory):
+    summarizer = ConversationSummarizer(memory, PROJECTS, keep_recent=2)
+    yield summarizer
+    summarizer.close()
+
+
+def add_turns(memory, turns):
+    """turns: [(timestamp, user_input, agent_response)]"""
+    memory._insert_conversations([(ts, user, agent, {}) for ts, user, agent in turns])
+
+
+def summaries(memory):
+    return {(s.project, s.day): s for s in memory.get_conversation_summaries(limit=50)}
+
+
+class FakeLLM:
+    """Just enough of StreamingClaude for the summarizer"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def stream_sync(self, messages, system=None, max_tokens=4000, **kwargs):
+        self.calls.append(messages[0]["content"])
+        if self.fail:
+            raise RuntimeError("overloaded")
+        return SimpleNamespace(text=f"resumo {len(self.calls)}")
+
+
+class TestRefresh:
+    """Test grouping and incremental refresh."""
+
+    def test_groups_by_project_and_day(self, memory, summarizer):
+        add_turns(memory, [
+            ("2026-10-17T09:00:00", "Como está o Max-Code? Tem testes falhando.", "Dois testes. Vou ver."),
+            ("2026-10-17T10:00:00", "Bom dia", "Bom dia, Juan!"),
+            ("2026-10-18T09:00:00", "Deploy do V-rtice hoje", "Agendado para as 18h."),
+            ("2026-10-18T10:00:00", "recente 1", "ok"),
+            ("2026-10-18T11:00:00", "recente 2", "ok"),
+        ])
+
+        assert summarizer.refresh() == 3
+
+        result = summaries(memory)
+        assert set(result) == {("Max-Code", "2026-10-17"), (GENERAL_PROJECT, "2026-10-17"),
+                               ("V-rtice", "2026-10-18")}
+        assert result[("Max-Code", "2026-10-17")].summary == \
+            "[09:00] Como está o Max-Code? → Dois testes."
+        assert all("recente" not in s.summary for s in result.values())
+
+    def test_incremental_only_new_turns(self, memory, summarizer):
+        add_turns(memory, [("2026-10-18T09:00:00", f"Max-Code passo {i}", "feito") for i in range(4)])
+        summarizer.refresh()
+        before = summaries(memory)
+
+        assert summarizer.refresh() == 0   # nada novo: não refaz nada
+
+        add_turns(memory, [("2026-10-18T12:00:00", f"V-rtice passo {i}", "feito") for i in range(2)])
+        assert summarizer.refresh() == 2
+
+        after = summaries(memory)
+        assert after[("Max-Code", "2026-10-18")].turns == 4
+        assert after[("Max-Code", "2026-10-18")].summary.startswith(
+            before[("Max-Code", "2026-10-18")].summary)
+        assert ("V-rtice", "2026-10-18") not in after   # ainda entre os turnos crus
+
+    def test_summary_size_bounded(self, memory, summarizer):
+        add_turns(memory, [("2026-10-18T09:00:00", "Max-Code " + "detalhe " * 200, "ok " * 300)] * 40)
+
+        summarizer.refresh()
+
+        summary = summaries(memory)[("Max-Code", "2026-10-18")]
+        assert summary.turns == 38
+        assert len(summary.summary.splitlines()) == summarizer.max_lines
+        assert estimate_tokens(summary.summary) < 1500
+
+
+class TestBatches:
+    """Test bounded refresh batches on long histories."""
+
+    def test_long_history_absorbed_in_batches(self, memory):
+        llm = FakeLLM()
+        summarizer = ConversationSummarizer(memory, PROJECTS, llm=llm, keep_recent=0, batch_size=50)
+        add_turns(memory, [(f"2026-{1 + i // 300:02d}-{1 + i // 12 % 25:02d}T09:00:00",
+                            f"Max-Code passo {i}", "feito") for i in range(1200)])
+        try:
+            assert summarizer.refresh() == 50
+            calls_first = len(llm.calls)
+            processed = 50
+            while (n := summarizer.refresh()):
+                processed += n
+                assert n <= 50
+        finally:
+            summarizer.close()
+
+        assert processed == 1200
+        assert calls_first <= 5            # só os grupos do primeiro lote
+        with memory.db.read() as conn:
+            assert conn.execute("SELECT SUM(turns) FROM conversation_summaries").fetchone()[0] == 1200
+
+    def test_group_split_across_batches(self, memory):
+        summarizer = ConversationSummarizer(memory, PROJECTS, keep_recent=0, batch_size=3)
+        add_turns(memory, [("2026-10-18T09:00:00", f"Max-Code passo {i}", "feito") for i in range(5)])
+        try:
+            summarizer.refresh()
+            summarizer.refresh()
+        finally:
+            summarizer.close()
+
+        summary = summaries(memory)[("Max-Code", "2026-10-18")]
+        assert summary.turns == 5
+        assert len(summary.summary.splitlines()) == 5
+
+
+class TestBackground:
+    """Test scheduling off the request path."""
+
+    def test_schedule_runs_in_background(self, memory, summarizer):
+        add_turns(memory, [("2026-10-18T09:00:00", f"pergunta {i}", "resposta") for i in range(5)])
+
+        first = summarizer.schedule()
+        second = summarizer.schedule()
+        first.result(timeout=5)
+        second.result(timeout=5)
+
+        assert summarizer.stats()["summarized_turns"] == 3
+        assert summaries(memory)[(GENERAL_PROJECT, "2026-10-18")].turns == 3
+
+
+class TestClaudeSummaries:
+    """Test summaries through Claude."""
+
+    def test_uses_previous_summary(self, memory):
+        llm = FakeLLM()
+        summarizer = ConversationSummarizer(memory, PROJECTS, llm=llm, keep_recent=0)
+        try:
+            add_turns(memory, [("2026-10-18T09:00:00", "Max-Code release", "Amanhã")])
+            summarizer.refresh()
+            add_turns(memory, [("2026-10-18T10:00:00", "Max-Code changelog", "Pronto")])
+            summarizer.refresh()
+        finally:
+            summarizer.close()
+
+        assert summaries(memory)[("Max-Code", "2026-10-18")].summary == "resumo 2"
+        assert "resumo 1" in llm.calls[1] and "changelog" in llm.calls[1]
+
+    def test_falls_back_to_extractive(self, memory):
+        summarizer = ConversationSummarizer(memory, PROJECTS, llm=FakeLLM(fail=True), keep_recent=0)
+        try:
+            add_turns(memory, [("2026-10-18T09:00:00", "Max-Code release", "Amanhã")])
+            summarizer.refresh()
+        finally:
+            summarizer.close()
+
+        assert summaries(memory)[("Max-Code", "2026-10-18")].summary == "[09:00] Max-Code release → Amanhã"
+        assert summarizer.stats()["llm_failures"] == 1
+
+
+class TestCallSites:
+    """Test the think() prompt built from turns + summaries."""
+
+    def test_think_context(self, tmp_path):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "think.db"))
+        agent.summarizer.llm = None   # extrativo, sem rede
+        try:
+            add_turns(agent.memory, [
+                (f"2026-10-18T{9 + i % 10:02d}:00:00", f"Max-Code pergunta {i} " + "x " * 300, "ok")
+                for i in range(30)
+            ])
+            agent.summarizer.refresh()
+            recent = list(reversed(agent.memory.get_recent_conversations(agent.summarizer.keep_recent)))
+
+            packed = agent.pack_context([], 0, 0, recent, agent.memory.get_conversation_summaries())
+        finally:
+            agent.close()
+
+        turns = json.loads(packed["recent_turns"])
+        assert turns and turns[0]["user_input"].startswith("Max-Code pergunta 29")
+        assert json.loads(packed["summaries"])[0]["project"] == "Max-Code"
+        assert packed.usage["recent_turns"].tokens <= agent.packer.budget("recent_turns")
+        assert packed.usage["summaries"].tokens <= agent.packer.budget("summaries")
@@ -0,0 +1,320 @@
+"""
+Sync Daemon Tests
+==================
+
+Test suite for the background GitHub/ClickUp sync daemon.
+
+Test Coverage:
+- Adaptive per-project intervals (active vs idle, failures)
+- Schedule persistence across restarts
+- notify_activity / trigger
+- Running inside the event loop without blocking it
+- Periodic memory retention (interval, persisted last run, background loop)
+- The packaged `sage` command running the daemon behind its REPL
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from sage import cli
+from sage.core.retention import RetentionPolicy
+from sage.core.sage import Sage
+from sage.core.secretary_agent import SecretaryAgent
+from sage.core.sync_daemon import SyncDaemon, SyncPolicy
+from sage.integrations.clickup_sync import SyncResult
+from sage.integrations.rate_limit import Priority, _current_priority
+
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+POLICY = SyncPolicy(min_interval=60, max_interval=600, backoff_factor=2.0, max_idle_wait=0.05)
+
+
+class FakeClickUpSync:
+    """ClickUpSyncEngine falso: cursor avança quando a lista 'muda'"""
+
+    def __init__(self, block: float = 0.0):
+        self.block = block
+        self.cursors = {}
+        self.changed = set()
+        self.calls = []
+
+    def get_state(self, list_id):
+        return self.cursors.get(list_id), None
+
+    def sync_list(self, list_id, project, force_full=False, now=None):
+        time.sleep(self.block)
+        self.calls.append(list_id)
+        if list_id in self.changed:
+            self.cursors[list_id] = str(int(self.cursors.get(list_id) or 0) + 1)
+        return SyncResult(list_id=list_id, project=project, full=False,
+                          cursor=self.cursors.get(list_id))
+
+
+def old_conversation(agent, when=NOW - timedelta(days=200)):
+    agent.memory._insert_conversations([(when.isoformat(), "conversa antiga", "resposta", {})])
+
+
+@pytest_asyncio.fixture
+async def agent(tmp_path):
+    agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "daemon.db"),
+                           retention_policies=[RetentionPolicy("conversations", 90)])
+    agent.projects = {
+        "Max-Code": {"github": "Max-Code", "clickup_list": "L1", "description": ""},
+        "V-rtice": {"github": "V-rtice", "clickup_list": "TBD", "description": ""},
+    }
+    agent.new_commits = {}
+    agent.github_calls = []
+    agent.priorities = []
+
+    async def fake_github(days=7, max_concurrency=8, projects=None):
+        agent.github_calls.append(list(projects))
+        agent.priorities.append(_current_priority.get())
+        return {
+            p: ({"error": "boom"} if agent.new_commits.get(p) == "error"
+                else {"new_commits": agent.new_commits.get(p, 0)})
+            for p in projects
+        }
+
+    agent.sync_with_github_async = fake_github
+    agent.clickup_sync = FakeClickUpSync()
+    yield agent
+    agent.close()
+
+
+class TestAdaptiveSchedule:
+    """Test interval adaptation."""
+
+    @pytest.mark.asyncio
+    async def test_first_run_syncs_everything(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+
+        entries = await daemon.run_once(now=NOW)
+
+        assert set(entries) == {"Max-Code", "V-rtice"}
+        assert agent.github_calls == [["Max-Code", "V-rtice"]]
+        assert agent.clickup_sync.calls == ["L1"]   # V-rtice sem lista
+        assert agent.priorities == [Priority.BACKGROUND]
+
+    @pytest.mark.asyncio
+    async def test_active_projects_sync_more_often(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+        agent.new_commits = {"Max-Code": 3}
+
+        await daemon.run_once(now=NOW)
+        await daemon.run_once(now=NOW + timedelta(seconds=60))
+
+        assert daemon.schedule["Max-Code"].interval_seconds == 60
+        assert daemon.schedule["V-rtice"].interval_seconds == 120
+        assert agent.github_calls[1] == ["Max-Code"]   # V-rtice ainda não estava devido
+        assert daemon.due_projects(NOW + timedelta(seconds=100)) == []
+
+    @pytest.mark.asyncio
+    async def test_idle_backoff_capped(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+        now = NOW
+        for _ in range(8):
+            await daemon.run_once(now=now, force=True)
+            now += timedelta(minutes=30)
+
+        assert daemon.schedule["V-rtice"].interval_seconds == 600
+
+    @pytest.mark.asyncio
+    async def test_clickup_changes_count_as_activity(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+        agent.clickup_sync.changed = {"L1"}
+
+        await daemon.run_once(now=NOW)
+        await daemon.run_once(now=NOW + timedelta(minutes=5), force=True)
+
+        assert daemon.schedule["Max-Code"].interval_seconds == 60
+        assert daemon.schedule["Max-Code"].last_change_at is not None
+
+    @pytest.mark.asyncio
+    async def test_failures_back_off(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+        agent.new_commits = {"Max-Code": "error"}
+
+        await daemon.run_once(now=NOW)
+
+        entry = daemon.schedule["Max-Code"]
+        assert entry.failures == 1
+        assert entry.last_error == "boom"
+        assert entry.interval_seconds == 120
+
+
+class TestPersistence:
+    """Test schedule persistence and manual nudges."""
+
+    @pytest.mark.asyncio
+    async def test_schedule_survives_restart(self, agent):
+        agent.new_commits = {"Max-Code": 1}
+        await SyncDaemon(agent, POLICY).run_once(now=NOW)
+
+        restarted = SyncDaemon(agent, POLICY)
+        restarted.load(now=NOW + timedelta(seconds=10))
+
+        assert restarted.schedule["V-rtice"].interval_seconds == 120
+        assert restarted.due_projects(NOW + timedelta(seconds=10)) == []
+
+    @pytest.mark.asyncio
+    async def test_notify_activity_pulls_sync_forward(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+        for i in range(3):
+            await daemon.run_once(now=NOW + timedelta(hours=i), force=True)
+        later = NOW + timedelta(hours=2, minutes=1)
+
+        daemon.notify_activity("V-rtice", now=later)
+
+        assert daemon.due_projects(later) == ["V-rtice"]
+        assert daemon.schedule["V-rtice"].interval_seconds == 60
+
+
+class TestEventLoop:
+    """Test running inside the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_background_and_stops(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+
+        daemon.start()
+        await asyncio.sleep(0.1)
+        daemon.trigger()
+        await asyncio.sleep(0.1)
+        await daemon.stop()
+
+        assert daemon.runs >= 2
+
+    @pytest.mark.asyncio
+    async def test_blocking_sync_does_not_stall_loop(self, agent):
+        agent.clickup_sync = FakeClickUpSync(block=0.3)
+        daemon = SyncDaemon(agent, POLICY)
+
+        daemon.start()
+        worst = 0.0
+        for _ in range(40):
+            start = time.monotonic()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.monotonic() - start)
+        await daemon.stop()
+
+        assert agent.clickup_sync.calls == ["L1"]
+        assert worst < 0.1
+
+
+class TestRetention:
+    """Test periodic memory retention driven by the daemon."""
+
+    def test_agent_builds_configured_engine(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SAGE_RETENTION_DAYS", "30")
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "env.db"))
+        try:
+            assert [(p.table, p.max_age_days) for p in agent.retention.policies] == \
+                [("conversations", 30)]
+        finally:
+            agent.close()
+
+    @pytest.mark.asyncio
+    async def test_first_run_applies_policies(self, agent):
+        old_conversation(agent)
+        daemon = SyncDaemon(agent, POLICY)
+
+        report = await daemon.run_retention(now=NOW)
+
+        assert report.deleted == 1
+        assert agent.memory.get_recent_conversations(10) == []
+        assert daemon.retention_status()["runs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_rerun_before_interval(self, agent):
+        daemon = SyncDaemon(agent, POLICY)
+        await daemon.run_retention(now=NOW)
+        old_conversation(agent)
+
+        assert await daemon.run_retention(now=NOW + timedelta(hours=1)) is None
+        report = await daemon.run_retention(now=NOW + timedelta(days=1, seconds=1))
+
+        assert report.deleted == 1
+
+    @pytest.mark.asyncio
+    async def test_last_run_survives_restart(self, agent):
+        await SyncDaemon(agent, POLICY).run_retention(now=NOW)
+
+        restarted = SyncDaemon(agent, POLICY)
+        restarted.load(now=NOW + timedelta(hours=1))
+
+        assert restarted.retention_status()["last_run_at"] == NOW.isoformat()
+        assert restarted.retention_next_at == NOW + timedelta(days=1)
+        assert await restarted.run_retention(now=NOW + timedelta(hours=1)) is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_zero_interval(self, agent):
+        old_conversation(agent)
+        policy = SyncPolicy(min_interval=60, max_interval=600, retention_interval=0)
+
+        assert await SyncDaemon(agent, policy).run_retention(now=NOW) is None
+        assert len(agent.memory.get_recent_conversations(10)) == 1
+
+    @pytest.mark.asyncio
+    async def test_background_loop_runs_retention(self, agent):
+        old_conversation(agent, datetime.now() - timedelta(days=200))
+        daemon = SyncDaemon(agent, POLICY)
+
+        daemon.start()
+        await asyncio.sleep(0.2)
+        await daemon.stop()
+
+        assert daemon.retention_runs == 1
+        assert agent.memory.get_recent_conversations(10) == []
+
+
+class TestCommandLine:
+    """Test the `sage` console script wiring."""
+
+    @pytest.mark.asyncio
+    async def test_cli_runs_daemon_behind_repl(self, tmp_path, monkeypatch):
+        started = []
+        seen = {}
+
+        class RecordingSage(Sage):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, db_path=str(tmp_path / "cli.db"))
+                started.append(self)
+
+                async def run_once(now=None, force=False):
+                    self.sync_daemon.runs += 1
+                    return {}
+
+                async def run_retention(now=None, force=False):
+                    return None
+
+                self.sync_daemon.run_once = run_once
+                self.sync_daemon.run_retention = run_retention
+
+        def fake_input(prompt):
+            seen["thread"] = threading.current_thread()
+            time.sleep(0.2)   # o event loop continua rodando o daemon
+            seen["runs"] = started[0].sync_daemon.runs
+            return "quit"
+
+        monkeypatch.setattr(cli, "Sage", RecordingSage)
+        monkeypatch.setattr("builtins.input", fake_input)
+        monkeypatch.setattr(sys, "argv", ["sage", "--api-key", "sk-test"])
+        monkeypatch.setenv("MAXIMUS_CORE_URL", "http://127.0.0.1:9")
+        monkeypatch.setenv("MABA_URL", "http://127.0.0.1:9")
+
+        await cli.main()
+
+        assistant = started[0]
+        assert seen["thread"] is not threading.main_thread()
+        assert seen["runs"] >= 1
+        assert assistant.sync_daemon._task is None   # stop() na saída
+        assert assistant.memory.db.closed
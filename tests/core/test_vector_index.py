@@ -0,0 +1,283 @@
+"""
+Vector Index Tests
+===================
+
+Test suite for the local semantic index over notes and tasks.
+
+Test Coverage:
+- Deterministic offline hashing embedder
+- Upserts, removals and slot reuse in the memory-mapped matrix
+- Batched flushes (not one per write) and incremental filter masks
+- Batched top-k cosine search with kind / project filters
+- Persistence across instances and rebuild on embedder change
+- IVF partitioning once the corpus is large
+- MemorySystem integration (queue triggers, semantic_search)
+- Context building sends only the top-k memories
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from sage.core.sage import Sage
+from sage.core.secretary_agent import MemorySystem, Note, SecretaryAgent, Task
+from sage.core.vector_index import HashingEmbedder, VectorIndex
+
+
+DOCS = [
+    ("note:1", "Deploy do Max-Code em produção na sexta", "Max-Code"),
+    ("note:2", "Reunião sobre moderação do bot do Discord", "Maximus-BOT"),
+    ("task:1", "Corrigir testes falhando no deploy do Max-Code", "Max-Code"),
+    ("task:2", "Relatório de ameaças da plataforma de cibersegurança", "V-rtice"),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = VectorIndex(str(tmp_path / "vectors"), HashingEmbedder(dim=256), initial_capacity=2)
+    index.upsert(DOCS)
+    yield index
+    index.close()
+
+
+def note(i, content, project="Max-Code"):
+    return Note(id=f"n{i}", content=content, tags=[], project=project,
+                created_at=f"2026-10-18T10:00:0{i}", updated_at="2026-10-18T10:00:00",
+                priority="medium")
+
+
+class TestEmbedder:
+    """Test the default embedder."""
+
+    def test_deterministic_and_normalized(self):
+        embedder = HashingEmbedder(dim=128)
+
+        a, b = embedder(["deploy do Max-Code", "deploy do Max-Code"])
+
+        assert a.dtype == np.float32 and a.shape == (128,)
+        assert np.array_equal(a, b)
+        assert np.linalg.norm(a) == pytest.approx(1.0)
+        assert not embedder([""]).any()
+
+    def test_related_texts_are_closer(self):
+        embedder = HashingEmbedder()
+        query, related, unrelated = embedder(["deploys do max-code",
+                                              "fazer deploy do Max-Code",
+                                              "reunião de moderação no Discord"])
+
+        assert query @ related > query @ unrelated + 0.3
+
+
+class TestIndex:
+    """Test writes and search."""
+
+    def test_top_k(self, index):
+        results = index.search("deploy Max-Code", k=2)
+
+        assert {key for key, _ in results} == {"task:1", "note:1"}
+        assert results[0][1] >= results[1][1] > 0
+
+    def test_batch_search_matches_single(self, index):
+        queries = ["deploy Max-Code", "bot do Discord"]
+
+        batch = index.search_batch(queries, k=3)
+
+        for results, query in zip(batch, queries):
+            single = index.search(query, k=3)
+            assert [k for k, _ in results] == [k for k, _ in single]
+            assert [s for _, s in results] == pytest.approx([s for _, s in single], abs=1e-6)
+        assert batch[1][0][0] == "note:2"
+
+    def test_filters(self, index):
+        assert [k for k, _ in index.search("deploy", k=5, kinds=["note"])][0] == "note:1"
+        assert all(k.startswith("note:") for k, _ in index.search("deploy", k=5, kinds=["note"]))
+        assert {k for k, _ in index.search("deploy", k=5, project="Max-Code")} == {"note:1", "task:1"}
+
+    def test_update_remove_and_reuse(self, index):
+        index.upsert([("note:1", "Férias em dezembro", "geral")])
+        assert index.search("deploy Max-Code", k=1)[0][0] == "task:1"
+        assert index.search("férias", k=1)[0][0] == "note:1"
+
+        index.remove(["task:1"])
+        index.upsert([("note:9", "Outro deploy", "Max-Code")])
+
+        assert "task:1" not in dict(index.search("deploy", k=10))
+        assert index.rows["note:9"] == 2          # linha liberada reaproveitada
+        assert len(index) == 4 and index.capacity >= 4
+
+    def test_writes_batched_until_flush_due(self, tmp_path):
+        index = VectorIndex(str(tmp_path / "batched"), HashingEmbedder(dim=64), flush_every=3)
+        try:
+            index.upsert(DOCS[:2])
+            assert not index.maybe_flush() and index.flushes == 0
+            assert not (tmp_path / "batched" / "index.json").exists()
+
+            index.upsert(DOCS[2:3])
+            assert index.maybe_flush() and index.stats()["pending_writes"] == 0
+        finally:
+            index.close()
+
+    def test_masks_updated_per_row(self, index, monkeypatch):
+        index.search("deploy", k=5, kinds=["note"])
+        calls = []
+        matches = index._matches
+        monkeypatch.setattr(index, "_matches", lambda row, sig: calls.append(row) or matches(row, sig))
+
+        index.upsert([("note:9", "Outro deploy", "Max-Code")])
+        index.remove(["note:1"])
+
+        assert len(calls) == 2                     # uma linha por escrita, sem varrer tudo
+        assert [k for k, _ in index.search("deploy", k=5, kinds=["note"])][0] == "note:9"
+        assert "note:1" not in dict(index.search("deploy", k=5, kinds=["note"]))
+
+    def test_persists(self, tmp_path, index):
+        index.flush()
+
+        reopened = VectorIndex(str(tmp_path / "vectors"), HashingEmbedder(dim=256))
+
+        assert reopened.search("deploy Max-Code", k=2) == index.search("deploy Max-Code", k=2)
+
+    def test_rebuilt_for_other_embedder(self, tmp_path, index):
+        index.flush()
+
+        other = VectorIndex(str(tmp_path / "vectors"), HashingEmbedder(dim=64))
+
+        assert len(other) == 0 and other.rebuilt
+
+
+class TestIVF:
+    """Test partitioned search on a larger corpus."""
+
+    def test_ivf_scans_fewer_vectors(self, tmp_path):
+        topics = ["deploy", "moderação", "ameaças", "roadmap", "reunião", "fatura", "viagem", "backup"]
+        docs = [(f"note:{i}", f"{topics[i % 8]} item {i} {topics[i % 8]}", None) for i in range(800)]
+        index = VectorIndex(str(tmp_path / "ivf"), HashingEmbedder(dim=128), ivf_min_size=400, nprobe=2)
+        try:
+            index.upsert(docs)
+
+            results = index.search("backup", k=5)
+            stats = index.stats()
+        finally:
+            index.close()
+
+        assert stats["ivf_lists"] == int(np.sqrt(800))
+        assert stats["avg_scanned"] < 800
+        assert all(int(key.split(":")[1]) % 8 == 7 for key, _ in results)
+
+
+class TestMemoryIntegration:
+    """Test indexing through MemorySystem writes."""
+
+    def test_saves_are_indexed(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "memory.db"))
+        try:
+            memory.save_note(note(1, "Deploy do Max-Code na sexta"))
+            memory.save_note(note(2, "Ideia para o bot do Discord", "Maximus-BOT"))
+            memory.save_task(Task(id="t1", title="Corrigir CI do deploy", description="Max-Code",
+                                  project="Max-Code", status="todo", priority="high",
+                                  due_date=None, created_at="2026-10-18T10:00:00"))
+
+            results = memory.semantic_search("deploy do Max-Code", limit=2)
+        finally:
+            memory.close()
+
+        assert [(r.kind, r.id) for r in results] == [("note", "n1"), ("task", "t1")]
+        assert results[0].score < results[1].score    # menor = mais relevante
+        assert results[0].title == "Deploy do Max-Code na sexta"
+
+    def test_external_writes_and_deletes_picked_up(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "memory.db"))
+        try:
+            memory.save_note(note(1, "Deploy do Max-Code"))
+            with memory.db.transaction() as conn:   # ex.: sync do ClickUp
+                conn.execute("DELETE FROM notes WHERE id = 'n1'")
+                conn.execute("""
+                    INSERT INTO tasks (id, title, description, project, status, priority, created_at)
+                    VALUES ('c1', 'Deploy pelo ClickUp', '', 'Max-Code', 'todo', 'medium', '2026-10-18')
+                """)
+
+            results = memory.semantic_search("deploy", limit=5)
+        finally:
+            memory.close()
+
+        assert [r.id for r in results] == ["c1"]
+
+    def test_saves_do_not_rewrite_index(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "memory.db"))
+        try:
+            for i in range(5):
+                memory.save_note(note(i, f"Deploy {i} do Max-Code"))
+
+            assert memory.vectors.flushes == 0
+            assert len(memory.semantic_search("deploy", limit=5)) == 5
+        finally:
+            memory.close()
+
+        conn = sqlite3.connect(tmp_path / "memory.db")
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM vector_queue").fetchone()[0] == 0
+        finally:
+            conn.close()
+
+    def test_unflushed_writes_recovered_from_queue(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "memory.db"), write_behind=False)
+        memory.save_note(note(1, "Reunião do bot do Discord", "Maximus-BOT"))
+        memory.flush_vectors()                      # n1 já gravado no índice
+        memory.save_note(note(2, "Deploy do Max-Code"))
+        memory.db.close()                           # queda: n2 nunca chegou ao disco
+
+        reopened = MemorySystem(str(tmp_path / "memory.db"))
+        try:
+            assert len(reopened.vectors) == 1
+            assert [r.id for r in reopened.semantic_search("deploy do Max-Code", limit=1)] == ["n2"]
+        finally:
+            reopened.close()
+
+    def test_existing_rows_indexed_on_open(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "memory.db"))
+        memory.save_note(note(1, "Deploy do Max-Code"))
+        memory.close()
+
+        reopened = MemorySystem(str(tmp_path / "memory.db"), vector_dir=str(tmp_path / "novo"))
+        try:
+            assert [r.id for r in reopened.semantic_search("deploy")] == ["n1"]
+        finally:
+            reopened.close()
+
+
+class TestCallSites:
+    """Test context building with the top-k memories."""
+
+    def test_think_uses_top_k(self, tmp_path):
+        agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "agent.db"))
+        try:
+            for i in range(20):
+                agent.create_note(f"Assunto aleatório número {i}", "geral", [])
+            agent.create_note("Deploy do Max-Code agendado", "Max-Code", [])
+
+            memories = agent.memory.semantic_search("quando é o deploy do Max-Code?", limit=5)
+        finally:
+            agent.close()
+
+        assert memories[0].title == "Deploy do Max-Code agendado"
+        assert len(memories) <= 5
+
+    @pytest.mark.asyncio
+    async def test_conscious_context_has_relevant_memories(self, tmp_path):
+        sage = Sage("sk-test", "pk-test", "tester", db_path=str(tmp_path / "sage.db"))
+        try:
+            for i in range(10):
+                sage.create_note(f"Nota genérica {i}", "geral", [])
+            sage.create_note("Deploy do Max-Code agendado", "Max-Code", [])
+
+            context = await sage._build_context("deploy do Max-Code")
+        finally:
+            await sage.close()
+
+        assert "recent_notes" not in context
+        assert context["relevant_memories"][0]["title"] == "Deploy do Max-Code agendado"
+        assert all("score" not in m for m in context["relevant_memories"])
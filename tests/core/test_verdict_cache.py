@@ -0,0 +1,246 @@
+"""
+Verdict Cache Tests
+====================
+
+Test suite for caching MAXIMUS Core consciousness verdicts.
+
+Test Coverage:
+- Canonical action keys (key order, whitespace, top-level bookkeeping)
+- Different targets, dates or step payloads never share a key
+- Relevant context fields change the key, volatile ones do not
+- TTL by safety tier (SAFE long, CAUTION short, RISKY / CRITICAL never)
+- Invalidation on policy / constitution version change
+- LRU eviction
+- MaximusCore serving repeated actions without calling the Core
+- Hit rate on PerformanceMonitor
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from sage.core.sage import (
+    ConsciousnessCheck, ConsciousnessLevel, MaximusCore, PerformanceMonitor, SafetyTier
+)
+from sage.core.verdict_cache import VerdictCache
+from sage.integrations.circuit_breaker import HealthCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def verdict(tier=SafetyTier.SAFE, level=ConsciousnessLevel.LOW, human=False):
+    return ConsciousnessCheck(approved=tier != SafetyTier.BLOCKED, consciousness_level=level,
+                              safety_tier=tier, reasoning="ok", constitutional_notes=["nota"],
+                              requires_human_approval=human)
+
+
+ACTION = {"type": "navigate", "url": "https://github.com/JuanCS-Dev",
+          "description": "Abrir o repositório"}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return VerdictCache(clock=clock)
+
+
+@pytest_asyncio.fixture
+async def core():
+    """Core fake que conta as verificações e anuncia uma versão de política"""
+    state = {"checks": 0, "policy_version": "v1", "safety_tier": "safe"}
+
+    async def health(request):
+        return web.json_response({"status": "ok", "policy_version": state["policy_version"]})
+
+    async def check(request):
+        state["checks"] += 1
+        return web.json_response({"approved": True, "consciousness_level": "low",
+                                  "safety_tier": state["safety_tier"], "reasoning": "ok",
+                                  "policy_version": state["policy_version"]})
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_post("/api/v1/consciousness/check", check)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("")).rstrip("/"), state
+    await server.close()
+
+
+class TestKeys:
+    """Test canonical action keys."""
+
+    def test_equivalent_actions_share_key(self, cache):
+        noisy = {"description": "  Abrir o\n repositório ", "url": "https://github.com/JuanCS-Dev",
+                 "type": "navigate", "timestamp": "2026-10-18T10:00:00",
+                 "created_at": "2026-10-18T09:59:58"}
+
+        assert cache.key(ACTION) == cache.key(noisy)
+
+    def test_different_targets_never_share_key(self, cache):
+        assert cache.key({"type": "delete_task", "task_id": "A"}) != \
+            cache.key({"type": "delete_task", "task_id": "B"})
+        assert cache.key({"type": "delete_note", "id": "n1"}) != \
+            cache.key({"type": "delete_note", "id": "n2"})
+
+    def test_user_dates_kept(self, cache):
+        a = {"type": "schedule", "when": "2026-10-20 14:00"}
+        b = {"type": "schedule", "when": "2031-01-01 03:00"}
+
+        assert cache.key(a) != cache.key(b)
+
+    def test_nested_payload_kept(self, cache):
+        task = {"task_id": "t1", "title": "Deploy", "steps": [{"id": "s1", "action": "deploy"}],
+                "result": None}
+        other = {**task, "steps": [{"id": "s2", "action": "deploy"}], "result": {"ok": True}}
+
+        assert cache.key({"type": "execute_task", "task": task}) != \
+            cache.key({"type": "execute_task", "task": other})
+
+    def test_different_action_or_context(self, cache):
+        other = {**ACTION, "url": "https://github.com/outro"}
+
+        assert cache.key(ACTION) != cache.key(other)
+        assert cache.key(ACTION, {"consciousness_enabled": True}) != \
+            cache.key(ACTION, {"consciousness_enabled": False})
+        assert cache.key(ACTION, {"consciousness_enabled": True, "performance": {"a": 1}}) == \
+            cache.key(ACTION, {"consciousness_enabled": True, "performance": {"a": 2}})
+
+
+class TestTTL:
+    """Test expiry by safety tier."""
+
+    def test_safe_outlives_caution(self, cache, clock):
+        cache.put("safe", verdict(SafetyTier.SAFE))
+        cache.put("caution", verdict(SafetyTier.CAUTION))
+
+        clock.now += 301
+        assert cache.get("safe") is not None
+        assert cache.get("caution") is None
+
+        clock.now += 3600
+        assert cache.get("safe") is None
+
+    def test_never_cached(self, cache):
+        assert not cache.put("risky", verdict(SafetyTier.RISKY))
+        assert not cache.put("critical", verdict(SafetyTier.SAFE, ConsciousnessLevel.CRITICAL))
+        assert not cache.put("human", verdict(SafetyTier.CAUTION, human=True))
+
+        assert cache.stats()["entries"] == 0 and cache.stats()["skipped"] == 3
+
+    def test_returns_copy(self, cache):
+        cache.put("k", verdict())
+
+        cache.get("k").constitutional_notes.append("alterado")
+
+        assert cache.get("k").constitutional_notes == ["nota"]
+
+
+class TestInvalidation:
+    """Test policy version and LRU."""
+
+    def test_policy_change_clears(self, cache):
+        cache.set_policy_version("v1")
+        cache.put("k", verdict())
+
+        assert not cache.set_policy_version("v1")
+        assert cache.get("k") is not None
+
+        assert cache.set_policy_version("v2")
+        assert cache.get("k") is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_lru_eviction(self, clock):
+        cache = VerdictCache(max_entries=2, clock=clock)
+        cache.put("a", verdict())
+        cache.put("b", verdict())
+        cache.get("a")
+
+        cache.put("c", verdict())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+
+class TestMaximusCore:
+    """Test verdict caching in front of the Core."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_action_skips_core(self, core):
+        url, state = core
+        max_core = MaximusCore(url)
+        try:
+            first = await max_core.check_consciousness(ACTION, {"consciousness_enabled": True})
+            second = await max_core.check_consciousness({**ACTION, "timestamp": "agora"},
+                                                        {"consciousness_enabled": True})
+        finally:
+            await max_core.close_session()
+
+        assert state["checks"] == 1
+        assert first == second
+        assert max_core.verdicts.stats()["hits_by_tier"] == {"safe": 1}
+
+    @pytest.mark.asyncio
+    async def test_risky_always_rechecked(self, core):
+        url, state = core
+        state["safety_tier"] = "risky"
+        max_core = MaximusCore(url)
+        try:
+            for _ in range(3):
+                await max_core.check_consciousness(ACTION, {})
+        finally:
+            await max_core.close_session()
+
+        assert state["checks"] == 3
+
+    @pytest.mark.asyncio
+    async def test_policy_change_rechecks(self, core):
+        url, state = core
+        max_core = MaximusCore(url)
+        health = HealthCache()
+        health.register("core", f"{url}/health", max_core.breaker, on_info=max_core.observe_policy)
+        try:
+            await max_core.check_consciousness(ACTION, {})
+            await health.probe("core")                  # mesma versão: mantém
+            await max_core.check_consciousness(ACTION, {})
+            assert state["checks"] == 1
+
+            state["policy_version"] = "v2"
+            await health.probe("core")
+            await max_core.check_consciousness(ACTION, {})
+        finally:
+            await health.stop()
+            await max_core.close_session()
+
+        assert state["checks"] == 2
+        assert max_core.verdicts.policy_version == "v2"
+
+
+class TestPerformanceMonitor:
+    """Test hit rate reporting."""
+
+    def test_hit_rate(self, cache):
+        monitor = PerformanceMonitor()
+        cache.add_listener(monitor.record_verdict_lookup)
+        cache.put("k", verdict())
+
+        for key in ("k", "k", "k", "outra"):
+            cache.get(key)
+
+        report = monitor.get_report()["consciousness_checks"]["verdict_cache"]
+        assert report == {"hits": 3, "misses": 1, "hit_rate": "75.0%"}
+        assert cache.stats()["hit_rate"] == "75.0%"
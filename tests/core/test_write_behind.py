@@ -0,0 +1,229 @@
+"""
+Write-Behind Buffer Tests
+==========================
+
+Test suite for the batched write-behind buffer used by conversation logging.
+
+Test Coverage:
+- Size and time flush thresholds
+- Ordering and durability on close
+- Retry after a failed batch
+- Signal-triggered flush (no deadlock when the signal lands mid-flush)
+- atexit hook released on close
+- MemorySystem integration (batched commits, read-your-writes)
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import gc
+import os
+import signal
+import threading
+import time
+import weakref
+
+import pytest
+
+from sage.core.secretary_agent import MemorySystem
+from sage.core.write_behind import WriteBehindBuffer
+
+
+class Recorder:
+    """Collects the batches handed to the flush function."""
+
+    def __init__(self):
+        self.batches = []
+        self.event = threading.Event()
+
+    def __call__(self, batch):
+        self.batches.append(list(batch))
+        self.event.set()
+
+    @property
+    def records(self):
+        return [r for batch in self.batches for r in batch]
+
+
+class TestThresholds:
+    """Test size and time based flushing."""
+
+    def test_flushes_when_batch_size_reached(self):
+        recorder = Recorder()
+        buffer = WriteBehindBuffer(recorder, max_batch=5, flush_interval=60)
+
+        for i in range(5):
+            buffer.add(i)
+
+        assert recorder.event.wait(2)
+        assert recorder.records == [0, 1, 2, 3, 4]
+        buffer.close()
+
+    def test_flushes_after_interval(self):
+        recorder = Recorder()
+        buffer = WriteBehindBuffer(recorder, max_batch=1000, flush_interval=0.05)
+
+        buffer.add("a")
+
+        assert recorder.event.wait(2)
+        assert recorder.records == ["a"]
+        buffer.close()
+
+    def test_add_does_not_write_inline(self):
+        recorder = Recorder()
+        buffer = WriteBehindBuffer(recorder, max_batch=1000, flush_interval=60)
+
+        buffer.add("a")
+
+        assert recorder.batches == []
+        assert len(buffer) == 1
+        buffer.close()
+
+
+class TestDurability:
+    """Test flush on close, ordering and retries."""
+
+    def test_close_flushes_pending_in_order(self):
+        recorder = Recorder()
+        buffer = WriteBehindBuffer(recorder, max_batch=1000, flush_interval=60)
+
+        for i in range(250):
+            buffer.add(i)
+        buffer.close()
+
+        assert recorder.records == list(range(250))
+        assert buffer.batches_written == 1
+
+    def test_add_after_close_fails(self):
+        buffer = WriteBehindBuffer(Recorder(), flush_interval=60)
+        buffer.close()
+
+        with pytest.raises(RuntimeError):
+            buffer.add("late")
+
+    def test_failed_batch_is_retried(self):
+        attempts = []
+
+        def flaky(batch):
+            attempts.append(list(batch))
+            if len(attempts) == 1:
+                raise IOError("disk full")
+
+        buffer = WriteBehindBuffer(flaky, max_batch=1000, flush_interval=60)
+        buffer.add("a")
+        with pytest.raises(IOError):
+            buffer.flush()
+        buffer.add("b")
+        buffer.flush()
+
+        assert attempts[-1] == ["a", "b"]
+        buffer.close()
+
+    def test_signal_triggers_flush_and_chains_previous_handler(self):
+        recorder = Recorder()
+        buffer = WriteBehindBuffer(recorder, max_batch=1000, flush_interval=60)
+        previous_calls = []
+        original = signal.signal(signal.SIGUSR1, lambda s, f: previous_calls.append(s))
+
+        try:
+            buffer.install_signal_handlers([signal.SIGUSR1])
+            buffer.add("a")
+            os.kill(os.getpid(), signal.SIGUSR1)
+            time.sleep(0.05)
+
+            assert recorder.records == ["a"]
+            assert previous_calls == [signal.SIGUSR1]
+        finally:
+            signal.signal(signal.SIGUSR1, original)
+            buffer.close()
+
+
+    def test_signal_during_flush_does_not_deadlock(self):
+        batches = []
+        original = signal.signal(signal.SIGUSR1, lambda s, f: None)
+
+        def write(batch):
+            if not batches:
+                os.kill(os.getpid(), signal.SIGUSR1)   # chega com o flush em andamento
+                time.sleep(0.01)
+            batches.append(list(batch))
+
+        buffer = WriteBehindBuffer(write, max_batch=1000, flush_interval=60)
+        try:
+            buffer.install_signal_handlers([signal.SIGUSR1])
+            buffer.add("a")
+            buffer.flush()
+            buffer.add("b")
+        finally:
+            signal.signal(signal.SIGUSR1, original)
+            buffer.close()
+
+        assert batches == [["a"], ["b"]]
+
+    def test_default_action_exits_through_atexit_flush(self):
+        recorder = Recorder()
+        buffer = WriteBehindBuffer(recorder, max_batch=1000, flush_interval=60)
+        original = signal.signal(signal.SIGUSR2, signal.SIG_DFL)
+        try:
+            buffer.install_signal_handlers([signal.SIGUSR2])
+            buffer.add("a")
+            with pytest.raises(SystemExit):
+                os.kill(os.getpid(), signal.SIGUSR2)
+                time.sleep(0.1)
+        finally:
+            signal.signal(signal.SIGUSR2, original)
+            buffer.close()
+
+        assert recorder.records == ["a"]
+
+    def test_closed_buffer_released(self):
+        buffer = WriteBehindBuffer(Recorder(), flush_interval=60)
+        buffer.close()
+        ref = weakref.ref(buffer)
+
+        del buffer
+        gc.collect()
+
+        assert ref() is None
+
+
+class TestMemorySystemIntegration:
+    """Test conversation logging through the buffer."""
+
+    def test_conversations_written_in_single_batch(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "wb.db"), flush_size=1000, flush_interval=60)
+
+        for i in range(200):
+            memory.save_conversation(f"pergunta {i}", "ok", {"turn": i})
+        recent = memory.get_recent_conversations(200)
+
+        assert len(recent) == 200
+        assert memory.conversation_buffer.batches_written == 1
+        assert recent[-1]["context"] == {"turn": 199}
+        memory.close()
+
+    def test_close_persists_pending_conversations(self, tmp_path):
+        path = str(tmp_path / "wb.db")
+        memory = MemorySystem(path, flush_size=1000, flush_interval=60)
+        memory.save_conversation("oi", "olá", {})
+        memory.close()
+
+        reopened = MemorySystem(path, write_behind=False)
+        assert [c["user_input"] for c in reopened.get_recent_conversations()] == ["oi"]
+        reopened.close()
+
+    def test_search_sees_buffered_conversations(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "wb.db"), flush_size=1000, flush_interval=60)
+        memory.save_conversation("deploy amanhã", "ok", {})
+
+        assert [r.kind for r in memory.search("deploy")] == ["conversation"]
+        memory.close()
+
+    def test_write_behind_can_be_disabled(self, tmp_path):
+        memory = MemorySystem(str(tmp_path / "sync.db"), write_behind=False)
+        memory.save_conversation("oi", "olá", {})
+
+        assert memory.conversation_buffer is None
+        with memory.db.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0] == 1
+        memory.close()
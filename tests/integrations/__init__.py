@@ -0,0 +1,6 @@
+"""
+Integration Tests
+==================
+
+Test suite for SAGE external integrations (HTTP transport, ClickUp, GitHub).
+"""
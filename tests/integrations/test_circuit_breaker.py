@@ -0,0 +1,286 @@
+"""
+Circuit Breaker Tests
+======================
+
+Test suite for the circuit breaker and health cache in front of MAXIMUS Core.
+
+Test Coverage:
+- closed → open → half_open → closed transitions
+- Fast-fail while open, single trial call while half-open
+- Health probes feeding the cache and the breaker
+- MaximusCore.check_consciousness falling back without network while open
+- Warning printed once per outage, not per call
+- Cancelled half-open trial releases its slot
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from sage.core.sage import MaximusCore, SafetyTier
+from sage.integrations.circuit_breaker import BreakerState, CircuitBreaker, HealthCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def closed_port_url() -> str:
+    """URL de uma porta sem ninguém escutando (conexão recusada)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("core", failure_threshold=3, reset_timeout=30, clock=clock)
+
+
+@pytest_asyncio.fixture
+async def core():
+    """Core fake: /health e /api/v1/consciousness/check, com saúde alternável"""
+    state = {"healthy": True, "checks": 0, "delay": 0.0}
+
+    async def health(request):
+        return web.json_response({"ok": state["healthy"]}, status=200 if state["healthy"] else 503)
+
+    async def check(request):
+        state["checks"] += 1
+        await asyncio.sleep(state["delay"])
+        return web.json_response({"approved": True, "consciousness_level": "low",
+                                  "safety_tier": "safe", "reasoning": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_post("/api/v1/consciousness/check", check)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("")).rstrip("/"), state
+    await server.close()
+
+
+class TestBreaker:
+    """Test state transitions."""
+
+    def test_opens_after_threshold(self, breaker):
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure("refused")
+        assert breaker.state == BreakerState.CLOSED
+
+        breaker.allow()
+        breaker.record_failure("refused")
+
+        assert breaker.state == BreakerState.OPEN
+        assert not breaker.allow()
+        assert breaker.stats()["fast_fails"] == 1
+
+    def test_success_resets_failures(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == BreakerState.CLOSED
+
+    def test_half_open_single_trial(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 30
+
+        assert breaker.allow()                 # chamada de teste
+        assert breaker.state == BreakerState.HALF_OPEN
+        assert not breaker.allow()             # as demais continuam no fallback
+
+        breaker.record_success()
+        assert breaker.state == BreakerState.CLOSED and breaker.allow()
+
+    def test_failed_trial_reopens(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 30
+        breaker.allow()
+
+        breaker.record_failure("still down")
+
+        assert breaker.state == BreakerState.OPEN
+        clock.now += 29
+        assert not breaker.allow()
+
+    def test_health_signals(self, breaker):
+        breaker.on_health(False, "HTTP 503")
+        assert breaker.state == BreakerState.OPEN
+
+        breaker.on_health(True)
+        assert breaker.state == BreakerState.HALF_OPEN and breaker.allow()
+
+    def test_healthy_probe_renews_stuck_trial(self, breaker):
+        breaker.on_health(False, "down")
+        breaker.on_health(True)
+        assert breaker.allow()                 # chamada de teste que nunca volta
+        assert not breaker.allow()
+
+        breaker.on_health(True)
+
+        assert breaker.allow()
+
+    def test_warns_once_per_outage(self, breaker, capsys):
+        for _ in range(10):
+            if breaker.allow():
+                breaker.record_failure("refused")
+
+        assert capsys.readouterr().out.count("circuito aberto") == 1
+
+
+class TestHealthCache:
+    """Test background probes and the cached status."""
+
+    @pytest.mark.asyncio
+    async def test_probe_feeds_cache_and_breaker(self, core, breaker):
+        url, state = core
+        health = HealthCache(interval=10)
+        health.register("core", f"{url}/health", breaker)
+        try:
+            assert health.is_healthy("core") is None
+            assert (await health.probe("core")).healthy
+
+            state["healthy"] = False
+            await health.probe("core")
+        finally:
+            await health.stop()
+
+        assert health.is_healthy("core") is False
+        assert breaker.state == BreakerState.OPEN
+        assert health.stats()["services"]["core"]["error"] == "HTTP 503"
+
+    @pytest.mark.asyncio
+    async def test_check_uses_cache_until_stale(self, core, clock):
+        url, _ = core
+        health = HealthCache(interval=10, clock=clock)
+        health.register("core", f"{url}/health")
+        try:
+            assert await health.check("core")
+            assert await health.check("core")
+            assert health.probes == 1
+
+            clock.now += 21                    # max_age = 2 × interval
+            assert health.is_healthy("core") is None
+            await health.check("core")
+        finally:
+            await health.stop()
+
+        assert health.probes == 2
+
+    @pytest.mark.asyncio
+    async def test_background_probes(self, core):
+        url, state = core
+        breaker = CircuitBreaker("core")
+        health = HealthCache(interval=0.05, unhealthy_interval=0.01)
+        health.register("core", f"{url}/health", breaker)
+        state["healthy"] = False
+
+        health.start()
+        try:
+            await asyncio.sleep(0.1)
+            assert breaker.state == BreakerState.OPEN
+
+            state["healthy"] = True
+            await asyncio.sleep(0.1)
+        finally:
+            await health.stop()
+
+        assert breaker.state == BreakerState.HALF_OPEN   # próxima chamada testa o Core
+        assert health.probes >= 3
+
+
+class TestMaximusCore:
+    """Test consciousness checks behind the breaker."""
+
+    @pytest.mark.asyncio
+    async def test_fast_fallback_while_down(self):
+        core = MaximusCore(closed_port_url(), breaker=CircuitBreaker("core", failure_threshold=2))
+        action = {"type": "create_note", "content": "oi"}
+        try:
+            for _ in range(2):
+                check = await core.check_consciousness(action, {})
+                assert check.approved and check.safety_tier == SafetyTier.SAFE
+
+            start = time.perf_counter()
+            for _ in range(100):
+                check = await core.check_consciousness(action, {})
+            per_call = (time.perf_counter() - start) / 100
+        finally:
+            await core.close_session()
+
+        assert core.breaker.state == BreakerState.OPEN
+        assert core.breaker.stats()["fast_fails"] == 100
+        assert per_call < 0.001
+        assert check.reasoning == "Ação aprovada por fallback (Core indisponível)"
+
+    @pytest.mark.asyncio
+    async def test_fallback_still_blocks_dangerous_actions(self):
+        breaker = CircuitBreaker("core")
+        breaker.on_health(False, "down")
+        core = MaximusCore(closed_port_url(), breaker=breaker)
+
+        check = await core.check_consciousness({"type": "shell", "command": "rm -rf /"}, {})
+
+        assert not check.approved and check.safety_tier == SafetyTier.BLOCKED
+
+    @pytest.mark.asyncio
+    async def test_recovers_through_half_open(self, core):
+        url, state = core
+        breaker = CircuitBreaker("core")
+        breaker.on_health(False, "down")
+        breaker.on_health(True)
+        max_core = MaximusCore(url, breaker=breaker)
+        try:
+            check = await max_core.check_consciousness({"type": "noop"}, {})
+        finally:
+            await max_core.close_session()
+
+        assert check.reasoning == "ok" and state["checks"] == 1
+        assert breaker.state == BreakerState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_releases_slot(self, core):
+        url, state = core
+        state["delay"] = 5
+        breaker = CircuitBreaker("core")
+        breaker.on_health(False, "down")
+        breaker.on_health(True)
+        max_core = MaximusCore(url, breaker=breaker)
+        try:
+            trial = asyncio.create_task(max_core.check_consciousness({"type": "noop"}, {}))
+            await asyncio.sleep(0.1)
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+            assert breaker.state == BreakerState.HALF_OPEN
+            state["delay"] = 0
+            check = await max_core.check_consciousness({"type": "noop"}, {})
+        finally:
+            await max_core.close_session()
+
+        assert check.reasoning == "ok"
+        assert breaker.state == BreakerState.CLOSED
@@ -0,0 +1,162 @@
+"""
+ClickUp Bulk Pipeline Tests
+============================
+
+Test suite for bulk task creation and status updates.
+
+Test Coverage:
+- Local rows written in one transaction, remote ids written back in batch
+- Concurrent pushes with bounded parallelism
+- Per-item success / failure reporting
+- Bulk status updates (local + ClickUp)
+- create_task delegating to the bulk path
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from sage.core.secretary_agent import SecretaryAgent
+
+
+class FakeClickUp:
+    """ClickUpIntegration falso: mede concorrência e falha sob demanda"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.created = []
+        self.updated = []
+
+    def _enter(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def _exit(self):
+        with self.lock:
+            self.active -= 1
+
+    def create_task(self, list_id, name, description="", priority=3):
+        self._enter()
+        try:
+            time.sleep(self.delay)
+            if "recusada" in name:
+                return None
+            if "rede" in name:
+                raise requests.ConnectionError("conexão recusada")
+            with self.lock:
+                self.created.append((list_id, name, priority))
+                return {"id": f"cu_{len(self.created)}"}
+        finally:
+            self._exit()
+
+    def update_task_status(self, task_id, status):
+        self._enter()
+        try:
+            time.sleep(self.delay)
+            with self.lock:
+                self.updated.append((task_id, status))
+            return task_id != "cu_bloqueada"
+        finally:
+            self._exit()
+
+
+@pytest.fixture
+def agent(tmp_path):
+    agent = SecretaryAgent("sk-test", "pk-test", "tester", db_path=str(tmp_path / "bulk.db"))
+    agent.clickup = FakeClickUp()
+    agent.projects["Max-Code"]["clickup_list"] = "L1"
+    yield agent
+    agent.close()
+
+
+def specs(n, project="Max-Code", **extra):
+    return [{"title": f"Passo {i}", "description": f"Descrição {i}", "project": project, **extra}
+            for i in range(n)]
+
+
+class TestCreateTasks:
+    """Test bulk creation."""
+
+    def test_creates_local_rows_and_links_remote_ids(self, agent):
+        results = agent.create_tasks(specs(20, priority="high"))
+
+        assert all(r.ok for r in results)
+        assert len({r.task_id for r in results}) == 20
+        tasks = {t.id: t for t in agent.memory.get_all_tasks()}
+        assert len(tasks) == 20
+        assert {tasks[r.task_id].clickup_id for r in results} == {r.clickup_id for r in results}
+        assert all(priority == 2 for _, _, priority in agent.clickup.created)
+        with agent.memory.db.read() as conn:
+            lists = {row[0] for row in conn.execute("SELECT clickup_list FROM tasks")}
+        assert lists == {"L1"}
+
+    def test_pushes_concurrently_with_bound(self, agent):
+        start = time.monotonic()
+        agent.create_tasks(specs(16), max_workers=4)
+        elapsed = time.monotonic() - start
+
+        assert agent.clickup.max_active == 4
+        assert elapsed < 16 * agent.clickup.delay / 2
+
+    def test_reports_per_item_failures(self, agent):
+        items = specs(3) + [
+            {"title": "recusada", "project": "Max-Code"},
+            {"title": "sem rede", "project": "Max-Code"},
+        ]
+
+        results = agent.create_tasks(items)
+
+        assert [r.ok for r in results] == [True, True, True, False, False]
+        assert results[3].error == "ClickUp recusou a criação da tarefa"
+        assert "conexão recusada" in results[4].error
+        assert agent.memory.count_tasks() == 5   # locais ficam, mesmo sem ClickUp
+        assert results[4].task.clickup_id is None
+
+    def test_projects_without_list_stay_local(self, agent):
+        results = agent.create_tasks(specs(3, project="V-rtice"))
+
+        assert all(r.ok and r.clickup_id is None for r in results)
+        assert agent.clickup.created == []
+
+    def test_create_task_uses_bulk_path(self, agent):
+        task = agent.create_task("Uma", "só", "Max-Code")
+
+        assert task.clickup_id == "cu_1"
+        assert agent.memory.get_all_tasks()[0].clickup_id == "cu_1"
+
+
+class TestUpdateStatuses:
+    """Test bulk status updates."""
+
+    def test_updates_local_and_remote(self, agent):
+        created = agent.create_tasks(specs(4))
+        local_only = agent.create_tasks(specs(1, project="V-rtice"))[0]
+        updates = {r.task_id: "done" for r in created}
+        updates[local_only.task_id] = "in_progress"
+        updates["task_inexistente"] = "done"
+
+        results = {r.task_id: r for r in agent.update_task_statuses(updates)}
+
+        assert all(results[r.task_id].ok for r in created)
+        assert results[local_only.task_id].ok
+        assert results["task_inexistente"].error == "tarefa não encontrada"
+        assert sorted(s for _, s in agent.clickup.updated) == ["complete"] * 4
+        assert agent.memory.count_tasks(status="done") == 4
+
+    def test_remote_failure_reported(self, agent):
+        task = agent.create_task("Bloqueada", "", "Max-Code")
+        agent.memory.set_clickup_ids([(task.id, "cu_bloqueada", "L1")])
+
+        result = agent.update_task_statuses({task.id: "done"})[0]
+
+        assert result.ok is False
+        assert result.error == "ClickUp recusou a atualização"
@@ -0,0 +1,243 @@
+"""
+ClickUp Sync Tests
+===================
+
+Test suite for the incremental, cursor-based ClickUp sync engine.
+
+Test Coverage:
+- First sync imports the whole list (paged)
+- Later syncs fetch only changed tasks (date_updated_gt)
+- Batched upsert keeps local ids of pushed tasks
+- Periodic reconciliation of deleted tasks
+- Daily digest: imported closed tasks count on their close date, not today
+- Status / priority mapping
+- ClickUpIntegration paging parameters
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from sage.core.secretary_agent import ClickUpIntegration, MemorySystem, Task
+from sage.integrations.clickup_sync import ClickUpSyncEngine, map_priority, map_status
+
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+class FakeClickUp:
+    """API de tarefas do ClickUp em memória (páginas de page_size)"""
+
+    def __init__(self, page_size: int = 100):
+        self.page_size = page_size
+        self.tasks = {}
+        self.clock = 1_760_000_000_000
+        self.calls = []
+
+    def put(self, task_id: str, name: str, status: str = "to do", status_type: str = "open",
+            date_closed: Optional[str] = None):
+        self.clock += 1000
+        self.tasks[task_id] = {
+            "id": task_id, "name": name, "text_content": f"Descrição {name}",
+            "status": {"status": status, "type": status_type},
+            "priority": {"priority": "high"},
+            "date_created": str(self.clock), "date_updated": str(self.clock), "due_date": None,
+            "date_closed": date_closed,
+        }
+
+    def get_tasks_page(self, list_id, page=0, date_updated_gt=None, include_closed=True):
+        self.calls.append((page, date_updated_gt))
+        matching = sorted(
+            (t for t in self.tasks.values()
+             if date_updated_gt is None or int(t["date_updated"]) > date_updated_gt),
+            key=lambda t: int(t["date_updated"])
+        )
+        batch = matching[page * self.page_size:(page + 1) * self.page_size]
+        return batch, (page + 1) * self.page_size >= len(matching)
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "clickup.db"), write_behind=False)
+    yield mem
+    mem.close()
+
+
+@pytest.fixture
+def clickup():
+    fake = FakeClickUp(page_size=10)
+    for i in range(35):
+        fake.put(f"cu{i}", f"Tarefa {i}")
+    return fake
+
+
+@pytest.fixture
+def engine(clickup, memory):
+    return ClickUpSyncEngine(clickup, memory)
+
+
+class TestIncrementalSync:
+    """Test cursor-based fetching."""
+
+    def test_first_sync_imports_everything(self, engine, memory):
+        result = engine.sync_list("L1", "Max-Code", now=NOW)
+
+        assert result.full is True
+        assert result.fetched == 35
+        assert result.requests == 4
+        assert memory.count_tasks(project="Max-Code") == 35
+
+    def test_second_sync_costs_proportional_to_changes(self, engine, clickup, memory):
+        engine.sync_list("L1", "Max-Code", now=NOW)
+        clickup.calls.clear()
+        clickup.put("cu3", "Tarefa 3 editada", status="complete", status_type="closed")
+        clickup.put("cu99", "Nova")
+
+        result = engine.sync_list("L1", "Max-Code", now=NOW + timedelta(minutes=5))
+
+        assert result.full is False
+        assert result.requests == 1
+        assert result.fetched == 3  # 2 alteradas + a do próprio cursor (janela de 1 ms)
+        assert clickup.calls[0][1] is not None
+        tasks = {t.clickup_id: t for t in memory.get_all_tasks()}
+        assert tasks["cu3"].title == "Tarefa 3 editada"
+        assert tasks["cu3"].status == "done"
+        assert memory.count_tasks() == 36
+
+    def test_no_changes_single_request(self, engine, clickup):
+        engine.sync_list("L1", "Max-Code", now=NOW)
+
+        result = engine.sync_list("L1", "Max-Code", now=NOW + timedelta(minutes=1))
+
+        assert (result.requests, result.fetched) == (1, 1)  # só a tarefa do cursor
+        assert result.cursor == engine.get_state("L1")[0]
+
+    def test_cursor_not_advanced_on_failure(self, engine, clickup, monkeypatch):
+        engine.sync_list("L1", "Max-Code", now=NOW)
+        cursor = engine.get_state("L1")[0]
+        clickup.put("cu50", "Nova")
+
+        def boom(conn, list_id, project, remote):
+            raise RuntimeError("disco cheio")
+
+        monkeypatch.setattr(engine, "_upsert", boom)
+        with pytest.raises(RuntimeError):
+            engine.sync_list("L1", "Max-Code", now=NOW + timedelta(minutes=1))
+
+        assert engine.get_state("L1")[0] == cursor
+
+    def test_pushed_task_keeps_local_id(self, engine, memory, clickup):
+        memory.save_task(Task(id="task_local", title="Criada aqui", description="", project="Max-Code",
+                              status="todo", priority="medium", due_date=None,
+                              created_at="2026-10-18T09:00:00", clickup_id="cu7"))
+
+        engine.sync_list("L1", "Max-Code", now=NOW)
+
+        ids = {t.id for t in memory.get_all_tasks() if t.clickup_id == "cu7"}
+        assert ids == {"task_local"}
+
+
+class TestReconciliation:
+    """Test periodic deletion reconcile."""
+
+    def test_deleted_tasks_removed_on_full_sync(self, engine, clickup, memory):
+        engine.sync_list("L1", "Max-Code", now=NOW)
+        del clickup.tasks["cu1"], clickup.tasks["cu2"]
+
+        incremental = engine.sync_list("L1", "Max-Code", now=NOW + timedelta(hours=1))
+        assert incremental.deleted == 0
+        assert memory.count_tasks() == 35
+
+        full = engine.sync_list("L1", "Max-Code", now=NOW + timedelta(hours=25))
+        assert full.full is True
+        assert full.deleted == 2
+        assert memory.count_tasks() == 33
+
+    def test_reconcile_scoped_to_list(self, engine, clickup, memory):
+        engine.sync_list("L1", "Max-Code", now=NOW)
+        other = FakeClickUp()
+        other.put("x1", "Outra lista")
+        ClickUpSyncEngine(other, memory).sync_list("L2", "V-rtice", now=NOW)
+        other.tasks.clear()
+
+        ClickUpSyncEngine(other, memory).sync_list("L2", "V-rtice", force_full=True, now=NOW)
+
+        assert memory.count_tasks(project="Max-Code") == 35
+        assert memory.count_tasks(project="V-rtice") == 0
+
+
+def ms(day: str) -> str:
+    return str(int(datetime.fromisoformat(f"{day}T15:00:00").timestamp() * 1000))
+
+
+class TestDigest:
+    """Test daily digest counters fed by the sync."""
+
+    def test_imported_closed_tasks_not_counted_today(self, engine, clickup, memory):
+        for i in range(5):
+            clickup.put(f"old{i}", f"Fechada {i}", status="complete", status_type="closed",
+                        date_closed=ms("2026-09-01"))
+        clickup.put("nodate", "Fechada sem data", status="complete", status_type="closed")
+        today = datetime.now().date().isoformat()
+
+        engine.sync_list("L1", "Max-Code", now=NOW)
+        engine.sync_list("L1", "Max-Code", force_full=True, now=NOW + timedelta(hours=25))
+
+        assert memory.get_daily_digest(today).tasks_completed == 0
+        assert memory.get_daily_digest("2026-09-01").tasks_completed == 5
+
+    def test_closed_after_import_counted_on_close_date(self, engine, clickup, memory):
+        engine.sync_list("L1", "Max-Code", now=NOW)
+        clickup.put("cu3", "Tarefa 3", status="complete", status_type="closed",
+                    date_closed=ms("2026-10-18"))
+
+        engine.sync_list("L1", "Max-Code", now=NOW + timedelta(minutes=5))
+        engine.sync_list("L1", "Max-Code", force_full=True, now=NOW + timedelta(hours=25))
+
+        assert memory.get_daily_digest("2026-10-18").tasks_completed == 1
+
+
+class TestMapping:
+    """Test ClickUp → local field mapping."""
+
+    def test_status_mapping(self):
+        assert map_status({"status": "complete", "type": "closed"}) == "done"
+        assert map_status({"status": "in progress", "type": "custom"}) == "in_progress"
+        assert map_status({"status": "to do", "type": "open"}) == "todo"
+        assert map_status(None) == "todo"
+
+    def test_priority_mapping(self):
+        assert map_priority({"priority": "urgent"}) == "critical"
+        assert map_priority(None) == "medium"
+
+
+class TestClickUpPaging:
+    """Test request parameters of ClickUpIntegration."""
+
+    def test_page_request_parameters(self, monkeypatch):
+        seen = []
+
+        class Response:
+            status_code = 200
+
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"tasks": [{"id": "a"}], "last_page": True}
+
+        clickup = ClickUpIntegration("pk-test")
+        monkeypatch.setattr(clickup.session, "get",
+                            lambda url, headers=None, params=None: seen.append(params) or Response())
+
+        tasks, last_page = clickup.get_tasks_page("L1", page=2, date_updated_gt=123)
+        clickup.close()
+
+        assert tasks == [{"id": "a"}] and last_page is True
+        assert seen[0]["page"] == 2
+        assert seen[0]["date_updated_gt"] == 123
+        assert seen[0]["include_closed"] == "true"
@@ -0,0 +1,198 @@
+"""
+Async GitHub Sync Tests
+========================
+
+Test suite for the asyncio GitHub client and the parallel project sync.
+
+Test Coverage:
+- Link-header pagination (rel="last" fan-out and rel="next" fallback)
+- Bounded concurrency
+- Wall time bounded by the slowest repo, not the sum
+- Retry on 5xx
+- project_context write-back from SecretaryAgent
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from sage.core.secretary_agent import SecretaryAgent
+from sage.integrations.github_async import AsyncGitHubClient
+from sage.integrations.http import HTTPConfig
+
+
+FAST = HTTPConfig(backoff_base=0.001, backoff_max=0.01)
+
+
+class FakeGitHub:
+    """API do GitHub simulada: 3 páginas por endpoint, latência fixa"""
+
+    def __init__(self, pages: int = 3, delay: float = 0.05, cursor_paging: bool = False):
+        self.pages = pages
+        self.delay = delay
+        self.cursor_paging = cursor_paging
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.failures = {}  # caminho → falhas restantes
+
+        self.app = web.Application()
+        self.app.router.add_get("/repos/{owner}/{repo}/{kind}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if self.failures.get(request.path, 0) > 0:
+            self.failures[request.path] -= 1
+            return web.json_response({"message": "unavailable"}, status=503)
+
+        repo, kind = request.match_info["repo"], request.match_info["kind"]
+        page = int(request.query.get("page", 1))
+        base = f"{request.scheme}://{request.host}{request.path}"
+
+        links = []
+        if page < self.pages:
+            links.append(f'<{base}?page={page + 1}>; rel="next"')
+            if not self.cursor_paging:
+                links.append(f'<{base}?page={self.pages}>; rel="last"')
+
+        items = [self.item(repo, kind, page, i) for i in range(2)]
+        return web.json_response(items, headers={"Link": ", ".join(links)} if links else {})
+
+    @staticmethod
+    def item(repo: str, kind: str, page: int, i: int) -> dict:
+        if kind == "commits":
+            return {"sha": f"{repo}-{page}-{i}",
+                    "commit": {"message": f"feat: mudança {page}.{i}\n\ncorpo",
+                               "author": {"name": "Juan", "date": f"2026-10-1{page}T10:00:00Z"}}}
+        if kind == "issues":
+            item = {"number": page * 10 + i, "title": "Bug"}
+            if i == 1:
+                item["pull_request"] = {}
+            return item
+        return {"type": "PushEvent", "created_at": f"2026-10-1{page}T12:00:00Z"}
+
+
+@pytest_asyncio.fixture
+async def fake_github():
+    fake = FakeGitHub()
+    server = TestServer(fake.app)
+    await server.start_server()
+    fake.url = str(server.make_url("")).rstrip("/")
+    yield fake
+    await server.close()
+
+
+class TestPagination:
+    """Test Link-header pagination."""
+
+    @pytest.mark.asyncio
+    async def test_follows_last_link_concurrently(self, fake_github):
+        async with AsyncGitHubClient("owner", base_url=fake_github.url, http_config=FAST) as client:
+            commits = await client.get_repo_commits("Max-Code")
+
+        assert len(commits) == 6
+        assert fake_github.requests == 3
+        assert fake_github.max_in_flight == 2  # páginas 2 e 3 juntas
+
+    @pytest.mark.asyncio
+    async def test_follows_next_link_without_last(self, fake_github):
+        fake_github.cursor_paging = True
+        async with AsyncGitHubClient("owner", base_url=fake_github.url, http_config=FAST) as client:
+            issues = await client.get_repo_issues("Max-Code")
+
+        assert len(issues) == 6
+
+    @pytest.mark.asyncio
+    async def test_max_pages_caps_fan_out(self, fake_github):
+        fake_github.pages = 50
+        async with AsyncGitHubClient("owner", base_url=fake_github.url, max_pages=4,
+                                     http_config=FAST) as client:
+            events = await client.get_repo_events("Max-Code")
+
+        assert len(events) == 8
+
+
+class TestConcurrency:
+    """Test fan-out across repos."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, fake_github):
+        repos = [f"repo-{i}" for i in range(10)]
+        async with AsyncGitHubClient("owner", base_url=fake_github.url, max_concurrency=4,
+                                     http_config=FAST) as client:
+            await client.sync_repos(repos)
+
+        assert fake_github.max_in_flight <= 4
+
+    @pytest.mark.asyncio
+    async def test_wall_time_bounded_by_slowest_repo(self, fake_github):
+        repos = [f"repo-{i}" for i in range(12)]
+        start = time.perf_counter()
+        async with AsyncGitHubClient("owner", base_url=fake_github.url, max_concurrency=64,
+                                     http_config=FAST) as client:
+            snapshots = await client.sync_repos(repos)
+        elapsed = time.perf_counter() - start
+
+        # 12 repos x 3 endpoints x 3 páginas = 108 requisições de 50 ms;
+        # em série seriam 5.4 s, aqui são duas "ondas" (página 1, páginas 2-3)
+        assert fake_github.requests == 108
+        assert elapsed < 1.5
+        assert all(len(s.commits) == 6 for s in snapshots.values())
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, fake_github):
+        fake_github.failures["/repos/owner/Max-Code/issues"] = 2
+        async with AsyncGitHubClient("owner", base_url=fake_github.url, http_config=FAST) as client:
+            snapshot = await client.sync_repo("Max-Code")
+
+        assert len(snapshot.issues) == 6
+        assert len(snapshot.open_issues) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_repo_does_not_abort_others(self, fake_github):
+        fake_github.failures["/repos/owner/broken/commits"] = 100
+        async with AsyncGitHubClient("owner", base_url=fake_github.url, http_config=FAST) as client:
+            snapshots = await client.sync_repos(["broken", "Max-Code"])
+
+        assert isinstance(snapshots["broken"], Exception)
+        assert len(snapshots["Max-Code"].commits) == 6
+
+
+class TestProjectContextSync:
+    """Test SecretaryAgent write-back into project_context."""
+
+    @pytest.mark.asyncio
+    async def test_sync_writes_project_context(self, fake_github, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "sage.core.secretary_agent.AsyncGitHubClient",
+            lambda username, **kwargs: AsyncGitHubClient(
+                username, base_url=fake_github.url, http_config=FAST, **kwargs)
+        )
+        agent = SecretaryAgent("sk-test", "pk-test", "owner", db_path=str(tmp_path / "gh.db"))
+
+        results = await agent.sync_with_github_async()
+        again = await agent.sync_with_github_async()
+        contexts = {c.name: c for c in agent.memory.get_project_contexts()}
+        agent.close()
+
+        assert set(contexts) == set(agent.projects)
+        max_code = contexts["Max-Code"]
+        assert max_code.open_issues == 3
+        assert max_code.last_activity == "2026-10-13T12:00:00Z"
+        assert max_code.recent_commits[0]["message"] == "feat: mudança 1.0"
+        assert results["Max-Code"]["new_commits"] == 6
+        assert again["Max-Code"]["new_commits"] == 0
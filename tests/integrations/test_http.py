@@ -0,0 +1,184 @@
+"""
+HTTP Session Tests
+===================
+
+Test suite for the pooled HTTP session layer used by the integrations.
+
+Test Coverage:
+- Keep-alive connection reuse
+- Default timeouts
+- Retry on 429/5xx (method-aware) with jittered backoff
+- ClickUp/GitHub integrations sharing one session
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from sage.core.secretary_agent import ClickUpIntegration, GitHubIntegration
+from sage.integrations.http import HTTPConfig, JitteredRetry, PooledSession
+
+
+FAST = HTTPConfig(max_retries=3, backoff_base=0.001, backoff_max=0.01, read_timeout=2.0)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Servidor HTTP/1.1 local com respostas programáveis"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.responses = []       # fila de (status, corpo); vazia = 200
+        self.requests = []        # (método, caminho)
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+            status, body = self.server.responses.pop(0) if self.server.responses else (200, {"ok": True})
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = StubServer()
+    thread = threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def session():
+    s = PooledSession(FAST)
+    yield s
+    s.close()
+
+
+class TestPooling:
+    """Test connection reuse and timeouts."""
+
+    def test_keep_alive_reuses_connection(self, server, session):
+        for _ in range(20):
+            assert session.get(f"{server.url}/ping").status_code == 200
+
+        assert server.connections == 1
+
+    def test_default_timeout_applied(self, session, monkeypatch):
+        seen = {}
+
+        def fake_request(self, method, url, **kwargs):
+            seen.update(kwargs)
+            return None
+
+        monkeypatch.setattr(requests.Session, "request", fake_request)
+        session.get("http://example.invalid")
+
+        assert seen["timeout"] == (FAST.connect_timeout, FAST.read_timeout)
+
+    def test_explicit_timeout_wins(self, session, monkeypatch):
+        seen = {}
+        monkeypatch.setattr(requests.Session, "request",
+                            lambda self, method, url, **kwargs: seen.update(kwargs))
+        session.get("http://example.invalid", timeout=1)
+
+        assert seen["timeout"] == 1
+
+
+class TestRetry:
+    """Test retry policy."""
+
+    def test_get_retried_on_503(self, server, session):
+        server.responses = [(503, {}), (503, {})]
+
+        response = session.get(f"{server.url}/tasks")
+
+        assert response.status_code == 200
+        assert len(server.requests) == 3
+
+    def test_post_retried_on_429(self, server, session):
+        server.responses = [(429, {})]
+
+        response = session.post(f"{server.url}/task", json={"name": "x"})
+
+        assert response.status_code == 200
+        assert len(server.requests) == 2
+
+    def test_post_not_retried_on_500(self, server, session):
+        server.responses = [(500, {})]
+
+        response = session.post(f"{server.url}/task", json={"name": "x"})
+
+        assert response.status_code == 500
+        assert len(server.requests) == 1
+
+    def test_last_response_returned_when_exhausted(self, server, session):
+        server.responses = [(429, {})] * 10
+
+        response = session.get(f"{server.url}/tasks")
+
+        assert response.status_code == 429
+        assert len(server.requests) == FAST.max_retries + 1
+
+    def test_backoff_is_jittered_and_capped(self):
+        retry = JitteredRetry(total=10, backoff_base=1.0, backoff_cap=4.0)
+        assert retry.get_backoff_time() == 0.0
+
+        for _ in range(6):
+            retry = retry.increment(method="GET", url="/x", response=None,
+                                    error=requests.exceptions.ConnectionError())
+        samples = {retry.get_backoff_time() for _ in range(50)}
+
+        assert all(0 <= s <= 4.0 for s in samples)
+        assert len(samples) > 1
+
+
+class TestIntegrations:
+    """Test integrations on top of the pooled session."""
+
+    def test_clickup_and_github_share_session(self, server, session):
+        server.responses = [(200, {"tasks": [{"id": "t1"}]}), (200, [{"sha": "abc"}])]
+        clickup = ClickUpIntegration("pk-test", session=session)
+        clickup.base_url = server.url
+        github = GitHubIntegration("tester", session=session)
+        github.base_url = server.url
+
+        assert clickup.get_tasks("list") == [{"id": "t1"}]
+        assert github.get_repo_commits("repo") == [{"sha": "abc"}]
+        assert server.connections == 1
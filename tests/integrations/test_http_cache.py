@@ -0,0 +1,225 @@
+"""
+HTTP Cache Tests
+=================
+
+Test suite for the persistent ETag / If-Modified-Since response cache.
+
+Test Coverage:
+- Conditional headers and 304 revalidation (requests and aiohttp)
+- Cache keys (params order, credentials)
+- Responses without validators are not stored
+- Eviction by age and by total size
+- Persistence across sessions
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from sage.core.secretary_agent import MemorySystem
+from sage.integrations.github_async import AsyncGitHubClient
+from sage.integrations.http import HTTPConfig, PooledSession
+from sage.integrations.http_cache import HTTPCache
+
+
+FAST = HTTPConfig(backoff_base=0.001, backoff_max=0.01)
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Responde com ETag e devolve 304 quando If-None-Match confere"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        server.seen.append(dict(self.headers))
+        if self.path.startswith("/plain"):
+            self._send(200, b'{"plain": true}', {})
+            return
+        etag = f'"v{server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", {"ETag": etag, "X-RateLimit-Remaining": "59"})
+            return
+        body = json.dumps({"version": server.version, "path": self.path}).encode()
+        self._send(200, body, {"ETag": etag, "Link": '<http://x/?page=2>; rel="next"'})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    srv.daemon_threads = True
+    srv.version = 1
+    srv.seen = []
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "cache.db"), write_behind=False)
+    yield mem
+    mem.close()
+
+
+@pytest.fixture
+def cache(memory):
+    return HTTPCache(memory.db)
+
+
+class TestConditionalRequests:
+    """Test revalidation through PooledSession."""
+
+    def test_second_request_is_revalidated(self, server, cache):
+        session = PooledSession(FAST, cache=cache)
+
+        first = session.get(f"{server.url}/repos/x/commits", params={"page": 1})
+        second = session.get(f"{server.url}/repos/x/commits", params={"page": 1})
+        session.close()
+
+        assert first.from_cache is False
+        assert second.from_cache is True
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["X-RateLimit-Remaining"] == "59"
+        assert second.headers["Link"] == '<http://x/?page=2>; rel="next"'
+        assert server.seen[1]["If-None-Match"] == '"v1"'
+        assert cache.revalidated == 1
+
+    def test_changed_resource_refreshes_entry(self, server, cache):
+        session = PooledSession(FAST, cache=cache)
+        session.get(f"{server.url}/repos/x/issues")
+        server.version = 2
+
+        changed = session.get(f"{server.url}/repos/x/issues")
+        again = session.get(f"{server.url}/repos/x/issues")
+        session.close()
+
+        assert changed.from_cache is False
+        assert changed.json()["version"] == 2
+        assert again.from_cache is True
+
+    def test_cache_survives_new_session(self, server, memory):
+        session = PooledSession(FAST, cache=HTTPCache(memory.db))
+        session.get(f"{server.url}/repos/x/events")
+        session.close()
+
+        fresh = PooledSession(FAST, cache=HTTPCache(memory.db))
+        response = fresh.get(f"{server.url}/repos/x/events")
+        fresh.close()
+
+        assert response.from_cache is True
+
+    def test_responses_without_validators_not_stored(self, server, cache):
+        session = PooledSession(FAST, cache=cache)
+        session.get(f"{server.url}/plain")
+        session.close()
+
+        assert cache.stats()["entries"] == 0
+
+    def test_post_bypasses_cache(self, server, cache):
+        session = PooledSession(FAST, cache=cache)
+        session.post(f"{server.url}/repos/x/issues", json={})
+        session.close()
+
+        assert cache.lookups == 0
+
+
+class TestKeys:
+    """Test cache key derivation."""
+
+    def test_param_order_irrelevant(self):
+        assert HTTPCache.key("http://a", {"a": 1, "b": 2}) == HTTPCache.key("http://a", {"b": 2, "a": 1})
+
+    def test_credentials_separate_entries(self):
+        assert HTTPCache.key("http://a", None, "token-1") != HTTPCache.key("http://a", None, "token-2")
+
+
+class TestEviction:
+    """Test eviction by age and size."""
+
+    def test_evicts_entries_older_than_max_age(self, cache):
+        cache.store(HTTPCache.key("http://a"), "http://a", 200, {"ETag": '"1"'}, b"{}")
+
+        removed = cache.evict(now=datetime.now() + timedelta(days=cache.max_age_days + 1))
+
+        assert removed == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_evicts_least_recently_used_above_max_bytes(self, memory):
+        cache = HTTPCache(memory.db)
+        for name in ("a", "b", "c"):
+            cache.store(HTTPCache.key(f"http://{name}"), f"http://{name}", 200, {"ETag": '"1"'}, b"{}")
+        cache.mark_revalidated(HTTPCache.key("http://a"))  # "a" passa a ser o mais recente
+        entry_size = cache.stats()["bytes"] // 3
+        cache.max_bytes = 2 * entry_size
+
+        removed = cache.evict()
+
+        with memory.db.read() as conn:
+            urls = {row[0] for row in conn.execute("SELECT url FROM http_cache")}
+        assert removed == 1
+        assert len(urls) == 2 and "http://a" in urls
+
+    def test_periodic_eviction_on_store(self, memory):
+        cache = HTTPCache(memory.db, max_bytes=1, evict_every=2)
+        cache.store(HTTPCache.key("http://a"), "http://a", 200, {"ETag": '"1"'}, b"x" * 100)
+        cache.store(HTTPCache.key("http://b"), "http://b", 200, {"ETag": '"1"'}, b"x" * 100)
+
+        assert cache.evicted == 2
+
+
+class TestAsyncClient:
+    """Test revalidation in the aiohttp GitHub client."""
+
+    @pytest_asyncio.fixture
+    async def etag_app(self):
+        state = {"requests": 0, "not_modified": 0}
+
+        async def handler(request):
+            state["requests"] += 1
+            if request.headers.get("If-None-Match") == '"c1"':
+                state["not_modified"] += 1
+                return web.Response(status=304, headers={"ETag": '"c1"'})
+            return web.json_response([{"sha": "abc"}], headers={"ETag": '"c1"'})
+
+        app = web.Application()
+        app.router.add_get("/repos/{owner}/{repo}/{kind}", handler)
+        server = TestServer(app)
+        await server.start_server()
+        state["url"] = str(server.make_url("")).rstrip("/")
+        yield state
+        await server.close()
+
+    @pytest.mark.asyncio
+    async def test_repeated_sync_served_from_cache(self, etag_app, cache):
+        async with AsyncGitHubClient("owner", base_url=etag_app["url"], http_config=FAST,
+                                     cache=cache) as client:
+            first = await client.sync_repo("Max-Code")
+            second = await client.sync_repo("Max-Code")
+
+        assert second.commits == first.commits == [{"sha": "abc"}]
+        assert etag_app["not_modified"] == 3  # commits, issues, events
+        assert cache.revalidated == 3
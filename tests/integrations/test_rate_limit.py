@@ -0,0 +1,295 @@
+"""
+Rate Limit Scheduler Tests
+===========================
+
+Test suite for the per-host token-bucket request scheduler.
+
+Test Coverage:
+- Pacing once the bucket is empty
+- Interactive requests ahead of background sync (and the reserve)
+- Learning from X-RateLimit-* / Retry-After headers
+- Bucket rate and capacity following the advertised limit and reset
+- 429 re-queued by PooledSession instead of failing
+- aiohttp sessions scheduled through trace_config
+- Queue depth and wait metrics
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from sage.integrations.http import HTTPConfig, PooledSession
+from sage.integrations.rate_limit import (
+    HostLimit, Priority, RateLimitScheduler, host_of, request_priority
+)
+
+
+HOST = "http://api.example.com"
+
+
+def scheduler_with(rate: float, capacity: float, reserve: float = 0.0) -> RateLimitScheduler:
+    return RateLimitScheduler(limits={"api.example.com": HostLimit(rate, capacity, reserve)})
+
+
+class TestTokenBucket:
+    """Test pacing and metrics."""
+
+    def test_burst_then_paced(self):
+        scheduler = scheduler_with(rate=20.0, capacity=3)
+
+        start = time.monotonic()
+        for _ in range(6):
+            scheduler.acquire(f"{HOST}/x")
+        elapsed = time.monotonic() - start
+
+        stats = scheduler.stats()["api.example.com"]
+        assert elapsed >= 0.12   # 3 de burst + 3 a 20/s
+        assert stats["requests"] == 6
+        assert stats["waited"] >= 2
+        assert stats["max_wait"] > 0
+
+    def test_hosts_are_independent(self):
+        scheduler = scheduler_with(rate=0.1, capacity=1)
+        scheduler.acquire(f"{HOST}/x")
+
+        assert scheduler.acquire("http://localhost:8152/health") < 0.01
+
+    def test_host_of(self):
+        assert host_of("https://API.github.com/repos/x?page=2") == "api.github.com"
+        assert host_of("http://localhost:8150/health") == "localhost:8150"
+
+
+class TestPriorities:
+    """Test interactive vs background ordering."""
+
+    def test_interactive_served_before_background(self):
+        scheduler = scheduler_with(rate=10.0, capacity=1)
+        scheduler.acquire(HOST)   # esvazia o bucket
+        order = []
+
+        def background():
+            with request_priority(Priority.BACKGROUND):
+                scheduler.acquire(HOST)
+            order.append("background")
+
+        def interactive():
+            scheduler.acquire(HOST)
+            order.append("interactive")
+
+        threads = [threading.Thread(target=background)]
+        threads[0].start()
+        while scheduler.queue_depth("api.example.com") < 1:
+            time.sleep(0.001)
+        threads.append(threading.Thread(target=interactive))
+        threads[1].start()
+        for thread in threads:
+            thread.join(5)
+
+        assert order == ["interactive", "background"]
+        assert scheduler.stats()["api.example.com"]["max_queue_depth"] == 2
+
+    def test_background_leaves_reserve_for_interactive(self):
+        scheduler = scheduler_with(rate=1.0, capacity=10, reserve=0.5)
+        with request_priority(Priority.BACKGROUND):
+            for _ in range(4):
+                assert scheduler.acquire(HOST) < 0.05
+
+        assert scheduler.acquire(HOST, priority=Priority.INTERACTIVE) < 0.05
+        assert scheduler.stats()["api.example.com"]["tokens"] < 6  # background teria de esperar
+
+
+class TestHeaderLearning:
+    """Test adaptation from response headers."""
+
+    def test_remaining_caps_tokens(self):
+        scheduler = scheduler_with(rate=1.0, capacity=100)
+        reset = int(time.time()) + 60
+
+        scheduler.observe(HOST, 200, {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "5",
+                                      "X-RateLimit-Reset": str(reset)})
+        stats = scheduler.stats()["api.example.com"]
+
+        assert stats["capacity"] == 60
+        assert stats["remaining"] == 5
+        assert stats["tokens"] <= 5.1
+
+    def test_limit_sets_rate_over_window(self):
+        scheduler = RateLimitScheduler()
+        url = "https://api.github.com/repos/x"
+
+        scheduler.observe(url, 200, {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "60",
+                                     "X-RateLimit-Reset": str(int(time.time()) + 1800)})
+        stats = scheduler.stats()["api.github.com"]
+
+        assert stats["capacity"] == 60
+        assert stats["rate"] == pytest.approx(60 / 3600)
+
+    def test_higher_plan_raises_rate(self):
+        scheduler = RateLimitScheduler()
+        url = "https://api.clickup.com/api/v2/list/1/task"
+
+        scheduler.observe(url, 200, {"X-RateLimit-Limit": "1000", "X-RateLimit-Remaining": "1000",
+                                     "X-RateLimit-Reset": str(int(time.time()) + 60)})
+        stats = scheduler.stats()["api.clickup.com"]
+
+        assert stats["capacity"] == 1000
+        assert stats["rate"] == pytest.approx(1000 / 60, rel=0.05)
+
+    def test_reset_widens_unknown_window(self):
+        scheduler = scheduler_with(rate=50.0, capacity=50)
+
+        scheduler.observe(HOST, 200, {"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "100",
+                                      "X-RateLimit-Reset": str(int(time.time()) + 100)})
+
+        assert scheduler.stats()["api.example.com"]["rate"] == pytest.approx(1.0, rel=0.05)
+
+    def test_exhausted_budget_blocks_until_reset(self):
+        scheduler = scheduler_with(rate=100.0, capacity=100)
+        reset = int(time.time()) + 30
+
+        scheduler.observe(HOST, 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+
+        assert scheduler.stats()["api.example.com"]["blocked_for"] > 25
+
+    def test_new_window_restores_budget(self):
+        scheduler = scheduler_with(rate=0.01, capacity=100)
+        now = int(time.time())
+        scheduler.observe(HOST, 200, {"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": str(now + 1)})
+
+        scheduler.observe(HOST, 200, {"X-RateLimit-Remaining": "99", "X-RateLimit-Reset": str(now + 61)})
+
+        assert scheduler.stats()["api.example.com"]["tokens"] >= 98
+
+    def test_429_retry_after(self):
+        scheduler = scheduler_with(rate=100.0, capacity=100)
+
+        scheduler.observe(HOST, 429, {"Retry-After": "7"})
+        stats = scheduler.stats()["api.example.com"]
+
+        assert stats["throttled"] == 1
+        assert 6 < stats["blocked_for"] <= 7
+
+    def test_429_without_headers_backs_off(self):
+        scheduler = RateLimitScheduler(backoff_base=0.05)
+        scheduler.observe(HOST, 429, {})
+        first = scheduler.stats()["api.example.com"]["blocked_for"]
+        scheduler.observe(HOST, 429, {})
+
+        assert 0 < first <= 0.05
+        assert scheduler.stats()["api.example.com"]["blocked_for"] > first
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """429 (Retry-After: 0) nas primeiras N requisições, depois 200"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            throttled = server.hits <= server.throttle
+        body = json.dumps({"ok": not throttled}).encode()
+        self.send_response(429 if throttled else 200)
+        self.send_header("Retry-After", "0")
+        self.send_header("X-RateLimit-Remaining", "0" if throttled else "42")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    srv.daemon_threads = True
+    srv.lock = threading.Lock()
+    srv.hits = 0
+    srv.throttle = 2
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+class TestPooledSessionIntegration:
+    """Test the scheduler inside PooledSession."""
+
+    def test_429_is_requeued_not_failed(self, server):
+        scheduler = RateLimitScheduler()
+        session = PooledSession(HTTPConfig(max_retries=3), scheduler=scheduler)
+
+        response = session.post(f"{server.url}/task", json={})
+        session.close()
+
+        stats = scheduler.stats()[host_of(server.url)]
+        assert response.status_code == 200
+        assert server.hits == 3
+        assert stats["throttled"] == 2
+        assert stats["remaining"] == 42
+
+    def test_gives_up_after_max_retries(self, server):
+        server.throttle = 10
+        session = PooledSession(HTTPConfig(max_retries=1), scheduler=RateLimitScheduler())
+
+        response = session.get(f"{server.url}/x")
+        session.close()
+
+        assert response.status_code == 429
+        assert server.hits == 2
+
+
+class TestAiohttpIntegration:
+    """Test scheduling of aiohttp sessions via trace_config."""
+
+    @pytest_asyncio.fixture
+    async def app_url(self):
+        async def handler(request):
+            return web.json_response({"ok": True}, headers={"X-RateLimit-Remaining": "7"})
+
+        app = web.Application()
+        app.router.add_get("/health", handler)
+        server = TestServer(app)
+        await server.start_server()
+        yield str(server.make_url("")).rstrip("/")
+        await server.close()
+
+    @pytest.mark.asyncio
+    async def test_requests_scheduled_and_observed(self, app_url):
+        scheduler = RateLimitScheduler(default_limit=HostLimit(rate=50.0, capacity=2))
+        async with aiohttp.ClientSession(trace_configs=[scheduler.trace_config()]) as session:
+            for _ in range(4):
+                async with session.get(f"{app_url}/health") as response:
+                    assert response.status == 200
+
+        stats = scheduler.stats()[host_of(app_url)]
+        assert stats["requests"] == 4
+        assert stats["remaining"] == 7
+        assert stats["waited"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = scheduler_with(rate=0.01, capacity=1)
+        await scheduler.acquire_async(HOST)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(scheduler.acquire_async(HOST), timeout=0.05)
+
+        assert scheduler.queue_depth("api.example.com") == 0
@@ -0,0 +1,238 @@
+"""
+Webhook Receiver Tests
+=======================
+
+Test suite for the local GitHub/ClickUp webhook receiver.
+
+Test Coverage:
+- HMAC signature validation
+- Push / issues events applied as project_context deltas
+- ClickUp task events applied to the tasks table
+- Redelivery deduplication by delivery id (and retry after failure)
+- EventReplayer (JSONL replay)
+
+Author: MAXIMUS AI
+Date: October 18, 2026
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+
+from sage.core.secretary_agent import MemorySystem
+from sage.integrations.clickup_sync import ClickUpSyncEngine
+from sage.integrations.webhooks import EventReplayer, WebhookReceiver, sign, verify_signature
+
+
+GITHUB_SECRET = "gh-secret"
+CLICKUP_SECRET = "cu-secret"
+
+PROJECTS = {
+    "Max-Code": {"github": "Max-Code", "clickup_list": "L1", "description": ""},
+}
+
+
+class FakeClickUp:
+    """get_task do ClickUp em memória (pode falhar uma vez)"""
+
+    def __init__(self):
+        self.tasks = {}
+        self.fail_next = False
+
+    def get_task(self, task_id):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("ClickUp fora do ar")
+        return self.tasks[task_id]
+
+
+def push_payload(*shas, ref="refs/heads/main"):
+    return {
+        "ref": ref,
+        "repository": {"name": "Max-Code", "default_branch": "main"},
+        "commits": [
+            {"id": sha, "message": f"feat: {sha}\n\ncorpo", "timestamp": f"2026-10-18T1{i}:00:00Z",
+             "author": {"name": "Juan"}}
+            for i, sha in enumerate(shas)
+        ],
+    }
+
+
+def issue_payload(action, number=1, pull_request=False):
+    issue = {"number": number, "state": "closed" if action == "closed" else "open",
+             "updated_at": "2026-10-18T12:00:00Z"}
+    if pull_request:
+        issue["pull_request"] = {}
+    return {"action": action, "issue": issue, "repository": {"name": "Max-Code"}}
+
+
+def clickup_task(task_id, status="to do", status_type="open"):
+    return {
+        "id": task_id, "name": f"Tarefa {task_id}", "text_content": "",
+        "status": {"status": status, "type": status_type}, "priority": None,
+        "date_created": "1760000000000", "date_updated": "1760000000000", "due_date": None,
+        "list": {"id": "L1"},
+    }
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = MemorySystem(str(tmp_path / "webhooks.db"), write_behind=False)
+    yield mem
+    mem.close()
+
+
+@pytest.fixture
+def clickup():
+    return FakeClickUp()
+
+
+@pytest_asyncio.fixture
+async def receiver(memory, clickup):
+    receiver = WebhookReceiver(memory, PROJECTS, clickup=clickup,
+                               clickup_sync=ClickUpSyncEngine(clickup, memory),
+                               github_secret=GITHUB_SECRET, clickup_secret=CLICKUP_SECRET)
+    await receiver.start(port=0)
+    yield receiver
+    await receiver.stop()
+
+
+@pytest_asyncio.fixture
+async def replayer(receiver):
+    replayer = EventReplayer(receiver.url, github_secret=GITHUB_SECRET, clickup_secret=CLICKUP_SECRET)
+    yield replayer
+    await replayer.close()
+
+
+def project_context(memory):
+    return {c.name: c for c in memory.get_project_contexts()}["Max-Code"]
+
+
+class TestSignatures:
+    """Test HMAC validation."""
+
+    def test_verify_signature(self):
+        body = b'{"a": 1}'
+        assert verify_signature("s", body, "sha256=" + sign("s", body))
+        assert verify_signature("s", body, sign("s", body))
+        assert not verify_signature("s", body, sign("outro", body))
+        assert not verify_signature(None, body, sign("s", body))
+
+    @pytest.mark.asyncio
+    async def test_bad_signature_rejected(self, receiver, replayer, memory):
+        status, _ = await replayer.github("push", push_payload("a1"), secret="errado")
+
+        assert status == 401
+        assert receiver.rejected == 1
+        assert memory.get_daily_digest("2026-10-18").commits_made == 0
+
+
+class TestGitHubEvents:
+    """Test GitHub deltas."""
+
+    @pytest.mark.asyncio
+    async def test_push_updates_commits_and_context(self, replayer, memory):
+        status, body = await replayer.github("push", push_payload("a1", "b2"), delivery_id="d-1")
+
+        context = project_context(memory)
+        assert (status, body["status"]) == (200, "applied")
+        assert memory.get_daily_digest("2026-10-18").commits_made == 2
+        assert [c["sha"] for c in context.recent_commits] == ["b2", "a1"]
+        assert context.recent_commits[0]["message"] == "feat: b2"
+        assert context.last_activity == "2026-10-18T11:00:00Z"
+
+    @pytest.mark.asyncio
+    async def test_redelivery_is_deduplicated(self, receiver, replayer, memory):
+        await replayer.github("issues", issue_payload("opened"), delivery_id="d-7")
+        status, body = await replayer.github("issues", issue_payload("opened"), delivery_id="d-7")
+
+        assert body["status"] == "duplicate"
+        assert receiver.duplicates == 1
+        assert project_context(memory).open_issues == 1
+
+    @pytest.mark.asyncio
+    async def test_issue_deltas(self, replayer, memory):
+        await replayer.github("issues", issue_payload("opened", 1))
+        await replayer.github("issues", issue_payload("opened", 2))
+        await replayer.github("issues", issue_payload("closed", 1))
+        _, body = await replayer.github("issues", issue_payload("opened", 3, pull_request=True))
+
+        assert body["status"] == "ignored"
+        assert project_context(memory).open_issues == 1
+
+    @pytest.mark.asyncio
+    async def test_push_to_other_branch_ignored(self, replayer, memory):
+        _, body = await replayer.github("push", push_payload("c3", ref="refs/heads/feature"))
+
+        assert body["status"] == "ignored"
+        assert memory.get_daily_digest("2026-10-18").commits_made == 0
+
+
+class TestClickUpEvents:
+    """Test ClickUp task events."""
+
+    @pytest.mark.asyncio
+    async def test_task_created_then_status_updated(self, replayer, clickup, memory):
+        clickup.tasks["t1"] = clickup_task("t1")
+        await replayer.clickup({"event": "taskCreated", "task_id": "t1", "webhook_id": "w",
+                                "history_items": [{"id": "h1"}]})
+
+        _, body = await replayer.clickup({
+            "event": "taskStatusUpdated", "task_id": "t1", "webhook_id": "w",
+            "history_items": [{"id": "h2", "field": "status",
+                               "after": {"status": "complete", "type": "closed"}}],
+        })
+
+        tasks = memory.get_all_tasks()
+        assert body["status"] == "applied"
+        assert [(t.clickup_id, t.status, t.project) for t in tasks] == [("t1", "done", "Max-Code")]
+
+    @pytest.mark.asyncio
+    async def test_task_deleted(self, replayer, clickup, memory):
+        clickup.tasks["t1"] = clickup_task("t1")
+        await replayer.clickup({"event": "taskCreated", "task_id": "t1", "history_items": [{"id": "h1"}]})
+
+        await replayer.clickup({"event": "taskDeleted", "task_id": "t1", "history_items": [{"id": "h9"}]})
+
+        assert memory.count_tasks() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_event_can_be_redelivered(self, receiver, replayer, clickup, memory):
+        clickup.tasks["t1"] = clickup_task("t1")
+        clickup.fail_next = True
+        event = {"event": "taskCreated", "task_id": "t1", "history_items": [{"id": "h1"}]}
+
+        first, _ = await replayer.clickup(event)
+        second, body = await replayer.clickup(event)
+
+        assert (first, second, body["status"]) == (500, 200, "applied")
+        assert memory.count_tasks() == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_list_ignored(self, replayer, clickup, memory):
+        clickup.tasks["t2"] = {**clickup_task("t2"), "list": {"id": "outra"}}
+
+        _, body = await replayer.clickup({"event": "taskCreated", "task_id": "t2",
+                                          "history_items": [{"id": "h1"}]})
+
+        assert body["status"] == "ignored"
+        assert memory.count_tasks() == 0
+
+
+class TestReplayer:
+    """Test JSONL replay."""
+
+    @pytest.mark.asyncio
+    async def test_replay_file(self, tmp_path, receiver, replayer, memory):
+        events = tmp_path / "events.jsonl"
+        events.write_text("\n".join(json.dumps(e) for e in [
+            {"source": "github", "event": "push", "delivery_id": "r-1", "payload": push_payload("a1")},
+            {"source": "github", "event": "push", "delivery_id": "r-1", "payload": push_payload("a1")},
+            {"source": "github", "event": "issues", "delivery_id": "r-2", "payload": issue_payload("opened")},
+        ]))
+
+        results = await replayer.replay_file(str(events))
+
+        assert [body["status"] for _, body in results] == ["applied", "duplicate", "applied"]
+        assert receiver.stats()["applied"] == 2